@@ -0,0 +1,40 @@
+#!/bin/sh
+# Capture command outputs on a host that cannot run Python, for `legacy-scan ingest-bundles`.
+# Usage: sudo sh collect_bundle.sh [output-dir]   -> <output-dir>/<hostname>.tar.gz
+set -u
+
+out_dir="${1:-.}"
+host="$(hostname 2>/dev/null || uname -n)"
+work="$(mktemp -d)"
+trap 'rm -rf "$work"' EXIT INT TERM
+bundle="$work/$host"
+mkdir -p "$bundle/cron"
+
+capture() {
+    # capture <file> <command...>: keep the output only when the command exists and succeeds.
+    file="$1"
+    shift
+    command -v "$1" >/dev/null 2>&1 || return 0
+    "$@" >"$bundle/$file" 2>/dev/null || rm -f "$bundle/$file"
+}
+
+echo "$host" >"$bundle/hostname"
+capture dpkg-l.txt dpkg -l
+capture rpm-qa.txt rpm -qa
+capture ss-tulpen.txt ss -tulpen
+capture systemctl-list-units.txt systemctl list-units --type=service --state=running --no-pager
+capture ps-aux.txt ps aux
+
+for user in $(cut -d: -f1 /etc/passwd); do
+    capture "crontab-$user.txt" crontab -l -u "$user"
+    [ -s "$bundle/crontab-$user.txt" ] || rm -f "$bundle/crontab-$user.txt"
+done
+for file in /etc/crontab /etc/cron.d/*; do
+    [ -f "$file" ] || continue
+    mkdir -p "$bundle/cron$(dirname "$file")"
+    cp "$file" "$bundle/cron$file"
+done
+
+mkdir -p "$out_dir"
+tar -C "$work" -czf "$out_dir/$host.tar.gz" "$host"
+echo "Bundle written to $out_dir/$host.tar.gz"
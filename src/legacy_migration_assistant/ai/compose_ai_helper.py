@@ -10,7 +10,13 @@ from legacy_migration_assistant.core.models import AppTopology
 
 def generate_compose_comments(topology: AppTopology, provider: AIProvider | None = None) -> List[str]:
     provider = provider or NoopAIProvider()
-    summary = ", ".join([f"{c.name}({c.component_type.value})" for c in topology.components])
+    # Only the packages each component needs beyond the base image, not the whole host.
+    summary = ", ".join(
+        f"{c.name}({c.component_type.value}; packages: {' '.join(c.packages)})"
+        if c.packages
+        else f"{c.name}({c.component_type.value})"
+        for c in topology.components
+    )
     prompt = f"Provide migration hints for compose services: {summary}"
     text = provider.complete(prompt)
     return [text]
@@ -5,29 +5,69 @@ from .models import (
     AppTopology,
     ComponentType,
     ConfigFile,
+    ConnectionEdge,
+    CpuAffinity,
     CronJob,
+    DiskUsage,
+    HostMetrics,
+    HugePagePool,
+    HugePageUsage,
+    IoUsage,
+    NumaNode,
     OSFamily,
     OSRelease,
     Package,
     Port,
+    PortLoad,
+    ProcessLimits,
     Relation,
+    ResourceUsage,
+    RuntimeSettings,
+    ScanOverhead,
     Service,
+    StartupTiming,
+    VolumeUsage,
+)
+from .utils import (
+    detect_systemd,
+    format_cpu_list,
+    parse_cpu_list,
+    percentile,
+    run_command,
+    safe_read_file,
 )
-from .utils import detect_systemd, run_command, safe_read_file
 
 __all__ = [
     "AppComponent",
     "AppTopology",
     "ComponentType",
     "ConfigFile",
+    "ConnectionEdge",
+    "CpuAffinity",
     "CronJob",
+    "DiskUsage",
+    "HostMetrics",
+    "HugePagePool",
+    "HugePageUsage",
+    "IoUsage",
+    "NumaNode",
     "OSFamily",
     "OSRelease",
     "Package",
     "Port",
+    "PortLoad",
+    "ProcessLimits",
     "Relation",
+    "ResourceUsage",
+    "RuntimeSettings",
+    "ScanOverhead",
     "Service",
+    "StartupTiming",
+    "VolumeUsage",
     "detect_systemd",
+    "format_cpu_list",
+    "parse_cpu_list",
+    "percentile",
     "run_command",
     "safe_read_file",
 ]
@@ -0,0 +1,174 @@
+"""Startup-order graph over application components."""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from legacy_migration_assistant.core.metrics import by_service, component_startup
+from legacy_migration_assistant.core.models import AppTopology
+
+Graph = Dict[str, List[str]]
+
+
+class DependencyCycleError(ValueError):
+    """Components depend on each other in a loop, so no start order exists."""
+
+    def __init__(self, cycle: List[str]) -> None:
+        self.cycle = cycle
+        super().__init__(f"dependency cycle: {' -> '.join(cycle)}")
+
+
+def startup_graph(topology: AppTopology) -> Tuple[Graph, List[Tuple[str, str]]]:
+    """Map each component to the components it needs running first.
+
+    Declared ``depends_on`` and heuristic relations are hard edges. Relations seen
+    only in sampled traffic are added after them and skipped when they would close
+    a cycle (two services that call each other), since traffic says nothing about
+    which must start first; those edges are returned as ``(source, target)`` pairs.
+    Names that are not components of the topology and self-references are dropped.
+    """
+
+    names = {component.name for component in topology.components}
+    graph: Graph = {}
+    for component in topology.components:
+        deps = set(component.depends_on)
+        deps.update(
+            rel.target
+            for rel in topology.relations
+            if rel.source == component.name and not rel.external and not rel.observed
+        )
+        graph[component.name] = sorted(dep for dep in deps if dep in names and dep != component.name)
+    dropped: List[Tuple[str, str]] = []
+    soft = sorted(
+        (rel for rel in topology.relations if rel.observed and not rel.external),
+        key=lambda rel: (-(rel.connections or 0), rel.source, rel.target),
+    )
+    # Busier edges first, so the dominant direction of a two-way pair is the one kept.
+    for rel in soft:
+        source, target = rel.source, rel.target
+        if source not in names or target not in names or source == target or target in graph[source]:
+            continue
+        if _reaches(graph, target, source):
+            dropped.append((source, target))
+        else:
+            graph[source] = sorted([*graph[source], target])
+    return graph, dropped
+
+
+def dependency_graph(topology: AppTopology) -> Graph:
+    """Return the start-order graph of :func:`startup_graph` without the dropped edges."""
+
+    return startup_graph(topology)[0]
+
+
+def _reaches(graph: Graph, start: str, goal: str) -> bool:
+    seen = {start}
+    stack = [start]
+    while stack:
+        name = stack.pop()
+        if name == goal:
+            return True
+        for dep in graph.get(name, []):
+            if dep not in seen:
+                seen.add(dep)
+                stack.append(dep)
+    return False
+
+
+def dropped_edge_note(target: str) -> str:
+    return f"observed traffic to {target} does not gate startup; waiting on it would close a dependency cycle"
+
+
+def graph_from_edges(edges: Mapping[str, Iterable[str]]) -> Graph:
+    """Build a graph from ``name -> dependencies``, keeping only known names."""
+
+    return {name: sorted({dep for dep in deps if dep in edges and dep != name}) for name, deps in edges.items()}
+
+
+def find_cycle(graph: Graph) -> Optional[List[str]]:
+    """Return one dependency cycle as ``[a, b, ..., a]``, or None when the graph is acyclic."""
+
+    state: Dict[str, int] = {}  # 1 = on the current path, 2 = finished
+    for root in sorted(graph):
+        if state.get(root):
+            continue
+        path = [root]
+        stack = [iter(graph[root])]
+        state[root] = 1
+        while stack:
+            dep = next(stack[-1], None)
+            if dep is None:
+                state[path.pop()] = 2
+                stack.pop()
+            elif state.get(dep) == 1:
+                return [*path[path.index(dep) :], dep]
+            elif not state.get(dep):
+                state[dep] = 1
+                path.append(dep)
+                stack.append(iter(graph.get(dep, [])))
+    return None
+
+
+def topological_levels(graph: Graph) -> List[List[str]]:
+    """Group components into start waves; everything in a wave can start in parallel.
+
+    Raises :class:`DependencyCycleError` naming the loop when no order exists.
+    """
+
+    remaining = {name: set(deps) for name, deps in graph.items()}
+    levels: List[List[str]] = []
+    while remaining:
+        ready = sorted(name for name, deps in remaining.items() if not deps)
+        if not ready:
+            raise DependencyCycleError(find_cycle({name: sorted(deps) for name, deps in remaining.items()}) or [])
+        levels.append(ready)
+        for name in ready:
+            del remaining[name]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+    return levels
+
+
+def start_waves(graph: Graph) -> Dict[str, int]:
+    """Return the 0-based start wave of each component."""
+
+    return {name: index for index, level in enumerate(topological_levels(graph)) for name in level}
+
+
+def critical_path(graph: Graph, durations: Optional[Mapping[str, float]] = None) -> Tuple[List[str], float]:
+    """Return the slowest dependency chain (first to start first) and its total duration.
+
+    Without measured durations every component counts as one step, so the length is
+    the number of waves the chain spans; with them, unmeasured components count as zero.
+    """
+
+    durations = durations or {}
+    default = 0.0 if durations else 1.0
+    finish: Dict[str, float] = {}
+    previous: Dict[str, Optional[str]] = {}
+    for level in topological_levels(graph):
+        for name in level:
+            slowest = max(graph[name], key=lambda dep: (finish[dep], dep), default=None)
+            finish[name] = (finish[slowest] if slowest else 0.0) + durations.get(name, default)
+            previous[name] = slowest
+    if not finish:
+        return [], 0.0
+    name: Optional[str] = max(finish, key=lambda key: (finish[key], key))
+    total = finish[name]
+    path: List[str] = []
+    while name is not None:
+        path.append(name)
+        name = previous[name]
+    return path[::-1], total
+
+
+def startup_durations(topology: AppTopology) -> Dict[str, float]:
+    """Measured start latency per component, for components that have one."""
+
+    index = by_service(topology.metrics.startup)
+    durations: Dict[str, float] = {}
+    for component in topology.components:
+        startup = component_startup(topology, component, index)
+        if startup is not None and startup.start_seconds is not None:
+            durations[component.name] = startup.start_seconds
+    return durations
@@ -0,0 +1,272 @@
+"""Helpers that attribute per-service measurements to application components."""
+
+from __future__ import annotations
+
+from itertools import zip_longest
+from typing import Dict, Iterable, List, Optional, TypeVar
+
+from legacy_migration_assistant.core.models import (
+    AppComponent,
+    AppTopology,
+    ConfigFile,
+    CpuAffinity,
+    HugePageUsage,
+    IoUsage,
+    PortLoad,
+    ProcessLimits,
+    ResourceUsage,
+    RuntimeSettings,
+    StartupTiming,
+    VolumeUsage,
+)
+
+T = TypeVar("T")
+
+# An accept queue this full at its peak means the listener could not keep up.
+SATURATED_ACCEPT_QUEUE_RATIO = 0.8
+# Peak established connections on one port that is worth calling out.
+HIGH_CONNECTION_COUNT = 500
+
+# The scanner measures this directory next to data directories to spot shared filesystems.
+LOG_DIR = "/var/log"
+
+
+def by_service(records: Iterable[T]) -> Dict[str, T]:
+    """Index per-service records by their ``service`` attribute."""
+
+    return {record.service: record for record in records}  # type: ignore[attr-defined]
+
+
+def _sum_ticks(series: List[List[int]]) -> List[int]:
+    # A service that started or stopped mid-window has fewer samples; count it as 0
+    # for the missing ticks rather than cutting every series to the shortest.
+    return [sum(values) for values in zip_longest(*series, fillvalue=0)]
+
+
+def merge_usage(name: str, records: List[ResourceUsage]) -> Optional[ResourceUsage]:
+    """Sum several services' samples tick by tick into one component-level record."""
+
+    if not records:
+        return None
+    if len(records) == 1:
+        return records[0]
+
+    peaks = [r.memory_peak_kib for r in records if r.memory_peak_kib is not None]
+    return ResourceUsage(
+        service=name,
+        cgroup=records[0].cgroup,
+        interval=records[0].interval,
+        memory_kib=_sum_ticks([r.memory_kib for r in records]),
+        memory_peak_kib=sum(peaks) if peaks else None,
+        cpu_millicores=_sum_ticks([r.cpu_millicores for r in records]),
+    )
+
+
+def usage_by_service(topology: AppTopology) -> Dict[str, ResourceUsage]:
+    return by_service(topology.metrics.usage)
+
+
+def component_usage(
+    topology: AppTopology, component: AppComponent, index: Optional[Dict[str, ResourceUsage]] = None
+) -> Optional[ResourceUsage]:
+    """Return the combined resource usage of the services backing ``component``.
+
+    Pass ``index`` from :func:`usage_by_service` when looking up many components.
+    """
+
+    index = usage_by_service(topology) if index is None else index
+    records = [index[name] for name in component.services if name in index]
+    return merge_usage(component.name, records)
+
+
+def merge_startup(name: str, records: List[StartupTiming]) -> Optional[StartupTiming]:
+    """A component is up once its slowest service is; restarts add up."""
+
+    timed = [r.start_seconds for r in records if r.start_seconds is not None]
+    if not records:
+        return None
+    return StartupTiming(
+        service=name,
+        start_seconds=max(timed) if timed else None,
+        restarts=sum(r.restarts for r in records),
+    )
+
+
+def component_startup(
+    topology: AppTopology, component: AppComponent, index: Optional[Dict[str, StartupTiming]] = None
+) -> Optional[StartupTiming]:
+    """Return the start latency of the services backing ``component``."""
+
+    index = by_service(topology.metrics.startup) if index is None else index
+    return merge_startup(component.name, [index[name] for name in component.services if name in index])
+
+
+def component_connections(
+    topology: AppTopology, component: AppComponent, index: Optional[Dict[int, PortLoad]] = None
+) -> List[int]:
+    """Return established connections on the component's ports, summed per sample tick."""
+
+    index = {load.port: load for load in topology.metrics.connections} if index is None else index
+    return _sum_ticks([index[port].established for port in component.ports if port in index])
+
+
+def component_port_loads(
+    topology: AppTopology, component: AppComponent, index: Optional[Dict[int, PortLoad]] = None
+) -> List[PortLoad]:
+    index = {load.port: load for load in topology.metrics.connections} if index is None else index
+    return [index[port] for port in component.ports if port in index]
+
+
+def accept_queue_saturation(load: PortLoad) -> Optional[float]:
+    """Peak accept-queue depth as a share of the listen backlog."""
+
+    if not load.accept_queue or not load.backlog:
+        return None
+    return max(load.accept_queue) / load.backlog
+
+
+def is_saturated(load: PortLoad) -> bool:
+    saturation = accept_queue_saturation(load)
+    return saturation is not None and saturation >= SATURATED_ACCEPT_QUEUE_RATIO
+
+
+def port_load_notes(loads: List[PortLoad]) -> List[str]:
+    """Flags for the application map: saturated accept queues and busy ports."""
+
+    notes: List[str] = []
+    for load in loads:
+        if is_saturated(load):
+            notes.append(
+                f"port {load.port}: accept queue saturated (peak {max(load.accept_queue)} of backlog {load.backlog})"
+            )
+        peak = max(load.established, default=0)
+        if peak >= HIGH_CONNECTION_COUNT:
+            notes.append(f"port {load.port}: high connection count (peak {peak} established)")
+    return notes
+
+
+def merge_limits(name: str, records: List[ProcessLimits]) -> Optional[ProcessLimits]:
+    """Combine limits of several services, keeping the most permissive value of each."""
+
+    if not records:
+        return None
+    if len(records) == 1:
+        return records[0]
+
+    def _widest(values: List[Optional[int]]) -> Optional[int]:
+        return None if any(v is None for v in values) else max(values)  # type: ignore[type-var]
+
+    def _merge(tables: List[Dict[str, Optional[int]]]) -> Dict[str, Optional[int]]:
+        names = sorted({key for table in tables for key in table})
+        return {key: _widest([table[key] for table in tables if key in table]) for key in names}
+
+    return ProcessLimits(
+        service=name,
+        soft=_merge([r.soft for r in records]),
+        hard=_merge([r.hard for r in records]),
+    )
+
+
+def component_limits(
+    topology: AppTopology, component: AppComponent, index: Optional[Dict[str, ProcessLimits]] = None
+) -> Optional[ProcessLimits]:
+    """Return the process limits the services backing ``component`` ran with."""
+
+    index = by_service(topology.metrics.limits) if index is None else index
+    return merge_limits(component.name, [index[name] for name in component.services if name in index])
+
+
+def component_config_memory(
+    topology: AppTopology, component: AppComponent, index: Optional[Dict[str, ConfigFile]] = None
+) -> Optional[int]:
+    """Return the memory (KiB) the component's configuration allows it to use, if known."""
+
+    index = {cfg.path: cfg for cfg in topology.configs} if index is None else index
+    estimates = [
+        int(index[path].metadata["tuning"]["memory_kib"])
+        for path in component.configs
+        if path in index and "tuning" in index[path].metadata
+    ]
+    return sum(estimates) if estimates else None
+
+
+def component_runtimes(
+    topology: AppTopology, component: AppComponent, index: Optional[Dict[str, RuntimeSettings]] = None
+) -> List[RuntimeSettings]:
+    """Return the runtime settings of the services backing ``component``."""
+
+    index = by_service(topology.metrics.runtimes) if index is None else index
+    return [index[name] for name in component.services if name in index]
+
+
+def merge_affinity(name: str, records: List[CpuAffinity]) -> Optional[CpuAffinity]:
+    """A component spanning several pinned services needs the union of their CPUs."""
+
+    if not records:
+        return None
+    return CpuAffinity(
+        service=name,
+        cpus=sorted({cpu for r in records for cpu in r.cpus}),
+        mems=sorted({mem for r in records for mem in r.mems}),
+        nodes=sorted({node for r in records for node in r.nodes}),
+    )
+
+
+def component_affinity(
+    topology: AppTopology, component: AppComponent, index: Optional[Dict[str, CpuAffinity]] = None
+) -> Optional[CpuAffinity]:
+    """Return the CPU/NUMA pinning of the services backing ``component``, if any."""
+
+    index = by_service(topology.metrics.affinity) if index is None else index
+    return merge_affinity(component.name, [index[name] for name in component.services if name in index])
+
+
+def component_hugepages(
+    topology: AppTopology, component: AppComponent, index: Optional[Dict[str, HugePageUsage]] = None
+) -> List[HugePageUsage]:
+    """Return the huge page usage of the services backing ``component``."""
+
+    index = by_service(topology.metrics.hugepages) if index is None else index
+    return [index[name] for name in component.services if name in index]
+
+
+def component_storage(
+    topology: AppTopology, component: AppComponent, index: Optional[Dict[str, VolumeUsage]] = None
+) -> List[VolumeUsage]:
+    """Return measurements for the component's volumes, in volume order."""
+
+    index = {v.path: v for v in topology.metrics.volumes} if index is None else index
+    return [index[path] for path in component.volumes if path in index]
+
+
+def merge_io(name: str, records: List[IoUsage]) -> Optional[IoUsage]:
+    """Sum several services' I/O rates tick by tick."""
+
+    if not records:
+        return None
+    if len(records) == 1:
+        return records[0]
+    versions = {r.cgroup for r in records}
+    return IoUsage(
+        service=name,
+        interval=records[0].interval,
+        # Operation counts only mean disk requests when every record came from a cgroup.
+        cgroup=versions.pop() if len(versions) == 1 else None,
+        read_bytes=_sum_ticks([r.read_bytes for r in records]),
+        write_bytes=_sum_ticks([r.write_bytes for r in records]),
+        read_ops=_sum_ticks([r.read_ops for r in records]),
+        write_ops=_sum_ticks([r.write_ops for r in records]),
+    )
+
+
+def component_io(
+    topology: AppTopology, component: AppComponent, index: Optional[Dict[str, IoUsage]] = None
+) -> Optional[IoUsage]:
+    """Return the combined I/O rates of the services backing ``component``."""
+
+    index = by_service(topology.metrics.io) if index is None else index
+    return merge_io(component.name, [index[name] for name in component.services if name in index])
+
+
+def host_log_storage(topology: AppTopology) -> Optional[VolumeUsage]:
+    return next((usage for usage in topology.metrics.volumes if usage.path == LOG_DIR), None)
@@ -2,9 +2,10 @@
 
 from __future__ import annotations
 
-from dataclasses import asdict, dataclass, field
+from dataclasses import asdict, dataclass, field, fields, is_dataclass
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Union, get_args, get_origin, get_type_hints
 
 
 class OSFamily(str, Enum):
@@ -31,6 +32,10 @@ class Package:
     name: str
     version: str
     source: Optional[str] = None
+    # Declared dependencies (dpkg Pre-Depends/Depends, rpm Requires); "a|b" is a choice.
+    depends: List[str] = field(default_factory=list)
+    # Virtual package names (dpkg) or capabilities (rpm) this package satisfies.
+    provides: List[str] = field(default_factory=list)
 
 
 @dataclass
@@ -42,6 +47,9 @@ class Service:
     main_cmd: Optional[str] = None
     manager: Optional[str] = None
     pid: Optional[int] = None
+    # Package that installed the main binary (or unit file), and its version.
+    package: Optional[str] = None
+    package_version: Optional[str] = None
 
 
 @dataclass
@@ -53,6 +61,7 @@ class Port:
     port: int
     process: Optional[str] = None
     pid: Optional[int] = None
+    backlog: Optional[int] = None
 
 
 @dataclass
@@ -72,6 +81,9 @@ class ConfigFile:
     path: str
     service: str
     metadata: Dict[str, Any] = field(default_factory=dict)
+    # Package that installed the file (or, for files it did not ship, its directory).
+    package: Optional[str] = None
+    package_version: Optional[str] = None
 
 
 class ComponentType(str, Enum):
@@ -98,6 +110,10 @@ class AppComponent:
     environment: Dict[str, str] = field(default_factory=dict)
     depends_on: List[str] = field(default_factory=list)
     notes: List[str] = field(default_factory=list)
+    services: List[str] = field(default_factory=list)
+    configs: List[str] = field(default_factory=list)
+    # Installed packages the component needs beyond the base image (see core.package_graph).
+    packages: List[str] = field(default_factory=list)
 
 
 @dataclass
@@ -107,6 +123,235 @@ class Relation:
     source: str
     target: str
     description: Optional[str] = None
+    # Peak and mean established connections observed from source to target, when sampled.
+    connections: Optional[int] = None
+    weight: Optional[float] = None
+    # Target is an address outside this host rather than a component.
+    external: bool = False
+    # Inferred only from sampled traffic; it orders startup only where it closes no cycle.
+    observed: bool = False
+
+
+@dataclass
+class ResourceUsage:
+    """Cgroup accounting sampled for one service over a window.
+
+    Samples are kept as plain integers (KiB and millicores) so they stay small in
+    scan.json and app-map.yaml.
+    """
+
+    service: str
+    cgroup: str
+    interval: float = 0.0
+    memory_kib: List[int] = field(default_factory=list)
+    memory_peak_kib: Optional[int] = None
+    cpu_millicores: List[int] = field(default_factory=list)
+
+
+@dataclass
+class StartupTiming:
+    """How long a systemd unit took to become active, and how often it restarted."""
+
+    service: str
+    start_seconds: Optional[float] = None
+    restarts: int = 0
+
+
+@dataclass
+class PortLoad:
+    """Load on one listening TCP port, sampled over a window.
+
+    ``accept_queue`` holds connections waiting for ``accept()`` at each tick, to be
+    compared with the listen ``backlog``; bytes are per second across the port's
+    established connections.
+    """
+
+    port: int
+    established: List[int] = field(default_factory=list)
+    accept_queue: List[int] = field(default_factory=list)
+    backlog: Optional[int] = None
+    bytes_in: List[int] = field(default_factory=list)
+    bytes_out: List[int] = field(default_factory=list)
+
+
+@dataclass
+class ProcessLimits:
+    """Resource limits a service's main process ran with, keyed by ulimit name.
+
+    Values are raw rlimit numbers as printed in /proc/<pid>/limits; None means unlimited.
+    """
+
+    service: str
+    pid: Optional[int] = None
+    soft: Dict[str, Optional[int]] = field(default_factory=dict)
+    hard: Dict[str, Optional[int]] = field(default_factory=dict)
+
+
+@dataclass
+class RuntimeSettings:
+    """Memory and concurrency settings a service's runtime was started with."""
+
+    service: str
+    runtime: str
+    heap_kib: Optional[int] = None
+    workers: Optional[int] = None
+    threads: Optional[int] = None
+    cpus: Optional[int] = None
+    options: List[str] = field(default_factory=list)
+
+
+@dataclass
+class NumaNode:
+    """One NUMA node of the host and the CPUs attached to it."""
+
+    node: int
+    cpus: List[int] = field(default_factory=list)
+
+
+@dataclass
+class CpuAffinity:
+    """CPUs and memory nodes a pinned (taskset/numactl) service is restricted to."""
+
+    service: str
+    cpus: List[int] = field(default_factory=list)
+    mems: List[int] = field(default_factory=list)
+    nodes: List[int] = field(default_factory=list)
+
+
+@dataclass
+class HugePagePool:
+    """The host's preallocated hugetlb pool for one page size."""
+
+    size_kib: int
+    total: int = 0
+    free: int = 0
+    reserved: int = 0
+    surplus: int = 0
+
+
+@dataclass
+class HugePageUsage:
+    """Huge pages mapped by a service's main process, from /proc/<pid>/smaps_rollup."""
+
+    service: str
+    hugetlb_kib: int = 0
+    page_size_kib: Optional[int] = None
+    anon_huge_kib: int = 0
+
+
+@dataclass
+class VolumeUsage:
+    """Measured size of a data directory and the filesystem it lives on.
+
+    ``complete`` is False when the walk hit its time cap; ``used_kib`` is then a lower bound.
+    """
+
+    path: str
+    used_kib: int = 0
+    files: int = 0
+    complete: bool = True
+    fstype: Optional[str] = None
+    mount_point: Optional[str] = None
+    mount_options: List[str] = field(default_factory=list)
+    source: Optional[str] = None
+
+
+@dataclass
+class IoUsage:
+    """Per-interval disk I/O rates of a service.
+
+    Taken from the unit cgroup's io.stat (blkio on v1) when ``cgroup`` names a
+    version: bytes and operations that reached the block layer, across all of the
+    unit's processes. Otherwise from /proc/<pid>/io of the main process, which
+    gives bytes only; operation series are then empty.
+    """
+
+    service: str
+    interval: float = 0.0
+    cgroup: Optional[str] = None
+    read_bytes: List[int] = field(default_factory=list)
+    write_bytes: List[int] = field(default_factory=list)
+    read_ops: List[int] = field(default_factory=list)
+    write_ops: List[int] = field(default_factory=list)
+
+
+@dataclass
+class DiskUsage:
+    """Per-interval rates of one block device, from /proc/diskstats."""
+
+    device: str
+    rotational: Optional[bool] = None
+    read_iops: List[int] = field(default_factory=list)
+    write_iops: List[int] = field(default_factory=list)
+    read_bytes: List[int] = field(default_factory=list)
+    write_bytes: List[int] = field(default_factory=list)
+    utilization: List[int] = field(default_factory=list)
+
+
+@dataclass
+class ConnectionEdge:
+    """Client connections from one service to one address, sampled over a window.
+
+    ``target`` names the local service listening on the address, if any.
+    """
+
+    source: str
+    address: str
+    port: int
+    target: Optional[str] = None
+    peak: int = 0
+    mean: float = 0.0
+
+
+@dataclass
+class ScanOverhead:
+    """What a resource-governed scan cost the host and how often it held back.
+
+    ``cpu_seconds`` includes the commands the scanner ran; ``measures`` lists the
+    controls that took effect (``cgroup``, ``nice``, ``ionice``).
+    """
+
+    measures: List[str] = field(default_factory=list)
+    cpu_limit: Optional[float] = None
+    read_limit_bytes: Optional[int] = None
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    max_rss_kib: int = 0
+    bytes_read: int = 0
+    files_dropped_from_cache: int = 0
+    throttled_seconds: float = 0.0
+    pressure_backoffs: int = 0
+    pressure_wait_seconds: float = 0.0
+
+
+@dataclass
+class HostMetrics:
+    """Optional runtime measurements collected next to the inventory."""
+
+    usage: List[ResourceUsage] = field(default_factory=list)
+    startup: List[StartupTiming] = field(default_factory=list)
+    connections: List[PortLoad] = field(default_factory=list)
+    sysctls: Dict[str, str] = field(default_factory=dict)
+    limits: List[ProcessLimits] = field(default_factory=list)
+    runtimes: List[RuntimeSettings] = field(default_factory=list)
+    online_cpus: List[int] = field(default_factory=list)
+    numa: List[NumaNode] = field(default_factory=list)
+    affinity: List[CpuAffinity] = field(default_factory=list)
+    hugepage_pools: List[HugePagePool] = field(default_factory=list)
+    hugepages: List[HugePageUsage] = field(default_factory=list)
+    transparent_hugepages: Optional[str] = None
+    volumes: List[VolumeUsage] = field(default_factory=list)
+    io: List[IoUsage] = field(default_factory=list)
+    disks: List[DiskUsage] = field(default_factory=list)
+    io_pressure: List[float] = field(default_factory=list)
+    listen_overflows: List[int] = field(default_factory=list)
+    edges: List[ConnectionEdge] = field(default_factory=list)
+    # Distinct edges left out once the sampler's edge limit was reached.
+    edges_dropped: int = 0
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "HostMetrics":
+        return _dataclass_from_dict(cls, data or {})
 
 
 @dataclass
@@ -120,8 +365,54 @@ class AppTopology:
     ports: List[Port] = field(default_factory=list)
     cron: List[CronJob] = field(default_factory=list)
     configs: List[ConfigFile] = field(default_factory=list)
+    metrics: HostMetrics = field(default_factory=HostMetrics)
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to a serializable dictionary."""
-        return asdict(self)
+        return asdict(self, dict_factory=_plain_dict)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "AppTopology":
+        """Rebuild a topology from :meth:`to_dict` output (e.g. a parsed app-map.yaml)."""
+        return _dataclass_from_dict(cls, data or {})
+
+
+def _plain_dict(items: List[Any]) -> Dict[str, Any]:
+    return {key: value.value if isinstance(value, Enum) else value for key, value in items}
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+@lru_cache(maxsize=None)
+def _converter(hint: Any) -> Callable[[Any], Any]:
+    """Build (once per type hint) a function turning plain data into ``hint``."""
+    origin = get_origin(hint)
+    if origin is Union:
+        inner = [arg for arg in get_args(hint) if arg is not type(None)]
+        convert = _converter(inner[0]) if len(inner) == 1 else _identity
+        return lambda value: None if value is None else convert(value)
+    if origin in (list, List):
+        item = _converter(get_args(hint)[0]) if get_args(hint) else _identity
+        return lambda value: None if value is None else [item(entry) for entry in value]
+    if origin in (dict, Dict):
+        item = _converter(get_args(hint)[1]) if get_args(hint) else _identity
+        return lambda value: None if value is None else {key: item(entry) for key, entry in value.items()}
+    if isinstance(hint, type) and is_dataclass(hint):
+        return lambda value: _dataclass_from_dict(hint, value) if isinstance(value, dict) else value
+    if isinstance(hint, type) and issubclass(hint, Enum):
+        return lambda value: None if value is None else hint(value)
+    return _identity
+
+
+@lru_cache(maxsize=None)
+def _field_converters(cls: Any) -> Dict[str, Callable[[Any], Any]]:
+    hints = get_type_hints(cls)
+    return {f.name: _converter(hints[f.name]) for f in fields(cls)}
+
 
+def _dataclass_from_dict(cls: Any, data: Dict[str, Any]) -> Any:
+    """Build a (possibly nested) dataclass from plain data, ignoring unknown keys."""
+    converters = _field_converters(cls)
+    return cls(**{key: converters[key](value) for key, value in data.items() if key in converters})
@@ -0,0 +1,181 @@
+"""Dependency closure of installed packages.
+
+Packages get integer ids and their resolved dependencies are stored as one
+compressed adjacency array (``offsets``/``targets``), so the closure of a handful
+of roots over thousands of packages is a breadth-first walk over two ``array``
+objects. The closure stops at base-image packages: whatever they pull in is in
+the base image already.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections import deque
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Sequence
+
+from legacy_migration_assistant.core.models import AppComponent, AppTopology, Package
+
+# Packages of the stock debian:bookworm-slim and ubi9-minimal images.
+DEBIAN_BASE_PACKAGES = frozenset(
+    """
+    adduser apt base-files base-passwd bash bsdutils coreutils dash debconf
+    debian-archive-keyring debianutils diffutils dpkg findutils gcc-12-base gpgv grep
+    gzip hostname init-system-helpers libacl1 libapt-pkg6.0 libattr1 libaudit-common
+    libaudit1 libblkid1 libbz2-1.0 libc-bin libc6 libcap-ng0 libcap2 libcom-err2
+    libcrypt1 libdb5.3 libdebconfclient0 libgcc-s1 libgcrypt20 libgmp10 libgnutls30
+    libgpg-error0 libgssapi-krb5-2 libhogweed6 libidn2-0 libk5crypto3 libkeyutils1
+    libkrb5-3 libkrb5support0 liblz4-1 liblzma5 libmd0 libmount1 libnettle8 libnsl2
+    libp11-kit0 libpam-modules libpam-modules-bin libpam-runtime libpam0g
+    libpcre2-8-0 libseccomp2 libselinux1 libsemanage-common libsemanage2 libsepol2
+    libsmartcols1 libss2 libstdc++6 libsystemd0 libtasn1-6 libtinfo6 libtirpc-common
+    libtirpc3 libudev1 libunistring2 libxxhash0 libzstd1 login logsave mawk mount
+    ncurses-base ncurses-bin passwd perl-base sed sysvinit-utils tar tzdata
+    usr-is-merged util-linux util-linux-extra zlib1g
+    """.split()
+)
+RHEL_BASE_PACKAGES = frozenset(
+    """
+    alternatives audit-libs basesystem bash bzip2-libs ca-certificates coreutils-single
+    crypto-policies curl filesystem gawk glib2 glibc glibc-common
+    glibc-minimal-langpack gmp gnupg2 gnutls gpgme json-c keyutils-libs krb5-libs
+    libacl libarchive libattr libblkid libcap libcap-ng libcom_err libcurl-minimal
+    libdnf libffi libgcc libgcrypt libgpg-error libidn2 libmodulemd libmount
+    libpeas libreport-filesystem librepo libselinux libsemanage libsepol libsigsegv
+    libsmartcols libsolv libstdc++ libtasn1 libunistring libuuid libverto libxml2
+    libyaml libzstd lua-libs lz4-libs microdnf mpfr ncurses-base ncurses-libs nettle
+    npth openssl-libs p11-kit p11-kit-trust pcre pcre2 pcre2-syntax popt
+    redhat-release rpm rpm-libs sed setup sqlite-libs systemd-libs tzdata xz-libs
+    zlib
+    """.split()
+)
+BASE_PACKAGES: Dict[str, FrozenSet[str]] = {"dpkg": DEBIAN_BASE_PACKAGES, "rpm": RHEL_BASE_PACKAGES}
+
+
+class PackageGraph:
+    """Installed packages and their resolved dependencies as integer adjacency arrays.
+
+    A dependency resolves to the installed package of that name, else to the first
+    package providing it (a dpkg virtual package or an rpm capability), else, for
+    file dependencies such as ``/bin/sh``, to ``file_owner(path)``. Of a choice
+    ``a|b`` the first alternative that resolves wins. Names are also known without
+    a dpkg ``:arch`` qualifier.
+    """
+
+    def __init__(self, packages: Sequence[Package], file_owner: Optional[Callable[[str], Optional[str]]] = None):
+        self.names: List[str] = []
+        self.ids: Dict[str, int] = {}
+        for package in packages:
+            if package.name not in self.ids:
+                self.ids[package.name] = len(self.names)
+                self.names.append(package.name)
+        # dpkg may qualify multi-arch packages as name:arch; dependencies never do.
+        for name, index in list(self.ids.items()):
+            self.ids.setdefault(name.split(":", 1)[0], index)
+        providers: Dict[str, int] = {}
+        for package in packages:
+            for capability in package.provides:
+                providers.setdefault(capability, self.ids[package.name])
+        self.unresolved = 0
+
+        def resolve(name: str) -> Optional[int]:
+            found = self.ids.get(name)
+            if found is None:
+                found = providers.get(name)
+            if found is None and name.startswith("/") and file_owner is not None:
+                owner = file_owner(name)
+                found = self.ids.get(owner) if owner else None
+            return found
+
+        self.offsets = array("i", [0])
+        self.targets = array("i")
+        seen_packages = set()
+        edges: Dict[int, List[int]] = {}
+        for package in packages:
+            source = self.ids[package.name]
+            if source in seen_packages:
+                continue
+            seen_packages.add(source)
+            deps: List[int] = []
+            for relation in package.depends:
+                target = None
+                for alternative in relation.split("|"):
+                    target = resolve(alternative)
+                    if target is not None:
+                        break
+                if target is None:
+                    self.unresolved += 1
+                elif target != source and target not in deps:
+                    deps.append(target)
+            edges[source] = deps
+        for source in range(len(self.names)):
+            self.targets.extend(edges.get(source, []))
+            self.offsets.append(len(self.targets))
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def dependencies(self, name: str) -> List[str]:
+        index = self.ids[name]
+        return [self.names[target] for target in self.targets[self.offsets[index] : self.offsets[index + 1]]]
+
+    def closure(self, roots: Iterable[str], exclude: Iterable[str] = ()) -> List[str]:
+        """Installed packages reachable from ``roots``, minus (and not expanded through) ``exclude``."""
+
+        seen = bytearray(len(self.names))
+        for name in exclude:
+            index = self.ids.get(name)
+            if index is not None:
+                seen[index] = 1
+        queue = deque()
+        for name in roots:
+            index = self.ids.get(name)
+            if index is not None and not seen[index]:
+                seen[index] = 2
+                queue.append(index)
+        offsets, targets = self.offsets, self.targets
+        while queue:
+            index = queue.popleft()
+            for target in targets[offsets[index] : offsets[index + 1]]:
+                if not seen[target]:
+                    seen[target] = 2
+                    queue.append(target)
+        return sorted(self.names[index] for index, state in enumerate(seen) if state == 2)
+
+
+def base_packages(packages: Sequence[Package]) -> FrozenSet[str]:
+    """The stock base-image set matching the packages' manager."""
+
+    source = next((package.source for package in packages if package.source), "dpkg")
+    return BASE_PACKAGES.get(source, frozenset())
+
+
+def component_roots(topology: AppTopology, component: AppComponent, graph: PackageGraph) -> List[str]:
+    """Packages owning a component's service binaries and config files.
+
+    Services the scan could not attribute fall back to an installed package of the
+    same name.
+    """
+
+    roots: List[str] = []
+    for service in topology.services:
+        if service.name in component.services:
+            name = service.package or (service.name if service.name in graph.ids else None)
+            if name and name not in roots:
+                roots.append(name)
+    for config in topology.configs:
+        if config.path in component.configs and config.package and config.package not in roots:
+            roots.append(config.package)
+    return roots
+
+
+def application_closures(
+    topology: AppTopology, base: Optional[Iterable[str]] = None, graph: Optional[PackageGraph] = None
+) -> Dict[str, List[str]]:
+    """Per component, the packages its roots need beyond the base image."""
+
+    graph = graph or PackageGraph(topology.packages)
+    excluded = frozenset(base_packages(topology.packages) if base is None else base)
+    return {
+        component.name: graph.closure(component_roots(topology, component, graph), excluded)
+        for component in topology.components
+    }
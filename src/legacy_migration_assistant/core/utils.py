@@ -2,10 +2,15 @@
 
 from __future__ import annotations
 
+import math
 import os
 import subprocess
 from pathlib import Path
-from typing import Iterable, Optional
+from typing import Any, Iterable, List, Optional, Sequence
+
+# Set while a resource-governed scan runs (see legacy_server_scanner.throttle); it
+# paces file reads and long-running loops.
+_governor: Optional[Any] = None
 
 
 def run_command(command: Iterable[str], timeout: int = 10) -> tuple[int, str, str]:
@@ -23,8 +28,22 @@ def run_command(command: Iterable[str], timeout: int = 10) -> tuple[int, str, st
         return 1, "", f"{exc}"
 
 
+def set_governor(governor: Optional[Any]) -> None:
+    """Route file reads and :func:`pace` through ``governor`` (None restores plain reads)."""
+    global _governor
+    _governor = governor
+
+
+def pace() -> None:
+    """Give an installed governor a chance to throttle; a no-op otherwise."""
+    if _governor is not None:
+        _governor.pace()
+
+
 def safe_read_file(path: str) -> Optional[str]:
     """Return file content or None if missing/unreadable."""
+    if _governor is not None:
+        return _governor.read_text(path)
     try:
         return Path(path).read_text(encoding="utf-8", errors="ignore")
     except OSError:
@@ -34,3 +53,38 @@ def safe_read_file(path: str) -> Optional[str]:
 def detect_systemd() -> bool:
     """Best-effort systemd detection."""
     return os.path.isdir("/run/systemd/system")
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile (``pct`` in 0..100); 0.0 for an empty sequence."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return float(ordered[min(rank, len(ordered)) - 1])
+
+
+def parse_cpu_list(value: str) -> List[int]:
+    """Expand kernel list syntax such as ``0-3,8,10-11`` into sorted integers."""
+    result: set = set()
+    for part in value.strip().split(","):
+        part = part.strip()
+        if not part:
+            continue
+        start, sep, end = part.partition("-")
+        try:
+            result.update(range(int(start), int(end) + 1) if sep else [int(start)])
+        except ValueError:
+            continue
+    return sorted(result)
+
+
+def format_cpu_list(cpus: List[int]) -> str:
+    """Inverse of :func:`parse_cpu_list`, e.g. for compose ``cpuset``."""
+    ranges: List[List[int]] = []
+    for cpu in sorted(set(cpus)):
+        if ranges and cpu == ranges[-1][1] + 1:
+            ranges[-1][1] = cpu
+        else:
+            ranges.append([cpu, cpu])
+    return ",".join(str(first) if first == last else f"{first}-{last}" for first, last in ranges)
@@ -0,0 +1,156 @@
+"""Debian and RPM package version ordering."""
+
+from __future__ import annotations
+
+import functools
+from typing import Callable, Tuple
+
+_DIGITS = "0123456789"
+
+
+def _is_alpha(char: str) -> bool:
+    return ("a" <= char <= "z") or ("A" <= char <= "Z")
+
+
+def _debian_order(char: str) -> int:
+    # dpkg: '~' sorts before everything, even the end of the string; letters before other symbols.
+    if char in _DIGITS:
+        return 0
+    if _is_alpha(char):
+        return ord(char)
+    if char == "~":
+        return -1
+    return ord(char) + 256
+
+
+def _debian_part_compare(left: str, right: str) -> int:
+    """dpkg's ``verrevcmp`` over an upstream version or a revision."""
+
+    i = j = 0
+    while i < len(left) or j < len(right):
+        while (i < len(left) and left[i] not in _DIGITS) or (j < len(right) and right[j] not in _DIGITS):
+            a = _debian_order(left[i]) if i < len(left) else 0
+            b = _debian_order(right[j]) if j < len(right) else 0
+            if a != b:
+                return a - b
+            i += 1
+            j += 1
+        while i < len(left) and left[i] == "0":
+            i += 1
+        while j < len(right) and right[j] == "0":
+            j += 1
+        first_diff = 0
+        while i < len(left) and left[i] in _DIGITS and j < len(right) and right[j] in _DIGITS:
+            if not first_diff:
+                first_diff = ord(left[i]) - ord(right[j])
+            i += 1
+            j += 1
+        if i < len(left) and left[i] in _DIGITS:
+            return 1
+        if j < len(right) and right[j] in _DIGITS:
+            return -1
+        if first_diff:
+            return first_diff
+    return 0
+
+
+def _split_evr(version: str) -> Tuple[int, str, str]:
+    """Split ``[epoch:]version[-release]`` into its parts (epoch defaults to 0)."""
+
+    epoch, sep, rest = version.partition(":")
+    if not sep or not epoch.isdigit():
+        epoch, rest = "0", version
+    upstream, _, release = rest.rpartition("-") if "-" in rest else (rest, "", "")
+    return int(epoch), upstream, release
+
+
+def compare_debian(left: str, right: str) -> int:
+    """Order two Debian versions like ``dpkg --compare-versions`` (negative, zero or positive)."""
+
+    l_epoch, l_upstream, l_revision = _split_evr(left)
+    r_epoch, r_upstream, r_revision = _split_evr(right)
+    if l_epoch != r_epoch:
+        return l_epoch - r_epoch
+    return _debian_part_compare(l_upstream, r_upstream) or _debian_part_compare(l_revision, r_revision)
+
+
+def _rpm_segment(text: str, start: int, numeric: bool) -> int:
+    end = start
+    while end < len(text) and (text[end] in _DIGITS if numeric else _is_alpha(text[end])):
+        end += 1
+    return end
+
+
+def _rpmvercmp(left: str, right: str) -> int:
+    """rpm's ``rpmvercmp``: alternating numeric/alpha segments, ``~`` before and ``^`` after the end."""
+
+    if left == right:
+        return 0
+    i = j = 0
+    while i < len(left) or j < len(right):
+        while i < len(left) and not (left[i].isascii() and left[i].isalnum()) and left[i] not in "~^":
+            i += 1
+        while j < len(right) and not (right[j].isascii() and right[j].isalnum()) and right[j] not in "~^":
+            j += 1
+        a = left[i] if i < len(left) else ""
+        b = right[j] if j < len(right) else ""
+        if a == "~" or b == "~":
+            if a != "~":
+                return 1
+            if b != "~":
+                return -1
+            i += 1
+            j += 1
+            continue
+        if a == "^" or b == "^":
+            if not a:
+                return -1
+            if not b:
+                return 1
+            if a != "^":
+                return 1
+            if b != "^":
+                return -1
+            i += 1
+            j += 1
+            continue
+        if not (a and b):
+            break
+        numeric = a in _DIGITS
+        i_end, j_end = _rpm_segment(left, i, numeric), _rpm_segment(right, j, numeric)
+        seg_left, seg_right = left[i:i_end], right[j:j_end]
+        if not seg_right:
+            # Segments of different types: numeric ones are newer.
+            return 1 if numeric else -1
+        if numeric:
+            seg_left, seg_right = seg_left.lstrip("0"), seg_right.lstrip("0")
+            if len(seg_left) != len(seg_right):
+                return len(seg_left) - len(seg_right)
+        if seg_left != seg_right:
+            return -1 if seg_left < seg_right else 1
+        i, j = i_end, j_end
+    if i >= len(left) and j >= len(right):
+        return 0
+    return -1 if i >= len(left) else 1
+
+
+def compare_rpm(left: str, right: str) -> int:
+    """Order two RPM ``[epoch:]version-release`` strings like ``rpmdev-vercmp``."""
+
+    l_epoch, l_version, l_release = _split_evr(left)
+    r_epoch, r_version, r_release = _split_evr(right)
+    if l_epoch != r_epoch:
+        return l_epoch - r_epoch
+    return _rpmvercmp(l_version, r_version) or _rpmvercmp(l_release, r_release)
+
+
+def version_comparator(source: str | None) -> Callable[[str, str], int]:
+    """Pick the ordering for a package's ``source`` (``"rpm"`` or, by default, Debian)."""
+
+    return compare_rpm if source == "rpm" else compare_debian
+
+
+def version_key(source: str | None) -> Callable[[str], object]:
+    """A ``sorted`` key that orders version strings of ``source`` oldest first."""
+
+    return functools.cmp_to_key(version_comparator(source))
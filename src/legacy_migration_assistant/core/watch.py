@@ -0,0 +1,234 @@
+"""File watching and incremental YAML loading for ``--watch`` modes."""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import hashlib
+import os
+import re
+import select
+import struct
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import yaml
+
+_SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# inotify(7) constants
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_EVENT_HEADER = struct.Struct("iIII")
+
+_TOP_LEVEL_KEY_RE = re.compile(r"^([A-Za-z_][\w-]*):(\s|$)")
+
+
+def load_yaml(content: str) -> Any:
+    """Parse YAML with the libyaml-backed loader when PyYAML was built with it."""
+
+    return yaml.load(content, Loader=_SafeLoader)  # noqa: S506 - always a safe loader
+
+
+def _file_state(path: str) -> Optional[Tuple[int, int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+class FileWatcher:
+    """Block until a file changes, using inotify when available and mtime polling otherwise.
+
+    The parent directory is watched rather than the file itself so that editors
+    which save by writing a temporary file and renaming it are still noticed.
+    """
+
+    def __init__(self, path: str, interval: float = 0.25, use_inotify: bool = True) -> None:
+        self.path = os.path.abspath(path)
+        self.interval = interval
+        self._name = os.path.basename(self.path).encode()
+        self._state = _file_state(self.path)
+        self._fd: Optional[int] = self._init_inotify() if use_inotify else None
+
+    @property
+    def backend(self) -> str:
+        return "inotify" if self._fd is not None else "mtime"
+
+    def _init_inotify(self) -> Optional[int]:
+        libc_name = ctypes.util.find_library("c")
+        if not libc_name:
+            return None
+        try:
+            libc = ctypes.CDLL(libc_name, use_errno=True)
+            fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        except (OSError, AttributeError):
+            return None
+        if fd < 0:
+            return None
+        mask = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE
+        directory = os.path.dirname(self.path).encode()
+        if libc.inotify_add_watch(fd, directory, mask) < 0:
+            os.close(fd)
+            return None
+        return fd
+
+    def close(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def _drain_inotify(self) -> bool:
+        touched = False
+        if self._fd is None:
+            return touched
+        while True:
+            try:
+                buf = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return touched
+            offset = 0
+            while offset + _EVENT_HEADER.size <= len(buf):
+                _, _, _, length = _EVENT_HEADER.unpack_from(buf, offset)
+                start = offset + _EVENT_HEADER.size
+                name = buf[start : start + length].rstrip(b"\0")
+                touched = touched or name == self._name
+                offset = start + length
+
+    def poll(self, timeout: Optional[float] = None) -> bool:
+        """Wait up to ``timeout`` seconds (forever if None); return True if the file changed."""
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if self._fd is not None:
+                ready, _, _ = select.select([self._fd], [], [], remaining)
+                if ready and not self._drain_inotify():
+                    continue
+            else:
+                time.sleep(self.interval if remaining is None else min(self.interval, remaining))
+            state = _file_state(self.path)
+            if state is not None and state != self._state:
+                self._state = state
+                return True
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+
+
+def watch_file(
+    path: str,
+    on_change: Callable[[], None],
+    interval: float = 0.25,
+    on_error: Optional[Callable[[Exception], None]] = None,
+) -> None:
+    """Call ``on_change`` once, then again after every modification until interrupted."""
+
+    watcher = FileWatcher(path, interval=interval)
+    try:
+        while True:
+            try:
+                on_change()
+            except Exception as exc:  # a half-saved file must not end the watch loop
+                if on_error is None:
+                    raise
+                on_error(exc)
+            watcher.poll()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+
+
+def _split_top_level(content: str) -> Optional[List[Tuple[str, str]]]:
+    """Split a block-style YAML mapping into (key, text) chunks, or None if not possible."""
+
+    chunks: List[Tuple[str, str]] = []
+    key: Optional[str] = None
+    lines: List[str] = []
+    for line in content.splitlines(keepends=True):
+        match = _TOP_LEVEL_KEY_RE.match(line)
+        if match:
+            if key is not None:
+                chunks.append((key, "".join(lines)))
+            key, lines = match.group(1), [line]
+        elif key is None:
+            if line.strip() and not line.lstrip().startswith(("#", "---")):
+                return None
+        else:
+            lines.append(line)
+    if key is not None:
+        chunks.append((key, "".join(lines)))
+    return chunks
+
+
+def _split_list_items(body: str) -> Optional[List[str]]:
+    items: List[str] = []
+    current: List[str] = []
+    for line in body.splitlines(keepends=True):
+        if line.startswith("- "):
+            if current:
+                items.append("".join(current))
+            current = [line]
+        elif current:
+            current.append(line)
+        elif line.strip() and not line.lstrip().startswith("#"):
+            return None
+    if current:
+        items.append("".join(current))
+    return items
+
+
+class IncrementalYAMLLoader:
+    """Re-parse only the changed parts of a large block-style YAML document.
+
+    The document is split into top-level sections and, for list sections written
+    with items at column 0 (as ``legacy-scan map`` emits them), into individual
+    items. Parsed values are cached by a hash of their source text, so editing one
+    component of a large map re-parses that component only.
+    """
+
+    def __init__(self) -> None:
+        self._cache: Dict[str, Any] = {}
+        self._live: Dict[str, Any] = {}
+        self.parsed_chunks = 0
+
+    def _parse(self, text: str) -> Any:
+        digest = hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+        if digest in self._cache:
+            value = self._cache[digest]
+        else:
+            value = load_yaml(text)
+            self.parsed_chunks += 1
+        self._live[digest] = value
+        return value
+
+    def load(self, content: str) -> Any:
+        self.parsed_chunks = 0
+        chunks = _split_top_level(content)
+        if chunks is None:
+            return load_yaml(content)
+        self._live = {}
+        try:
+            result = self._load_chunks(chunks)
+        except yaml.YAMLError:
+            # e.g. anchors shared across sections; fall back to a plain full parse
+            return load_yaml(content)
+        # Drop entries for text that no longer exists so the cache tracks the file.
+        self._cache = self._live
+        return result
+
+    def _load_chunks(self, chunks: List[Tuple[str, str]]) -> Dict[str, Any]:
+        result: Dict[str, Any] = {}
+        for key, text in chunks:
+            header, _, body = text.partition("\n")
+            items = None if header[len(key) + 1 :].strip() else _split_list_items(body)
+            if items:
+                result[key] = [entry for item in items for entry in (self._parse(item) or [])]
+            else:
+                result[key] = (self._parse(text) or {}).get(key)
+        return result
@@ -0,0 +1,237 @@
+"""Build scans from command-output bundles collected on hosts that cannot run Python.
+
+A bundle is a tar archive (optionally gzip/bzip2/xz compressed), normally written
+by ``scripts/collect_bundle.sh``. Members may sit under one top-level directory;
+all are optional:
+
+============================  ======================================================
+``hostname``                  output of ``hostname`` (else the archive name is used)
+``dpkg-l.txt``                output of ``dpkg -l``
+``rpm-qa.txt``                output of ``rpm -qa``
+``ss-tulpen.txt``             output of ``ss -tulpen``
+``systemctl-list-units.txt``  ``systemctl list-units --type=service --state=running``
+``ps-aux.txt``                output of ``ps aux`` (used when systemctl is absent)
+``crontab-<user>.txt``        output of ``crontab -l -u <user>``
+``cron/<host path>``          system crontabs copied verbatim, e.g. ``cron/etc/crontab``
+============================  ======================================================
+
+Archives are read member by member with ``extractfile``; nothing is unpacked to disk.
+Each host's output goes to ``<output root>/<host>/``. Workers write to a private
+staging directory and the host directories are assigned once they all finished:
+when several bundles report the same host, the first (in path order) keeps that
+directory and the others get ``<host>--<archive name>/`` and name the first in
+their ``duplicate_of``.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import shutil
+import tarfile
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from legacy_migration_assistant.legacy_server_scanner import exporter
+from legacy_migration_assistant.legacy_server_scanner.cron import parse_crontab_text
+from legacy_migration_assistant.legacy_server_scanner.packages import (
+    parse_dpkg_output,
+    parse_rpm_output,
+)
+from legacy_migration_assistant.legacy_server_scanner.ports import parse_ss_output
+from legacy_migration_assistant.legacy_server_scanner.services import (
+    parse_ps_aux,
+    parse_systemctl_list_units,
+)
+from legacy_migration_assistant.legacy_server_scanner.topology_builder import (
+    serialize_scan,
+    topology_from_scan,
+)
+
+BUNDLE_SUFFIXES = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tar.xz")
+BUNDLE_FILES = (
+    "hostname",
+    "dpkg-l.txt",
+    "rpm-qa.txt",
+    "ss-tulpen.txt",
+    "systemctl-list-units.txt",
+    "ps-aux.txt",
+)
+CRONTAB_PREFIX = "crontab-"
+SYSTEM_CRON_DIR = "cron/"
+# Captured outputs larger than this are ignored rather than read into memory.
+MAX_MEMBER_BYTES = 64 * 1024 * 1024
+SUMMARY_FILE = "ingest-summary.json"
+STAGING_DIR = ".ingest-staging"
+
+_UNSAFE_HOST_RE = re.compile(r"[^A-Za-z0-9._-]+")
+
+
+@dataclass
+class IngestResult:
+    source: str
+    host: Optional[str] = None
+    output_dir: Optional[str] = None
+    packages: int = 0
+    services: int = 0
+    ports: int = 0
+    cron: int = 0
+    seconds: float = 0.0
+    error: Optional[str] = None
+    # Source of the earlier bundle with the same host, which kept the plain <host>/ directory.
+    duplicate_of: Optional[str] = None
+
+
+def _is_bundle_entry(name: str) -> bool:
+    return name in BUNDLE_FILES or name.startswith((CRONTAB_PREFIX, SYSTEM_CRON_DIR))
+
+
+def _relative_name(name: str) -> str:
+    """Member name relative to the bundle root, dropping ``./`` and one top-level directory."""
+
+    name = name.removeprefix("./")
+    if not _is_bundle_entry(name) and "/" in name:
+        name = name.split("/", 1)[1]
+    return name
+
+
+def read_bundle(path: str) -> Dict[str, str]:
+    """Return ``{relative member name: text}`` for the recognized members of a bundle."""
+
+    files: Dict[str, str] = {}
+    with tarfile.open(path, mode="r:*") as archive:
+        for member in archive:
+            if not member.isfile() or member.size > MAX_MEMBER_BYTES:
+                continue
+            name = _relative_name(member.name)
+            if not _is_bundle_entry(name):
+                continue
+            handle = archive.extractfile(member)
+            if handle is not None:
+                files[name] = handle.read().decode("utf-8", errors="replace")
+    return files
+
+
+def bundle_host(path: str, files: Dict[str, str]) -> str:
+    """Host name from the ``hostname`` member or the archive name, safe to use as a directory."""
+
+    lines = files.get("hostname", "").strip().splitlines()
+    host = lines[0].strip() if lines else ""
+    if not host:
+        host = Path(path).name
+        for suffix in BUNDLE_SUFFIXES:
+            if host.endswith(suffix):
+                host = host[: -len(suffix)]
+                break
+    host = _UNSAFE_HOST_RE.sub("_", host).strip(".")
+    return host or "host"
+
+
+def place_outputs(results: List[IngestResult], output_root: str) -> None:
+    """Move staged outputs to a host directory that is unique across the run.
+
+    The first successful bundle of each host gets ``<host>``; later ones with the
+    same host get ``<host>--<archive name>`` so they cannot overwrite each other.
+    """
+
+    used: Set[str] = set()
+    first: Dict[str, str] = {}
+    for result in results:
+        if result.error or result.host is None or result.output_dir is None:
+            continue
+        result.duplicate_of = first.get(result.host)
+        directory = result.host
+        if result.duplicate_of is not None:
+            directory = f"{result.host}--{bundle_host(result.source, {})}"
+        candidate, counter = directory, 2
+        while candidate in used:
+            candidate, counter = f"{directory}-{counter}", counter + 1
+        used.add(candidate)
+        first.setdefault(result.host, result.source)
+        staged, out = Path(result.output_dir), Path(output_root) / candidate
+        out.mkdir(parents=True, exist_ok=True)
+        for path in staged.iterdir():
+            os.replace(path, out / path.name)
+        staged.rmdir()
+        result.output_dir = str(out)
+
+
+def scan_from_bundle(files: Dict[str, str]) -> Dict[str, object]:
+    """Feed each captured output to the scanner's own parsers and return a scan payload."""
+
+    packages = parse_dpkg_output(files.get("dpkg-l.txt", "")) + parse_rpm_output(files.get("rpm-qa.txt", ""))
+    services = parse_systemctl_list_units(files.get("systemctl-list-units.txt", ""))
+    if not services:
+        services = parse_ps_aux(files.get("ps-aux.txt", ""))
+    ports = parse_ss_output(files.get("ss-tulpen.txt", ""))
+    cron_jobs = []
+    for name, content in sorted(files.items()):
+        if name.startswith(CRONTAB_PREFIX):
+            user = name[len(CRONTAB_PREFIX) :].removesuffix(".txt")
+            cron_jobs.extend(parse_crontab_text(content, source="user", user=user))
+        elif name.startswith(SYSTEM_CRON_DIR):
+            cron_jobs.extend(parse_crontab_text(content, source="/" + name[len(SYSTEM_CRON_DIR) :], user="root"))
+    return serialize_scan(packages, services, ports, cron_jobs, [])
+
+
+def ingest_bundle(source: str, output_root: str, directory: Optional[str] = None) -> IngestResult:
+    """Write ``<output_root>/<directory>/scan.json`` and ``app-map.yaml``; failures are captured.
+
+    ``directory`` defaults to the bundle's host name.
+    """
+
+    result = IngestResult(source=source)
+    started = time.perf_counter()
+    try:
+        files = read_bundle(source)
+        result.host = bundle_host(source, files)
+        scan = scan_from_bundle(files)
+        out = Path(output_root) / (directory or result.host)
+        out.mkdir(parents=True, exist_ok=True)
+        (out / "scan.json").write_text(json.dumps(scan, indent=2), encoding="utf-8")
+        exporter.save_topology(topology_from_scan(scan), str(out / "app-map.yaml"), fmt="yaml")
+        result.output_dir = str(out)
+        result.packages, result.services = len(scan["packages"]), len(scan["services"])
+        result.ports, result.cron = len(scan["ports"]), len(scan["cron"])
+    except Exception as exc:  # one corrupt bundle must not stop the run
+        result.error = f"{type(exc).__name__}: {exc}"
+    result.seconds = round(time.perf_counter() - started, 4)
+    return result
+
+
+def discover_bundles(root: str) -> List[Path]:
+    return sorted(path for path in Path(root).rglob("*") if path.is_file() and path.name.endswith(BUNDLE_SUFFIXES))
+
+
+def run_ingest(bundles: List[Path], output_root: str, jobs: Optional[int] = None) -> List[IngestResult]:
+    """Ingest every bundle using a process pool; ``jobs=1`` runs in-process.
+
+    Each bundle is written to its own staging directory and moved to its host
+    directory afterwards, so bundles reporting the same host never race for one
+    directory and no archive is opened twice.
+    """
+
+    staging = [f"{STAGING_DIR}/{index}" for index in range(len(bundles))]
+    try:
+        if jobs == 1:
+            results = [ingest_bundle(str(path), output_root, name) for path, name in zip(bundles, staging, strict=True)]
+        else:
+            results = []
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                futures: List[Tuple[str, Future]] = [
+                    (str(path), pool.submit(ingest_bundle, str(path), output_root, name))
+                    for path, name in zip(bundles, staging, strict=True)
+                ]
+                for source, future in futures:
+                    try:
+                        results.append(future.result())
+                    except Exception as exc:  # e.g. a worker killed by the OOM killer
+                        results.append(IngestResult(source=source, error=f"{type(exc).__name__}: {exc}"))
+        place_outputs(results, output_root)
+    finally:
+        shutil.rmtree(Path(output_root) / STAGING_DIR, ignore_errors=True)
+    return results
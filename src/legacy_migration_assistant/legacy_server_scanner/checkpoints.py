@@ -0,0 +1,172 @@
+"""Resumable scans: keep each collector's finished output on disk.
+
+Every collector writes ``<name>.json`` into the checkpoint directory as soon as it
+finishes, via a temporary file and ``os.replace`` so a killed scan never leaves a
+half-written checkpoint behind. ``host.json`` records which host (machine id,
+hostname, kernel) and which boot the checkpoints belong to; when it does not match the host
+being scanned every checkpoint is discarded, since PIDs, ports and samples from
+another host or a previous boot describe something that no longer exists.
+
+Collectors whose output depends on scan options (the sampling window, the storage
+time cap) store those options next to their data and are re-run when they change.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import tempfile
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+from legacy_migration_assistant.core.models import HostMetrics
+from legacy_migration_assistant.core.utils import safe_read_file
+
+FINGERPRINT_FILE = "host.json"
+# Bump when the layout of a checkpoint changes, so older ones are not misread.
+CHECKPOINT_VERSION = 1
+
+MACHINE_ID_PATHS = ("/etc/machine-id", "/var/lib/dbus/machine-id")
+BOOT_ID_PATH = "/proc/sys/kernel/random/boot_id"
+KERNEL_RELEASE_PATH = "/proc/sys/kernel/osrelease"
+
+T = TypeVar("T")
+
+
+def host_fingerprint() -> Dict[str, str]:
+    """Identify this host and its current boot."""
+
+    machine_id = next((text.strip() for text in map(safe_read_file, MACHINE_ID_PATHS) if text), "")
+    return {
+        "hostname": socket.gethostname(),
+        "machine_id": machine_id,
+        "boot_id": (safe_read_file(BOOT_ID_PATH) or "").strip(),
+        "kernel": (safe_read_file(KERNEL_RELEASE_PATH) or "").strip(),
+    }
+
+
+def atomic_write_json(path: Path, data: Any) -> None:
+    """Write ``data`` as JSON so readers see either the old file or the complete new one."""
+
+    handle, temp = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(handle, "w", encoding="utf-8") as stream:
+            json.dump(data, stream)
+            stream.flush()
+            os.fsync(stream.fileno())
+        os.replace(temp, path)
+    except BaseException:
+        Path(temp).unlink(missing_ok=True)
+        raise
+
+
+class CheckpointStore:
+    """Finished collector outputs of one host, validated against its fingerprint."""
+
+    def __init__(self, directory: str, fingerprint: Dict[str, str]) -> None:
+        self.root = Path(directory)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.fingerprint = {"version": CHECKPOINT_VERSION, **fingerprint}
+        self.resumed: List[str] = []
+        self.discarded = False
+        stored = self._read(self.root / FINGERPRINT_FILE)
+        if stored != self.fingerprint:
+            self.discarded = stored is not None and self._collector_files() != []
+            self.clear()
+            atomic_write_json(self.root / FINGERPRINT_FILE, self.fingerprint)
+
+    @staticmethod
+    def _read(path: Path) -> Optional[Any]:
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def _collector_files(self) -> List[Path]:
+        return [path for path in self.root.glob("*.json") if path.name != FINGERPRINT_FILE]
+
+    def load(self, name: str, params: Optional[Dict[str, Any]] = None) -> Optional[Any]:
+        """Return the stored output of ``name`` if it was collected with the same ``params``."""
+
+        stored = self._read(self.root / f"{name}.json")
+        if not isinstance(stored, dict) or stored.get("params") != (params or {}):
+            return None
+        return stored.get("data")
+
+    def save(self, name: str, data: Any, params: Optional[Dict[str, Any]] = None) -> None:
+        atomic_write_json(self.root / f"{name}.json", {"params": params or {}, "data": data})
+
+    def clear(self) -> None:
+        """Drop every collector checkpoint (the fingerprint stays)."""
+
+        for path in self._collector_files():
+            path.unlink(missing_ok=True)
+        for path in self.root.glob(".*.tmp"):
+            path.unlink(missing_ok=True)
+
+    def run(
+        self,
+        name: str,
+        collect: Callable[[], T],
+        encode: Callable[[T], Any],
+        decode: Callable[[Any], T],
+        params: Optional[Dict[str, Any]] = None,
+    ) -> T:
+        """Return the checkpointed output of ``name``, or collect and checkpoint it."""
+
+        stored = self.load(name, params)
+        if stored is not None:
+            self.resumed.append(name)
+            return decode(stored)
+        result = collect()
+        self.save(name, encode(result), params)
+        return result
+
+
+def checkpointed_list(
+    store: Optional[CheckpointStore],
+    name: str,
+    cls: type,
+    collect: Callable[[], List[Any]],
+    params: Optional[Dict[str, Any]] = None,
+) -> List[Any]:
+    """Run a collector returning ``cls`` dataclasses, through ``store`` when there is one."""
+
+    if store is None:
+        return collect()
+    return store.run(
+        name,
+        collect,
+        encode=lambda items: [asdict(item) for item in items],
+        decode=lambda data: [cls(**item) for item in data],
+        params=params,
+    )
+
+
+def checkpointed_metrics(
+    store: Optional[CheckpointStore],
+    name: str,
+    collect: Callable[[], Dict[str, Any]],
+    params: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Run a collector returning some :class:`HostMetrics` fields, through ``store`` when there is one."""
+
+    if store is None:
+        return collect()
+
+    def encode(fields: Dict[str, Any]) -> Dict[str, Any]:
+        return {key: value for key, value in asdict(HostMetrics(**fields)).items() if key in fields}
+
+    def decode(data: Dict[str, Any]) -> Dict[str, Any]:
+        metrics = HostMetrics.from_dict(data)
+        return {key: getattr(metrics, key) for key in data}
+
+    return store.run(
+        name,
+        collect,
+        encode=encode,
+        decode=decode,
+        params=params,
+    )
@@ -19,6 +19,16 @@ def _has_name(names: List[str], needles: List[str]) -> bool:
     return any(needle in entry for entry in lowered for needle in needles)
 
 
+def _matching(services: List[Service], needles: List[str]) -> List[str]:
+    """Names of services backing a component, used to attribute measurements."""
+    return [svc.name for svc in services if any(needle in svc.name.lower() for needle in needles)]
+
+
+def _matching_configs(configs: List[ConfigFile], needles: List[str]) -> List[str]:
+    """Paths of config files belonging to a component, used to attribute tuning."""
+    return [cfg.path for cfg in configs if any(needle in cfg.service.lower() for needle in needles)]
+
+
 def classify_components(
     packages: List[Package], services: List[Service], ports: List[Port], configs: List[ConfigFile]
 ) -> List[AppComponent]:
@@ -31,7 +41,9 @@ def classify_components(
                 name="web",
                 component_type=ComponentType.WEB,
                 ports=web_ports,
-                notes=["Detected web server (nginx/apache)"]
+                notes=["Detected web server (nginx/apache)"],
+                services=_matching(services, ["nginx", "apache"]),
+                configs=_matching_configs(configs, ["nginx", "apache"]),
             )
         )
 
@@ -42,6 +54,8 @@ def classify_components(
                 component_type=ComponentType.WORKER,
                 notes=["PHP runtime detected"],
                 depends_on=["web"] if any(c.name == "web" for c in components) else [],
+                services=_matching(services, ["php"]),
+                configs=_matching_configs(configs, ["php"]),
             )
         )
 
@@ -53,6 +67,8 @@ def classify_components(
                 ports=[3306],
                 volumes=["/var/lib/mysql"],
                 notes=["MySQL/MariaDB detected"],
+                services=_matching(services, ["mysql", "mariadb"]),
+                configs=_matching_configs(configs, ["mysql", "mariadb"]),
             )
         )
     if _has_name([svc.name for svc in services], ["postgres", "postgresql"]):
@@ -63,6 +79,8 @@ def classify_components(
                 ports=[5432],
                 volumes=["/var/lib/postgresql"],
                 notes=["PostgreSQL detected"],
+                services=_matching(services, ["postgres", "postgresql"]),
+                configs=_matching_configs(configs, ["postgres", "postgresql"]),
             )
         )
 
@@ -73,10 +91,20 @@ def classify_components(
                 component_type=ComponentType.CACHE,
                 ports=[6379],
                 volumes=["/var/lib/redis"],
+                services=_matching(services, ["redis"]),
+                configs=_matching_configs(configs, ["redis"]),
             )
         )
     if _has_name([svc.name for svc in services], ["memcached"]):
-        components.append(AppComponent(name="memcached", component_type=ComponentType.CACHE, ports=[11211]))
+        components.append(
+            AppComponent(
+                name="memcached",
+                component_type=ComponentType.CACHE,
+                ports=[11211],
+                services=_matching(services, ["memcached"]),
+                configs=_matching_configs(configs, ["memcached"]),
+            )
+        )
     if _has_name([svc.name for svc in services], ["rabbitmq"]):
         components.append(
             AppComponent(
@@ -84,16 +112,25 @@ def classify_components(
                 component_type=ComponentType.QUEUE,
                 ports=[5672, 15672],
                 volumes=["/var/lib/rabbitmq"],
+                services=_matching(services, ["rabbitmq"]),
+                configs=_matching_configs(configs, ["rabbitmq"]),
             )
         )
 
     if _has_name([svc.name for svc in services], ["cron", "crond"]):
-        components.append(AppComponent(name="cron", component_type=ComponentType.CRON))
+        components.append(
+            AppComponent(name="cron", component_type=ComponentType.CRON, services=_matching(services, ["cron", "crond"]))
+        )
 
     for svc in services:
         if svc.name in {"sshd", "rsyslog", "systemd-logind"}:
             components.append(
-                AppComponent(name=svc.name, component_type=ComponentType.SUPPORT, notes=["Infrastructure"])
+                AppComponent(
+                    name=svc.name,
+                    component_type=ComponentType.SUPPORT,
+                    notes=["Infrastructure"],
+                    services=[svc.name],
+                )
             )
 
     return components
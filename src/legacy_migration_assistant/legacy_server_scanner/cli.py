@@ -3,116 +3,349 @@
 from __future__ import annotations
 
 import argparse
+import contextlib
 import json
+import sys
+import time
 from dataclasses import asdict
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import List
 
 import yaml
 
+from legacy_migration_assistant.core.graph import (
+    DependencyCycleError,
+    critical_path,
+    dropped_edge_note,
+    startup_durations,
+    startup_graph,
+    topological_levels,
+)
 from legacy_migration_assistant.core.models import (
-    AppComponent,
     AppTopology,
-    ComponentType,
     ConfigFile,
     CronJob,
+    HostMetrics,
     Package,
     Port,
-    Relation,
     Service,
 )
-from legacy_migration_assistant.legacy_server_scanner import compose_generator, exporter
+from legacy_migration_assistant.core.watch import IncrementalYAMLLoader, watch_file
+from legacy_migration_assistant.legacy_server_scanner import (
+    bundles,
+    columnar,
+    compose_generator,
+    drift,
+    exporter,
+    ownership,
+    throttle,
+)
+from legacy_migration_assistant.legacy_server_scanner.cgroups import UnitUsageSampler, systemd_units
+from legacy_migration_assistant.legacy_server_scanner.checkpoints import (
+    CheckpointStore,
+    checkpointed_list,
+    checkpointed_metrics,
+    host_fingerprint,
+)
 from legacy_migration_assistant.legacy_server_scanner.configs import discover_configs
+from legacy_migration_assistant.legacy_server_scanner.connections import ConnectionSampler
 from legacy_migration_assistant.legacy_server_scanner.cron import collect_cron
+from legacy_migration_assistant.legacy_server_scanner.fleet import (
+    DEFAULT_THRESHOLD,
+    build_clusters,
+    fingerprint_scans,
+)
+from legacy_migration_assistant.legacy_server_scanner.hugepages import (
+    collect_hugepage_usage,
+    read_hugepage_pools,
+    read_transparent_hugepages,
+)
+from legacy_migration_assistant.legacy_server_scanner.io_profile import IoSampler
+from legacy_migration_assistant.legacy_server_scanner.kernel import (
+    collect_process_limits,
+    read_sysctls,
+)
+from legacy_migration_assistant.legacy_server_scanner.numa import (
+    collect_cpu_affinity,
+    read_numa_layout,
+)
 from legacy_migration_assistant.legacy_server_scanner.packages import collect_packages
 from legacy_migration_assistant.legacy_server_scanner.ports import collect_ports
-from legacy_migration_assistant.legacy_server_scanner.services import collect_services
-from legacy_migration_assistant.legacy_server_scanner.topology_builder import build_topology
-
+from legacy_migration_assistant.legacy_server_scanner.relations import RelationSampler
+from legacy_migration_assistant.legacy_server_scanner.runtimes import collect_runtime_settings
+from legacy_migration_assistant.legacy_server_scanner.sampling import run_samplers
+from legacy_migration_assistant.legacy_server_scanner.services import (
+    collect_services,
+    collect_startup_timings,
+    resolve_main_pids,
+)
+from legacy_migration_assistant.legacy_server_scanner.storage import (
+    DEFAULT_TIME_CAP,
+    collect_volume_usage,
+)
+from legacy_migration_assistant.legacy_server_scanner.topology_builder import (
+    serialize_scan,
+    topology_from_scan,
+)
 
-def _serialize_scan(packages, services, ports, cron_jobs, configs) -> Dict[str, Any]:
-    return {
-        "packages": [asdict(p) for p in packages],
-        "services": [asdict(s) for s in services],
-        "ports": [asdict(p) for p in ports],
-        "cron": [asdict(c) for c in cron_jobs],
-        "configs": [asdict(c) for c in configs],
-    }
 
+def command_scan(args: argparse.Namespace) -> None:
+    store = CheckpointStore(args.checkpoint_dir, host_fingerprint()) if args.checkpoint_dir else None
+    if store is not None and store.discarded:
+        print(f"Checkpoints in {args.checkpoint_dir} belong to another host or boot; starting over")
+    governor = None
+    if args.throttle:
+        governor = throttle.ScanGovernor(
+            cpu_share=args.max_cpu or None,
+            read_bytes_per_second=int(args.max_read_mbps * 1_000_000) or None,
+            pressure_threshold=args.pressure_threshold or None,
+        )
+    with governor if governor is not None else contextlib.nullcontext():
+        packages = checkpointed_list(store, "packages", Package, collect_packages)
+        services = checkpointed_list(store, "services", Service, collect_services)
+        ports = checkpointed_list(store, "ports", Port, collect_ports)
+        cron_jobs = checkpointed_list(store, "cron", CronJob, collect_cron)
+        configs = checkpointed_list(store, "configs", ConfigFile, discover_configs)
+        pids = resolve_main_pids(services)
+        index = ownership.build_ownership_index(packages, cache=args.ownership_cache)
+        if index is not None:
+            ownership.resolve_file_dependencies(packages, index)
+            ownership.annotate_services(services, index, pids)
+            ownership.annotate_configs(configs, index)
 
-def _deserialize_list(data: List[Dict[str, Any]], cls):
-    return [cls(**item) for item in data]
+        def sample() -> dict:
+            usage_sampler = UnitUsageSampler(services, interval=args.sample_interval)
+            connection_sampler = ConnectionSampler(ports)
+            relation_sampler = RelationSampler(services, ports)
+            samplers = [usage_sampler, connection_sampler, relation_sampler]
+            io_sampler = None
+            if args.io_profile:
+                io_sampler = IoSampler(pids, interval=args.sample_interval, units=systemd_units(services))
+            if io_sampler is not None:
+                samplers.append(io_sampler)
+            run_samplers(samplers, window=args.sample_window, interval=args.sample_interval)
+            return {
+                "usage": usage_sampler.results(),
+                "connections": connection_sampler.results(),
+                "listen_overflows": connection_sampler.overflow_results(),
+                "edges": relation_sampler.results(),
+                "edges_dropped": relation_sampler.dropped,
+                "io": io_sampler.results() if io_sampler else [],
+                "disks": io_sampler.disk_results() if io_sampler else [],
+                "io_pressure": io_sampler.pressure_results() if io_sampler else [],
+            }
 
+        def processes() -> dict:
+            online_cpus, numa = read_numa_layout()
+            hugepage_size, hugepage_pools = read_hugepage_pools()
+            return {
+                "startup": collect_startup_timings(services),
+                "sysctls": read_sysctls(),
+                "limits": collect_process_limits(services, pids=pids),
+                "runtimes": collect_runtime_settings(services, pids),
+                "online_cpus": online_cpus,
+                "numa": numa,
+                "affinity": collect_cpu_affinity(pids, online_cpus, numa),
+                "hugepage_pools": hugepage_pools,
+                "hugepages": collect_hugepage_usage(pids, hugepage_size, hugepage_pools),
+                "transparent_hugepages": read_transparent_hugepages(),
+            }
 
-def command_scan(args: argparse.Namespace) -> None:
-    packages = collect_packages()
-    services = collect_services()
-    ports = collect_ports()
-    cron_jobs = collect_cron()
-    configs = discover_configs()
+        sample_params = {"window": args.sample_window, "interval": args.sample_interval, "io_profile": args.io_profile}
+        metrics = HostMetrics(
+            **checkpointed_metrics(store, "samples", sample, sample_params),
+            **checkpointed_metrics(store, "processes", processes),
+            **checkpointed_metrics(
+                store,
+                "volumes",
+                lambda: {"volumes": collect_volume_usage(time_cap=args.storage_time_cap)},
+                {"time_cap": args.storage_time_cap},
+            ),
+        )
 
-    scan_payload = _serialize_scan(packages, services, ports, cron_jobs, configs)
+    overhead = governor.overhead() if governor is not None else None
+    scan_payload = serialize_scan(packages, services, ports, cron_jobs, configs, metrics, overhead)
     Path(args.output).write_text(json.dumps(scan_payload, indent=2), encoding="utf-8")
+    if store is not None:
+        if store.resumed:
+            print(f"Resumed from checkpoints: {', '.join(store.resumed)}")
+        store.clear()
+    if overhead is not None:
+        print(
+            f"Scan overhead: {overhead.cpu_seconds:.1f}s CPU over {overhead.wall_seconds:.1f}s, "
+            f"{overhead.bytes_read / 1_000_000:.1f} MB read, throttled {overhead.throttled_seconds:.1f}s, "
+            f"{overhead.pressure_backoffs} pressure back-off(s) ({', '.join(overhead.measures) or 'pacing only'})"
+        )
     print(f"Scan saved to {args.output}")
 
 
+def read_base_packages(path: str) -> List[str]:
+    """Package names from a plain list (``#`` comments allowed) or from a scan.json."""
+
+    text = Path(path).read_text(encoding="utf-8")
+    if text.lstrip().startswith("{"):
+        return [item["name"] for item in json.loads(text).get("packages", [])]
+    return [line.split("#", 1)[0].strip() for line in text.splitlines() if line.split("#", 1)[0].strip()]
+
+
 def command_map(args: argparse.Namespace) -> None:
     raw = json.loads(Path(args.scan).read_text(encoding="utf-8"))
-    packages = _deserialize_list(raw.get("packages", []), Package)
-    services = _deserialize_list(raw.get("services", []), Service)
-    ports = _deserialize_list(raw.get("ports", []), Port)
-    cron_jobs = _deserialize_list(raw.get("cron", []), CronJob)
-    configs = _deserialize_list(raw.get("configs", []), ConfigFile)
-
-    topology = build_topology(packages, services, ports, configs, cron_jobs)
+    base = read_base_packages(args.base_packages) if args.base_packages else None
+    topology = topology_from_scan(raw, base)
     exporter.save_topology(topology, args.output, fmt="yaml")
     print(f"Application map saved to {args.output}")
 
 
-def _topology_from_dict(data: Dict[str, Any]) -> AppTopology:
-    components = [
-        AppComponent(
-            name=item["name"],
-            component_type=ComponentType(item["component_type"]),
-            ports=item.get("ports", []),
-            volumes=item.get("volumes", []),
-            environment=item.get("environment", {}),
-            depends_on=item.get("depends_on", []),
-            notes=item.get("notes", []),
+def command_cluster(args: argparse.Namespace) -> None:
+    started = time.perf_counter()
+    hosts = fingerprint_scans(args.scan_dir, jobs=args.jobs)
+    if not hosts:
+        raise SystemExit(f"No scan files found under {args.scan_dir}")
+    clusters = build_clusters(hosts, args.threshold)
+    elapsed = time.perf_counter() - started
+
+    root = Path(args.output_dir)
+    index = []
+    for number, cluster in enumerate(clusters, start=1):
+        name = f"cluster-{number:03d}"
+        (root / name).mkdir(parents=True, exist_ok=True)
+        representative = cluster.representative
+        topology = topology_from_scan(json.loads(Path(representative.path).read_text(encoding="utf-8")))
+        exporter.save_topology(topology, str(root / name / "app-map.yaml"), fmt="yaml")
+        hosts_doc = {
+            "representative": representative.host,
+            "hosts": [member.host for member in cluster.members],
+            "deltas": [asdict(delta) for delta in cluster.deltas],
+        }
+        (root / name / "hosts.yaml").write_text(yaml.safe_dump(hosts_doc, sort_keys=False), encoding="utf-8")
+        index.append({"cluster": name, "representative": representative.host, "hosts": len(cluster.members)})
+    (root / "clusters.json").write_text(json.dumps(index, indent=2), encoding="utf-8")
+    print(f"{len(hosts)} host(s) grouped into {len(clusters)} cluster(s) in {elapsed:.2f}s; written to {root}")
+
+
+def command_drift(args: argparse.Namespace) -> None:
+    started = time.perf_counter()
+    try:
+        fleet = drift.load_fleet(args.scan_dir)
+    except ImportError as exc:
+        raise SystemExit(str(exc)) from exc
+    if not fleet.hosts:
+        raise SystemExit(f"No scan files found under {args.scan_dir}")
+    package_rows, host_rows, entries = drift.analyze_drift(fleet, args.outlier_share)
+    written = drift.write_drift_csv(args.output_dir, fleet, package_rows, host_rows, entries, args.package)
+    elapsed = time.perf_counter() - started
+    print(f"{len(fleet.hosts)} host(s), {len(fleet.packages)} package(s) analysed in {elapsed:.2f}s")
+    for row in [row for row in package_rows if row.behind][: args.top]:
+        print(
+            f"  {row.package} ({row.source}): {len(row.histogram)} version(s) on {row.hosts} host(s), "
+            f"{row.behind} behind {row.latest}, {row.outliers} outlier(s)"
         )
-        for item in data.get("components", [])
-    ]
-    relations = [
-        Relation(source=item["source"], target=item["target"], description=item.get("description"))
-        for item in data.get("relations", [])
-    ]
-    packages = _deserialize_list(data.get("packages", []), Package)
-    services = _deserialize_list(data.get("services", []), Service)
-    ports = _deserialize_list(data.get("ports", []), Port)
-    cron_jobs = _deserialize_list(data.get("cron", []), CronJob)
-    configs = _deserialize_list(data.get("configs", []), ConfigFile)
-
-    # Components and relations are simple structures; reuse dictionaries directly
-    topo = AppTopology(
-        components=components,
-        relations=relations,
-        packages=packages,
-        services=services,
-        ports=ports,
-        cron=cron_jobs,
-        configs=configs,
-    )
-    return topo
+    print(f"Drift report written to {', '.join(written)}")
+
+
+def command_export(args: argparse.Namespace) -> None:
+    started = time.perf_counter()
+    if not args.columnar:
+        hosts = columnar.export_json_lines(args.scan_dir, args.output)
+        print(f"{hosts} scan(s) exported to {args.output} in {time.perf_counter() - started:.2f}s")
+        return
+    try:
+        hosts, counts, paths = columnar.export_columnar(args.scan_dir, args.output, args.format, args.row_group_rows)
+    except ImportError as exc:
+        raise SystemExit(str(exc)) from exc
+    rows = ", ".join(f"{section}={count}" for section, count in counts.items())
+    print(f"{hosts} scan(s) exported to {len(paths)} file(s) under {args.output} in {time.perf_counter() - started:.2f}s")
+    print(f"  rows: {rows}")
+
+
+def command_ingest_bundles(args: argparse.Namespace) -> None:
+    found = bundles.discover_bundles(args.bundle_dir)
+    if not found:
+        raise SystemExit(f"No bundles ({', '.join(bundles.BUNDLE_SUFFIXES)}) found under {args.bundle_dir}")
+    started = time.perf_counter()
+    results = bundles.run_ingest(found, args.output_root, jobs=args.jobs)
+    elapsed = time.perf_counter() - started
+
+    failed = [result for result in results if result.error]
+    duplicates = [result for result in results if result.duplicate_of and not result.error]
+    root = Path(args.output_root)
+    root.mkdir(parents=True, exist_ok=True)
+    summary = {
+        "bundles": len(results),
+        "succeeded": len(results) - len(failed),
+        "failed": len(failed),
+        "duplicate_hosts": len(duplicates),
+        "wall_seconds": round(elapsed, 3),
+        "results": [asdict(result) for result in results],
+    }
+    (root / bundles.SUMMARY_FILE).write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    for result in failed:
+        print(f"{result.source}: ERROR {result.error}", file=sys.stderr)
+    for result in duplicates:
+        print(
+            f"{result.source}: host {result.host} already ingested from {result.duplicate_of}; "
+            f"written to {result.output_dir}",
+            file=sys.stderr,
+        )
+    print(
+        f"{summary['succeeded']}/{summary['bundles']} bundle(s) ingested in {elapsed:.2f}s; "
+        f"summary saved to {root / bundles.SUMMARY_FILE}"
+    )
+    if failed:
+        raise SystemExit(1)
+
+
+def _watch_compose(args: argparse.Namespace) -> None:
+    loader = IncrementalYAMLLoader()
+    renderer = compose_generator.IncrementalComposeRenderer()
+    output = Path(args.output)
+
+    def regenerate() -> None:
+        started = time.perf_counter()
+        topology = AppTopology.from_dict(loader.load(Path(args.map).read_text(encoding="utf-8")) or {})
+        rendered = renderer.render(topology)
+        if not output.exists() or output.read_text(encoding="utf-8") != rendered:
+            output.write_text(rendered, encoding="utf-8")
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f"[watch] {len(renderer.rendered)} service(s) re-rendered in {elapsed:.1f} ms -> {output}")
+
+    print(f"Watching {args.map} for changes (Ctrl+C to stop)")
+    watch_file(
+        args.map,
+        regenerate,
+        interval=args.watch_interval,
+        on_error=lambda exc: print(f"[watch] skipped invalid map: {exc}", file=sys.stderr),
+    )
+
+
+def _print_start_plan(topology: AppTopology) -> None:
+    graph, dropped = startup_graph(topology)
+    for index, level in enumerate(topological_levels(graph)):
+        print(f"  wave {index}: {', '.join(level)}")
+    for source, target in dropped:
+        print(f"  {source}: {dropped_edge_note(target)}")
+    durations = startup_durations(topology)
+    path, length = critical_path(graph, durations)
+    if len(path) > 1:
+        unit = f"{length:.1f}s measured start time" if durations else f"{int(length)} waves"
+        print(f"  critical path: {' -> '.join(path)} ({unit})")
 
 
 def command_compose(args: argparse.Namespace) -> None:
+    if args.watch:
+        _watch_compose(args)
+        return
     content = Path(args.map).read_text(encoding="utf-8")
     data = yaml.safe_load(content)
-    topology = _topology_from_dict(data)
-    compose = compose_generator.build_compose(topology)
+    topology = AppTopology.from_dict(data)
+    try:
+        compose = compose_generator.build_compose(topology)
+    except DependencyCycleError as exc:
+        raise SystemExit(f"Cannot order service startup: {exc}") from exc
     rendered = compose_generator.compose_to_yaml(compose)
     Path(args.output).write_text(rendered, encoding="utf-8")
     print(f"Docker compose saved to {args.output}")
+    _print_start_plan(topology)
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -121,18 +354,140 @@ def build_parser() -> argparse.ArgumentParser:
 
     scan = sub.add_parser("scan", help="Collect raw scan data")
     scan.add_argument("--output", required=True, help="Path to write scan.json")
+    scan.add_argument(
+        "--sample-window",
+        type=float,
+        default=0.0,
+        help="Seconds to sample service resource usage and connections (0 takes a single snapshot)",
+    )
+    scan.add_argument("--sample-interval", type=float, default=1.0, help="Seconds between samples")
+    scan.add_argument(
+        "--io-profile",
+        action="store_true",
+        help="Also sample per-service I/O, disk throughput and I/O pressure during the window",
+    )
+    scan.add_argument(
+        "--storage-time-cap",
+        type=float,
+        default=DEFAULT_TIME_CAP,
+        help="Seconds to spend measuring each data directory before reporting a lower bound",
+    )
+    scan.add_argument(
+        "--checkpoint-dir",
+        help="Keep each collector's output here as it finishes; a re-run resumes the unfinished ones",
+    )
+    scan.add_argument(
+        "--ownership-cache",
+        help="Keep the file-to-package index here and reuse it until packages change",
+    )
+    scan.add_argument(
+        "--throttle",
+        action="store_true",
+        help="Run at low priority within CPU and read-bandwidth caps, backing off under host pressure",
+    )
+    scan.add_argument(
+        "--max-cpu",
+        type=float,
+        default=throttle.DEFAULT_CPU_SHARE,
+        help="With --throttle: CPUs the scan may use, commands included (0 disables the cap)",
+    )
+    scan.add_argument(
+        "--max-read-mbps",
+        type=float,
+        default=throttle.DEFAULT_READ_MBPS,
+        help="With --throttle: file read bandwidth cap in MB/s (0 disables the cap)",
+    )
+    scan.add_argument(
+        "--pressure-threshold",
+        type=float,
+        default=throttle.DEFAULT_PRESSURE_THRESHOLD,
+        help="With --throttle: pause while CPU or I/O pressure (PSI some avg10, %%) reaches this (0 disables)",
+    )
     scan.set_defaults(func=command_scan)
 
     map_cmd = sub.add_parser("map", help="Build application map from scan")
     map_cmd.add_argument("--scan", required=True, help="Path to scan.json")
     map_cmd.add_argument("--output", required=True, help="Path to app-map.yaml output")
+    map_cmd.add_argument(
+        "--base-packages",
+        help="Packages of the target base image (one per line, or the scan.json of a base container); "
+        "default: the stock slim image of the host's distribution",
+    )
     map_cmd.set_defaults(func=command_map)
 
     compose_cmd = sub.add_parser("compose", help="Generate docker-compose from map")
     compose_cmd.add_argument("--map", required=True, help="Path to app-map.yaml")
     compose_cmd.add_argument("--output", required=True, help="Path to docker-compose.yaml")
+    compose_cmd.add_argument("--watch", action="store_true", help="Regenerate whenever the map changes")
+    compose_cmd.add_argument(
+        "--watch-interval", type=float, default=0.25, help="Polling interval when inotify is unavailable"
+    )
     compose_cmd.set_defaults(func=command_compose)
 
+    cluster_cmd = sub.add_parser("cluster", help="Group similar hosts' scans and emit one map per group")
+    cluster_cmd.add_argument("scan_dir", help="Directory searched recursively for <host>.json scans")
+    cluster_cmd.add_argument("--output-dir", required=True, help="Directory for per-cluster maps and host deltas")
+    cluster_cmd.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Minimum estimated Jaccard similarity of package/service/port sets to share a cluster",
+    )
+    cluster_cmd.add_argument("--jobs", type=int, default=None, help="Worker processes (default: CPU count)")
+    cluster_cmd.set_defaults(func=command_cluster)
+
+    drift_cmd = sub.add_parser("drift", help="Report package version drift across a directory of scans")
+    drift_cmd.add_argument("scan_dir", help="Directory searched recursively for <host>.json scans")
+    drift_cmd.add_argument("--output-dir", required=True, help="Directory for the drift CSV files")
+    drift_cmd.add_argument(
+        "--package",
+        action="append",
+        default=[],
+        help="Also list every host's version of packages matching this glob (repeatable, e.g. 'php*')",
+    )
+    drift_cmd.add_argument(
+        "--outlier-share",
+        type=float,
+        default=drift.DEFAULT_OUTLIER_SHARE,
+        help="Versions on fewer than this share of a package's hosts count as outliers",
+    )
+    drift_cmd.add_argument("--top", type=int, default=10, help="Packages to summarise on the console")
+    drift_cmd.set_defaults(func=command_drift)
+
+    export_cmd = sub.add_parser("export", help="Export a directory of scans for analytics tools")
+    export_cmd.add_argument("scan_dir", help="Directory searched recursively for <host>.json scans")
+    export_cmd.add_argument(
+        "--output", required=True, help="JSON Lines file, or a directory of tables with --columnar"
+    )
+    export_cmd.add_argument(
+        "--columnar",
+        action="store_true",
+        help="Write one table per section (packages, services, ports, cron, configs) with a host column",
+    )
+    export_cmd.add_argument(
+        "--format",
+        choices=columnar.FORMATS,
+        default="auto",
+        help="Table format; auto picks Parquet when pyarrow is installed and chunked CSV otherwise",
+    )
+    export_cmd.add_argument(
+        "--row-group-rows",
+        type=int,
+        default=columnar.DEFAULT_ROW_GROUP_ROWS,
+        help="Rows buffered per section before a row group (or CSV chunk) is written",
+    )
+    export_cmd.set_defaults(func=command_export)
+
+    ingest_cmd = sub.add_parser(
+        "ingest-bundles", help="Build scans and maps from command-output tarballs collected offline"
+    )
+    ingest_cmd.add_argument("bundle_dir", help="Directory searched recursively for bundle archives")
+    ingest_cmd.add_argument(
+        "--output-root", required=True, help="Directory receiving <host>/scan.json and <host>/app-map.yaml"
+    )
+    ingest_cmd.add_argument("--jobs", type=int, default=None, help="Worker processes (default: CPU count)")
+    ingest_cmd.set_defaults(func=command_ingest_bundles)
+
     return parser
 
 
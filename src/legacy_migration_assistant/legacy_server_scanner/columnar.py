@@ -0,0 +1,165 @@
+"""Flatten a directory of scans into one table per scan section.
+
+Each of packages, services, ports, cron and configs becomes a table with a leading
+``host`` column. Rows are buffered per section and flushed as a row group (Arrow
+IPC record batch, Parquet row group, or CSV chunk file) once the buffer reaches
+``row_group_rows``, so memory stays bounded by one scan plus one row group per
+section however large the fleet is.
+
+pyarrow is optional; without it only CSV is available.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import typing
+from dataclasses import fields
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from legacy_migration_assistant.core.models import ConfigFile, CronJob, Package, Port, Service
+from legacy_migration_assistant.legacy_server_scanner.fleet import iter_scans
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - exercised only without pyarrow
+    pa = pa_ipc = pq = None
+
+SECTIONS = {
+    "packages": Package,
+    "services": Service,
+    "ports": Port,
+    "cron": CronJob,
+    "configs": ConfigFile,
+}
+FORMATS = ("auto", "parquet", "arrow", "csv")
+DEFAULT_ROW_GROUP_ROWS = 65536
+_SUFFIXES = {"parquet": ".parquet", "arrow": ".arrow"}
+
+
+def section_columns(cls: type) -> List[Tuple[str, bool]]:
+    """``(name, is_integer)`` for the host column and each field of a section's dataclass."""
+
+    hints = typing.get_type_hints(cls)
+    columns = [("host", False)]
+    for item in fields(cls):
+        hint = hints[item.name]
+        columns.append((item.name, hint is int or hint == Optional[int]))
+    return columns
+
+
+def _cell(value: Any, is_integer: bool) -> Any:
+    if value is None or is_integer:
+        return value
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, sort_keys=True)
+    return str(value)
+
+
+def resolve_format(fmt: str) -> str:
+    """Turn ``auto`` into parquet or csv; reject Arrow formats when pyarrow is missing."""
+
+    if fmt == "auto":
+        return "parquet" if pa is not None else "csv"
+    if fmt in _SUFFIXES and pa is None:
+        raise ImportError(f"{fmt} output needs pyarrow: pip install 'legacy-migration-assistant[columnar]'")
+    return fmt
+
+
+class _SectionWriter:
+    """Buffer one section's rows and write them out a row group at a time."""
+
+    def __init__(self, root: Path, section: str, fmt: str, row_group_rows: int) -> None:
+        self.root = root
+        self.section = section
+        self.fmt = fmt
+        self.row_group_rows = row_group_rows
+        self.columns = section_columns(SECTIONS[section])
+        self.rows: List[List[Any]] = []
+        self.written = 0
+        self.paths: List[str] = []
+        self._writer = None
+        self._schema = None
+        if fmt in _SUFFIXES:
+            self._schema = pa.schema(
+                [(name, pa.int64() if is_integer else pa.string()) for name, is_integer in self.columns]
+            )
+
+    def add(self, host: str, items: List[Dict[str, Any]]) -> None:
+        for item in items:
+            self.rows.append([host] + [_cell(item.get(name), is_int) for name, is_int in self.columns[1:]])
+        while len(self.rows) >= self.row_group_rows:
+            rows, self.rows = self.rows[: self.row_group_rows], self.rows[self.row_group_rows :]
+            self._write(rows)
+
+    def _write(self, rows: List[List[Any]]) -> None:
+        if self.fmt == "csv":
+            path = self.root / f"{self.section}-{len(self.paths) + 1:05d}.csv"
+            with open(path, "w", newline="", encoding="utf-8") as handle:
+                writer = csv.writer(handle)
+                writer.writerow([name for name, _ in self.columns])
+                writer.writerows(rows)
+            self.paths.append(str(path))
+        else:
+            arrays = [
+                pa.array(column, type=self._schema.field(index).type)
+                for index, column in enumerate(zip(*rows, strict=True))
+            ]
+            if self._writer is None:
+                path = self.root / f"{self.section}{_SUFFIXES[self.fmt]}"
+                if self.fmt == "parquet":
+                    self._writer = pq.ParquetWriter(str(path), self._schema)
+                else:
+                    self._writer = pa_ipc.new_file(str(path), self._schema)
+                self.paths.append(str(path))
+            # Each call writes one Parquet row group or one Arrow IPC record batch.
+            self._writer.write_batch(pa.record_batch(arrays, schema=self._schema))
+        self.written += len(rows)
+
+    def close(self) -> None:
+        if self.rows:
+            self._write(self.rows)
+            self.rows = []
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+def export_columnar(
+    scan_dir: str, output_dir: str, fmt: str = "auto", row_group_rows: int = DEFAULT_ROW_GROUP_ROWS
+) -> Tuple[int, Dict[str, int], List[str]]:
+    """Stream every scan under ``scan_dir`` into per-section tables.
+
+    Returns the number of hosts, rows written per section and the files created.
+    """
+
+    fmt = resolve_format(fmt)
+    root = Path(output_dir)
+    root.mkdir(parents=True, exist_ok=True)
+    writers = {section: _SectionWriter(root, section, fmt, row_group_rows) for section in SECTIONS}
+    hosts = 0
+    try:
+        for host, _, raw in iter_scans(scan_dir):
+            hosts += 1
+            for section, writer in writers.items():
+                writer.add(host, raw.get(section, []) or [])
+    finally:
+        for writer in writers.values():
+            writer.close()
+    counts = {section: writer.written for section, writer in writers.items()}
+    paths = [path for writer in writers.values() for path in writer.paths]
+    return hosts, counts, paths
+
+
+def export_json_lines(scan_dir: str, output: str) -> int:
+    """Write one scan per line (``{"host": ..., **scan}``), streaming; returns the host count."""
+
+    hosts = 0
+    with open(output, "w", encoding="utf-8") as handle:
+        for host, _, raw in iter_scans(scan_dir):
+            handle.write(json.dumps({"host": host, **raw}) + "\n")
+            hosts += 1
+    return hosts
@@ -2,52 +2,176 @@
 
 from __future__ import annotations
 
-from typing import Dict, List
+from typing import Collection, Dict, List, Optional, Sequence, Set, Tuple
 
 import yaml
 
-from legacy_migration_assistant.core.models import AppTopology
+from legacy_migration_assistant.core.graph import (
+    dropped_edge_note,
+    startup_graph,
+    topological_levels,
+)
+from legacy_migration_assistant.core.metrics import (
+    by_service,
+    component_affinity,
+    component_config_memory,
+    component_limits,
+    component_startup,
+    component_usage,
+    usage_by_service,
+)
+from legacy_migration_assistant.core.models import (
+    AppComponent,
+    AppTopology,
+    CpuAffinity,
+    ProcessLimits,
+    ResourceUsage,
+    StartupTiming,
+)
+from legacy_migration_assistant.core.utils import format_cpu_list
+from legacy_migration_assistant.legacy_to_k8s_blueprints.kernel_advisor import (
+    compose_sysctls,
+    compose_ulimits,
+)
+from legacy_migration_assistant.legacy_to_k8s_blueprints.probes_advisor import (
+    compose_healthcheck,
+    has_compose_healthcheck,
+)
+from legacy_migration_assistant.legacy_to_k8s_blueprints.resources_advisor import (
+    suggest_resources,
+    to_compose_resources,
+)
 
 
 def _build_service_ports(ports: List[int]) -> List[str]:
     return [f"{port}:{port}" for port in ports]
 
 
-def _relations_dependencies(topology: AppTopology, name: str) -> List[str]:
-    deps = {rel.target for rel in topology.relations if rel.source == name}
-    return sorted(deps)
+def build_compose_service(
+    component: AppComponent,
+    depends: List[str],
+    usage: Optional[ResourceUsage] = None,
+    sysctls: Optional[Dict[str, str]] = None,
+    limits: Optional[ProcessLimits] = None,
+    configured_memory_kib: Optional[int] = None,
+    affinity: Optional[CpuAffinity] = None,
+    startup: Optional[StartupTiming] = None,
+    healthchecked: Collection[str] = (),
+    start_notes: Sequence[str] = (),
+) -> Tuple[Dict[str, object], Dict[str, Dict[str, object]]]:
+    """Create one compose service plus the named volumes it declares.
+
+    Dependencies listed in ``healthchecked`` are waited on until healthy; the
+    rest only until started, since they have no healthcheck to pass.
+    ``start_notes`` explain observed dependencies left out of ``depends_on`` and
+    dependencies that can only be waited on until started.
+    """
+
+    volumes: Dict[str, Dict[str, object]] = {}
+    service: Dict[str, object] = {
+        "image": "TODO: choose image",
+    }
+    if component.ports:
+        service["ports"] = _build_service_ports(component.ports)
+    if component.volumes:
+        mount_names = []
+        for idx, vol in enumerate(component.volumes):
+            name = f"{component.name}-data-{idx}"
+            volumes[name] = {"driver": "local"}
+            mount_names.append(f"{name}:{vol}")
+        service["volumes"] = mount_names
+    if component.environment:
+        safe_env = {k: v for k, v in component.environment.items() if "key" not in k.lower() and "pass" not in k.lower()}
+        if safe_env:
+            service["environment"] = safe_env
+    if depends:
+        service["depends_on"] = {
+            dep: {"condition": "service_healthy" if dep in healthchecked else "service_started"}
+            for dep in sorted(depends)
+        }
+    healthcheck = compose_healthcheck(component.component_type, component.ports, startup)
+    if healthcheck:
+        service["healthcheck"] = healthcheck
+    if usage is not None or configured_memory_kib:
+        advice = suggest_resources(component.component_type, usage, configured_memory_kib)
+        service["deploy"] = {"resources": to_compose_resources(advice)}
+    notes = [*component.notes, *start_notes]
+    service_sysctls, sysctl_notes = compose_sysctls(sysctls or {})
+    if service_sysctls:
+        service["sysctls"] = service_sysctls
+    notes += sysctl_notes
+    ulimits = compose_ulimits(limits)
+    if ulimits:
+        service["ulimits"] = ulimits
+    if affinity is not None and affinity.cpus:
+        service["cpuset"] = format_cpu_list(affinity.cpus)
+    if affinity is not None and affinity.mems:
+        notes.append(f"host bound memory to NUMA node(s) {format_cpu_list(affinity.mems)}; compose cannot express that")
+    if notes:
+        service["x-notes"] = notes
+    service["restart"] = "unless-stopped"
+    return service, volumes
+
+
+def _start_order(
+    topology: AppTopology,
+) -> Tuple[Dict[str, List[str]], Set[str], Dict[str, List[str]]]:
+    """Return the checked dependency graph, the components that get a healthcheck and
+    per-component notes on observed edges dropped from the graph and on dependencies
+    that can only be waited on until started.
+
+    Raises :class:`~legacy_migration_assistant.core.graph.DependencyCycleError` when the
+    components depend on each other in a loop, which compose would refuse to start.
+    """
+
+    graph, dropped = startup_graph(topology)
+    topological_levels(graph)
+    healthchecked = {c.name for c in topology.components if has_compose_healthcheck(c.ports)}
+    listening = {c.name for c in topology.components if c.ports}
+    notes: Dict[str, List[str]] = {}
+    for source, target in dropped:
+        notes.setdefault(source, []).append(dropped_edge_note(target))
+    for name, deps in graph.items():
+        for dep in deps:
+            if dep in listening and dep not in healthchecked:
+                notes.setdefault(name, []).append(
+                    f"waits for {dep} to start, not to become healthy: no health command is "
+                    f"known to exist in its image; add a healthcheck to gate on readiness"
+                )
+    return graph, healthchecked, notes
 
 
 def build_compose(topology: AppTopology) -> Dict[str, object]:
-    """Create docker-compose structure from topology."""
+    """Create docker-compose structure from topology.
+
+    Each service waits only for its own dependencies to become healthy, so compose
+    starts independent components in parallel waves rather than one after another.
+    """
 
     services: Dict[str, Dict[str, object]] = {}
     volumes: Dict[str, Dict[str, object]] = {}
 
+    graph, healthchecked, start_notes = _start_order(topology)
+    usage_index = usage_by_service(topology)
+    limits_index = by_service(topology.metrics.limits)
+    config_index = {cfg.path: cfg for cfg in topology.configs}
+    affinity_index = by_service(topology.metrics.affinity)
+    startup_index = by_service(topology.metrics.startup)
     for component in topology.components:
-        service: Dict[str, object] = {
-            "image": "TODO: choose image",
-        }
-        if component.ports:
-            service["ports"] = _build_service_ports(component.ports)
-        if component.volumes:
-            mount_names = []
-            for idx, vol in enumerate(component.volumes):
-                name = f"{component.name}-data-{idx}"
-                volumes[name] = {"driver": "local"}
-                mount_names.append(f"{name}:{vol}")
-            service["volumes"] = mount_names
-        if component.environment:
-            safe_env = {k: v for k, v in component.environment.items() if "key" not in k.lower() and "pass" not in k.lower()}
-            if safe_env:
-                service["environment"] = safe_env
-        depends = set(component.depends_on) | set(_relations_dependencies(topology, component.name))
-        if depends:
-            service["depends_on"] = sorted(depends)
-        if component.notes:
-            service["x-notes"] = component.notes
-        service["restart"] = "unless-stopped"
+        service, service_volumes = build_compose_service(
+            component,
+            graph[component.name],
+            component_usage(topology, component, usage_index),
+            topology.metrics.sysctls,
+            component_limits(topology, component, limits_index),
+            component_config_memory(topology, component, config_index),
+            component_affinity(topology, component, affinity_index),
+            component_startup(topology, component, startup_index),
+            healthchecked,
+            start_notes.get(component.name, []),
+        )
         services[component.name] = service
+        volumes.update(service_volumes)
 
     compose: Dict[str, object] = {
         "version": "3.9",
@@ -63,3 +187,64 @@ def compose_to_yaml(compose: Dict[str, object]) -> str:
 
     return yaml.safe_dump(compose, sort_keys=False)
 
+
+def _indent(text: str) -> str:
+    return "".join(f"  {line}" if line.strip() else line for line in text.splitlines(keepends=True))
+
+
+class IncrementalComposeRenderer:
+    """Render compose YAML, re-rendering only services whose inputs changed.
+
+    Each service's YAML fragment is cached under a fingerprint of its component
+    and resolved dependencies; unchanged fragments are spliced back verbatim.
+    """
+
+    def __init__(self) -> None:
+        self._cache: Dict[str, Tuple[str, str, Dict[str, Dict[str, object]]]] = {}
+        self.rendered: List[str] = []
+
+    def render(self, topology: AppTopology) -> str:
+        self.rendered = []
+        cache: Dict[str, Tuple[str, str, Dict[str, Dict[str, object]]]] = {}
+        fragments: List[str] = []
+        volumes: Dict[str, Dict[str, object]] = {}
+        usage_index = usage_by_service(topology)
+        limits_index = by_service(topology.metrics.limits)
+        config_index = {cfg.path: cfg for cfg in topology.configs}
+        affinity_index = by_service(topology.metrics.affinity)
+        startup_index = by_service(topology.metrics.startup)
+        sysctls = topology.metrics.sysctls
+        graph, healthchecked, start_notes = _start_order(topology)
+        for component in topology.components:
+            depends = graph[component.name]
+            notes = start_notes.get(component.name, [])
+            gated = sorted(dep for dep in depends if dep in healthchecked)
+            usage = component_usage(topology, component, usage_index)
+            limits = component_limits(topology, component, limits_index)
+            configured = component_config_memory(topology, component, config_index)
+            affinity = component_affinity(topology, component, affinity_index)
+            startup = component_startup(topology, component, startup_index)
+            fingerprint = (
+                f"{component!r}|{depends!r}|{gated!r}|{usage!r}|{sysctls!r}|{limits!r}|{configured!r}|"
+                f"{affinity!r}|{startup!r}|{notes!r}"
+            )
+            cached = self._cache.get(component.name)
+            if cached is None or cached[0] != fingerprint:
+                service, service_volumes = build_compose_service(
+                    component, depends, usage, sysctls, limits, configured, affinity, startup, healthchecked, notes
+                )
+                fragment = _indent(yaml.safe_dump({component.name: service}, sort_keys=False))
+                cached = (fingerprint, fragment, service_volumes)
+                self.rendered.append(component.name)
+            cache[component.name] = cached
+            fragments.append(cached[1])
+            volumes.update(cached[2])
+        self._cache = cache
+
+        header = compose_to_yaml({"version": "3.9", "services": {}}).replace("services: {}\n", "services:\n")
+        text = header + "".join(fragments)
+        if not fragments:
+            text = compose_to_yaml({"version": "3.9", "services": {}})
+        if volumes:
+            text += compose_to_yaml({"volumes": volumes})
+        return text
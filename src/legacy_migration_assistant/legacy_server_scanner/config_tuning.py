@@ -0,0 +1,340 @@
+"""Extract memory-relevant tuning from nginx, php-fpm, MySQL, PostgreSQL and redis configs.
+
+Each dialect parser turns one file into ordered ``(section, key, value)`` directives,
+with includes as ``INCLUDE`` directives whose value is a glob. Parsed files are
+cached by a hash of their content, so snippets shared between many includes (or
+many scans) are parsed once.
+"""
+
+from __future__ import annotations
+
+import glob
+import hashlib
+import os
+import re
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from legacy_migration_assistant.core.utils import safe_read_file
+
+Directive = Tuple[str, str, str]
+
+INCLUDE = "!include"
+
+MAX_INCLUDE_DEPTH = 8
+
+# Config files tuning is extracted from; their includes pull in the rest.
+ENTRY_FILES = {
+    "nginx": ("nginx.conf",),
+    "php-fpm": ("php-fpm.conf",),
+    "mysql": ("my.cnf",),
+    "postgresql": ("postgresql.conf",),
+    "redis": ("redis.conf",),
+}
+
+# Per-process estimates used to turn settings into memory.
+NGINX_WORKER_KIB = 8 * 1024
+NGINX_CONNECTION_KIB = 8
+PHP_FPM_CHILD_KIB = 64 * 1024
+MYSQL_BASE_KIB = 128 * 1024
+POSTGRES_BACKEND_KIB = 2 * 1024
+POSTGRES_BASE_KIB = 64 * 1024
+# Fragmentation, client buffers and replication backlog on top of maxmemory.
+REDIS_OVERHEAD_FACTOR = 1.3
+
+
+_PARSE_CACHE: Dict[Tuple[str, str], List[Directive]] = {}
+
+_SIZE_RE = re.compile(r"^(\d+(?:\.\d+)?)\s*([a-z]*)$")
+_BINARY_UNITS = {"": 1, "b": 1}
+for _power, _unit in enumerate("kmgt", start=1):
+    _BINARY_UNITS[_unit] = _BINARY_UNITS[f"{_unit}b"] = 1024**_power
+
+
+def parse_size(value: str, default_unit: int = 1, decimal_short: bool = False) -> Optional[int]:
+    """Parse ``4G``/``128MB``/``2gb`` style sizes to bytes.
+
+    Unit-less numbers are multiplied by ``default_unit`` (PostgreSQL counts
+    shared_buffers in 8kB pages). ``decimal_short`` follows redis, where ``1k`` is
+    1000 bytes and ``1kb`` is 1024.
+    """
+
+    match = _SIZE_RE.match(value.strip().strip("'\"").lower())
+    if not match or match.group(2) not in _BINARY_UNITS:
+        return None
+    number, unit = float(match.group(1)), match.group(2)
+    if not unit:
+        return int(number * default_unit)
+    if decimal_short and len(unit) == 1 and unit != "b":
+        return int(number * 1000 ** ("kmgt".index(unit) + 1))
+    return int(number * _BINARY_UNITS[unit])
+
+
+def _strip_comment(line: str, markers: str = "#") -> str:
+    for marker in markers:
+        line = line.split(marker, 1)[0]
+    return line.strip()
+
+
+_NGINX_DIRECTIVE_RE = re.compile(r"([A-Za-z_][\w.]*)\s+([^;{}]*?)\s*;")
+
+
+def parse_nginx(content: str) -> List[Directive]:
+    text = "\n".join(_strip_comment(line) for line in content.splitlines())
+    return [
+        ("", INCLUDE if key == "include" else key, value) for key, value in _NGINX_DIRECTIVE_RE.findall(text)
+    ]
+
+
+def parse_ini(content: str) -> List[Directive]:
+    """my.cnf and php-fpm style: ``[section]``, ``key = value``, ``!include``/``include=``."""
+
+    directives: List[Directive] = []
+    section = ""
+    for raw in content.splitlines():
+        line = _strip_comment(raw, "#;")
+        if not line:
+            continue
+        if line.startswith("[") and line.endswith("]"):
+            section = line[1:-1].strip().lower()
+            continue
+        if line.startswith(("!include ", "!includedir ")):
+            directive, _, target = line.partition(" ")
+            target = target.strip()
+            if directive == "!includedir":
+                target = os.path.join(target, "*.cnf")
+            directives.append((section, INCLUDE, target))
+            continue
+        key, sep, value = line.partition("=")
+        key = key.strip()
+        if not sep:
+            continue
+        # MySQL treats dashes and underscores in option names alike.
+        directives.append((section, INCLUDE if key == "include" else key.replace("-", "_"), value.strip()))
+    return directives
+
+
+def parse_postgresql(content: str) -> List[Directive]:
+    directives: List[Directive] = []
+    for raw in content.splitlines():
+        line = _strip_comment(raw)
+        if not line:
+            continue
+        key, _, value = line.partition("=") if "=" in line else line.partition(" ")
+        key, value = key.strip(), value.strip().strip("'")
+        if key in ("include", "include_if_exists"):
+            directives.append(("", INCLUDE, value))
+        elif key == "include_dir":
+            directives.append(("", INCLUDE, os.path.join(value, "*.conf")))
+        else:
+            directives.append(("", key, value))
+    return directives
+
+
+def parse_redis(content: str) -> List[Directive]:
+    directives: List[Directive] = []
+    for raw in content.splitlines():
+        line = _strip_comment(raw)
+        if not line:
+            continue
+        key, _, value = line.partition(" ")
+        key, value = key.lower(), value.strip().strip("\"")
+        directives.append(("", INCLUDE if key == "include" else key, value))
+    return directives
+
+
+PARSERS: Dict[str, Callable[[str], List[Directive]]] = {
+    "nginx": parse_nginx,
+    "php-fpm": parse_ini,
+    "mysql": parse_ini,
+    "postgresql": parse_postgresql,
+    "redis": parse_redis,
+}
+
+
+def parse_cached(dialect: str, content: str) -> List[Directive]:
+    """Parse ``content`` with the dialect's parser, reusing results for identical text."""
+
+    key = (dialect, hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest())
+    parsed = _PARSE_CACHE.get(key)
+    if parsed is None:
+        parsed = _PARSE_CACHE[key] = PARSERS[dialect](content)
+    return parsed
+
+
+def _expand_include(target: str, base_dir: str) -> List[str]:
+    pattern = target if os.path.isabs(target) else os.path.join(base_dir, target)
+    return sorted(path for path in glob.glob(pattern) if os.path.isfile(path))
+
+
+def resolve_directives(
+    dialect: str, path: str, seen: Optional[set] = None, depth: int = 0, base_dir: Optional[str] = None
+) -> Tuple[List[Directive], List[str]]:
+    """Return the directives of ``path`` with includes spliced in, and the files read.
+
+    Relative includes are resolved against the including file's directory, except
+    for nginx where they are relative to the directory of the main nginx.conf.
+    """
+
+    seen = set() if seen is None else seen
+    real = os.path.realpath(path)
+    if real in seen or depth > MAX_INCLUDE_DEPTH:
+        return [], []
+    seen.add(real)
+    content = safe_read_file(path)
+    if content is None:
+        return [], []
+    directives: List[Directive] = []
+    files = [path]
+    include_base = base_dir or str(Path(path).parent)
+    for directive in parse_cached(dialect, content):
+        if directive[1] != INCLUDE:
+            directives.append(directive)
+            continue
+        for included in _expand_include(directive[2], include_base):
+            nested_base = include_base if dialect == "nginx" else None
+            nested, nested_files = resolve_directives(dialect, included, seen, depth + 1, nested_base)
+            directives.extend(nested)
+            files.extend(nested_files)
+    return directives, files
+
+
+def _last(
+    directives: List[Directive], key: str, sections: Optional[Tuple[str, ...]] = None
+) -> Optional[str]:
+    value = None
+    for section, name, raw in directives:
+        if name == key and (sections is None or section in sections):
+            value = raw
+    return value
+
+
+def _nginx(directives: List[Directive]) -> Optional[Dict[str, object]]:
+    workers_raw = _last(directives, "worker_processes")
+    connections_raw = _last(directives, "worker_connections")
+    if workers_raw is None and connections_raw is None:
+        return None
+    workers = (os.cpu_count() or 1) if workers_raw in (None, "auto") else int(workers_raw)
+    connections = int(connections_raw) if connections_raw and connections_raw.isdigit() else 512
+    return {
+        "settings": {"worker_processes": workers, "worker_connections": connections},
+        "memory_kib": workers * (NGINX_WORKER_KIB + connections * NGINX_CONNECTION_KIB),
+    }
+
+
+def _php_fpm(directives: List[Directive]) -> Optional[Dict[str, object]]:
+    pools: Dict[str, Dict[str, str]] = {}
+    for section, key, value in directives:
+        if section and section != "global":
+            pools.setdefault(section, {})[key] = value
+    children = {
+        name: int(pool["pm.max_children"])
+        for name, pool in pools.items()
+        if pool.get("pm.max_children", "").isdigit()
+    }
+    if not children:
+        return None
+    memory = 0
+    for name, count in children.items():
+        limit = parse_size(pools[name].get("php_admin_value[memory_limit]", "")) or 0
+        per_child = min(PHP_FPM_CHILD_KIB, limit // 1024) if limit > 0 else PHP_FPM_CHILD_KIB
+        memory += count * per_child
+    return {"settings": {"pm.max_children": children}, "memory_kib": memory}
+
+
+_MYSQL_SECTIONS = ("mysqld", "server", "mariadb", "mariadbd", "mysqld_safe")
+_MYSQL_DEFAULTS = {
+    "innodb_buffer_pool_size": "128M",
+    "key_buffer_size": "8M",
+    "max_connections": "151",
+    "sort_buffer_size": "256K",
+    "join_buffer_size": "256K",
+    "read_buffer_size": "128K",
+    "read_rnd_buffer_size": "256K",
+    "thread_stack": "1M",
+    "binlog_cache_size": "32K",
+}
+_MYSQL_PER_CONNECTION = (
+    "sort_buffer_size",
+    "join_buffer_size",
+    "read_buffer_size",
+    "read_rnd_buffer_size",
+    "thread_stack",
+    "binlog_cache_size",
+)
+
+
+def _mysql(directives: List[Directive]) -> Optional[Dict[str, object]]:
+    found = {key: _last(directives, key, _MYSQL_SECTIONS) for key in _MYSQL_DEFAULTS}
+    if found["innodb_buffer_pool_size"] is None and found["max_connections"] is None:
+        return None
+    values = {key: parse_size(found[key] or default) or 0 for key, default in _MYSQL_DEFAULTS.items()}
+    per_connection = sum(values[key] for key in _MYSQL_PER_CONNECTION)
+    total = (
+        values["innodb_buffer_pool_size"]
+        + values["key_buffer_size"]
+        + values["max_connections"] * per_connection
+    )
+    return {
+        "settings": {
+            "innodb_buffer_pool_size": values["innodb_buffer_pool_size"],
+            "max_connections": values["max_connections"],
+        },
+        "memory_kib": total // 1024 + MYSQL_BASE_KIB,
+    }
+
+
+def _postgresql(directives: List[Directive]) -> Optional[Dict[str, object]]:
+    shared = _last(directives, "shared_buffers")
+    max_connections = _last(directives, "max_connections")
+    if shared is None and max_connections is None:
+        return None
+
+    def _kib(key: str, default: str, unit: int) -> int:
+        # Unit-less values are 8kB pages for shared_buffers and kB for the *_mem settings.
+        return (parse_size(_last(directives, key) or default, default_unit=unit) or 0) // 1024
+
+    shared_kib = _kib("shared_buffers", "128MB", 8192)
+    work_mem_kib = _kib("work_mem", "4MB", 1024)
+    maintenance_kib = _kib("maintenance_work_mem", "64MB", 1024)
+    connections = int(max_connections) if max_connections and max_connections.isdigit() else 100
+    backends = connections * (work_mem_kib + POSTGRES_BACKEND_KIB)
+    return {
+        "settings": {"shared_buffers_kib": shared_kib, "work_mem_kib": work_mem_kib, "max_connections": connections},
+        "memory_kib": shared_kib + maintenance_kib + backends + POSTGRES_BASE_KIB,
+    }
+
+
+def _redis(directives: List[Directive]) -> Optional[Dict[str, object]]:
+    maxmemory = parse_size(_last(directives, "maxmemory") or "0", decimal_short=True) or 0
+    if not maxmemory:
+        return None
+    return {
+        "settings": {"maxmemory": maxmemory, "maxmemory_policy": _last(directives, "maxmemory-policy")},
+        "memory_kib": int(maxmemory * REDIS_OVERHEAD_FACTOR) // 1024,
+    }
+
+
+EXTRACTORS: Dict[str, Callable[[List[Directive]], Optional[Dict[str, object]]]] = {
+    "nginx": _nginx,
+    "php-fpm": _php_fpm,
+    "mysql": _mysql,
+    "postgresql": _postgresql,
+    "redis": _redis,
+}
+
+
+def extract_tuning(service: str, path: str) -> Optional[Dict[str, object]]:
+    """Return ``{"settings", "memory_kib", "includes"}`` for an entry config file, else None."""
+
+    if service not in EXTRACTORS or Path(path).name not in ENTRY_FILES[service]:
+        return None
+    directives, files = resolve_directives(service, path)
+    try:
+        tuning = EXTRACTORS[service](directives)
+    except ValueError:
+        return None
+    if tuning is None:
+        return None
+    tuning["includes"] = files[1:]
+    return tuning
@@ -2,22 +2,26 @@
 
 from __future__ import annotations
 
+import glob
+import os
 import re
-from pathlib import Path
 from typing import Dict, List
 
 from legacy_migration_assistant.core.models import ConfigFile
 from legacy_migration_assistant.core.utils import safe_read_file
+from legacy_migration_assistant.legacy_server_scanner.config_tuning import extract_tuning
 
 KNOWN_PATHS = [
     ("nginx", ["/etc/nginx/nginx.conf", "/etc/nginx/conf.d", "/etc/nginx/sites-enabled"]),
     ("apache", ["/etc/httpd", "/etc/apache2"]),
-    ("php-fpm", ["/etc/php-fpm.d", "/etc/php", "/etc/php/*/fpm"]),
-    ("mysql", ["/etc/mysql/my.cnf", "/var/lib/mysql"]),
-    ("postgresql", ["/etc/postgresql", "/var/lib/postgresql"]),
-    ("redis", ["/etc/redis/redis.conf"]),
+    ("php-fpm", ["/etc/php-fpm.conf", "/etc/php-fpm.d", "/etc/php", "/etc/php/*/fpm", "/etc/php/*/fpm/pool.d"]),
+    ("mysql", ["/etc/my.cnf", "/etc/mysql/my.cnf", "/etc/mysql/conf.d", "/etc/mysql/mysql.conf.d", "/var/lib/mysql"]),
+    ("postgresql", ["/etc/postgresql", "/etc/postgresql/*/main", "/var/lib/postgresql", "/var/lib/pgsql/data"]),
+    ("redis", ["/etc/redis/redis.conf", "/etc/redis.conf"]),
     ("rabbitmq", ["/etc/rabbitmq/rabbitmq.conf", "/etc/rabbitmq/conf.d"]),
 ]
+# Directories are listed one level deep, and only for files that look like configs.
+CONFIG_SUFFIXES = (".conf", ".cnf", ".ini")
 
 
 def _extract_ports(content: str) -> List[int]:
@@ -33,16 +37,33 @@ def _extract_ports(content: str) -> List[int]:
     return sorted({p for p in ports if p > 0})
 
 
+def _expand(path: str) -> List[str]:
+    files: List[str] = []
+    for match in sorted(glob.glob(path)):
+        if os.path.isfile(match):
+            files.append(match)
+        elif os.path.isdir(match):
+            entries = sorted(os.listdir(match))
+            files.extend(
+                os.path.join(match, name)
+                for name in entries
+                if name.endswith(CONFIG_SUFFIXES) and os.path.isfile(os.path.join(match, name))
+            )
+    return files
+
+
 def _scan_path(service: str, path: str) -> List[ConfigFile]:
     results: List[ConfigFile] = []
-    for resolved in Path().glob(path):
-        if resolved.is_file():
-            content = safe_read_file(str(resolved)) or ""
-            metadata: Dict[str, object] = {}
-            ports = _extract_ports(content)
-            if ports:
-                metadata["ports"] = ports
-            results.append(ConfigFile(path=str(resolved), service=service, metadata=metadata))
+    for resolved in _expand(path):
+        content = safe_read_file(resolved) or ""
+        metadata: Dict[str, object] = {}
+        ports = _extract_ports(content)
+        if ports:
+            metadata["ports"] = ports
+        tuning = extract_tuning(service, resolved)
+        if tuning:
+            metadata["tuning"] = tuning
+        results.append(ConfigFile(path=resolved, service=service, metadata=metadata))
     return results
 
 
@@ -50,7 +71,11 @@ def discover_configs() -> List[ConfigFile]:
     """Discover known config files with minimal metadata extraction."""
 
     configs: List[ConfigFile] = []
+    seen: set = set()
     for service, paths in KNOWN_PATHS:
         for path in paths:
-            configs.extend(_scan_path(service, path))
+            for config in _scan_path(service, path):
+                if config.path not in seen:
+                    seen.add(config.path)
+                    configs.append(config)
     return configs
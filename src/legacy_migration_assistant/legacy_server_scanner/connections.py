@@ -0,0 +1,229 @@
+"""Sample load on listening TCP ports.
+
+Established connections and accept-queue depths come from /proc/net/tcp{,6};
+per-connection byte counters from ``ss -tin`` when it is available.
+"""
+
+from __future__ import annotations
+
+import socket
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from legacy_migration_assistant.core.models import Port, PortLoad
+from legacy_migration_assistant.core.utils import run_command, safe_read_file
+
+PROC_ROOT = "/proc"
+TCP_TABLES = ("net/tcp", "net/tcp6")
+
+# Socket states as printed in the ``st`` column (see include/net/tcp_states.h).
+TCP_ESTABLISHED = 0x01
+TCP_LISTEN = 0x0A
+
+
+@dataclass
+class TcpSocket:
+    local_address: str
+    local_port: int
+    remote_address: str
+    remote_port: int
+    state: int
+    inode: int
+    tx_queue: int = 0
+    rx_queue: int = 0
+
+
+def decode_address(value: str) -> Tuple[str, int]:
+    """Decode ``0100007F:1F90`` style entries (host-endian 32-bit words) to (ip, port)."""
+
+    address, _, port = value.partition(":")
+    raw = bytes.fromhex(address)
+    count = len(raw) // 4
+    # The hex digits are each word's numeric value; re-pack natively to get wire order.
+    packed = struct.pack(f"={count}I", *struct.unpack(f"!{count}I", raw))
+    family = socket.AF_INET if len(packed) == 4 else socket.AF_INET6
+    return socket.inet_ntop(family, packed), int(port, 16)
+
+
+def parse_proc_net_tcp(content: str) -> Iterator[TcpSocket]:
+    """Yield the sockets listed in a /proc/net/tcp or /proc/net/tcp6 table."""
+
+    for line in content.splitlines()[1:]:
+        fields = line.split()
+        if len(fields) < 10:
+            continue
+        try:
+            local, local_port = decode_address(fields[1])
+            remote, remote_port = decode_address(fields[2])
+            tx_queue, _, rx_queue = fields[4].partition(":")
+            yield TcpSocket(
+                local,
+                local_port,
+                remote,
+                remote_port,
+                int(fields[3], 16),
+                int(fields[9]),
+                int(tx_queue, 16),
+                int(rx_queue, 16),
+            )
+        except ValueError:
+            continue
+
+
+def read_tcp_sockets(proc_root: str = PROC_ROOT) -> Iterator[TcpSocket]:
+    for table in TCP_TABLES:
+        content = safe_read_file(str(Path(proc_root) / table))
+        if content:
+            yield from parse_proc_net_tcp(content)
+
+
+def count_established(sockets: Iterable[TcpSocket], ports: Iterable[int]) -> Dict[int, int]:
+    """Count established sockets whose local side is one of the listening ``ports``."""
+
+    counts = dict.fromkeys(ports, 0)
+    for sock in sockets:
+        if sock.state == TCP_ESTABLISHED and sock.local_port in counts:
+            counts[sock.local_port] += 1
+    return counts
+
+
+def accept_queue_depths(sockets: Iterable[TcpSocket], ports: Iterable[int]) -> Dict[int, int]:
+    """Connections waiting to be accepted per port (rx_queue of LISTEN sockets)."""
+
+    depths = dict.fromkeys(ports, 0)
+    for sock in sockets:
+        if sock.state == TCP_LISTEN and sock.local_port in depths:
+            depths[sock.local_port] += sock.rx_queue
+    return depths
+
+
+def parse_ss_tcp_info(output: str) -> Dict[Tuple[str, str], Tuple[int, int, int]]:
+    """Parse ``ss -Htin`` into {(local, peer): (local port, bytes received, bytes acked)}."""
+
+    connections: Dict[Tuple[str, str], Tuple[int, int, int]] = {}
+    key: Optional[Tuple[str, str]] = None
+    port = 0
+    for line in output.splitlines():
+        if not line.strip():
+            continue
+        if not line[0].isspace():
+            parts = line.split()
+            key = None
+            if len(parts) >= 5:
+                try:
+                    port = int(parts[3].rpartition(":")[2])
+                except ValueError:
+                    continue
+                key = (parts[3], parts[4])
+            continue
+        if key is None:
+            continue
+        counters = dict(token.split(":", 1) for token in line.split() if token.startswith(("bytes_received:", "bytes_acked:")))
+        try:
+            connections[key] = (port, int(counters.get("bytes_received", 0)), int(counters.get("bytes_acked", 0)))
+        except ValueError:
+            continue
+    return connections
+
+
+def read_listen_overflows(proc_root: str = PROC_ROOT) -> Optional[int]:
+    """Return the cumulative TcpExt ListenOverflows counter from /proc/net/netstat."""
+
+    lines = (safe_read_file(str(Path(proc_root) / "net" / "netstat")) or "").splitlines()
+    for header, values in zip(lines[::2], lines[1::2], strict=False):
+        if header.startswith("TcpExt:") and values.startswith("TcpExt:"):
+            table = dict(zip(header.split()[1:], values.split()[1:], strict=False))
+            try:
+                return int(table["ListenOverflows"])
+            except (KeyError, ValueError):
+                return None
+    return None
+
+
+def read_somaxconn(proc_root: str = PROC_ROOT) -> Optional[int]:
+    value = safe_read_file(str(Path(proc_root) / "sys" / "net" / "core" / "somaxconn"))
+    return int(value) if value and value.strip().isdigit() else None
+
+
+class ConnectionSampler:
+    """Record per-port load for the host's TCP listeners on every tick.
+
+    Byte rates need ``ss``; when it is missing or fails once, they are skipped
+    for the rest of the window so a tick stays a couple of file reads.
+    """
+
+    def __init__(
+        self,
+        ports: List[Port],
+        proc_root: str = PROC_ROOT,
+        runner: Callable[[List[str]], Tuple[int, str, str]] = run_command,
+        throughput: bool = True,
+    ) -> None:
+        self.proc_root = proc_root
+        self.runner = runner
+        self.throughput = throughput
+        listening = sorted({p.port for p in ports if p.protocol.startswith("tcp")})
+        self._loads = {port: PortLoad(port=port) for port in listening}
+        somaxconn = read_somaxconn(proc_root)
+        for port in ports:
+            if port.port in self._loads and port.backlog is not None:
+                load = self._loads[port.port]
+                load.backlog = max(load.backlog or 0, port.backlog)
+        for load in self._loads.values():
+            # The kernel caps every backlog at somaxconn.
+            if load.backlog is None or (somaxconn and load.backlog > somaxconn):
+                load.backlog = somaxconn
+        self._last_bytes: Optional[Dict[Tuple[str, str], Tuple[int, int, int]]] = None
+        self._last_overflows: Optional[int] = None
+        self._overflows: List[int] = []
+
+    def _tick_bytes(self, elapsed: float) -> None:
+        code, stdout, _ = self.runner(["ss", "-Htin"])
+        if code != 0:
+            self.throughput = False
+            return
+        current = parse_ss_tcp_info(stdout)
+        previous, self._last_bytes = self._last_bytes, current
+        if previous is None or elapsed <= 0:
+            return
+        totals = {port: [0, 0] for port in self._loads}
+        for key, (port, received, acked) in current.items():
+            if port not in totals:
+                continue
+            _, old_received, old_acked = previous.get(key, (port, 0, 0))
+            totals[port][0] += max(0, received - old_received)
+            totals[port][1] += max(0, acked - old_acked)
+        for port, (received, acked) in totals.items():
+            self._loads[port].bytes_in.append(round(received / elapsed))
+            self._loads[port].bytes_out.append(round(acked / elapsed))
+
+    def _tick_overflows(self) -> None:
+        total = read_listen_overflows(self.proc_root)
+        if total is None:
+            return
+        if self._last_overflows is not None:
+            self._overflows.append(max(0, total - self._last_overflows))
+        self._last_overflows = total
+
+    def tick(self, elapsed: float) -> None:
+        if not self._loads:
+            return
+        sockets = list(read_tcp_sockets(self.proc_root))
+        counts = count_established(sockets, self._loads)
+        depths = accept_queue_depths(sockets, self._loads)
+        for port, count in counts.items():
+            self._loads[port].established.append(count)
+            self._loads[port].accept_queue.append(depths[port])
+        if self.throughput:
+            self._tick_bytes(elapsed)
+        self._tick_overflows()
+
+    def results(self) -> List[PortLoad]:
+        return [load for load in self._loads.values() if load.established]
+
+    def overflow_results(self) -> List[int]:
+        """Host-wide accept-queue overflows per interval."""
+
+        return list(self._overflows)
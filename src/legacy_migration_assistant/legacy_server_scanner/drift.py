@@ -0,0 +1,248 @@
+"""Package version drift across a fleet of scans.
+
+Every (host, package, version) triple becomes three integers: host id, package id
+and a fleet-wide version id. Only the distinct version strings of each package are
+ordered with the Debian or RPM rules; histograms, "behind latest" and outlier
+counts are then plain NumPy reductions over the id arrays, whatever the fleet size.
+
+NumPy is optional: install the ``fleet`` extra to use this module.
+"""
+
+from __future__ import annotations
+
+import csv
+import fnmatch
+from array import array
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from legacy_migration_assistant.core.versions import version_comparator, version_key
+from legacy_migration_assistant.legacy_server_scanner.fleet import iter_scans
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without the extra
+    np = None
+
+# A version held by fewer than this share of a package's hosts is an outlier...
+DEFAULT_OUTLIER_SHARE = 0.05
+# ...as long as the package is on enough hosts for a share to mean something.
+MIN_OUTLIER_HOSTS = 20
+
+PACKAGES_CSV = "drift-packages.csv"
+HOSTS_CSV = "drift-hosts.csv"
+SELECTED_CSV = "drift-selected.csv"
+
+
+@dataclass
+class PackageDrift:
+    package: str
+    source: str
+    hosts: int
+    latest: str
+    behind: int
+    outliers: int
+    # Version -> hosts, oldest first.
+    histogram: Dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class HostDrift:
+    host: str
+    packages: int
+    behind: int
+    outliers: int
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("package drift analysis needs NumPy: pip install 'legacy-migration-assistant[fleet]'")
+
+
+class FleetVersions:
+    """Integer-encoded package versions of many hosts."""
+
+    def __init__(self) -> None:
+        _require_numpy()
+        self.hosts: List[str] = []
+        self.packages: List[Tuple[str, str]] = []
+        self._package_ids: Dict[Tuple[str, str], int] = {}
+        # (package id, version) -> id in first-seen order; re-ordered by version in encode().
+        self._seen: Dict[Tuple[int, str], int] = {}
+        self._host = array("i")
+        self._package = array("i")
+        self._version = array("i")
+
+    def add_host(self, host: str, packages: Iterable[Dict[str, object]]) -> None:
+        host_id = len(self.hosts)
+        self.hosts.append(host)
+        for pkg in packages:
+            key = (str(pkg["name"]), str(pkg.get("source") or "dpkg"))
+            package_id = self._package_ids.get(key)
+            if package_id is None:
+                package_id = self._package_ids[key] = len(self.packages)
+                self.packages.append(key)
+            self._host.append(host_id)
+            self._package.append(package_id)
+            self._version.append(self._seen.setdefault((package_id, str(pkg.get("version") or "")), len(self._seen)))
+
+    def encode(self):
+        """Return ``(hosts, packages, versions, offsets, labels, ranks)``.
+
+        ``hosts``/``packages``/``versions`` hold one entry per installed package.
+        Version ids of package ``p`` run from ``offsets[p]`` to ``offsets[p + 1]``,
+        oldest first, and ``labels`` spells them out; ``ranks`` is the dense order
+        of each version within its package (equal versions spelled differently
+        share a rank).
+        """
+
+        by_package: List[List[Tuple[str, int]]] = [[] for _ in self.packages]
+        for (package_id, version), seen_id in self._seen.items():
+            by_package[package_id].append((version, seen_id))
+        offsets = np.zeros(len(self.packages) + 1, dtype=np.int64)
+        remap = np.zeros(len(self._seen), dtype=np.int64)
+        labels: List[str] = []
+        ranks: List[int] = []
+        for package_id, entries in enumerate(by_package):
+            source = self.packages[package_id][1]
+            compare, key = version_comparator(source), version_key(source)
+            entries.sort(key=lambda entry: key(entry[0]))
+            rank = 0
+            for index, (version, seen_id) in enumerate(entries):
+                if index and compare(entries[index - 1][0], version) != 0:
+                    rank += 1
+                remap[seen_id] = len(labels)
+                labels.append(version)
+                ranks.append(rank)
+            offsets[package_id + 1] = len(labels)
+        hosts = np.frombuffer(self._host, dtype=np.int32)
+        packages = np.frombuffer(self._package, dtype=np.int32)
+        versions = remap[np.frombuffer(self._version, dtype=np.int32)]
+        return hosts, packages, versions, offsets, labels, np.asarray(ranks, dtype=np.int64)
+
+
+def load_fleet(scan_dir: str) -> FleetVersions:
+    fleet = FleetVersions()
+    for host, _, raw in iter_scans(scan_dir):
+        fleet.add_host(host, raw.get("packages", []))
+    return fleet
+
+
+def analyze_drift(
+    fleet: FleetVersions, outlier_share: float = DEFAULT_OUTLIER_SHARE
+) -> Tuple[List[PackageDrift], List[HostDrift], Dict[str, object]]:
+    """Compute per-package histograms, behind-latest and outlier counts, and per-host totals.
+
+    The third value holds the per-entry arrays (``hosts``, ``packages``, ``versions``,
+    ``behind``, ``outlier``), version ``labels`` and ``offsets`` for drilling into
+    single packages with :func:`write_drift_csv`.
+    """
+
+    hosts, packages, versions, offsets, labels, ranks = fleet.encode()
+    package_count, host_count = len(fleet.packages), len(fleet.hosts)
+    installed = np.bincount(packages, minlength=package_count)
+    histogram = np.bincount(versions, minlength=len(labels))
+    # Versions are sorted within each package, so its last one holds the top rank.
+    latest_rank = ranks[offsets[1:] - 1]
+
+    behind = ranks[versions] < latest_rank[packages]
+    share = histogram[versions] / np.maximum(installed[packages], 1)
+    outlier = (share < outlier_share) & (installed[packages] >= MIN_OUTLIER_HOSTS)
+    behind_by_package = np.bincount(packages[behind], minlength=package_count)
+    outliers_by_package = np.bincount(packages[outlier], minlength=package_count)
+
+    package_rows: List[PackageDrift] = []
+    for package_id, (name, source) in enumerate(fleet.packages):
+        start, end = int(offsets[package_id]), int(offsets[package_id + 1])
+        package_rows.append(
+            PackageDrift(
+                package=name,
+                source=source,
+                hosts=int(installed[package_id]),
+                latest=labels[end - 1],
+                behind=int(behind_by_package[package_id]),
+                outliers=int(outliers_by_package[package_id]),
+                histogram={labels[i]: int(histogram[i]) for i in range(start, end) if histogram[i]},
+            )
+        )
+    package_rows.sort(key=lambda row: (-row.behind, row.package, row.source))
+
+    per_host = np.bincount(hosts, minlength=host_count)
+    behind_by_host = np.bincount(hosts[behind], minlength=host_count)
+    outliers_by_host = np.bincount(hosts[outlier], minlength=host_count)
+    host_rows = [
+        HostDrift(
+            host=name,
+            packages=int(per_host[index]),
+            behind=int(behind_by_host[index]),
+            outliers=int(outliers_by_host[index]),
+        )
+        for index, name in enumerate(fleet.hosts)
+    ]
+    host_rows.sort(key=lambda row: (-row.behind, row.host))
+    entries = {
+        "hosts": hosts,
+        "packages": packages,
+        "versions": versions,
+        "behind": behind,
+        "outlier": outlier,
+        "labels": labels,
+        "offsets": offsets,
+    }
+    return package_rows, host_rows, entries
+
+
+def write_drift_csv(
+    output_dir: str,
+    fleet: FleetVersions,
+    package_rows: List[PackageDrift],
+    host_rows: List[HostDrift],
+    entries: Dict[str, object],
+    selected: Optional[List[str]] = None,
+) -> List[str]:
+    """Write the package and host summaries, plus one row per host for ``selected`` packages."""
+
+    root = Path(output_dir)
+    root.mkdir(parents=True, exist_ok=True)
+    written = [str(root / PACKAGES_CSV), str(root / HOSTS_CSV)]
+    with open(root / PACKAGES_CSV, "w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["package", "source", "hosts", "versions", "latest", "behind_latest", "outlier_hosts", "histogram"])
+        for row in package_rows:
+            histogram = ";".join(f"{version}={count}" for version, count in row.histogram.items())
+            writer.writerow(
+                [row.package, row.source, row.hosts, len(row.histogram), row.latest, row.behind, row.outliers, histogram]
+            )
+    with open(root / HOSTS_CSV, "w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["host", "packages", "behind_latest", "outlier_packages"])
+        for row in host_rows:
+            writer.writerow([row.host, row.packages, row.behind, row.outliers])
+    if selected:
+        wanted = [
+            package_id
+            for package_id, (name, _) in enumerate(fleet.packages)
+            if any(fnmatch.fnmatchcase(name, pattern) for pattern in selected)
+        ]
+        mask = np.isin(entries["packages"], wanted)
+        labels, offsets = entries["labels"], entries["offsets"]
+        with open(root / SELECTED_CSV, "w", newline="", encoding="utf-8") as handle:
+            writer = csv.writer(handle)
+            writer.writerow(["host", "package", "source", "version", "latest", "behind_latest", "outlier"])
+            for index in np.flatnonzero(mask):
+                package_id = int(entries["packages"][index])
+                name, source = fleet.packages[package_id]
+                writer.writerow(
+                    [
+                        fleet.hosts[int(entries["hosts"][index])],
+                        name,
+                        source,
+                        labels[int(entries["versions"][index])],
+                        labels[int(offsets[package_id + 1]) - 1],
+                        bool(entries["behind"][index]),
+                        bool(entries["outlier"][index]),
+                    ]
+                )
+        written.append(str(root / SELECTED_CSV))
+    return written
@@ -0,0 +1,229 @@
+"""Group near-identical hosts of a fleet so one blueprint can serve each archetype.
+
+Hosts are fingerprinted by the set of installed package names, running services and
+listening ports. A one-permutation MinHash signature approximates the Jaccard
+similarity of two such sets; banding the signatures (locality-sensitive hashing)
+only ever compares hosts that share a bucket, so clustering stays near-linear in the
+number of scans instead of comparing every pair.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import operator
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import chain
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterator, List, Optional, Tuple
+
+SIGNATURE_SIZE = 128
+# 32 bands x 4 rows put the LSH curve's midpoint, (1/32) ** (1/4), near 0.42: a pair at
+# DEFAULT_THRESHOLD shares a bucket with probability 1 - (1 - 0.8**4) ** 32 > 0.9999999.
+# The extra candidates cost one estimate per host and band, which the threshold then rejects.
+BANDS = 32
+DEFAULT_THRESHOLD = 0.8
+_MASK = (1 << 64) - 1
+# Signature size -> feature -> (bin, value); fleets share most features, so each is hashed once per process.
+_HASH_CACHE: Dict[int, Dict[str, Tuple[int, int]]] = {}
+
+
+@dataclass
+class HostFingerprint:
+    host: str
+    path: str
+    features: FrozenSet[str]
+    versions: Dict[str, str] = field(default_factory=dict)
+    signature: Tuple[int, ...] = ()
+
+
+@dataclass
+class HostDelta:
+    """How one host differs from its cluster's representative."""
+
+    host: str
+    similarity: float
+    added: List[str] = field(default_factory=list)
+    missing: List[str] = field(default_factory=list)
+    versions: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class HostCluster:
+    representative: HostFingerprint
+    members: List[HostFingerprint]
+    deltas: List[HostDelta] = field(default_factory=list)
+
+
+def load_scan(path: Path) -> Optional[Dict[str, Any]]:
+    """Return the scan payload in ``path``, or None when it is unreadable or not a scan."""
+
+    try:
+        raw = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if isinstance(raw, dict) and any(key in raw for key in ("packages", "services", "ports")):
+        return raw
+    return None
+
+
+def scan_host(path: Path) -> str:
+    """``web01.json`` -> ``web01``; ``web01/scan.json`` (as ``ingest-bundles`` writes) -> ``web01``."""
+
+    return path.parent.name if path.stem == "scan" and path.parent.name else path.stem
+
+
+def iter_scans(scan_dir: str) -> Iterator[Tuple[str, Path, Dict[str, Any]]]:
+    """Yield ``(host, path, scan)`` for every scan JSON under ``scan_dir``.
+
+    Files that are not scan payloads (no packages, services or ports) are skipped.
+    """
+
+    for path in sorted(Path(scan_dir).rglob("*.json")):
+        raw = load_scan(path)
+        if raw is not None:
+            yield scan_host(path), path, raw
+
+
+def host_features(raw: Dict[str, Any]) -> FrozenSet[str]:
+    """The set a host is compared on: package names, service names and listening ports."""
+
+    features = {f"pkg:{pkg['name']}" for pkg in raw.get("packages", [])}
+    features.update(f"svc:{svc['name']}" for svc in raw.get("services", []))
+    features.update(f"port:{port['protocol']}/{port['port']}" for port in raw.get("ports", []))
+    return frozenset(features)
+
+
+def _feature_hash(feature: str, size: int, cache: Dict[str, Tuple[int, int]]) -> Tuple[int, int]:
+    value = int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "big")
+    cached = cache[feature] = (value % size, value // size)
+    return cached
+
+
+def minhash(features: FrozenSet[str], size: int = SIGNATURE_SIZE) -> Tuple[int, ...]:
+    """One-permutation MinHash: hash each feature once into one of ``size`` bins.
+
+    Empty bins borrow the value of the next non-empty bin (rotation densification),
+    so every position stays comparable between hosts.
+    """
+
+    cache = _HASH_CACHE.setdefault(size, {})
+    hashed = [cache[f] if f in cache else _feature_hash(f, size, cache) for f in features]
+    # Sorting by value descending lets dict() keep the minimum of each bin.
+    bins = dict(sorted(hashed, key=operator.itemgetter(1), reverse=True))
+    if not bins:
+        return tuple([_MASK] * size)
+    signature: List[int] = []
+    for index in range(size):
+        offset = 0
+        while (index + offset) % size not in bins:
+            offset += 1
+        # Tag borrowed values with the distance so they only match identically densified bins.
+        signature.append((bins[(index + offset) % size] + offset * 0x9E3779B97F4A7C15) & _MASK)
+    return tuple(signature)
+
+
+def estimated_similarity(left: Tuple[int, ...], right: Tuple[int, ...]) -> float:
+    if not left:
+        return 0.0
+    return sum(map(operator.eq, left, right)) / len(left)
+
+
+def jaccard(left: FrozenSet[str], right: FrozenSet[str]) -> float:
+    union = len(left | right)
+    return len(left & right) / union if union else 1.0
+
+
+def fingerprint_file(path: str) -> Optional[HostFingerprint]:
+    """Read one scan and keep only its fingerprint and package versions."""
+
+    raw = load_scan(Path(path))
+    if raw is None:
+        return None
+    features = host_features(raw)
+    return HostFingerprint(
+        host=scan_host(Path(path)),
+        path=path,
+        features=features,
+        versions={pkg["name"]: pkg.get("version", "") for pkg in raw.get("packages", [])},
+        signature=minhash(features),
+    )
+
+
+def fingerprint_scans(scan_dir: str, jobs: Optional[int] = None) -> List[HostFingerprint]:
+    """Fingerprint every scan under ``scan_dir`` using a process pool.
+
+    ``jobs=1`` runs in-process, which is handy for debugging and tests.
+    """
+
+    paths = [str(path) for path in sorted(Path(scan_dir).rglob("*.json"))]
+    if jobs == 1:
+        results = map(fingerprint_file, paths)
+        return [host for host in results if host is not None]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        results = pool.map(fingerprint_file, paths, chunksize=64)
+        return [host for host in results if host is not None]
+
+
+def _find(parent: List[int], index: int) -> int:
+    while parent[index] != index:
+        parent[index] = parent[parent[index]]
+        index = parent[index]
+    return index
+
+
+def cluster_hosts(
+    hosts: List[HostFingerprint], threshold: float = DEFAULT_THRESHOLD, bands: int = BANDS
+) -> List[List[HostFingerprint]]:
+    """Union hosts that share an LSH bucket and whose estimated similarity reaches ``threshold``.
+
+    Each bucket is checked against its first member only, so the work is linear in
+    the number of hosts times the number of bands.
+    """
+
+    parent = list(range(len(hosts)))
+    rows = len(hosts[0].signature) // bands if hosts else 0
+    for band in range(bands):
+        buckets: Dict[Tuple[int, ...], int] = {}
+        for index, host in enumerate(hosts):
+            key = host.signature[band * rows : (band + 1) * rows]
+            first = buckets.setdefault(key, index)
+            if first == index or _find(parent, first) == _find(parent, index):
+                continue
+            if estimated_similarity(hosts[first].signature, host.signature) >= threshold:
+                parent[_find(parent, index)] = _find(parent, first)
+    groups: Dict[int, List[HostFingerprint]] = {}
+    for index, host in enumerate(hosts):
+        groups.setdefault(_find(parent, index), []).append(host)
+    return sorted(groups.values(), key=lambda members: (-len(members), members[0].host))
+
+
+def _representative(members: List[HostFingerprint]) -> HostFingerprint:
+    """The member closest to the features most of the cluster shares."""
+
+    counts = Counter(chain.from_iterable(member.features for member in members))
+    core = frozenset(feature for feature, count in counts.items() if count * 2 > len(members))
+    return max(members, key=lambda member: (jaccard(member.features, core), member.host))
+
+
+def host_delta(host: HostFingerprint, representative: HostFingerprint) -> HostDelta:
+    changed = host.versions.items() - representative.versions.items()
+    versions = {name: version for name, version in sorted(changed) if name in representative.versions}
+    return HostDelta(
+        host=host.host,
+        similarity=round(jaccard(host.features, representative.features), 3),
+        added=sorted(host.features - representative.features),
+        missing=sorted(representative.features - host.features),
+        versions=versions,
+    )
+
+
+def build_clusters(hosts: List[HostFingerprint], threshold: float = DEFAULT_THRESHOLD) -> List[HostCluster]:
+    clusters: List[HostCluster] = []
+    for members in cluster_hosts(hosts, threshold):
+        representative = _representative(members)
+        deltas = [host_delta(member, representative) for member in members if member is not representative]
+        clusters.append(HostCluster(representative=representative, members=members, deltas=deltas))
+    return clusters
@@ -0,0 +1,136 @@
+"""Read hugetlb pools, transparent hugepage mode and per-process huge page mappings."""
+
+from __future__ import annotations
+
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from legacy_migration_assistant.core.models import HugePagePool, HugePageUsage
+from legacy_migration_assistant.core.utils import safe_read_file
+
+PROC_ROOT = "/proc"
+SYS_MM_ROOT = "/sys/kernel/mm"
+
+_POOL_DIR_RE = re.compile(r"^hugepages-(\d+)kB$")
+_THP_MODE_RE = re.compile(r"\[(\w+)\]")
+
+
+def _kib(value: str) -> int:
+    """``"2048 kB"`` -> 2048."""
+
+    try:
+        return int(value.split()[0])
+    except (IndexError, ValueError):
+        return 0
+
+
+def _read_int(path: Path) -> int:
+    content = safe_read_file(str(path))
+    try:
+        return int(content.strip()) if content else 0
+    except ValueError:
+        return 0
+
+
+def read_meminfo(proc_root: str = PROC_ROOT) -> Dict[str, str]:
+    fields: Dict[str, str] = {}
+    for line in (safe_read_file(str(Path(proc_root) / "meminfo")) or "").splitlines():
+        key, sep, value = line.partition(":")
+        if sep:
+            fields[key.strip()] = value.strip()
+    return fields
+
+
+def read_hugepage_pools(
+    sys_root: str = SYS_MM_ROOT, proc_root: str = PROC_ROOT
+) -> Tuple[Optional[int], List[HugePagePool]]:
+    """Return the default huge page size and every pool of the host.
+
+    Pools come from ``/sys/kernel/mm/hugepages``; without sysfs only the
+    default-size pool reported by ``/proc/meminfo`` is known.
+    """
+
+    meminfo = read_meminfo(proc_root)
+    default_size = _kib(meminfo.get("Hugepagesize", "")) or None
+    pools: List[HugePagePool] = []
+    root = Path(sys_root) / "hugepages"
+    if root.is_dir():
+        for entry in sorted(root.iterdir()):
+            match = _POOL_DIR_RE.match(entry.name)
+            if match:
+                pools.append(
+                    HugePagePool(
+                        size_kib=int(match.group(1)),
+                        total=_read_int(entry / "nr_hugepages"),
+                        free=_read_int(entry / "free_hugepages"),
+                        reserved=_read_int(entry / "resv_hugepages"),
+                        surplus=_read_int(entry / "surplus_hugepages"),
+                    )
+                )
+    elif default_size and "HugePages_Total" in meminfo:
+        pools.append(
+            HugePagePool(
+                size_kib=default_size,
+                total=_kib(meminfo["HugePages_Total"]),
+                free=_kib(meminfo.get("HugePages_Free", "0")),
+                reserved=_kib(meminfo.get("HugePages_Rsvd", "0")),
+                surplus=_kib(meminfo.get("HugePages_Surp", "0")),
+            )
+        )
+    return default_size, sorted(pools, key=lambda p: p.size_kib)
+
+
+def read_transparent_hugepages(sys_root: str = SYS_MM_ROOT) -> Optional[str]:
+    """Return the selected THP mode (``always``, ``madvise`` or ``never``)."""
+
+    content = safe_read_file(str(Path(sys_root) / "transparent_hugepage" / "enabled"))
+    match = _THP_MODE_RE.search(content or "")
+    return match.group(1) if match else None
+
+
+def read_smaps_hugepages(pid: int, proc_root: str = PROC_ROOT) -> Optional[Tuple[int, int]]:
+    """Return (HugetlbPages, AnonHugePages) in KiB for one process."""
+
+    content = safe_read_file(str(Path(proc_root) / str(pid) / "smaps_rollup"))
+    if content is None:
+        return None
+    fields: Dict[str, int] = {}
+    for line in content.splitlines():
+        key, sep, value = line.partition(":")
+        if sep and key in ("HugetlbPages", "AnonHugePages"):
+            fields[key] = _kib(value)
+    return fields.get("HugetlbPages", 0), fields.get("AnonHugePages", 0)
+
+
+def _hugetlb_page_size(default_size: Optional[int], pools: List[HugePagePool]) -> Optional[int]:
+    """smaps_rollup does not split hugetlb by page size; attribute it to the only pool in use."""
+
+    in_use = [p.size_kib for p in pools if p.total - p.free + p.reserved > 0]
+    return in_use[0] if len(in_use) == 1 else default_size
+
+
+def collect_hugepage_usage(
+    pids: Dict[str, int],
+    default_size: Optional[int],
+    pools: List[HugePagePool],
+    proc_root: str = PROC_ROOT,
+) -> List[HugePageUsage]:
+    """Record services whose main process maps hugetlb or transparent huge pages."""
+
+    page_size = _hugetlb_page_size(default_size, pools)
+    records: List[HugePageUsage] = []
+    for name, pid in sorted(pids.items()):
+        mapped = read_smaps_hugepages(pid, proc_root)
+        if mapped is None or not any(mapped):
+            continue
+        hugetlb, anon = mapped
+        records.append(
+            HugePageUsage(
+                service=name,
+                hugetlb_kib=hugetlb,
+                page_size_kib=page_size if hugetlb else None,
+                anon_huge_kib=anon,
+            )
+        )
+    return records
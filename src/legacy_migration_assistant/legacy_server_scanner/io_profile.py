@@ -0,0 +1,205 @@
+"""Sample per-service disk I/O, block device throughput and I/O pressure over a window."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from legacy_migration_assistant.core.models import DiskUsage, IoUsage
+from legacy_migration_assistant.core.utils import safe_read_file
+from legacy_migration_assistant.legacy_server_scanner.cgroups import (
+    CGROUP_ROOT,
+    detect_cgroup_version,
+    read_unit_io,
+)
+
+PROC_ROOT = "/proc"
+SYS_ROOT = "/sys"
+# diskstats counts sectors of 512 bytes regardless of the device's block size.
+SECTOR_BYTES = 512
+VIRTUAL_DEVICE_PREFIXES = ("loop", "ram", "zram", "sr", "fd")
+
+
+@dataclass
+class _DiskCounters:
+    reads: int
+    read_sectors: int
+    writes: int
+    write_sectors: int
+    io_ticks_ms: int
+
+
+def parse_proc_io(content: str) -> Dict[str, int]:
+    """Parse /proc/<pid>/io (``read_bytes: 123`` lines)."""
+
+    counters: Dict[str, int] = {}
+    for line in content.splitlines():
+        key, sep, value = line.partition(":")
+        if sep:
+            try:
+                counters[key.strip()] = int(value)
+            except ValueError:
+                continue
+    return counters
+
+
+def parse_diskstats(content: str) -> Dict[str, _DiskCounters]:
+    disks: Dict[str, _DiskCounters] = {}
+    for line in content.splitlines():
+        fields = line.split()
+        if len(fields) < 13:
+            continue
+        try:
+            disks[fields[2]] = _DiskCounters(
+                reads=int(fields[3]),
+                read_sectors=int(fields[5]),
+                writes=int(fields[7]),
+                write_sectors=int(fields[9]),
+                io_ticks_ms=int(fields[12]),
+            )
+        except ValueError:
+            continue
+    return disks
+
+
+def parse_pressure_total(content: str) -> Optional[int]:
+    """Return the cumulative ``some`` stall time in microseconds from a PSI file."""
+
+    for line in content.splitlines():
+        if line.startswith("some "):
+            for token in line.split()[1:]:
+                key, _, value = token.partition("=")
+                if key == "total":
+                    try:
+                        return int(value)
+                    except ValueError:
+                        return None
+    return None
+
+
+def _rate(current: int, previous: int, elapsed: float) -> int:
+    return round(max(0, current - previous) / elapsed)
+
+
+class IoSampler:
+    """Accumulate I/O rates of services and whole block devices.
+
+    A service's rates come from its unit cgroup (``io.stat`` on v2, blkio on v1),
+    which covers all of its processes and counts real disk requests. Services
+    without cgroup I/O accounting fall back to ``/proc/<pid>/io`` of the main
+    process, which gives bytes only: its syscr/syscw count syscalls, not disk
+    operations. Rates need two readings, so the first tick only records the counters.
+    """
+
+    def __init__(
+        self,
+        pids: Dict[str, int],
+        proc_root: str = PROC_ROOT,
+        sys_root: str = SYS_ROOT,
+        interval: float = 1.0,
+        units: Optional[Dict[str, str]] = None,
+        cgroup_root: str = CGROUP_ROOT,
+    ) -> None:
+        self.pids = dict(pids)
+        self.proc_root = proc_root
+        self.sys_root = sys_root
+        self.interval = interval
+        self.units = dict(units or {})
+        self.cgroup_root = cgroup_root
+        self.cgroup_version = detect_cgroup_version(cgroup_root) if self.units else None
+        self._io: Dict[str, IoUsage] = {}
+        self._disks: Dict[str, DiskUsage] = {}
+        self._pressure: List[float] = []
+        self._last_proc: Dict[str, Dict[str, int]] = {}
+        self._last_unit: Dict[str, Dict[str, int]] = {}
+        self._last_disk: Dict[str, _DiskCounters] = {}
+        self._last_pressure: Optional[int] = None
+
+    def _is_disk(self, name: str) -> bool:
+        """Whole, physical-ish disks only: partitions would double count their parent."""
+
+        if name.startswith(VIRTUAL_DEVICE_PREFIXES):
+            return False
+        block = Path(self.sys_root) / "block"
+        return (block / name).exists() if block.is_dir() else True
+
+    def _rotational(self, name: str) -> Optional[bool]:
+        value = safe_read_file(str(Path(self.sys_root) / "block" / name / "queue" / "rotational"))
+        return value.strip() == "1" if value and value.strip() in ("0", "1") else None
+
+    def _tick_units(self, elapsed: float) -> None:
+        if self.cgroup_version is None:
+            return
+        for unit, name in self.units.items():
+            counters = read_unit_io(self.cgroup_root, unit, self.cgroup_version)
+            if counters is None:
+                continue
+            previous = self._last_unit.get(name)
+            self._last_unit[name] = counters
+            if previous is None or elapsed <= 0:
+                continue
+            record = self._io.setdefault(
+                name, IoUsage(service=name, interval=self.interval, cgroup=self.cgroup_version)
+            )
+            for key in ("read_bytes", "write_bytes", "read_ops", "write_ops"):
+                getattr(record, key).append(_rate(counters[key], previous[key], elapsed))
+
+    def _tick_processes(self, elapsed: float) -> None:
+        for name, pid in self.pids.items():
+            if name in self._last_unit:
+                continue
+            content = safe_read_file(str(Path(self.proc_root) / str(pid) / "io"))
+            if content is None:
+                continue
+            counters = parse_proc_io(content)
+            previous = self._last_proc.get(name)
+            self._last_proc[name] = counters
+            if previous is None or elapsed <= 0:
+                continue
+            record = self._io.setdefault(name, IoUsage(service=name, interval=self.interval))
+            record.read_bytes.append(_rate(counters.get("read_bytes", 0), previous.get("read_bytes", 0), elapsed))
+            record.write_bytes.append(_rate(counters.get("write_bytes", 0), previous.get("write_bytes", 0), elapsed))
+
+    def _tick_disks(self, elapsed: float) -> None:
+        stats = parse_diskstats(safe_read_file(str(Path(self.proc_root) / "diskstats")) or "")
+        for name, counters in stats.items():
+            if not self._is_disk(name):
+                continue
+            previous = self._last_disk.get(name)
+            self._last_disk[name] = counters
+            if previous is None or elapsed <= 0:
+                continue
+            record = self._disks.get(name)
+            if record is None:
+                record = self._disks[name] = DiskUsage(device=name, rotational=self._rotational(name))
+            record.read_iops.append(_rate(counters.reads, previous.reads, elapsed))
+            record.write_iops.append(_rate(counters.writes, previous.writes, elapsed))
+            record.read_bytes.append(_rate(counters.read_sectors, previous.read_sectors, elapsed) * SECTOR_BYTES)
+            record.write_bytes.append(_rate(counters.write_sectors, previous.write_sectors, elapsed) * SECTOR_BYTES)
+            busy_ms = max(0, counters.io_ticks_ms - previous.io_ticks_ms)
+            record.utilization.append(min(100, round(busy_ms / (elapsed * 10))))
+
+    def _tick_pressure(self, elapsed: float) -> None:
+        total = parse_pressure_total(safe_read_file(str(Path(self.proc_root) / "pressure" / "io")) or "")
+        if total is None:
+            return
+        if self._last_pressure is not None and elapsed > 0:
+            stalled = max(0, total - self._last_pressure) / (elapsed * 1_000_000)
+            self._pressure.append(round(min(100.0, stalled * 100), 2))
+        self._last_pressure = total
+
+    def tick(self, elapsed: float) -> None:
+        self._tick_units(elapsed)
+        self._tick_processes(elapsed)
+        self._tick_disks(elapsed)
+        self._tick_pressure(elapsed)
+
+    def results(self) -> List[IoUsage]:
+        return list(self._io.values())
+
+    def disk_results(self) -> List[DiskUsage]:
+        return sorted(self._disks.values(), key=lambda d: d.device)
+
+    def pressure_results(self) -> List[float]:
+        return list(self._pressure)
@@ -0,0 +1,111 @@
+"""Collect kernel sysctls and per-process resource limits that legacy hosts are tuned with."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from legacy_migration_assistant.core.models import ProcessLimits, Service
+from legacy_migration_assistant.core.utils import safe_read_file
+from legacy_migration_assistant.legacy_server_scanner.services import resolve_main_pids
+
+PROC_ROOT = "/proc"
+
+# Parameters commonly raised for web servers, databases and JVMs.
+SYSCTL_KEYS = (
+    "net.core.somaxconn",
+    "net.core.netdev_max_backlog",
+    "net.core.rmem_max",
+    "net.core.wmem_max",
+    "net.ipv4.ip_local_port_range",
+    "net.ipv4.tcp_max_syn_backlog",
+    "net.ipv4.tcp_fin_timeout",
+    "net.ipv4.tcp_keepalive_time",
+    "net.ipv4.tcp_keepalive_intvl",
+    "net.ipv4.tcp_keepalive_probes",
+    "net.ipv4.tcp_tw_reuse",
+    "net.ipv4.tcp_syncookies",
+    "fs.file-max",
+    "fs.nr_open",
+    "fs.inotify.max_user_watches",
+    "vm.swappiness",
+    "vm.overcommit_memory",
+    "vm.max_map_count",
+    "vm.dirty_ratio",
+    "vm.dirty_background_ratio",
+    "kernel.shmmax",
+    "kernel.shmall",
+    "kernel.shmmni",
+    "kernel.sem",
+    "kernel.msgmax",
+    "kernel.msgmnb",
+    "kernel.pid_max",
+)
+
+# /proc/<pid>/limits row titles mapped to the names compose `ulimits` uses.
+LIMIT_NAMES = {
+    "Max cpu time": "cpu",
+    "Max file size": "fsize",
+    "Max data size": "data",
+    "Max stack size": "stack",
+    "Max core file size": "core",
+    "Max resident set": "rss",
+    "Max processes": "nproc",
+    "Max open files": "nofile",
+    "Max locked memory": "memlock",
+    "Max address space": "as",
+    "Max file locks": "locks",
+    "Max pending signals": "sigpending",
+    "Max msgqueue size": "msgqueue",
+    "Max nice priority": "nice",
+    "Max realtime priority": "rtprio",
+}
+
+
+def read_sysctls(keys: Tuple[str, ...] = SYSCTL_KEYS, proc_root: str = PROC_ROOT) -> Dict[str, str]:
+    """Read sysctl values, normalising whitespace (``"32768\\t60999"`` -> ``"32768 60999"``)."""
+
+    values: Dict[str, str] = {}
+    for key in keys:
+        content = safe_read_file(str(Path(proc_root) / "sys" / key.replace(".", "/")))
+        if content is not None and content.strip():
+            values[key] = " ".join(content.split())
+    return values
+
+
+def _limit_value(raw: str) -> Optional[int]:
+    return None if raw == "unlimited" else int(raw)
+
+
+def parse_proc_limits(content: str) -> Tuple[Dict[str, Optional[int]], Dict[str, Optional[int]]]:
+    """Parse /proc/<pid>/limits into (soft, hard) dicts; None means unlimited."""
+
+    soft: Dict[str, Optional[int]] = {}
+    hard: Dict[str, Optional[int]] = {}
+    for line in content.splitlines()[1:]:
+        for title, name in LIMIT_NAMES.items():
+            if not line.startswith(title + " "):
+                continue
+            fields = line[len(title) :].split()
+            try:
+                soft[name], hard[name] = _limit_value(fields[0]), _limit_value(fields[1])
+            except (IndexError, ValueError):
+                pass
+            break
+    return soft, hard
+
+
+def collect_process_limits(
+    services: List[Service], proc_root: str = PROC_ROOT, pids: Optional[Dict[str, int]] = None
+) -> List[ProcessLimits]:
+    """Read the limits of every service's main process (pids are resolved via systemd)."""
+
+    pids = resolve_main_pids(services) if pids is None else pids
+    records: List[ProcessLimits] = []
+    for name, pid in sorted(pids.items()):
+        content = safe_read_file(str(Path(proc_root) / str(pid) / "limits"))
+        if not content:
+            continue
+        soft, hard = parse_proc_limits(content)
+        records.append(ProcessLimits(service=name, pid=pid, soft=soft, hard=hard))
+    return records
@@ -0,0 +1,77 @@
+"""Read host NUMA layout and per-process CPU/memory-node affinity."""
+
+from __future__ import annotations
+
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from legacy_migration_assistant.core.models import CpuAffinity, NumaNode
+from legacy_migration_assistant.core.utils import parse_cpu_list, safe_read_file
+
+PROC_ROOT = "/proc"
+SYS_NODE_ROOT = "/sys/devices/system"
+
+_NODE_DIR_RE = re.compile(r"^node(\d+)$")
+
+
+def read_numa_layout(sys_root: str = SYS_NODE_ROOT) -> Tuple[List[int], List[NumaNode]]:
+    """Return the online CPUs and the NUMA nodes with their CPU lists."""
+
+    base = Path(sys_root)
+    online = parse_cpu_list(safe_read_file(str(base / "cpu" / "online")) or "")
+    nodes: List[NumaNode] = []
+    node_root = base / "node"
+    if node_root.is_dir():
+        for entry in sorted(node_root.iterdir()):
+            match = _NODE_DIR_RE.match(entry.name)
+            if match:
+                cpus = parse_cpu_list(safe_read_file(str(entry / "cpulist")) or "")
+                nodes.append(NumaNode(node=int(match.group(1)), cpus=cpus))
+    return online, sorted(nodes, key=lambda n: n.node)
+
+
+def read_process_affinity(pid: int, proc_root: str = PROC_ROOT) -> Optional[Tuple[List[int], List[int]]]:
+    """Return (Cpus_allowed_list, Mems_allowed_list) from /proc/<pid>/status."""
+
+    content = safe_read_file(str(Path(proc_root) / str(pid) / "status"))
+    if content is None:
+        return None
+    fields: Dict[str, str] = {}
+    for line in content.splitlines():
+        key, _, value = line.partition(":")
+        if key in ("Cpus_allowed_list", "Mems_allowed_list"):
+            fields[key] = value
+    cpus = parse_cpu_list(fields.get("Cpus_allowed_list", ""))
+    return cpus, parse_cpu_list(fields.get("Mems_allowed_list", ""))
+
+
+def collect_cpu_affinity(
+    pids: Dict[str, int],
+    online_cpus: List[int],
+    numa: List[NumaNode],
+    proc_root: str = PROC_ROOT,
+) -> List[CpuAffinity]:
+    """Record services whose CPUs or memory nodes are narrower than the whole host."""
+
+    all_nodes = [node.node for node in numa]
+    records: List[CpuAffinity] = []
+    for name, pid in sorted(pids.items()):
+        affinity = read_process_affinity(pid, proc_root)
+        if affinity is None:
+            continue
+        cpus, mems = affinity
+        cpus_pinned = bool(cpus) and bool(online_cpus) and set(cpus) < set(online_cpus)
+        mems_pinned = bool(mems) and len(all_nodes) > 1 and set(mems) < set(all_nodes)
+        if not (cpus_pinned or mems_pinned):
+            continue
+        nodes = sorted({node.node for node in numa if set(node.cpus) & set(cpus)})
+        records.append(
+            CpuAffinity(
+                service=name,
+                cpus=cpus if cpus_pinned else [],
+                mems=mems if mems_pinned else [],
+                nodes=nodes,
+            )
+        )
+    return records
@@ -0,0 +1,381 @@
+"""Which installed package owns a file.
+
+The index is built from dpkg's ``/var/lib/dpkg/info/*.list`` files or from the rpm
+database's file lists and stores every owned file once, in sorted order: the UTF-8
+paths are concatenated into one bytes blob with an ``array`` of start offsets and
+one of owner ids, so half a million paths take a few tens of MB instead of the
+hundreds a dict of strings would. Building streams the package lists instead of
+materializing every path as an object: each package's paths are sorted and packed
+on their own, then merged into the blob. Lookups are a :func:`bisect.bisect_left`
+over the blob. Directories are dropped (many packages share them); a file that is not
+packaged itself can still be attributed to the single package owning its
+siblings, see :meth:`OwnershipIndex.directory_owner`.
+
+The index can be saved to a cache file keyed on the package database's
+modification time and is reloaded instead of rebuilt while nothing was installed.
+"""
+
+from __future__ import annotations
+
+import bisect
+import glob
+import heapq
+import io
+import json
+import os
+import struct
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Set, Tuple
+
+from legacy_migration_assistant.core.models import ConfigFile, OSFamily, Package, Service
+from legacy_migration_assistant.core.utils import run_command, safe_read_file
+from legacy_migration_assistant.legacy_server_scanner.os_detection import detect_os_family
+
+DPKG_INFO_DIR = "/var/lib/dpkg/info"
+DPKG_STATUS = "/var/lib/dpkg/status"
+RPM_DB_DIR = "/var/lib/rpm"
+RPM_FILES_QUERY = ("rpm", "-qa", "--qf", "[%{NAME}\t%{VERSION}-%{RELEASE}\t%{FILENAMES}\n]")
+RPM_QUERY_TIMEOUT = 300
+PROC_ROOT = "/proc"
+UNIT_DIRS = ("/lib/systemd/system", "/usr/lib/systemd/system")
+
+CACHE_MAGIC = b"LMA-OWN1"
+_HEADER = struct.Struct("<8sQ")
+
+# (package name, version)
+Owner = Tuple[str, str]
+# Separates the paths of one packed run; it cannot occur in a path.
+_RUN_SEPARATOR = b"\0"
+
+
+class _Paths(Sequence[bytes]):
+    """Read-only sequence view of the sorted path blob, for :mod:`bisect`."""
+
+    def __init__(self, blob: bytes, offsets: array) -> None:
+        self.blob = blob
+        self.offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):  # type: ignore[override]
+        return self.blob[self.offsets[index] : self.offsets[index + 1]]
+
+
+class OwnershipIndex:
+    """Sorted ``path -> package`` map over compact arrays."""
+
+    def __init__(self, packages: List[Owner], blob: bytes, offsets: array, owners: array, key: str = "") -> None:
+        self.packages = packages
+        self.blob = blob
+        self.offsets = offsets
+        self.owners = owners
+        self.key = key
+        self._paths = _Paths(blob, offsets)
+
+    @classmethod
+    def build(cls, packages: List[Owner], entries: Iterable[Tuple[str, int]], key: str = "") -> "OwnershipIndex":
+        """Index ``(path, package id)`` entries; ids point into ``packages``.
+
+        ``entries`` is consumed once, as a stream. Each run of entries with the same
+        id (one package list) is sorted and packed into a single bytes object, and
+        the runs are merged into the final blob, so peak memory stays close to the
+        total length of the paths.
+        """
+
+        runs: List[Tuple[int, bytes]] = []
+        parents: Set[bytes] = set()
+        run: List[bytes] = []
+        run_id = -1
+        for path, package_id in entries:
+            if package_id != run_id:
+                if run:
+                    runs.append((run_id, _pack_run(run)))
+                run, run_id = [], package_id
+            encoded = os.path.normpath(path).encode("utf-8", "surrogateescape")
+            run.append(encoded)
+            parents.add(os.path.dirname(encoded))
+        if run:
+            runs.append((run_id, _pack_run(run)))
+        del run
+
+        blob = bytearray()
+        offsets = array("q", [0])
+        owners = array("i")
+        previous = None
+        # Ties sort by run order, so the first package listing a path keeps it
+        # (later ones are diversions); directories are dropped.
+        merged = heapq.merge(*(_unpack_run(order, owner, packed) for order, (owner, packed) in enumerate(runs)))
+        runs.clear()
+        for path, _, package_id in merged:
+            duplicate, previous = path == previous, path
+            if duplicate or path in parents:
+                continue
+            blob += path
+            offsets.append(len(blob))
+            owners.append(package_id)
+        del merged, parents
+        return cls(packages, bytes(blob), offsets, owners, key)
+
+    def __len__(self) -> int:
+        return len(self.owners)
+
+    def _find(self, path: bytes) -> Optional[int]:
+        index = bisect.bisect_left(self._paths, path)
+        if index < len(self.owners) and self._paths[index] == path:
+            return index
+        return None
+
+    def owner(self, path: str) -> Optional[Owner]:
+        """Package and version that installed ``path``, trying its /usr-merged and resolved forms."""
+
+        for candidate in _candidates(path):
+            index = self._find(candidate.encode("utf-8", "surrogateescape"))
+            if index is not None:
+                return self.packages[self.owners[index]]
+        return None
+
+    def directory_owner(self, directory: str) -> Optional[Owner]:
+        """The package owning files directly in ``directory``, if exactly one does."""
+
+        prefix = os.path.normpath(directory).rstrip("/").encode("utf-8", "surrogateescape") + b"/"
+        start = bisect.bisect_left(self._paths, prefix)
+        # "0" is the byte after "/", so this bounds everything under the prefix.
+        end = bisect.bisect_left(self._paths, prefix[:-1] + b"0", start)
+        found = {self.owners[index] for index in range(start, end) if b"/" not in self._paths[index][len(prefix) :]}
+        return self.packages[found.pop()] if len(found) == 1 else None
+
+    def save(self, path: str) -> None:
+        """Write the index to ``path`` (replaced atomically)."""
+
+        header = json.dumps({"key": self.key, "packages": self.packages, "count": len(self.owners)}).encode()
+        temp = f"{path}.tmp"
+        with open(temp, "wb") as handle:
+            handle.write(_HEADER.pack(CACHE_MAGIC, len(header)))
+            handle.write(header)
+            handle.write(self.offsets.tobytes())
+            handle.write(self.owners.tobytes())
+            handle.write(self.blob)
+        os.replace(temp, path)
+
+    @classmethod
+    def load(cls, path: str, key: Optional[str] = None) -> Optional["OwnershipIndex"]:
+        """Read a saved index; None when missing, corrupt or saved under another ``key``."""
+
+        try:
+            with open(path, "rb") as handle:
+                magic, header_size = _HEADER.unpack(handle.read(_HEADER.size))
+                if magic != CACHE_MAGIC:
+                    return None
+                header = json.loads(handle.read(header_size))
+                if key is not None and header.get("key") != key:
+                    return None
+                offsets, owners = array("q"), array("i")
+                offsets.fromfile(handle, header["count"] + 1)
+                owners.fromfile(handle, header["count"])
+                blob = handle.read()
+        except (OSError, ValueError, EOFError, KeyError, struct.error):
+            return None
+        if len(blob) != offsets[-1]:
+            return None
+        packages = [(name, version) for name, version in header["packages"]]
+        return cls(packages, blob, offsets, owners, header.get("key", ""))
+
+
+def _pack_run(paths: List[bytes]) -> bytes:
+    paths.sort()
+    return _RUN_SEPARATOR.join(paths)
+
+
+def _unpack_run(order: int, package_id: int, packed: bytes) -> Iterator[Tuple[bytes, int, int]]:
+    """Yield ``(path, order, package id)`` from a packed run without splitting it all at once."""
+
+    start = 0
+    while True:
+        end = packed.find(_RUN_SEPARATOR, start)
+        if end < 0:
+            yield packed[start:], order, package_id
+            return
+        yield packed[start:end], order, package_id
+        start = end + 1
+
+
+def _usr_merge_twin(path: str) -> Optional[str]:
+    if path.startswith("/usr/"):
+        return path[len("/usr") :]
+    if path.startswith(("/bin/", "/sbin/", "/lib/", "/lib64/")):
+        return "/usr" + path
+    return None
+
+
+def _candidates(path: str) -> Iterator[str]:
+    """``path``, its /usr-merge twin, then its symlink-resolved forms (only resolved if needed)."""
+
+    path = os.path.normpath(path)
+    yield path
+    twin = _usr_merge_twin(path)
+    if twin:
+        yield twin
+    resolved = os.path.realpath(path)
+    if resolved != path:
+        yield resolved
+        twin = _usr_merge_twin(resolved)
+        if twin:
+            yield twin
+
+
+def _base_name(name: str) -> str:
+    # dpkg qualifies multi-arch packages as name:arch.
+    return name.split(":", 1)[0]
+
+
+def parse_dpkg_lists(
+    info_dir: str, versions: Mapping[str, str]
+) -> Tuple[List[Owner], Iterator[Tuple[str, int]]]:
+    """Read every ``<package>[:arch].list`` under ``info_dir``.
+
+    The packages come from the file names at once; the ``(path, package id)``
+    entries are read lazily, one list file at a time.
+    """
+
+    list_files = sorted(glob.glob(os.path.join(info_dir, "*.list")))
+    names = [_base_name(Path(list_file).stem) for list_file in list_files]
+    packages = [(name, versions.get(name, "")) for name in names]
+
+    def entries() -> Iterator[Tuple[str, int]]:
+        for package_id, list_file in enumerate(list_files):
+            for line in (safe_read_file(list_file) or "").splitlines():
+                if line.startswith("/") and line != "/.":
+                    yield line, package_id
+
+    return packages, entries()
+
+
+def parse_rpm_file_list(output: str) -> Tuple[List[Owner], Iterator[Tuple[str, int]]]:
+    """Parse ``name<TAB>version-release<TAB>path`` lines from :data:`RPM_FILES_QUERY`.
+
+    Entries are parsed lazily; ``packages`` fills in as they are consumed, so it is
+    complete once :meth:`OwnershipIndex.build` has read them.
+    """
+
+    ids: Dict[Owner, int] = {}
+    packages: List[Owner] = []
+
+    def entries() -> Iterator[Tuple[str, int]]:
+        for line in io.StringIO(output):
+            parts = line.rstrip("\n").split("\t", 2)
+            if len(parts) != 3 or not parts[2].startswith("/"):
+                continue
+            owner = (parts[0], parts[1])
+            package_id = ids.get(owner)
+            if package_id is None:
+                package_id = ids[owner] = len(packages)
+                packages.append(owner)
+            yield parts[2], package_id
+
+    return packages, entries()
+
+
+def _mtime_key(*paths: str) -> str:
+    stamps = []
+    for path in paths:
+        try:
+            stamps.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            stamps.append(0)
+    return ":".join(str(stamp) for stamp in stamps)
+
+
+def database_key(family: OSFamily) -> str:
+    """Changes whenever a package is installed, removed or upgraded."""
+
+    if family == OSFamily.DEBIAN:
+        return f"dpkg:{_mtime_key(DPKG_STATUS, DPKG_INFO_DIR)}"
+    databases = sorted(glob.glob(os.path.join(RPM_DB_DIR, "*")))
+    return f"rpm:{_mtime_key(RPM_DB_DIR, *databases)}"
+
+
+def build_ownership_index(
+    packages: Iterable[Package] = (),
+    os_family: Optional[OSFamily] = None,
+    cache: Optional[str] = None,
+) -> Optional[OwnershipIndex]:
+    """Build (or load from ``cache``) the index of this host's package manager.
+
+    ``packages`` supplies dpkg versions, which the ``.list`` files do not carry.
+    Returns None on hosts without dpkg or rpm.
+    """
+
+    family = os_family or detect_os_family()
+    if family not in (OSFamily.DEBIAN, OSFamily.RHEL):
+        return None
+    key = database_key(family)
+    if cache:
+        cached = OwnershipIndex.load(cache, key)
+        if cached is not None:
+            return cached
+    if family == OSFamily.DEBIAN:
+        versions = {_base_name(pkg.name): pkg.version for pkg in packages}
+        owners, entries = parse_dpkg_lists(DPKG_INFO_DIR, versions)
+    else:
+        code, stdout, _ = run_command(RPM_FILES_QUERY, timeout=RPM_QUERY_TIMEOUT)
+        if code != 0:
+            return None
+        owners, entries = parse_rpm_file_list(stdout)
+    index = OwnershipIndex.build(owners, entries, key)
+    if cache:
+        try:
+            Path(cache).parent.mkdir(parents=True, exist_ok=True)
+            index.save(cache)
+        except OSError:
+            pass
+    return index
+
+
+def resolve_file_dependencies(packages: List[Package], index: OwnershipIndex) -> None:
+    """Replace file dependencies (rpm ``Requires: /bin/sh``) by the package owning the file."""
+
+    for package in packages:
+        resolved = []
+        for dep in package.depends:
+            owner = index.owner(dep) if dep.startswith("/") else None
+            resolved.append(owner[0] if owner else dep)
+        package.depends = resolved
+
+
+def service_binary(service: Service, pid: Optional[int], proc_root: str = PROC_ROOT) -> Optional[str]:
+    """Executable of a service's main process, or the absolute command of its command line."""
+
+    if pid:
+        try:
+            return os.readlink(os.path.join(proc_root, str(pid), "exe")).removesuffix(" (deleted)")
+        except OSError:
+            pass
+    command = (service.main_cmd or "").split()
+    if command and command[0].startswith("/"):
+        return command[0]
+    return None
+
+
+def annotate_services(
+    services: List[Service], index: OwnershipIndex, pids: Mapping[str, int], proc_root: str = PROC_ROOT
+) -> None:
+    """Set ``package``/``package_version`` from the main binary, else from the systemd unit file."""
+
+    for service in services:
+        paths = [service_binary(service, pids.get(service.name) or service.pid, proc_root)]
+        if service.manager == "systemd":
+            paths.extend(os.path.join(unit_dir, f"{service.name}.service") for unit_dir in UNIT_DIRS)
+        owner = next((found for found in map(index.owner, filter(None, paths)) if found), None)
+        if owner is not None:
+            service.package, service.package_version = owner
+
+
+def annotate_configs(configs: List[ConfigFile], index: OwnershipIndex) -> None:
+    """Set ``package``/``package_version`` of each config file, falling back to its directory's owner."""
+
+    for config in configs:
+        owner = index.owner(config.path) or index.directory_owner(os.path.dirname(config.path))
+        if owner is not None:
+            config.package, config.package_version = owner
@@ -2,12 +2,18 @@
 
 from __future__ import annotations
 
+import re
 from typing import List, Optional
 
 from legacy_migration_assistant.core.models import OSFamily, Package
 from legacy_migration_assistant.core.utils import run_command
 from legacy_migration_assistant.legacy_server_scanner.os_detection import detect_os_family
 
+DPKG_QUERY_FORMAT = "${db:Status-Abbrev}\t${Package}\t${Version}\t${Pre-Depends}\t${Depends}\t${Provides}\n"
+RPM_QUERY_FORMAT = "%{NAME}\t%{VERSION}-%{RELEASE}\t[%{REQUIRENAME},]\t[%{PROVIDENAME},]\n"
+# Version constraints, architecture restrictions and build profiles of a dpkg relation.
+_DPKG_RELATION_NOISE = re.compile(r"\([^)]*\)|\[[^]]*\]|<[^>]*>")
+
 
 def parse_dpkg_output(output: str) -> List[Package]:
     """Parse `dpkg -l` or `apt list --installed` style output."""
@@ -27,6 +33,43 @@ def parse_dpkg_output(output: str) -> List[Package]:
     return packages
 
 
+def parse_dpkg_relations(value: str) -> List[str]:
+    """Turn ``libc6 (>= 2.34), default-mta | mail-transport-agent`` into ``["libc6", "default-mta|mail-transport-agent"]``."""
+
+    relations: List[str] = []
+    for group in value.split(","):
+        names = []
+        for alternative in group.split("|"):
+            name = _DPKG_RELATION_NOISE.sub("", alternative).strip().split(":", 1)[0]
+            if name:
+                names.append(name)
+        if names:
+            relations.append("|".join(names))
+    return relations
+
+
+def parse_dpkg_query_output(output: str) -> List[Package]:
+    """Parse ``dpkg-query -W -f`` output in :data:`DPKG_QUERY_FORMAT`."""
+
+    packages: List[Package] = []
+    for line in output.splitlines():
+        parts = line.split("\t")
+        if len(parts) != 6:
+            continue
+        status, name, version, pre_depends, depends, provides = parts
+        if status.startswith(("ii", "rc")):
+            packages.append(
+                Package(
+                    name=name,
+                    version=version,
+                    source="dpkg",
+                    depends=parse_dpkg_relations(f"{pre_depends},{depends}"),
+                    provides=parse_dpkg_relations(provides),
+                )
+            )
+    return packages
+
+
 def parse_rpm_output(output: str) -> List[Package]:
     """Parse `rpm -qa` or `dnf list installed` style output."""
 
@@ -46,11 +89,44 @@ def parse_rpm_output(output: str) -> List[Package]:
     return packages
 
 
+def _capabilities(value: str, skip_own: str = "") -> List[str]:
+    names: List[str] = []
+    for name in value.split(","):
+        name = name.strip()
+        if name and name != skip_own and not name.startswith("rpmlib(") and name not in names:
+            names.append(name)
+    return names
+
+
+def parse_rpm_query_output(output: str) -> List[Package]:
+    """Parse ``rpm -qa --qf`` output in :data:`RPM_QUERY_FORMAT`."""
+
+    packages: List[Package] = []
+    for line in output.splitlines():
+        parts = line.split("\t")
+        if len(parts) != 4 or not parts[0] or parts[0] == "gpg-pubkey":
+            continue
+        name, version, requires, provides = parts
+        packages.append(
+            Package(
+                name=name,
+                version=version,
+                source="rpm",
+                depends=_capabilities(requires),
+                provides=_capabilities(provides, skip_own=name),
+            )
+        )
+    return packages
+
+
 def collect_packages(os_family: Optional[OSFamily] = None) -> List[Package]:
     """Collect packages for the current system using appropriate tooling."""
 
     family = os_family or detect_os_family()
     if family == OSFamily.DEBIAN:
+        code, stdout, _ = run_command(["dpkg-query", "-W", "-f", DPKG_QUERY_FORMAT])
+        if code == 0:
+            return parse_dpkg_query_output(stdout)
         code, stdout, _ = run_command(["dpkg", "-l"])
         if code == 0:
             return parse_dpkg_output(stdout)
@@ -58,6 +134,9 @@ def collect_packages(os_family: Optional[OSFamily] = None) -> List[Package]:
         return parse_dpkg_output(stdout) if code == 0 else []
 
     if family == OSFamily.RHEL:
+        code, stdout, _ = run_command(["rpm", "-qa", "--qf", RPM_QUERY_FORMAT], timeout=60)
+        if code == 0:
+            return parse_rpm_query_output(stdout)
         code, stdout, _ = run_command(["rpm", "-qa"])
         if code == 0:
             return parse_rpm_output(stdout)
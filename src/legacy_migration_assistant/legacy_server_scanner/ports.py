@@ -36,7 +36,9 @@ def parse_ss_output(output: str) -> List[Port]:
             port_num = int(port_str)
         except ValueError:
             continue
-        ports.append(Port(protocol=proto, address=address or "*", port=port_num, process=process))
+        # For TCP listeners ss prints the listen backlog in the Send-Q column.
+        backlog = int(parts[3]) if proto == "tcp" and parts[1] == "LISTEN" and parts[3].isdigit() else None
+        ports.append(Port(protocol=proto, address=address or "*", port=port_num, process=process, backlog=backlog))
     return ports
 
 
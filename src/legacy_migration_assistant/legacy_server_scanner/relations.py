@@ -0,0 +1,156 @@
+"""Mine component relations from the host's established TCP connections."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from legacy_migration_assistant.core.models import ConnectionEdge, Port, Service
+from legacy_migration_assistant.core.utils import safe_read_file
+from legacy_migration_assistant.legacy_server_scanner.connections import (
+    TCP_ESTABLISHED,
+    TCP_LISTEN,
+    read_tcp_sockets,
+)
+
+PROC_ROOT = "/proc"
+# Distinct (service, address, port) edges kept; more are counted in ``dropped``.
+MAX_EDGES = 10000
+LOCAL_ADDRESSES = frozenset({"127.0.0.1", "::1", "0.0.0.0", "::"})  # noqa: S104 - matched, never bound
+
+EdgeKey = Tuple[str, str, int]
+
+
+def map_socket_inodes(wanted: Set[int], proc_root: str = PROC_ROOT) -> Dict[int, int]:
+    """Return {socket inode: pid} for ``wanted`` inodes, stopping once all are found."""
+
+    owners: Dict[int, int] = {}
+    if not wanted:
+        return owners
+    try:
+        processes = os.scandir(proc_root)
+    except OSError:
+        return owners
+    with processes:
+        for proc in processes:
+            if not proc.name.isdigit():
+                continue
+            try:
+                with os.scandir(os.path.join(proc.path, "fd")) as fds:
+                    for fd in fds:
+                        try:
+                            link = os.readlink(fd.path)
+                        except OSError:
+                            continue
+                        if link.startswith("socket:["):
+                            inode = int(link[8:-1])
+                            if inode in wanted:
+                                owners[inode] = int(proc.name)
+            except OSError:
+                continue
+            if len(owners) == len(wanted):
+                break
+    return owners
+
+
+def unit_from_cgroup(content: str) -> Optional[str]:
+    """Return the systemd service a process belongs to, from /proc/<pid>/cgroup."""
+
+    for line in content.splitlines():
+        for part in reversed(line.rpartition(":")[2].split("/")):
+            if part.endswith(".service"):
+                return part[: -len(".service")]
+    return None
+
+
+class RelationSampler:
+    """Count client connections per (source service, remote address, port) on every tick.
+
+    Each tick streams the socket tables once and walks /proc/*/fd once, so cost is
+    linear in sockets and descriptors. Aggregated state is capped at ``max_edges``
+    distinct edges regardless of how many connections the host holds.
+    """
+
+    def __init__(
+        self,
+        services: List[Service],
+        ports: List[Port],
+        proc_root: str = PROC_ROOT,
+        max_edges: int = MAX_EDGES,
+    ) -> None:
+        self.proc_root = proc_root
+        self.max_edges = max_edges
+        self.names = {svc.name for svc in services}
+        self.pids = {svc.pid: svc.name for svc in services if svc.pid}
+        self.listening = {p.port for p in ports if p.protocol.startswith("tcp")}
+        self.dropped = 0
+        self._ticks = 0
+        self._edges: Dict[EdgeKey, List[int]] = {}  # key -> [sum of counts, peak]
+        self._listeners: Dict[int, str] = {}
+        self._local: Set[str] = set(LOCAL_ADDRESSES)
+        self._owners: Dict[int, Optional[str]] = {}
+
+    def _service_of(self, pid: int) -> Optional[str]:
+        if pid not in self._owners:
+            base = Path(self.proc_root) / str(pid)
+            name = unit_from_cgroup(safe_read_file(str(base / "cgroup")) or "")
+            if name not in self.names:
+                name = self.pids.get(pid)
+            if name is None:
+                comm = (safe_read_file(str(base / "comm")) or "").strip()
+                name = comm if comm in self.names else None
+            self._owners[pid] = name
+        return self._owners[pid]
+
+    def tick(self, elapsed: float) -> None:
+        self._ticks += 1
+        listeners: Dict[int, int] = {}
+        clients: Dict[int, Tuple[str, int]] = {}
+        for sock in read_tcp_sockets(self.proc_root):
+            if sock.state == TCP_LISTEN and sock.local_port in self.listening:
+                listeners[sock.inode] = sock.local_port
+            elif sock.state == TCP_ESTABLISHED and sock.local_port not in self.listening and sock.inode:
+                self._local.add(sock.local_address)
+                clients[sock.inode] = (sock.remote_address, sock.remote_port)
+        owners = map_socket_inodes(set(listeners) | set(clients), self.proc_root)
+        for inode, port in listeners.items():
+            service = self._service_of(owners[inode]) if inode in owners else None
+            if service:
+                self._listeners[port] = service
+        counts: Dict[EdgeKey, int] = {}
+        for inode, (address, port) in clients.items():
+            source = self._service_of(owners[inode]) if inode in owners else None
+            if source:
+                key = (source, address, port)
+                counts[key] = counts.get(key, 0) + 1
+        self._merge(counts.items())
+
+    def _merge(self, counts: Iterable[Tuple[EdgeKey, int]]) -> None:
+        for key, count in counts:
+            stats = self._edges.get(key)
+            if stats is None:
+                if len(self._edges) >= self.max_edges:
+                    self.dropped += 1
+                    continue
+                stats = self._edges[key] = [0, 0]
+            stats[0] += count
+            stats[1] = max(stats[1], count)
+
+    def results(self) -> List[ConnectionEdge]:
+        edges: List[ConnectionEdge] = []
+        for (source, address, port), (total, peak) in sorted(self._edges.items()):
+            target = self._listeners.get(port) if address in self._local else None
+            if target == source:
+                continue
+            edges.append(
+                ConnectionEdge(
+                    source=source,
+                    address=address,
+                    port=port,
+                    target=target,
+                    peak=peak,
+                    mean=round(total / max(1, self._ticks), 2),
+                )
+            )
+        return edges
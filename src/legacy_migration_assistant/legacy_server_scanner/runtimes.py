@@ -0,0 +1,240 @@
+"""Recognize JVM, Node.js, gunicorn and uWSGI command lines and extract their tuning."""
+
+from __future__ import annotations
+
+import os
+import shlex
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from legacy_migration_assistant.core.models import RuntimeSettings, Service
+from legacy_migration_assistant.core.utils import safe_read_file
+from legacy_migration_assistant.legacy_server_scanner.config_tuning import parse_size
+
+PROC_ROOT = "/proc"
+
+# Only these variables are read from /proc/<pid>/environ; nothing else is kept.
+RUNTIME_ENV_KEYS = (
+    "JAVA_TOOL_OPTIONS",
+    "JDK_JAVA_OPTIONS",
+    "_JAVA_OPTIONS",
+    "NODE_OPTIONS",
+    "UV_THREADPOOL_SIZE",
+    "GUNICORN_CMD_ARGS",
+)
+
+# JVM flags worth carrying into the container, matched by prefix.
+JVM_FLAG_PREFIXES = (
+    "-Xmx",
+    "-Xms",
+    "-Xss",
+    "-XX:MaxHeapSize=",
+    "-XX:MaxMetaspaceSize=",
+    "-XX:MaxDirectMemorySize=",
+    "-XX:MaxRAMPercentage=",
+    "-XX:InitialRAMPercentage=",
+    "-XX:ActiveProcessorCount=",
+    "-XX:+Use",
+)
+
+# Launcher options whose value is the next argument rather than part of the option.
+JVM_OPTIONS_WITH_VALUE = frozenset(
+    {
+        "-cp",
+        "-classpath",
+        "--class-path",
+        "-p",
+        "--module-path",
+        "--upgrade-module-path",
+        "--add-modules",
+        "--add-exports",
+        "--add-opens",
+        "--add-reads",
+        "--limit-modules",
+        "--patch-module",
+        "--enable-native-access",
+    }
+)
+
+
+def read_cmdline(pid: int, proc_root: str = PROC_ROOT) -> Optional[List[str]]:
+    content = safe_read_file(str(Path(proc_root) / str(pid) / "cmdline"))
+    if not content:
+        return None
+    return [arg for arg in content.split("\0") if arg]
+
+
+def read_runtime_env(pid: int, proc_root: str = PROC_ROOT) -> Dict[str, str]:
+    content = safe_read_file(str(Path(proc_root) / str(pid) / "environ")) or ""
+    env: Dict[str, str] = {}
+    for entry in content.split("\0"):
+        key, sep, value = entry.partition("=")
+        if sep and key in RUNTIME_ENV_KEYS:
+            env[key] = value
+    return env
+
+
+def _flag(args: List[str], names: tuple, short: Optional[str] = None) -> Optional[str]:
+    """Return the last value given as ``--name=v``, ``--name v``, ``-s v`` or ``-sv``."""
+
+    value = None
+    for index, arg in enumerate(args):
+        name, sep, inline = arg.partition("=")
+        if name in names:
+            value = inline if sep else (args[index + 1] if index + 1 < len(args) else None)
+        elif short and arg.startswith(short):
+            value = arg[len(short) :] or (args[index + 1] if index + 1 < len(args) else None)
+    return value
+
+
+def _split(value: str) -> List[str]:
+    try:
+        return shlex.split(value)
+    except ValueError:
+        return value.split()
+
+
+def _int(value: Optional[str]) -> Optional[int]:
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _jvm_options(args: List[str]) -> List[str]:
+    options: List[str] = []
+    takes_value = False
+    for arg in args:
+        if takes_value:
+            takes_value = False
+            continue
+        if arg in ("-jar", "-m", "--module") or not arg.startswith("-"):
+            break  # application arguments follow the main class, jar or module
+        options.append(arg)
+        takes_value = arg in JVM_OPTIONS_WITH_VALUE
+    return options
+
+
+def _jvm_flag_name(option: str) -> str:
+    """``-Xmx8g`` -> ``-Xmx``, ``-XX:MaxRAMPercentage=75`` -> ``-XX:MaxRAMPercentage``."""
+
+    if option.startswith("-XX:"):
+        return option.split("=", 1)[0]
+    return option[:4]
+
+
+def _analyze_java(service: str, argv: List[str], env: Dict[str, str]) -> RuntimeSettings:
+    # Precedence: JAVA_TOOL_OPTIONS < JDK_JAVA_OPTIONS < command line < _JAVA_OPTIONS.
+    options = (
+        _split(env.get("JAVA_TOOL_OPTIONS", ""))
+        + _split(env.get("JDK_JAVA_OPTIONS", ""))
+        + _jvm_options(argv[1:])
+        + _split(env.get("_JAVA_OPTIONS", ""))
+    )
+    kept: Dict[str, str] = {}
+    for option in options:
+        if option.startswith(JVM_FLAG_PREFIXES):
+            kept[_jvm_flag_name(option)] = option
+    heap = None
+    if "-Xmx" in kept:
+        heap = parse_size(kept["-Xmx"][len("-Xmx") :])
+    elif "-XX:MaxHeapSize" in kept:
+        heap = parse_size(kept["-XX:MaxHeapSize"].split("=", 1)[1])
+    cpus = None
+    if "-XX:ActiveProcessorCount" in kept:
+        cpus = _int(kept["-XX:ActiveProcessorCount"].split("=", 1)[1])
+    return RuntimeSettings(
+        service=service,
+        runtime="jvm",
+        heap_kib=heap // 1024 if heap else None,
+        cpus=cpus,
+        options=list(kept.values()),
+    )
+
+
+def _analyze_node(service: str, argv: List[str], env: Dict[str, str]) -> RuntimeSettings:
+    args = _split(env.get("NODE_OPTIONS", "")) + argv[1:]
+    old_space = _int(_flag(args, ("--max-old-space-size", "--max_old_space_size")))
+    return RuntimeSettings(
+        service=service,
+        runtime="node",
+        heap_kib=old_space * 1024 if old_space else None,
+        threads=_int(env.get("UV_THREADPOOL_SIZE")),
+        options=[f"--max-old-space-size={old_space}"] if old_space else [],
+    )
+
+
+def _analyze_gunicorn(service: str, argv: List[str], env: Dict[str, str]) -> RuntimeSettings:
+    # Only flags actually given are kept: with -c the rest comes from a config file we do
+    # not read, and GUNICORN_CMD_ARGS would override it if we invented a default.
+    args = _split(env.get("GUNICORN_CMD_ARGS", "")) + argv[1:]
+    workers = _int(_flag(args, ("--workers",), "-w"))
+    threads = _int(_flag(args, ("--threads",)))
+    worker_class = _flag(args, ("--worker-class",), "-k")
+    options = []
+    if workers:
+        options.append(f"--workers={workers}")
+    if threads:
+        options.append(f"--threads={threads}")
+    if worker_class:
+        options.append(f"--worker-class={worker_class}")
+    return RuntimeSettings(service=service, runtime="gunicorn", workers=workers, threads=threads, options=options)
+
+
+def _analyze_uwsgi(service: str, argv: List[str], env: Dict[str, str]) -> RuntimeSettings:
+    args = argv[1:]
+    workers = _int(_flag(args, ("--processes", "--workers"), "-p"))
+    threads = _int(_flag(args, ("--threads",)))
+    options = ([f"--processes={workers}"] if workers else []) + ([f"--threads={threads}"] if threads else [])
+    return RuntimeSettings(service=service, runtime="uwsgi", workers=workers, threads=threads, options=options)
+
+
+def _program(argv: List[str]) -> str:
+    """Name of the program, looking through ``python -m x`` and ``python /path/bin/x``."""
+
+    name = os.path.basename(argv[0])
+    if name.startswith("python") and len(argv) > 1:
+        if argv[1] == "-m" and len(argv) > 2:
+            return argv[2]
+        return os.path.basename(argv[1])
+    return name
+
+
+def analyze_cmdline(
+    service: str, argv: List[str], env: Optional[Dict[str, str]] = None
+) -> Optional[RuntimeSettings]:
+    """Return runtime settings if ``argv`` starts a recognized runtime."""
+
+    if not argv:
+        return None
+    env = env or {}
+    program = _program(argv)
+    if program == "java":
+        return _analyze_java(service, argv, env)
+    if program in ("node", "nodejs"):
+        return _analyze_node(service, argv, env)
+    if program == "gunicorn":
+        return _analyze_gunicorn(service, argv, env)
+    if program in ("uwsgi", "uwsgi-core"):
+        return _analyze_uwsgi(service, argv, env)
+    return None
+
+
+def collect_runtime_settings(
+    services: List[Service], pids: Dict[str, int], proc_root: str = PROC_ROOT
+) -> List[RuntimeSettings]:
+    """Analyze each service's main process command line (and runtime env variables).
+
+    Services without a known pid fall back to the command captured by ``ps``.
+    """
+
+    results: List[RuntimeSettings] = []
+    for svc in services:
+        pid = pids.get(svc.name)
+        argv = read_cmdline(pid, proc_root) if pid else None
+        if argv is None and svc.main_cmd:
+            argv = _split(svc.main_cmd)
+        settings = analyze_cmdline(svc.name, argv or [], read_runtime_env(pid, proc_root) if pid else {})
+        if settings is not None:
+            results.append(settings)
+    return results
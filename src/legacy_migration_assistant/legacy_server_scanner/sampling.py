@@ -0,0 +1,35 @@
+"""Drive several samplers from one shared clock so a scan waits for one window only."""
+
+from __future__ import annotations
+
+import time
+from typing import Callable, List, Protocol
+
+from legacy_migration_assistant.core.utils import pace
+
+
+class Sampler(Protocol):
+    def tick(self, elapsed: float) -> None:
+        """Take one sample; ``elapsed`` is the time since the previous tick (0 at first)."""
+        ...
+
+
+def run_samplers(
+    samplers: List[Sampler],
+    window: float = 0.0,
+    interval: float = 1.0,
+    sleep: Callable[[float], None] = time.sleep,
+    clock: Callable[[], float] = time.monotonic,
+) -> None:
+    """Tick every sampler once, then every ``interval`` seconds until ``window`` elapses."""
+
+    ticks = int(window / interval) if window > 0 and interval > 0 else 0
+    previous = clock()
+    for tick in range(ticks + 1):
+        if tick:
+            sleep(interval)
+        now = clock()
+        elapsed, previous = now - previous, now
+        for sampler in samplers:
+            sampler.tick(elapsed)
+        pace()
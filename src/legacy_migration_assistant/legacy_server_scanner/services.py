@@ -5,9 +5,9 @@ Service inspection logic for systemd and init-like systems.
 from __future__ import annotations
 
 import os
-from typing import List
+from typing import Dict, List, Optional
 
-from legacy_migration_assistant.core.models import Service
+from legacy_migration_assistant.core.models import Service, StartupTiming
 from legacy_migration_assistant.core.utils import detect_systemd, run_command
 
 
@@ -60,3 +60,85 @@ def collect_services() -> List[Service]:
 
     code, stdout, _ = run_command(["ps", "aux"])
     return parse_ps_aux(stdout) if code == 0 else []
+
+
+STARTUP_PROPERTIES = (
+    "Id",
+    "InactiveExitTimestampMonotonic",
+    "ActiveEnterTimestampMonotonic",
+    "NRestarts",
+)
+
+
+def parse_systemctl_show(output: str) -> List[Dict[str, str]]:
+    """Parse `systemctl show` output; multiple units are separated by blank lines."""
+
+    blocks: List[Dict[str, str]] = []
+    current: Dict[str, str] = {}
+    for line in output.splitlines():
+        if not line.strip():
+            if current:
+                blocks.append(current)
+                current = {}
+            continue
+        key, sep, value = line.partition("=")
+        if sep:
+            current[key.strip()] = value.strip()
+    if current:
+        blocks.append(current)
+    return blocks
+
+
+def _int_property(props: Dict[str, str], key: str) -> Optional[int]:
+    try:
+        return int(props.get(key, ""))
+    except ValueError:
+        return None
+
+
+def startup_timing_from_properties(props: Dict[str, str]) -> Optional[StartupTiming]:
+    """Build a StartupTiming from InactiveExit -> ActiveEnter monotonic timestamps (usec)."""
+
+    unit = props.get("Id")
+    if not unit:
+        return None
+    exited = _int_property(props, "InactiveExitTimestampMonotonic")
+    entered = _int_property(props, "ActiveEnterTimestampMonotonic")
+    seconds = None
+    if exited and entered and entered >= exited:
+        seconds = round((entered - exited) / 1_000_000, 3)
+    return StartupTiming(
+        service=unit.replace(".service", ""),
+        start_seconds=seconds,
+        restarts=_int_property(props, "NRestarts") or 0,
+    )
+
+
+def collect_startup_timings(services: List[Service]) -> List[StartupTiming]:
+    """Query systemd once for the start latency and restart count of every unit."""
+
+    units = [f"{svc.name}.service" for svc in services if svc.manager == "systemd"]
+    if not units:
+        return []
+    code, stdout, _ = run_command(["systemctl", "show", *units, "-p", ",".join(STARTUP_PROPERTIES)])
+    if code != 0:
+        return []
+    timings = [startup_timing_from_properties(props) for props in parse_systemctl_show(stdout)]
+    return [timing for timing in timings if timing is not None]
+
+
+def resolve_main_pids(services: List[Service]) -> Dict[str, int]:
+    """Map service names to their main pid, asking systemd (in one call) for its units."""
+
+    pids = {svc.name: svc.pid for svc in services if svc.pid}
+    units = [f"{svc.name}.service" for svc in services if svc.manager == "systemd" and svc.name not in pids]
+    if not units:
+        return pids
+    code, stdout, _ = run_command(["systemctl", "show", *units, "-p", "Id,MainPID"])
+    if code != 0:
+        return pids
+    for props in parse_systemctl_show(stdout):
+        pid = _int_property(props, "MainPID")
+        if props.get("Id") and pid:
+            pids[props["Id"].replace(".service", "")] = pid
+    return pids
@@ -0,0 +1,177 @@
+"""Measure data directories and the filesystems backing them."""
+
+from __future__ import annotations
+
+import os
+import re
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional, Set, Tuple
+
+from legacy_migration_assistant.core.metrics import LOG_DIR
+from legacy_migration_assistant.core.models import VolumeUsage
+from legacy_migration_assistant.core.utils import pace, safe_read_file
+
+PROC_ROOT = "/proc"
+
+# Data directories of the stateful services the classifier recognizes.
+DATA_DIRS = (
+    "/var/lib/mysql",
+    "/var/lib/postgresql",
+    "/var/lib/pgsql",
+    "/var/lib/redis",
+    "/var/lib/rabbitmq",
+    "/var/lib/mongodb",
+)
+# Each directory walk stops after this many seconds and reports a lower bound.
+DEFAULT_TIME_CAP = 30.0
+DEFAULT_WORKERS = 8
+
+_OCTAL_ESCAPE_RE = re.compile(r"\\([0-7]{3})")
+
+
+@dataclass
+class MountEntry:
+    mount_point: str
+    fstype: str
+    source: str
+    options: List[str] = field(default_factory=list)
+
+
+def _unescape(value: str) -> str:
+    """mountinfo escapes space, tab, newline and backslash as octal (``\\040``)."""
+
+    return _OCTAL_ESCAPE_RE.sub(lambda m: chr(int(m.group(1), 8)), value)
+
+
+def parse_mountinfo(content: str) -> List[MountEntry]:
+    """Parse /proc/<pid>/mountinfo; options merge per-mount and superblock flags."""
+
+    mounts: List[MountEntry] = []
+    for line in content.splitlines():
+        head, sep, tail = line.partition(" - ")
+        fields, rest = head.split(), tail.split()
+        if not sep or len(fields) < 6 or len(rest) < 2:
+            continue
+        options = fields[5].split(",")
+        if len(rest) > 2:
+            options += [opt for opt in rest[2].split(",") if opt not in options]
+        mounts.append(MountEntry(_unescape(fields[4]), rest[0], _unescape(rest[1]), options))
+    return mounts
+
+
+def find_mount(path: str, mounts: List[MountEntry]) -> Optional[MountEntry]:
+    """Return the mount holding ``path``; later entries shadow earlier ones."""
+
+    best: Optional[MountEntry] = None
+    for mount in mounts:
+        point = mount.mount_point.rstrip("/") or "/"
+        if path == point or path.startswith(point if point == "/" else point + "/"):
+            if best is None or len(point) >= len(best.mount_point.rstrip("/") or "/"):
+                best = mount
+    return best
+
+
+def _scan_directory(path: str) -> Tuple[int, int, List[str], List[Tuple[int, int, int]]]:
+    """Scan one directory without recursing.
+
+    Returns (512-byte blocks, file count, subdirectories, hard-linked files as
+    (dev, inode, blocks)) so the caller can count each multiply linked inode once.
+    """
+
+    blocks = files = 0
+    subdirs: List[str] = []
+    linked: List[Tuple[int, int, int]] = []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    st = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                    blocks += st.st_blocks
+                elif st.st_nlink > 1:
+                    linked.append((st.st_dev, st.st_ino, st.st_blocks))
+                    files += 1
+                else:
+                    blocks += st.st_blocks
+                    files += 1
+    except OSError:
+        pass
+    pace()
+    return blocks, files, subdirs, linked
+
+
+def measure_directory(
+    path: str,
+    time_cap: float = DEFAULT_TIME_CAP,
+    workers: int = DEFAULT_WORKERS,
+    clock: Callable[[], float] = time.monotonic,
+) -> Tuple[int, int, bool]:
+    """Sum allocated blocks under ``path`` like ``du -s``, walking directories in parallel.
+
+    Returns (KiB used, file count, complete). Directories still queued when
+    ``time_cap`` runs out are skipped and ``complete`` is False.
+    """
+
+    deadline = clock() + time_cap
+    blocks = files = 0
+    seen: Set[Tuple[int, int]] = set()
+    complete = True
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        pending: Set[Future] = {pool.submit(_scan_directory, path)}
+        while pending:
+            done, pending = wait(pending, timeout=max(0.0, deadline - clock()), return_when=FIRST_COMPLETED)
+            if not done:
+                complete = False
+                for future in pending:
+                    future.cancel()
+                break
+            expired = clock() >= deadline
+            for future in done:
+                dir_blocks, dir_files, subdirs, linked = future.result()
+                blocks += dir_blocks
+                files += dir_files
+                for dev, ino, file_blocks in linked:
+                    if (dev, ino) not in seen:
+                        seen.add((dev, ino))
+                        blocks += file_blocks
+                if expired and subdirs:
+                    complete = False
+                elif not expired:
+                    pending.update(pool.submit(_scan_directory, sub) for sub in subdirs)
+    return blocks // 2, files, complete
+
+
+def collect_volume_usage(
+    paths: Iterable[str] = (*DATA_DIRS, LOG_DIR),
+    time_cap: float = DEFAULT_TIME_CAP,
+    workers: int = DEFAULT_WORKERS,
+    proc_root: str = PROC_ROOT,
+) -> List[VolumeUsage]:
+    """Measure each existing data directory and record its mount's type and options."""
+
+    mounts = parse_mountinfo(safe_read_file(str(Path(proc_root) / "self" / "mountinfo")) or "")
+    records: List[VolumeUsage] = []
+    for path in paths:
+        if not os.path.isdir(path):
+            continue
+        used_kib, files, complete = measure_directory(path, time_cap, workers)
+        mount = find_mount(os.path.realpath(path), mounts)
+        records.append(
+            VolumeUsage(
+                path=path,
+                used_kib=used_kib,
+                files=files,
+                complete=complete,
+                fstype=mount.fstype if mount else None,
+                mount_point=mount.mount_point if mount else None,
+                mount_options=mount.options if mount else [],
+                source=mount.source if mount else None,
+            )
+        )
+    return records
@@ -0,0 +1,353 @@
+"""Resource-governed scans for busy production hosts.
+
+:class:`ScanGovernor` keeps the scanner's footprint small:
+
+* it lowers its own CPU and I/O priority (``nice`` 19, ``ionice`` best-effort 7),
+  which every command the collectors run inherits;
+* as root on cgroup v2 it also moves into a transient ``legacy-scan-<pid>`` cgroup
+  whose ``cpu.max`` and ``io.max`` make the kernel enforce the caps;
+* in any case it paces itself: file reads draw from a read-bandwidth budget, files
+  of ``LARGE_READ_BYTES`` or more are dropped from the page cache with
+  ``posix_fadvise(DONTNEED)`` once read, and work pauses whenever the scanner's CPU
+  time (its commands included) runs ahead of its CPU share;
+* it backs off while ``/proc/pressure/cpu`` or ``/proc/pressure/io`` shows other
+  work stalling.
+
+Collectors reach the governor through :func:`core.utils.safe_read_file` and
+:func:`core.utils.pace`, so they need no changes of their own.
+"""
+
+from __future__ import annotations
+
+import os
+import resource
+import threading
+import time
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from legacy_migration_assistant.core.models import ScanOverhead
+from legacy_migration_assistant.core.utils import run_command, set_governor
+from legacy_migration_assistant.legacy_server_scanner.cgroups import CGROUP_ROOT
+from legacy_migration_assistant.legacy_server_scanner.io_profile import (
+    PROC_ROOT,
+    SYS_ROOT,
+    VIRTUAL_DEVICE_PREFIXES,
+)
+
+DEFAULT_CPU_SHARE = 0.25
+DEFAULT_READ_MBPS = 20.0
+# Share of time (avg10, percent) some task stalled on CPU or I/O before the scan waits.
+DEFAULT_PRESSURE_THRESHOLD = 10.0
+
+NICE_LEVEL = 19
+IONICE_CLASS = 2
+IONICE_LEVEL = 7
+CGROUP_PREFIX = "legacy-scan-"
+CPU_PERIOD_US = 100_000
+
+LARGE_READ_BYTES = 1 << 20
+READ_CHUNK_BYTES = 1 << 16
+# Pauses shorter than this are not worth a sleep; longer ones are split so pressure is rechecked.
+MIN_PAUSE = 0.01
+MAX_PAUSE = 1.0
+PRESSURE_CHECK_INTERVAL = 1.0
+MIN_BACKOFF = 0.5
+MAX_BACKOFF = 8.0
+# Give up waiting for a quiet host after this long and carry on, throttled as usual;
+# pressure is then not checked again for PRESSURE_COOLDOWN, so a host that stays busy
+# costs one capped wait per cool-down rather than one per pace() call.
+MAX_PRESSURE_WAIT = 60.0
+PRESSURE_COOLDOWN = 300.0
+
+
+def parse_pressure_avg10(content: str) -> Optional[float]:
+    """Return the ``some avg10`` stall percentage from a PSI file."""
+
+    for line in content.splitlines():
+        if line.startswith("some "):
+            for token in line.split()[1:]:
+                key, _, value = token.partition("=")
+                if key == "avg10":
+                    try:
+                        return float(value)
+                    except ValueError:
+                        return None
+    return None
+
+
+def read_pressure(proc_root: str = PROC_ROOT) -> Optional[float]:
+    """Worst of CPU and I/O ``some avg10`` pressure, or None without PSI."""
+
+    values = []
+    for resource_name in ("cpu", "io"):
+        try:
+            content = (Path(proc_root) / "pressure" / resource_name).read_text(encoding="utf-8")
+        except OSError:
+            continue
+        value = parse_pressure_avg10(content)
+        if value is not None:
+            values.append(value)
+    return max(values, default=None)
+
+
+def cpu_seconds() -> float:
+    """CPU time of this process and the commands it has waited for."""
+
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+
+def block_devices(sys_root: str = SYS_ROOT) -> List[str]:
+    """``major:minor`` of every physical block device."""
+
+    devices: List[str] = []
+    block = Path(sys_root) / "block"
+    if not block.is_dir():
+        return devices
+    for entry in sorted(block.iterdir()):
+        if entry.name.startswith(VIRTUAL_DEVICE_PREFIXES):
+            continue
+        try:
+            devices.append((entry / "dev").read_text(encoding="utf-8").strip())
+        except OSError:
+            continue
+    return devices
+
+
+def current_cgroup(proc_root: str = PROC_ROOT) -> Optional[str]:
+    """This process's cgroup v2 path (``0::/...`` in /proc/self/cgroup)."""
+
+    try:
+        content = (Path(proc_root) / "self" / "cgroup").read_text(encoding="utf-8")
+    except OSError:
+        return None
+    for line in content.splitlines():
+        if line.startswith("0::"):
+            return line[3:]
+    return None
+
+
+def enter_cgroup(
+    cpu_share: Optional[float],
+    read_bytes_per_second: Optional[int],
+    pid: int,
+    cgroup_root: str = CGROUP_ROOT,
+    sys_root: str = SYS_ROOT,
+) -> Optional[Path]:
+    """Move ``pid`` into a new cgroup v2 capped at ``cpu_share`` CPUs and the read rate.
+
+    Returns the cgroup, or None where that is not possible (cgroup v1, not root,
+    controllers not delegated).
+    """
+
+    root = Path(cgroup_root)
+    if not (root / "cgroup.controllers").exists():
+        return None
+    path = root / f"{CGROUP_PREFIX}{pid}"
+    try:
+        path.mkdir(exist_ok=True)
+        if cpu_share:
+            (path / "cpu.max").write_text(f"{max(1000, int(cpu_share * CPU_PERIOD_US))} {CPU_PERIOD_US}")
+        if read_bytes_per_second:
+            for device in block_devices(sys_root):
+                try:
+                    (path / "io.max").write_text(f"{device} rbps={read_bytes_per_second}")
+                except OSError:
+                    continue
+        (path / "cgroup.procs").write_text(str(pid))
+    except OSError:
+        try:
+            path.rmdir()
+        except OSError:
+            pass
+        return None
+    return path
+
+
+def leave_cgroup(path: Path, origin: Optional[str], pid: int, cgroup_root: str = CGROUP_ROOT) -> None:
+    """Move ``pid`` back to ``origin`` and remove the transient cgroup."""
+
+    try:
+        if origin is not None:
+            (Path(cgroup_root) / origin.lstrip("/") / "cgroup.procs").write_text(str(pid))
+        path.rmdir()
+    except OSError:
+        pass
+
+
+class ScanGovernor:
+    """Cap a scan's CPU share and read bandwidth and yield to a contended host.
+
+    Use it as a context manager around the scan; while active it is installed as the
+    governor of :mod:`core.utils`. :meth:`overhead` reports what the scan cost.
+    """
+
+    def __init__(
+        self,
+        cpu_share: Optional[float] = DEFAULT_CPU_SHARE,
+        read_bytes_per_second: Optional[int] = int(DEFAULT_READ_MBPS * 1_000_000),
+        pressure_threshold: Optional[float] = DEFAULT_PRESSURE_THRESHOLD,
+        use_cgroup: bool = True,
+        proc_root: str = PROC_ROOT,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        cpu_time: Callable[[], float] = cpu_seconds,
+        pressure: Optional[Callable[[], Optional[float]]] = None,
+    ) -> None:
+        self.cpu_share = cpu_share
+        self.read_bytes_per_second = read_bytes_per_second
+        self.pressure_threshold = pressure_threshold
+        self.use_cgroup = use_cgroup
+        self.proc_root = proc_root
+        self._clock = clock
+        self._sleep = sleep
+        self._cpu_time = cpu_time
+        self._pressure = pressure or (lambda: read_pressure(proc_root))
+        self._lock = threading.Lock()
+        self.measures: List[str] = []
+        self.bytes_read = 0
+        self.files_dropped_from_cache = 0
+        self.throttled_seconds = 0.0
+        self.pressure_backoffs = 0
+        self.pressure_wait_seconds = 0.0
+        self._started = self._cpu_started = 0.0
+        self._stopped: Optional[float] = None
+        self._cpu_stopped: Optional[float] = None
+        self._next_pressure_check = 0.0
+        self._cgroup: Optional[Path] = None
+        self._origin: Optional[str] = None
+
+    def start(self) -> None:
+        """Lower the scanner's priority, enter a capped cgroup if possible and start the clocks."""
+
+        pid = os.getpid()
+        try:
+            os.setpriority(os.PRIO_PROCESS, 0, max(NICE_LEVEL, os.getpriority(os.PRIO_PROCESS, 0)))
+            self.measures.append("nice")
+        except OSError:
+            pass
+        code, _, _ = run_command(["ionice", "-c", str(IONICE_CLASS), "-n", str(IONICE_LEVEL), "-p", str(pid)])
+        if code == 0:
+            self.measures.append("ionice")
+        if self.use_cgroup:
+            self._origin = current_cgroup(self.proc_root)
+            self._cgroup = enter_cgroup(self.cpu_share, self.read_bytes_per_second, pid)
+            if self._cgroup is not None:
+                self.measures.append("cgroup")
+        self._started = self._clock()
+        self._cpu_started = self._cpu_time()
+
+    def stop(self) -> None:
+        self._stopped = self._clock()
+        self._cpu_stopped = self._cpu_time()
+        if self._cgroup is not None:
+            leave_cgroup(self._cgroup, self._origin, os.getpid())
+            self._cgroup = None
+
+    def __enter__(self) -> "ScanGovernor":
+        self.start()
+        set_governor(self)
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        set_governor(None)
+        self.stop()
+
+    def _pause(self, seconds: float) -> None:
+        self._sleep(seconds)
+        self.throttled_seconds += seconds
+
+    def _hold_cpu(self) -> None:
+        if not self.cpu_share:
+            return
+        used = self._cpu_time() - self._cpu_started
+        ahead = used / self.cpu_share - (self._clock() - self._started)
+        if ahead >= MIN_PAUSE:
+            self._pause(min(ahead, MAX_PAUSE))
+
+    def _hold_reads(self) -> None:
+        if not self.read_bytes_per_second:
+            return
+        ahead = self.bytes_read / self.read_bytes_per_second - (self._clock() - self._started)
+        if ahead >= MIN_PAUSE:
+            self._pause(min(ahead, MAX_PAUSE))
+
+    def _yield_to_pressure(self) -> None:
+        if self.pressure_threshold is None or self._clock() < self._next_pressure_check:
+            return
+        delay = MIN_BACKOFF
+        waited = 0.0
+        quiet = False
+        while waited < MAX_PRESSURE_WAIT:
+            stall = self._pressure()
+            if stall is None or stall < self.pressure_threshold:
+                quiet = True
+                break
+            pause = min(delay, MAX_PRESSURE_WAIT - waited)
+            self._sleep(pause)
+            waited += pause
+            delay = min(delay * 2, MAX_BACKOFF)
+        if waited:
+            self.pressure_backoffs += 1
+            self.pressure_wait_seconds += waited
+        interval = PRESSURE_CHECK_INTERVAL if quiet else PRESSURE_COOLDOWN
+        self._next_pressure_check = self._clock() + interval
+
+    def pace(self) -> None:
+        """Sleep while the scan is over its CPU share or the host is under pressure."""
+
+        with self._lock:
+            self._hold_cpu()
+            self._yield_to_pressure()
+
+    def read_text(self, path: str) -> Optional[str]:
+        """Read a file within the bandwidth budget; None if missing or unreadable."""
+
+        chunks: List[bytes] = []
+        size = 0
+        try:
+            with open(path, "rb") as handle:
+                while True:
+                    chunk = handle.read(READ_CHUNK_BYTES)
+                    if not chunk:
+                        break
+                    chunks.append(chunk)
+                    size += len(chunk)
+                    with self._lock:
+                        self.bytes_read += len(chunk)
+                        self._hold_reads()
+                if size >= LARGE_READ_BYTES and hasattr(os, "posix_fadvise"):
+                    os.posix_fadvise(handle.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+                    with self._lock:
+                        self.files_dropped_from_cache += 1
+        except OSError:
+            return None
+        self.pace()
+        # Match Path.read_text: undecodable bytes dropped, newlines translated.
+        text = b"".join(chunks).decode("utf-8", errors="ignore")
+        return text.replace("\r\n", "\n").replace("\r", "\n")
+
+    def overhead(self) -> ScanOverhead:
+        """Cost of the scan so far (or up to :meth:`stop`)."""
+
+        wall = (self._stopped if self._stopped is not None else self._clock()) - self._started
+        cpu = (self._cpu_stopped if self._cpu_stopped is not None else self._cpu_time()) - self._cpu_started
+        # ru_maxrss is in KiB on Linux.
+        max_rss = max(
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+            resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+        )
+        return ScanOverhead(
+            measures=list(self.measures),
+            cpu_limit=self.cpu_share,
+            read_limit_bytes=self.read_bytes_per_second,
+            wall_seconds=round(wall, 3),
+            cpu_seconds=round(cpu, 3),
+            max_rss_kib=int(max_rss),
+            bytes_read=self.bytes_read,
+            files_dropped_from_cache=self.files_dropped_from_cache,
+            throttled_seconds=round(self.throttled_seconds, 3),
+            pressure_backoffs=self.pressure_backoffs,
+            pressure_wait_seconds=round(self.pressure_wait_seconds, 3),
+        )
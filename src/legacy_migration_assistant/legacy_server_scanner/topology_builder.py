@@ -2,19 +2,25 @@
 
 from __future__ import annotations
 
-from typing import List
+from dataclasses import asdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
+from legacy_migration_assistant.core.metrics import component_port_loads, port_load_notes
 from legacy_migration_assistant.core.models import (
     AppComponent,
     AppTopology,
     ComponentType,
     ConfigFile,
+    ConnectionEdge,
     CronJob,
+    HostMetrics,
     Package,
     Port,
     Relation,
+    ScanOverhead,
     Service,
 )
+from legacy_migration_assistant.core.package_graph import application_closures
 from legacy_migration_assistant.legacy_server_scanner.classifier import classify_components
 
 
@@ -52,21 +58,80 @@ def build_relations(components: List[AppComponent]) -> List[Relation]:
     return relations
 
 
+def _edge_target(edge: ConnectionEdge, components: List[AppComponent]) -> Tuple[str, bool]:
+    """Resolve an edge's target to a component name, or to ``address:port`` if external."""
+
+    for component in components:
+        if edge.target is not None and edge.target in component.services:
+            return component.name, False
+    if edge.target is not None:
+        for component in components:
+            if edge.port in component.ports:
+                return component.name, False
+        return edge.target, False
+    return f"{edge.address}:{edge.port}", True
+
+
+def observed_relations(
+    components: List[AppComponent], edges: List[ConnectionEdge], relations: List[Relation]
+) -> List[Relation]:
+    """Merge sampled connection edges into ``relations``, weighted by peak and mean connections.
+
+    Edges between services of the same component are dropped; edges to the same
+    component pair are summed.
+    """
+
+    owner = {svc: c.name for c in components for svc in c.services}
+    weights: Dict[Tuple[str, str, bool], Tuple[int, float]] = {}
+    for edge in edges:
+        source = owner.get(edge.source, edge.source)
+        target, external = _edge_target(edge, components)
+        if source != target:
+            key = (source, target, external)
+            peak, mean = weights.get(key, (0, 0.0))
+            weights[key] = (peak + edge.peak, mean + edge.mean)
+    merged = list(relations)
+    index = {(rel.source, rel.target): rel for rel in merged}
+    for (source, target, external), (peak, mean) in sorted(weights.items()):
+        relation = index.get((source, target))
+        if relation is None:
+            where = "remote " if external else ""
+            relation = Relation(
+                source=source,
+                target=target,
+                description=f"observed connections to {where}{target}",
+                external=external,
+                observed=True,
+            )
+            merged.append(relation)
+        relation.connections = peak
+        relation.weight = round(mean, 2)
+    return merged
+
+
 def build_topology(
     packages: List[Package],
     services: List[Service],
     ports: List[Port],
     configs: List[ConfigFile],
     cron_jobs: List[CronJob],
+    metrics: Optional[HostMetrics] = None,
+    base_packages: Optional[Iterable[str]] = None,
 ) -> AppTopology:
-    """Create an AppTopology from scan results."""
+    """Create an AppTopology from scan results.
+
+    Each component lists the packages its services and configs need beyond
+    ``base_packages`` (by default the stock base image of the host's package manager).
+    """
 
     components = classify_components(packages, services, ports, configs)
     for component in components:
         if component.component_type == ComponentType.CRON and cron_jobs:
             component.notes.append(f"{len(cron_jobs)} cron entries detected")
     relations = build_relations(components)
-    return AppTopology(
+    if metrics is not None and metrics.edges:
+        relations = observed_relations(components, metrics.edges, relations)
+    topology = AppTopology(
         components=components,
         relations=relations,
         packages=packages,
@@ -74,4 +139,49 @@ def build_topology(
         ports=ports,
         cron=cron_jobs,
         configs=configs,
+        metrics=metrics or HostMetrics(),
+    )
+    for component in components:
+        component.notes.extend(port_load_notes(component_port_loads(topology, component)))
+    closures = application_closures(topology, base_packages)
+    for component in components:
+        component.packages = closures[component.name]
+    return topology
+
+
+def serialize_scan(
+    packages: List[Package],
+    services: List[Service],
+    ports: List[Port],
+    cron_jobs: List[CronJob],
+    configs: List[ConfigFile],
+    metrics: Optional[HostMetrics] = None,
+    overhead: Optional[ScanOverhead] = None,
+) -> Dict[str, Any]:
+    """Return the ``scan.json`` payload for collected scan results."""
+
+    payload = {
+        "packages": [asdict(p) for p in packages],
+        "services": [asdict(s) for s in services],
+        "ports": [asdict(p) for p in ports],
+        "cron": [asdict(c) for c in cron_jobs],
+        "configs": [asdict(c) for c in configs],
+        "metrics": asdict(metrics or HostMetrics()),
+    }
+    if overhead is not None:
+        payload["overhead"] = asdict(overhead)
+    return payload
+
+
+def topology_from_scan(raw: Dict[str, Any], base_packages: Optional[Iterable[str]] = None) -> AppTopology:
+    """Build the topology of one ``scan.json`` payload."""
+
+    return build_topology(
+        [Package(**item) for item in raw.get("packages", [])],
+        [Service(**item) for item in raw.get("services", [])],
+        [Port(**item) for item in raw.get("ports", [])],
+        [ConfigFile(**item) for item in raw.get("configs", [])],
+        [CronJob(**item) for item in raw.get("cron", [])],
+        HostMetrics.from_dict(raw.get("metrics", {})),
+        base_packages,
     )
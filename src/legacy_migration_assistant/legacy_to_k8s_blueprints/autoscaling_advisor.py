@@ -0,0 +1,75 @@
+"""Replica and HorizontalPodAutoscaler heuristics driven by sampled load."""
+
+from __future__ import annotations
+
+import math
+from typing import List, Optional
+
+from legacy_migration_assistant.core.models import ComponentType, ResourceUsage
+from legacy_migration_assistant.legacy_to_k8s_blueprints.blueprint_models import AutoscalingAdvice
+
+STATELESS_TYPES = frozenset({ComponentType.WEB, ComponentType.WORKER})
+STATEFUL_TYPES = frozenset({ComponentType.DATABASE, ComponentType.CACHE, ComponentType.QUEUE})
+
+# Fewer samples than this say nothing about burstiness.
+MIN_SAMPLES = 3
+MIN_REPLICAS = 2
+MAX_REPLICAS = 10
+# Floor for components whose listen backlog filled up on the legacy host.
+SATURATED_MIN_REPLICAS = 3
+# The target leaves room for a peak-to-mean burst while new pods start, within these bounds.
+MIN_TARGET_UTILIZATION = 50
+MAX_TARGET_UTILIZATION = 80
+
+
+def peak_to_mean(samples: List[int]) -> Optional[float]:
+    """Return max/mean of a sample series, or None when it is too short or idle."""
+
+    if len(samples) < MIN_SAMPLES:
+        return None
+    mean = sum(samples) / len(samples)
+    if mean <= 0:
+        return None
+    return max(samples) / mean
+
+
+def suggest_autoscaling(
+    component_type: ComponentType | None,
+    usage: Optional[ResourceUsage] = None,
+    connections: Optional[List[int]] = None,
+    saturated: bool = False,
+) -> Optional[AutoscalingAdvice]:
+    """Size an HPA for stateless components from the burstiest observed signal.
+
+    CPU is what the HPA scales on; connection counts only widen the replica range
+    when traffic was burstier than CPU during the window. A saturated accept queue
+    means one host was already not enough, so the floor is raised.
+    """
+
+    if component_type not in STATELESS_TYPES:
+        return None
+    signals = [usage.cpu_millicores if usage else [], connections or []]
+    ratios = [r for r in map(peak_to_mean, signals) if r is not None]
+    if not ratios and not saturated:
+        return None
+    ratio = max(ratios, default=1.0)
+    min_replicas = SATURATED_MIN_REPLICAS if saturated else MIN_REPLICAS
+    max_replicas = min(MAX_REPLICAS, max(min_replicas + 1, math.ceil(min_replicas * ratio)))
+    target = round(100 / ratio)
+    return AutoscalingAdvice(
+        min_replicas=min_replicas,
+        max_replicas=max_replicas,
+        target_cpu_utilization=min(MAX_TARGET_UTILIZATION, max(MIN_TARGET_UTILIZATION, target)),
+        peak_to_mean=round(ratio, 2),
+    )
+
+
+def scaling_note(component_type: ComponentType | None) -> Optional[str]:
+    """Explain why a stateful component is kept at a single replica."""
+
+    if component_type not in STATEFUL_TYPES:
+        return None
+    return (
+        f"single replica: {component_type.value} keeps state on local storage; "
+        "scale it with the engine's own replication rather than an autoscaler"
+    )
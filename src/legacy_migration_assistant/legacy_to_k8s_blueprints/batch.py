@@ -0,0 +1,144 @@
+"""Batch conversion of many compose files and application maps in one run."""
+
+from __future__ import annotations
+
+import glob
+import json
+import re
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import yaml
+
+from legacy_migration_assistant.core.models import AppTopology
+from legacy_migration_assistant.legacy_to_k8s_blueprints.blueprint_models import BlueprintService
+from legacy_migration_assistant.legacy_to_k8s_blueprints.bundle import write_directory
+from legacy_migration_assistant.legacy_to_k8s_blueprints.compose_parser import (
+    parse_compose_dict,
+    topology_to_blueprint,
+)
+from legacy_migration_assistant.legacy_to_k8s_blueprints.k8s_generator import iter_manifests
+
+INPUT_SUFFIXES = (".yml", ".yaml", ".json")
+SUMMARY_FILE = "batch-summary.json"
+
+
+@dataclass
+class BatchResult:
+    """Outcome of converting a single input file."""
+
+    source: str
+    namespace: str
+    kind: Optional[str] = None
+    output_dir: Optional[str] = None
+    manifests: int = 0
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+
+def discover_inputs(patterns: List[str]) -> List[Path]:
+    """Expand directories (recursively) and glob patterns into input files."""
+
+    found: Dict[str, Path] = {}
+    for pattern in patterns:
+        path = Path(pattern)
+        if path.is_dir():
+            candidates = [p for p in path.rglob("*") if p.suffix in INPUT_SUFFIXES]
+        else:
+            candidates = [Path(p) for p in glob.glob(pattern, recursive=True)]
+        for candidate in candidates:
+            if candidate.is_file():
+                found.setdefault(str(candidate), candidate)
+    return [found[key] for key in sorted(found)]
+
+
+def namespace_for(path: Path, taken: Optional[set] = None) -> str:
+    """Derive a DNS-1123 namespace name from a file name, unique within ``taken``."""
+
+    base = re.sub(r"[^a-z0-9-]+", "-", path.stem.lower()).strip("-")[:55] or "app"
+    name = base
+    suffix = 2
+    while taken is not None and name in taken:
+        name = f"{base}-{suffix}"
+        suffix += 1
+    if taken is not None:
+        taken.add(name)
+    return name
+
+
+def load_blueprint(path: Path) -> Tuple[str, List[BlueprintService]]:
+    """Load a compose file or application map, detected by its top-level keys."""
+
+    content = path.read_text(encoding="utf-8")
+    data = json.loads(content) if path.suffix == ".json" else yaml.safe_load(content)
+    if not isinstance(data, dict):
+        raise ValueError("input is not a mapping")
+    if "components" in data:
+        return "map", topology_to_blueprint(AppTopology.from_dict(data))
+    if "services" in data:
+        return "compose", parse_compose_dict(data)
+    raise ValueError("neither a compose file (services) nor an application map (components)")
+
+
+def convert_one(
+    source: str, output_dir: str, namespace: str, ingress_host: Optional[str] = None
+) -> BatchResult:
+    """Convert one input; failures are captured in the result instead of raised."""
+
+    result = BatchResult(source=source, namespace=namespace)
+    started = time.perf_counter()
+    try:
+        result.kind, blueprint = load_blueprint(Path(source))
+        manifests = iter_manifests(blueprint, namespace=namespace, ingress_host=ingress_host)
+        result.manifests = write_directory(manifests, output_dir)
+        result.output_dir = output_dir
+    except Exception as exc:  # one bad input must not stop the batch
+        result.error = f"{type(exc).__name__}: {exc}"
+    result.seconds = round(time.perf_counter() - started, 4)
+    return result
+
+
+def run_batch(
+    inputs: List[Path],
+    output_root: str,
+    jobs: Optional[int] = None,
+    ingress_host: Optional[str] = None,
+) -> List[BatchResult]:
+    """Convert every input into ``output_root/<namespace>``, using a process pool.
+
+    ``jobs=1`` runs in-process, which is handy for debugging and tests.
+    """
+
+    root = Path(output_root)
+    taken: set = set()
+    plan = [(str(path), namespace_for(path, taken)) for path in inputs]
+    if jobs == 1:
+        return [convert_one(src, str(root / ns), ns, ingress_host) for src, ns in plan]
+
+    results: List[BatchResult] = []
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures: List[Tuple[str, str, Future]] = [
+            (src, ns, pool.submit(convert_one, src, str(root / ns), ns, ingress_host)) for src, ns in plan
+        ]
+        for src, ns, future in futures:
+            try:
+                results.append(future.result())
+            except Exception as exc:  # e.g. a worker killed by the OOM killer
+                results.append(BatchResult(source=src, namespace=ns, error=f"{type(exc).__name__}: {exc}"))
+    return results
+
+
+def summarize(results: List[BatchResult], wall_seconds: float) -> Dict[str, object]:
+    """Build the JSON-serializable batch summary."""
+
+    failed = [r for r in results if r.error]
+    return {
+        "inputs": len(results),
+        "succeeded": len(results) - len(failed),
+        "failed": len(failed),
+        "wall_seconds": round(wall_seconds, 3),
+        "results": [asdict(r) for r in results],
+    }
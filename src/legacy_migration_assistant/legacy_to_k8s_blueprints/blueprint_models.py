@@ -5,7 +5,19 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional
 
-from legacy_migration_assistant.core.models import ComponentType
+from legacy_migration_assistant.core.models import (
+    ComponentType,
+    CpuAffinity,
+    HugePageUsage,
+    IoUsage,
+    PortLoad,
+    ProcessLimits,
+    Relation,
+    ResourceUsage,
+    RuntimeSettings,
+    StartupTiming,
+    VolumeUsage,
+)
 
 
 @dataclass
@@ -20,6 +32,29 @@ class BlueprintService:
     volumes: List[str] = field(default_factory=list)
     depends_on: List[str] = field(default_factory=list)
     exposed: bool = True
+    usage: Optional[ResourceUsage] = None
+    resources: Optional["ResourceAdvice"] = None
+    startup: Optional[StartupTiming] = None
+    connections: List[int] = field(default_factory=list)
+    port_loads: List[PortLoad] = field(default_factory=list)
+    # Relations to other components heavy enough to ask for co-location.
+    coupled: List[Relation] = field(default_factory=list)
+    sysctls: Dict[str, str] = field(default_factory=dict)
+    limits: Optional[ProcessLimits] = None
+    configured_memory_kib: Optional[int] = None
+    runtimes: List[RuntimeSettings] = field(default_factory=list)
+    affinity: Optional[CpuAffinity] = None
+    hugepages: List[HugePageUsage] = field(default_factory=list)
+    transparent_hugepages: Optional[str] = None
+    storage: List[VolumeUsage] = field(default_factory=list)
+    log_storage: Optional[VolumeUsage] = None
+    io: Optional[IoUsage] = None
+    io_pressure: List[float] = field(default_factory=list)
+    # Filled by the startup advisor: 0-based start wave and dependency -> port to wait on.
+    start_wave: Optional[int] = None
+    wait_for: Dict[str, int] = field(default_factory=dict)
+    # Free-form notes carried into the manifest's notes annotation.
+    notes: List[str] = field(default_factory=list)
 
 
 @dataclass
@@ -36,3 +71,28 @@ class ProbeAdvice:
     readiness: Dict[str, object]
     startup: Optional[Dict[str, object]] = None
 
+
+@dataclass
+class PlacementThresholds:
+    """When sampled traffic between two components is worth a co-location preference."""
+
+    min_mean_connections: float = 4.0
+    min_peak_connections: int = 16
+
+
+@dataclass
+class AutoscalingAdvice:
+    min_replicas: int
+    max_replicas: int
+    target_cpu_utilization: int
+    peak_to_mean: float
+
+
+@dataclass
+class Finding:
+    """Something about a workload that manifests alone cannot express."""
+
+    workload: str
+    category: str
+    message: str
+    kubelet: List[str] = field(default_factory=list)
@@ -0,0 +1,66 @@
+"""Streaming writers for rendered Kubernetes manifests."""
+
+from __future__ import annotations
+
+import io
+import sys
+import tarfile
+from pathlib import Path
+from typing import Iterable, TextIO, Tuple
+
+Manifests = Iterable[Tuple[str, str]]
+
+TARBALL_SUFFIXES = (".tar.gz", ".tgz")
+
+
+def write_directory(manifests: Manifests, output_dir: str) -> int:
+    """Write each manifest to its own file inside ``output_dir``."""
+
+    out = Path(output_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    count = 0
+    for name, content in manifests:
+        (out / name).write_text(content, encoding="utf-8")
+        count += 1
+    return count
+
+
+def _write_stream(manifests: Manifests, handle: TextIO) -> int:
+    count = 0
+    for name, content in manifests:
+        handle.write(f"---\n# Source: {name}\n")
+        handle.write(content if content.endswith("\n") else content + "\n")
+        count += 1
+    return count
+
+
+def write_multi_document(manifests: Manifests, path: str) -> int:
+    """Write manifests as one multi-document YAML stream (``-`` for stdout)."""
+
+    if path == "-":
+        return _write_stream(manifests, sys.stdout)
+    with open(path, "w", encoding="utf-8") as handle:
+        return _write_stream(manifests, handle)
+
+
+def write_tarball(manifests: Manifests, path: str) -> int:
+    """Write manifests as members of a gzip-compressed tar archive."""
+
+    count = 0
+    with tarfile.open(path, "w:gz") as archive:
+        for name, content in manifests:
+            data = content.encode("utf-8")
+            info = tarfile.TarInfo(name=name)
+            info.size = len(data)
+            info.mode = 0o644
+            archive.addfile(info, io.BytesIO(data))
+            count += 1
+    return count
+
+
+def write_bundle(manifests: Manifests, path: str) -> int:
+    """Write a single bundle, choosing tar.gz or multi-document YAML by suffix."""
+
+    if path.endswith(TARBALL_SUFFIXES):
+        return write_tarball(manifests, path)
+    return write_multi_document(manifests, path)
@@ -4,78 +4,157 @@ from __future__ import annotations
 
 import argparse
 import json
+import sys
+import time
 from pathlib import Path
-from typing import Any, Dict, List
-
-import yaml
-
-from legacy_migration_assistant.core.models import (
-    AppComponent,
-    AppTopology,
-    ComponentType,
-    Relation,
+from typing import List
+
+from legacy_migration_assistant.core.graph import DependencyCycleError
+from legacy_migration_assistant.core.models import AppTopology
+from legacy_migration_assistant.core.watch import IncrementalYAMLLoader, load_yaml, watch_file
+from legacy_migration_assistant.legacy_to_k8s_blueprints import batch
+from legacy_migration_assistant.legacy_to_k8s_blueprints.blueprint_models import (
+    BlueprintService,
+    PlacementThresholds,
 )
+from legacy_migration_assistant.legacy_to_k8s_blueprints.bundle import write_bundle, write_directory
 from legacy_migration_assistant.legacy_to_k8s_blueprints.compose_parser import (
     parse_compose_file,
+    parse_map_file,
     topology_to_blueprint,
 )
-from legacy_migration_assistant.legacy_to_k8s_blueprints.k8s_generator import generate_manifests
+from legacy_migration_assistant.legacy_to_k8s_blueprints.k8s_generator import (
+    IncrementalManifestRenderer,
+    iter_manifests,
+)
+from legacy_migration_assistant.legacy_to_k8s_blueprints.report import (
+    collect_findings,
+    write_report,
+)
 
 
-def _ensure_output_dir(path: str) -> Path:
-    out = Path(path)
-    out.mkdir(parents=True, exist_ok=True)
-    return out
+def _write_manifests(args: argparse.Namespace, manifests) -> None:
+    if args.bundle:
+        count = write_bundle(manifests, args.bundle)
+        if args.bundle != "-":
+            print(f"{count} K8s manifests bundled into {args.bundle}")
+        return
+    write_directory(manifests, args.output_dir)
+    print(f"K8s manifests written to {args.output_dir}")
 
 
-def _topology_from_dict(data: Dict[str, Any]) -> AppTopology:
-    components = [
-        AppComponent(
-            name=item["name"],
-            component_type=ComponentType(item["component_type"]),
-            ports=item.get("ports", []),
-            volumes=item.get("volumes", []),
-            environment=item.get("environment", {}),
-            depends_on=item.get("depends_on", []),
-            notes=item.get("notes", []),
-        )
-        for item in data.get("components", [])
-    ]
-    relations = [
-        Relation(source=item["source"], target=item["target"], description=item.get("description"))
-        for item in data.get("relations", [])
-    ]
-    topology = AppTopology(
-        components=components,
-        relations=relations,
-        packages=data.get("packages", []),
-        services=data.get("services", []),
-        ports=data.get("ports", []),
-        cron=data.get("cron", []),
-        configs=data.get("configs", []),
-    )
-    return topology
+def _write_report(args: argparse.Namespace, blueprint: List[BlueprintService]) -> None:
+    if not args.report:
+        return
+    findings = collect_findings(blueprint)
+    write_report(findings, args.report)
+    for finding in findings:
+        print(f"[{finding.category}] {finding.workload}: {finding.message}", file=sys.stderr)
+    print(f"{len(findings)} finding(s) written to {args.report}", file=sys.stderr)
 
 
 def command_from_compose(args: argparse.Namespace) -> None:
-    blueprint = parse_compose_file(args.compose)
-    manifests = generate_manifests(blueprint, namespace=args.namespace, ingress_host=args.ingress_host)
-    out = _ensure_output_dir(args.output_dir)
-    for name, content in manifests.items():
-        (out / name).write_text(content, encoding="utf-8")
-    print(f"K8s manifests written to {out}")
+    try:
+        blueprint = parse_compose_file(args.compose)
+    except DependencyCycleError as exc:
+        raise SystemExit(f"Cannot order service startup: {exc}") from exc
+    _write_report(args, blueprint)
+    manifests = iter_manifests(blueprint, namespace=args.namespace, ingress_host=args.ingress_host)
+    _write_manifests(args, manifests)
+
+
+def _placement(args: argparse.Namespace) -> PlacementThresholds:
+    return PlacementThresholds(
+        min_mean_connections=args.colocate_min_mean, min_peak_connections=args.colocate_min_peak
+    )
+
+
+def _watch_map(args: argparse.Namespace) -> None:
+    loader = IncrementalYAMLLoader()
+    renderer = IncrementalManifestRenderer()
+    out = Path(args.output_dir) if args.output_dir else None
+
+    def regenerate() -> None:
+        started = time.perf_counter()
+        content = Path(args.map).read_text(encoding="utf-8")
+        data = loader.load(content) if args.map.endswith((".yml", ".yaml")) else load_yaml(content)
+        blueprint = topology_to_blueprint(AppTopology.from_dict(data or {}), _placement(args))
+        if args.report:
+            write_report(collect_findings(blueprint), args.report)
+        manifests = renderer.render(blueprint, namespace=args.namespace, ingress_host=args.ingress_host)
+        if out is None:
+            write_bundle(manifests, args.bundle)
+        else:
+            changed = set(renderer.changed)
+            write_directory(((name, doc) for name, doc in manifests if name in changed), str(out))
+            for name in renderer.removed:
+                (out / name).unlink(missing_ok=True)
+        elapsed = (time.perf_counter() - started) * 1000
+        print(
+            f"[watch] {len(renderer.changed)} manifest(s) updated, {len(renderer.removed)} removed "
+            f"in {elapsed:.1f} ms",
+            file=sys.stderr,
+        )
+
+    print(f"Watching {args.map} for changes (Ctrl+C to stop)", file=sys.stderr)
+    watch_file(
+        args.map,
+        regenerate,
+        interval=args.watch_interval,
+        on_error=lambda exc: print(f"[watch] skipped invalid map: {exc}", file=sys.stderr),
+    )
 
 
 def command_from_map(args: argparse.Namespace) -> None:
-    raw_content = Path(args.map).read_text(encoding="utf-8")
-    data = yaml.safe_load(raw_content) if args.map.endswith((".yml", ".yaml")) else json.loads(raw_content)
-    topology = _topology_from_dict(data or {})
-    blueprint = topology_to_blueprint(topology)
-    manifests = generate_manifests(blueprint, namespace=args.namespace, ingress_host=args.ingress_host)
-    out = _ensure_output_dir(args.output_dir)
-    for name, content in manifests.items():
-        (out / name).write_text(content, encoding="utf-8")
-    print(f"K8s manifests written to {out}")
+    if args.watch:
+        _watch_map(args)
+        return
+    topology = parse_map_file(args.map)
+    try:
+        blueprint = topology_to_blueprint(topology, _placement(args))
+    except DependencyCycleError as exc:
+        raise SystemExit(f"Cannot order service startup: {exc}") from exc
+    _write_report(args, blueprint)
+    manifests = iter_manifests(blueprint, namespace=args.namespace, ingress_host=args.ingress_host)
+    _write_manifests(args, manifests)
+
+
+def command_batch(args: argparse.Namespace) -> None:
+    inputs = batch.discover_inputs(args.inputs)
+    if not inputs:
+        raise SystemExit("No compose files or application maps found")
+    started = time.perf_counter()
+    results = batch.run_batch(inputs, args.output_root, jobs=args.jobs, ingress_host=args.ingress_host)
+    summary = batch.summarize(results, time.perf_counter() - started)
+
+    root = Path(args.output_root)
+    root.mkdir(parents=True, exist_ok=True)
+    (root / batch.SUMMARY_FILE).write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    for result in results:
+        status = f"ERROR {result.error}" if result.error else f"{result.manifests} manifests"
+        print(f"{result.source} -> {result.namespace} [{result.seconds:.3f}s] {status}")
+    print(
+        f"{summary['succeeded']}/{summary['inputs']} inputs converted in {summary['wall_seconds']}s; "
+        f"summary saved to {root / batch.SUMMARY_FILE}"
+    )
+    if summary["failed"]:
+        raise SystemExit(1)
+
+
+def _add_output_arguments(cmd: argparse.ArgumentParser) -> None:
+    target = cmd.add_mutually_exclusive_group(required=True)
+    target.add_argument("--output-dir", help="Directory for manifests")
+    target.add_argument(
+        "--bundle",
+        help="Single multi-document YAML file (or .tar.gz/.tgz archive); '-' for stdout",
+    )
+    cmd.add_argument("--namespace", default="default")
+    cmd.add_argument("--ingress-host", default=None)
+    cmd.add_argument(
+        "--report",
+        default=None,
+        help="Write a JSON report of findings that need node or cluster changes (e.g. kubelet policies)",
+    )
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -84,18 +163,38 @@ def build_parser() -> argparse.ArgumentParser:
 
     compose_cmd = sub.add_parser("from-compose", help="Generate from docker-compose")
     compose_cmd.add_argument("--compose", required=True, help="Path to docker-compose.yml")
-    compose_cmd.add_argument("--output-dir", required=True, help="Directory for manifests")
-    compose_cmd.add_argument("--namespace", default="default")
-    compose_cmd.add_argument("--ingress-host", default=None)
+    _add_output_arguments(compose_cmd)
     compose_cmd.set_defaults(func=command_from_compose)
 
     map_cmd = sub.add_parser("from-map", help="Generate from application map")
     map_cmd.add_argument("--map", required=True, help="Path to app-map.yaml")
-    map_cmd.add_argument("--output-dir", required=True, help="Directory for manifests")
-    map_cmd.add_argument("--namespace", default="default")
-    map_cmd.add_argument("--ingress-host", default=None)
+    _add_output_arguments(map_cmd)
+    map_cmd.add_argument("--watch", action="store_true", help="Regenerate whenever the map changes")
+    map_cmd.add_argument(
+        "--watch-interval", type=float, default=0.25, help="Polling interval when inotify is unavailable"
+    )
+    defaults = PlacementThresholds()
+    map_cmd.add_argument(
+        "--colocate-min-mean",
+        type=float,
+        default=defaults.min_mean_connections,
+        help="Mean sampled connections between two components that earns a podAffinity preference",
+    )
+    map_cmd.add_argument(
+        "--colocate-min-peak",
+        type=int,
+        default=defaults.min_peak_connections,
+        help="Peak sampled connections that earns a podAffinity preference",
+    )
     map_cmd.set_defaults(func=command_from_map)
 
+    batch_cmd = sub.add_parser("batch", help="Convert many compose files and maps, one namespace each")
+    batch_cmd.add_argument("inputs", nargs="+", help="Directories or glob patterns of inputs")
+    batch_cmd.add_argument("--output-root", required=True, help="Directory receiving one folder per input")
+    batch_cmd.add_argument("--jobs", type=int, default=None, help="Worker processes (default: CPU count)")
+    batch_cmd.add_argument("--ingress-host", default=None)
+    batch_cmd.set_defaults(func=command_batch)
+
     return parser
 
 
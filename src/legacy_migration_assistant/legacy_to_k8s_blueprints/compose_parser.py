@@ -2,12 +2,40 @@
 
 from __future__ import annotations
 
-from typing import Dict, List
+import json
+from pathlib import Path
+from typing import Dict, List, Optional
 
 import yaml
 
-from legacy_migration_assistant.core.models import AppTopology
-from legacy_migration_assistant.legacy_to_k8s_blueprints.blueprint_models import BlueprintService
+from legacy_migration_assistant.core.graph import dropped_edge_note, startup_graph
+from legacy_migration_assistant.core.metrics import (
+    by_service,
+    component_affinity,
+    component_config_memory,
+    component_connections,
+    component_hugepages,
+    component_io,
+    component_limits,
+    component_port_loads,
+    component_runtimes,
+    component_startup,
+    component_storage,
+    component_usage,
+    host_log_storage,
+    usage_by_service,
+)
+from legacy_migration_assistant.core.models import AppTopology, CpuAffinity
+from legacy_migration_assistant.core.utils import parse_cpu_list
+from legacy_migration_assistant.legacy_to_k8s_blueprints.blueprint_models import (
+    BlueprintService,
+    PlacementThresholds,
+)
+from legacy_migration_assistant.legacy_to_k8s_blueprints.placement_advisor import coupled_relations
+from legacy_migration_assistant.legacy_to_k8s_blueprints.resources_advisor import (
+    from_compose_resources,
+)
+from legacy_migration_assistant.legacy_to_k8s_blueprints.startup_advisor import order_services
 
 
 def _extract_ports(port_entries: List[object]) -> List[int]:
@@ -39,6 +67,9 @@ def parse_compose_dict(data: Dict[str, object]) -> List[BlueprintService]:
         environment = {str(k): str(v) for k, v in env_raw.items()} if isinstance(env_raw, dict) else {}
         volumes = [str(v) for v in raw.get("volumes", []) or []]
         depends_on = list(raw.get("depends_on", []) or [])
+        deploy = raw.get("deploy") or {}
+        resources = deploy.get("resources") if isinstance(deploy, dict) else None
+        cpuset = parse_cpu_list(str(raw.get("cpuset") or ""))
         services.append(
             BlueprintService(
                 name=name,
@@ -47,8 +78,11 @@ def parse_compose_dict(data: Dict[str, object]) -> List[BlueprintService]:
                 volumes=volumes,
                 depends_on=depends_on,
                 image=raw.get("image"),
+                resources=from_compose_resources(resources) if isinstance(resources, dict) else None,
+                affinity=CpuAffinity(service=name, cpus=cpuset) if cpuset else None,
             )
         )
+    order_services(services)
     return services
 
 
@@ -57,9 +91,29 @@ def parse_compose_file(path: str) -> List[BlueprintService]:
     return parse_compose_dict(content or {})
 
 
-def topology_to_blueprint(topology: AppTopology) -> List[BlueprintService]:
+def parse_map_file(path: str) -> AppTopology:
+    """Load an application map written by ``legacy-scan map`` (YAML or JSON)."""
+
+    content = Path(path).read_text(encoding="utf-8")
+    data = yaml.safe_load(content) if path.endswith((".yml", ".yaml")) else json.loads(content)
+    return AppTopology.from_dict(data or {})
+
+
+def topology_to_blueprint(
+    topology: AppTopology, placement: Optional[PlacementThresholds] = None
+) -> List[BlueprintService]:
     services: List[BlueprintService] = []
-    name_to_component: Dict[str, object] = {c.name: c for c in topology.components}
+    usage_index = usage_by_service(topology)
+    startup_index = by_service(topology.metrics.startup)
+    connection_index = {load.port: load for load in topology.metrics.connections}
+    limits_index = by_service(topology.metrics.limits)
+    config_index = {cfg.path: cfg for cfg in topology.configs}
+    runtime_index = by_service(topology.metrics.runtimes)
+    affinity_index = by_service(topology.metrics.affinity)
+    hugepages_index = by_service(topology.metrics.hugepages)
+    storage_index = {usage.path: usage for usage in topology.metrics.volumes}
+    io_index = by_service(topology.metrics.io)
+    log_storage = host_log_storage(topology)
     for comp in topology.components:
         depends = list(comp.depends_on)
         services.append(
@@ -70,15 +124,31 @@ def topology_to_blueprint(topology: AppTopology) -> List[BlueprintService]:
                 environment=comp.environment,
                 volumes=comp.volumes,
                 depends_on=depends,
+                usage=component_usage(topology, comp, usage_index),
+                startup=component_startup(topology, comp, startup_index),
+                connections=component_connections(topology, comp, connection_index),
+                port_loads=component_port_loads(topology, comp, connection_index),
+                coupled=coupled_relations(topology.relations, comp.name, placement),
+                sysctls=topology.metrics.sysctls,
+                limits=component_limits(topology, comp, limits_index),
+                configured_memory_kib=component_config_memory(topology, comp, config_index),
+                runtimes=component_runtimes(topology, comp, runtime_index),
+                affinity=component_affinity(topology, comp, affinity_index),
+                hugepages=component_hugepages(topology, comp, hugepages_index),
+                transparent_hugepages=topology.metrics.transparent_hugepages,
+                storage=component_storage(topology, comp, storage_index),
+                log_storage=log_storage,
+                io=component_io(topology, comp, io_index),
+                io_pressure=topology.metrics.io_pressure,
             )
         )
-    # Infer relations dependencies if missing
-    for rel in topology.relations:
-        source_component = name_to_component.get(rel.source)
-        if not source_component:
-            continue
-        match = next((svc for svc in services if svc.name == rel.source), None)
-        if match and rel.target not in match.depends_on:
-            match.depends_on.append(rel.target)
+    # Relations add dependencies; observed ones that would close a cycle only get a note.
+    graph, dropped = startup_graph(topology)
+    by_name = {svc.name: svc for svc in services}
+    for svc in services:
+        svc.depends_on += [dep for dep in graph[svc.name] if dep not in svc.depends_on]
+    for source, target in dropped:
+        by_name[source].notes.append(dropped_edge_note(target))
+    order_services(services)
     return services
 
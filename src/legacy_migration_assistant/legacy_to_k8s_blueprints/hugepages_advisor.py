@@ -0,0 +1,94 @@
+"""Hugepage resources, HugePages volumes and node notes for components that map huge pages."""
+
+from __future__ import annotations
+
+import math
+from typing import Dict, List, Optional, Tuple
+
+from legacy_migration_assistant.core.models import HugePageUsage
+from legacy_migration_assistant.legacy_to_k8s_blueprints.blueprint_models import (
+    BlueprintService,
+    Finding,
+)
+
+HUGEPAGES_MOUNT = "/dev/hugepages"
+# Used when the page size of a hugetlb mapping could not be attributed to a pool.
+DEFAULT_PAGE_SIZE_KIB = 2048
+
+
+def format_page_size(size_kib: int) -> str:
+    """2048 -> ``"2Mi"``, 1048576 -> ``"1Gi"``."""
+
+    if size_kib % (1024 * 1024) == 0:
+        return f"{size_kib // (1024 * 1024)}Gi"
+    if size_kib % 1024 == 0:
+        return f"{size_kib // 1024}Mi"
+    return f"{size_kib}Ki"
+
+
+def hugepage_requests(usages: List[HugePageUsage]) -> Dict[str, str]:
+    """Sum hugetlb mappings per page size, rounded up to whole pages.
+
+    Kubernetes requires hugepage requests to equal limits, so the same map serves both.
+    """
+
+    totals: Dict[int, int] = {}
+    for usage in usages:
+        if usage.hugetlb_kib:
+            size = usage.page_size_kib or DEFAULT_PAGE_SIZE_KIB
+            totals[size] = totals.get(size, 0) + usage.hugetlb_kib
+    requests: Dict[str, str] = {}
+    for size, kib in sorted(totals.items()):
+        pages = math.ceil(kib / size)
+        requests[f"hugepages-{format_page_size(size)}"] = format_page_size(pages * size)
+    return requests
+
+
+def hugepage_volumes(requests: Dict[str, str]) -> Tuple[List[Dict[str, object]], List[Dict[str, str]]]:
+    """Return (volumes, volumeMounts) backing the requested hugepage sizes.
+
+    A single size uses the generic ``HugePages`` medium; several sizes need one
+    ``HugePages-<size>`` volume each.
+    """
+
+    sizes = [name[len("hugepages-") :] for name in requests]
+    if len(sizes) == 1:
+        return (
+            [{"name": "hugepages", "emptyDir": {"medium": "HugePages"}}],
+            [{"name": "hugepages", "mountPath": HUGEPAGES_MOUNT}],
+        )
+    volumes: List[Dict[str, object]] = []
+    mounts: List[Dict[str, str]] = []
+    for size in sizes:
+        name = f"hugepages-{size.lower()}"
+        volumes.append({"name": name, "emptyDir": {"medium": f"HugePages-{size}"}})
+        mounts.append({"name": name, "mountPath": f"{HUGEPAGES_MOUNT}-{size}"})
+    return volumes, mounts
+
+
+def transparent_hugepage_note(usages: List[HugePageUsage], mode: Optional[str]) -> Optional[str]:
+    anon_kib = sum(usage.anon_huge_kib for usage in usages)
+    if not anon_kib:
+        return None
+    host = f" (host mode: {mode})" if mode else ""
+    return (
+        f"{anon_kib // 1024} MiB were backed by transparent huge pages{host}; "
+        "keep transparent_hugepage enabled on the target nodes"
+    )
+
+
+def hugepage_findings(service: BlueprintService) -> List[Finding]:
+    requests = hugepage_requests(service.hugepages)
+    if not requests:
+        return []
+    sizes = ", ".join(f"{amount} of {name}" for name, amount in requests.items())
+    return [
+        Finding(
+            workload=service.name,
+            category="hugepages",
+            message=(
+                f"requests {sizes}; nodes must preallocate them (vm.nr_hugepages or the "
+                "hugepagesz=/hugepages= kernel parameters) before the pod can schedule"
+            ),
+        )
+    ]
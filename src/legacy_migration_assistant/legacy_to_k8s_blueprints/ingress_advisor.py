@@ -0,0 +1,47 @@
+"""Ingress timeout annotations derived from sampled per-port load."""
+
+from __future__ import annotations
+
+from typing import Dict, List
+
+from legacy_migration_assistant.core.metrics import is_saturated
+from legacy_migration_assistant.core.models import PortLoad
+from legacy_migration_assistant.legacy_to_k8s_blueprints.blueprint_models import BlueprintService
+
+# ingress-nginx annotations; other controllers ignore them.
+READ_TIMEOUT_ANNOTATION = "nginx.ingress.kubernetes.io/proxy-read-timeout"
+SEND_TIMEOUT_ANNOTATION = "nginx.ingress.kubernetes.io/proxy-send-timeout"
+CONNECT_TIMEOUT_ANNOTATION = "nginx.ingress.kubernetes.io/proxy-connect-timeout"
+
+# Many connections moving little data each are websockets or long polling.
+LONG_LIVED_MIN_CONNECTIONS = 50
+LONG_LIVED_MAX_BYTES_PER_CONNECTION = 512
+LONG_LIVED_TIMEOUT_SECONDS = 3600
+# A backend that queued connections on the host needs longer than the 5 s default to accept.
+SATURATED_CONNECT_TIMEOUT_SECONDS = 15
+
+
+def has_long_lived_connections(load: PortLoad) -> bool:
+    """True when the port held many connections that were mostly idle."""
+
+    if not load.established or not (load.bytes_in or load.bytes_out):
+        return False
+    mean_connections = sum(load.established) / len(load.established)
+    if mean_connections < LONG_LIVED_MIN_CONNECTIONS:
+        return False
+    samples = max(len(load.bytes_in), len(load.bytes_out))
+    mean_bytes = (sum(load.bytes_in) + sum(load.bytes_out)) / samples
+    return mean_bytes / mean_connections < LONG_LIVED_MAX_BYTES_PER_CONNECTION
+
+
+def ingress_annotations(services: List[BlueprintService]) -> Dict[str, str]:
+    """Timeouts for the shared Ingress, taking the most demanding backend."""
+
+    annotations: Dict[str, str] = {}
+    loads = [load for svc in services if svc.ports for load in svc.port_loads]
+    if any(has_long_lived_connections(load) for load in loads):
+        annotations[READ_TIMEOUT_ANNOTATION] = str(LONG_LIVED_TIMEOUT_SECONDS)
+        annotations[SEND_TIMEOUT_ANNOTATION] = str(LONG_LIVED_TIMEOUT_SECONDS)
+    if any(is_saturated(load) for load in loads):
+        annotations[CONNECT_TIMEOUT_ANNOTATION] = str(SATURATED_CONNECT_TIMEOUT_SECONDS)
+    return annotations
@@ -0,0 +1,118 @@
+"""Flag disk-bound components and steer them to fast storage."""
+
+from __future__ import annotations
+
+from typing import Dict, List, Optional
+
+from legacy_migration_assistant.core.models import IoUsage
+from legacy_migration_assistant.core.utils import percentile
+from legacy_migration_assistant.legacy_to_k8s_blueprints.blueprint_models import (
+    BlueprintService,
+    Finding,
+)
+
+IO_PERCENTILE = 90
+# p90 over the window at or above either threshold marks a component as I/O heavy.
+# Operations are block-layer requests and only count when they came from cgroup stats.
+IO_HEAVY_BYTES_PER_S = 20 * 1024 * 1024
+IO_HEAVY_OPS_PER_S = 500
+# Host I/O pressure (share of time some task stalled on I/O) worth mentioning.
+IO_PRESSURE_NOTE_PERCENT = 10.0
+# Nodes with local SSDs are expected to carry this label; it is not a Kubernetes standard.
+LOCAL_SSD_NODE_LABEL = "legacy-migration/local-ssd"
+LOCAL_SSD_AFFINITY_WEIGHT = 50
+
+
+def _p90(series: List[int]) -> float:
+    return percentile(series, IO_PERCENTILE) if series else 0.0
+
+
+def _total(first: List[int], second: List[int]) -> List[int]:
+    return [a + b for a, b in zip(first, second, strict=False)] or first or second
+
+
+def io_rates(usage: Optional[IoUsage]) -> Dict[str, float]:
+    """p90 bytes/s and operations/s, read and write combined and write alone.
+
+    Operations are 0 unless measured from the unit cgroup; older scans stored
+    syscall counts there, which say nothing about the disk.
+    """
+
+    if usage is None:
+        return {"bytes": 0.0, "ops": 0.0, "write_bytes": 0.0}
+    return {
+        "bytes": _p90(_total(usage.read_bytes, usage.write_bytes)),
+        "ops": _p90(_total(usage.read_ops, usage.write_ops)) if usage.cgroup else 0.0,
+        "write_bytes": _p90(usage.write_bytes),
+    }
+
+
+def is_io_heavy(usage: Optional[IoUsage]) -> bool:
+    rates = io_rates(usage)
+    return rates["bytes"] >= IO_HEAVY_BYTES_PER_S or rates["ops"] >= IO_HEAVY_OPS_PER_S
+
+
+def is_heavy_writer(usage: Optional[IoUsage]) -> bool:
+    return is_io_heavy(usage) and io_rates(usage)["write_bytes"] * 2 >= io_rates(usage)["bytes"]
+
+
+def local_ssd_affinity() -> Dict[str, object]:
+    """Prefer, but do not require, nodes labelled as having local SSDs."""
+
+    return {
+        "nodeAffinity": {
+            "preferredDuringSchedulingIgnoredDuringExecution": [
+                {
+                    "weight": LOCAL_SSD_AFFINITY_WEIGHT,
+                    "preference": {
+                        "matchExpressions": [{"key": LOCAL_SSD_NODE_LABEL, "operator": "In", "values": ["true"]}]
+                    },
+                }
+            ]
+        }
+    }
+
+
+def shared_log_volumes(service: BlueprintService) -> List[str]:
+    """Data directories on the same filesystem as the host's log directory."""
+
+    logs = service.log_storage
+    if logs is None or logs.mount_point is None:
+        return []
+    return [usage.path for usage in service.storage if usage.mount_point == logs.mount_point]
+
+
+def io_notes(service: BlueprintService) -> List[str]:
+    if not is_io_heavy(service.io):
+        return []
+    rates = io_rates(service.io)
+    ops = f" and {rates['ops']:.0f} ops/s" if service.io.cgroup else ""
+    notes = [
+        f"I/O heavy: p90 {rates['bytes'] / (1024 * 1024):.1f} MiB/s{ops}; "
+        f"prefers nodes labelled {LOCAL_SSD_NODE_LABEL}=true"
+    ]
+    stalled = max(service.io_pressure, default=0.0)
+    if stalled >= IO_PRESSURE_NOTE_PERCENT:
+        notes.append(f"host tasks stalled on I/O up to {stalled:.0f}% of the time during the scan")
+    shared = shared_log_volumes(service)
+    if shared and is_heavy_writer(service.io):
+        notes.append(
+            f"heavy writes to {', '.join(shared)} competed with logs on {service.log_storage.mount_point}; "
+            "log to stdout or a separate volume"
+        )
+    return notes
+
+
+def io_findings(service: BlueprintService) -> List[Finding]:
+    if not is_io_heavy(service.io):
+        return []
+    return [
+        Finding(
+            workload=service.name,
+            category="io",
+            message=(
+                f"disk-bound on the host; use an SSD-backed storage class and label local-SSD nodes "
+                f"with {LOCAL_SSD_NODE_LABEL}=true"
+            ),
+        )
+    ]
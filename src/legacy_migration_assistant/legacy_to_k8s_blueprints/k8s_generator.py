@@ -2,45 +2,110 @@
 
 from __future__ import annotations
 
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 
 import yaml
 
+from legacy_migration_assistant.core.metrics import is_saturated
 from legacy_migration_assistant.legacy_to_k8s_blueprints import security_policies
-from legacy_migration_assistant.legacy_to_k8s_blueprints.blueprint_models import BlueprintService
+from legacy_migration_assistant.legacy_to_k8s_blueprints.autoscaling_advisor import (
+    scaling_note,
+    suggest_autoscaling,
+)
+from legacy_migration_assistant.legacy_to_k8s_blueprints.blueprint_models import (
+    AutoscalingAdvice,
+    BlueprintService,
+)
+from legacy_migration_assistant.legacy_to_k8s_blueprints.hugepages_advisor import (
+    hugepage_requests,
+    hugepage_volumes,
+    transparent_hugepage_note,
+)
+from legacy_migration_assistant.legacy_to_k8s_blueprints.ingress_advisor import ingress_annotations
+from legacy_migration_assistant.legacy_to_k8s_blueprints.io_advisor import (
+    io_notes,
+    is_io_heavy,
+    local_ssd_affinity,
+)
+from legacy_migration_assistant.legacy_to_k8s_blueprints.kernel_advisor import (
+    pod_sysctls,
+    pod_ulimit_notes,
+)
+from legacy_migration_assistant.legacy_to_k8s_blueprints.pinning_advisor import guaranteed_resources
+from legacy_migration_assistant.legacy_to_k8s_blueprints.placement_advisor import pod_placement
 from legacy_migration_assistant.legacy_to_k8s_blueprints.probes_advisor import suggest_probes
 from legacy_migration_assistant.legacy_to_k8s_blueprints.resources_advisor import suggest_resources
+from legacy_migration_assistant.legacy_to_k8s_blueprints.runtime_advisor import (
+    combined_cpu_millicores,
+    combined_env_hints,
+    combined_memory_kib,
+)
+from legacy_migration_assistant.legacy_to_k8s_blueprints.startup_advisor import (
+    START_WAVE_ANNOTATION,
+    wait_init_containers,
+)
+from legacy_migration_assistant.legacy_to_k8s_blueprints.storage_advisor import (
+    storage_notes,
+    uses_statefulset,
+    volume_claim_template,
+)
 
 
 def _container_name(service: BlueprintService) -> str:
     return service.name.replace("_", "-")
 
 
+NOTES_ANNOTATION = "legacy-migration/notes"
+
+
+def _autoscaling(service: BlueprintService) -> Optional[AutoscalingAdvice]:
+    saturated = any(is_saturated(load) for load in service.port_loads)
+    return suggest_autoscaling(service.component_type, service.usage, service.connections, saturated)
+
+
 def build_deployment(service: BlueprintService, namespace: str = "default") -> Dict[str, object]:
-    resources = suggest_resources(service.component_type)
-    probes = suggest_probes(service.component_type, service.ports)
+    autoscaling = _autoscaling(service)
+    runtime_memory = combined_memory_kib(service.runtimes)
+    configured_memory = (service.configured_memory_kib or 0) + (runtime_memory or 0)
+    resources = service.resources or suggest_resources(
+        service.component_type,
+        service.usage,
+        configured_memory or None,
+        combined_cpu_millicores(service.runtimes),
+    )
+    if service.affinity is not None:
+        resources = guaranteed_resources(resources, service.affinity)
+    environment = {**service.environment, **combined_env_hints(service.runtimes, service.environment)}
+    probes = suggest_probes(service.component_type, service.ports, service.startup)
+    hugepages = hugepage_requests(service.hugepages)
     container = {
         "name": _container_name(service),
         "image": service.image or "TODO: provide image",
         "ports": [{"containerPort": p} for p in service.ports] if service.ports else [],
-        "env": [{"name": k, "value": v} for k, v in service.environment.items()],
+        "env": [{"name": k, "value": v} for k, v in environment.items()],
         "resources": {
-            "requests": {"cpu": resources.cpu_request, "memory": resources.memory_request},
-            "limits": {"cpu": resources.cpu_limit, "memory": resources.memory_limit},
+            "requests": {"cpu": resources.cpu_request, "memory": resources.memory_request, **hugepages},
+            "limits": {"cpu": resources.cpu_limit, "memory": resources.memory_limit, **hugepages},
         },
         "livenessProbe": probes.liveness,
         "readinessProbe": probes.readiness,
     }
     if probes.startup:
         container["startupProbe"] = probes.startup
-    if service.volumes:
-        container["volumeMounts"] = [{"name": f"data-{idx}", "mountPath": path} for idx, path in enumerate(service.volumes)]
+    volumes = [{"name": f"data-{idx}", "emptyDir": {}} for idx, _ in enumerate(service.volumes)]
+    mounts = [{"name": f"data-{idx}", "mountPath": path} for idx, path in enumerate(service.volumes)]
+    if hugepages:
+        hugepage_vols, hugepage_mounts = hugepage_volumes(hugepages)
+        volumes += hugepage_vols
+        mounts += hugepage_mounts
+    if mounts:
+        container["volumeMounts"] = mounts
     template = {
         "apiVersion": "apps/v1",
         "kind": "Deployment",
         "metadata": {"name": service.name, "namespace": namespace, "labels": {"app": service.name}},
         "spec": {
-            "replicas": 1,
+            "replicas": autoscaling.min_replicas if autoscaling else 1,
             "selector": {"matchLabels": {"app": service.name}},
             "template": {
                 "metadata": {"labels": {"app": service.name}},
@@ -52,13 +117,97 @@ def build_deployment(service: BlueprintService, namespace: str = "default") -> D
             },
         },
     }
-    if service.volumes:
-        template["spec"]["template"]["spec"]["volumes"] = [
-            {"name": f"data-{idx}", "emptyDir": {}} for idx, _ in enumerate(service.volumes)
-        ]
+    init_containers = wait_init_containers(service)
+    if init_containers:
+        template["spec"]["template"]["spec"]["initContainers"] = init_containers
+    sysctls, notes = pod_sysctls(service.sysctls)
+    if sysctls:
+        template["spec"]["template"]["spec"]["securityContext"]["sysctls"] = sysctls
+    notes += service.notes
+    notes += pod_ulimit_notes(service.limits)
+    notes += io_notes(service)
+    affinity, spread, placement_notes = pod_placement(service, autoscaling)
+    if is_io_heavy(service.io):
+        affinity.update(local_ssd_affinity())
+    if affinity:
+        template["spec"]["template"]["spec"]["affinity"] = affinity
+    if spread:
+        template["spec"]["template"]["spec"]["topologySpreadConstraints"] = spread
+    notes += placement_notes
+    thp_note = transparent_hugepage_note(service.hugepages, service.transparent_hugepages)
+    if thp_note:
+        notes.append(thp_note)
+    note = scaling_note(service.component_type)
+    if note:
+        notes.insert(0, note)
+    if notes:
+        template["metadata"]["annotations"] = {NOTES_ANNOTATION: "\n".join(notes)}
+    if service.start_wave is not None:
+        template["metadata"].setdefault("annotations", {})[START_WAVE_ANNOTATION] = str(service.start_wave)
+    if volumes:
+        template["spec"]["template"]["spec"]["volumes"] = volumes
     return template
 
 
+def build_statefulset(service: BlueprintService, namespace: str = "default") -> Dict[str, object]:
+    """Like :func:`build_deployment`, but data volumes become per-replica claims."""
+
+    manifest = build_deployment(service, namespace)
+    manifest["kind"] = "StatefulSet"
+    pod = manifest["spec"]["template"]["spec"]
+    claims = {f"data-{idx}" for idx, _ in enumerate(service.volumes)}
+    volumes = [volume for volume in pod.pop("volumes", []) if volume["name"] not in claims]
+    if volumes:
+        pod["volumes"] = volumes
+    measured = {usage.path: usage for usage in service.storage}
+    io_heavy = is_io_heavy(service.io)
+    manifest["spec"] = {
+        "serviceName": headless_service_name(service.name),
+        **manifest["spec"],
+        "volumeClaimTemplates": [
+            volume_claim_template(f"data-{idx}", service.component_type, measured.get(path), io_heavy)
+            for idx, path in enumerate(service.volumes)
+        ],
+    }
+    notes = storage_notes(service.storage)
+    if notes:
+        annotations = manifest["metadata"].setdefault("annotations", {})
+        annotations[NOTES_ANNOTATION] = "\n".join(filter(None, [annotations.get(NOTES_ANNOTATION), *notes]))
+    return manifest
+
+
+def build_hpa(service: BlueprintService, namespace: str = "default") -> Optional[Dict[str, object]]:
+    """Return an autoscaling/v2 HPA on CPU utilization, or None when none is advised."""
+
+    advice = _autoscaling(service)
+    if advice is None:
+        return None
+    return {
+        "apiVersion": "autoscaling/v2",
+        "kind": "HorizontalPodAutoscaler",
+        "metadata": {
+            "name": service.name,
+            "namespace": namespace,
+            "labels": {"app": service.name},
+            "annotations": {NOTES_ANNOTATION: f"observed peak-to-mean load ratio {advice.peak_to_mean}"},
+        },
+        "spec": {
+            "scaleTargetRef": {"apiVersion": "apps/v1", "kind": "Deployment", "name": service.name},
+            "minReplicas": advice.min_replicas,
+            "maxReplicas": advice.max_replicas,
+            "metrics": [
+                {
+                    "type": "Resource",
+                    "resource": {
+                        "name": "cpu",
+                        "target": {"type": "Utilization", "averageUtilization": advice.target_cpu_utilization},
+                    },
+                }
+            ],
+        },
+    }
+
+
 def build_service(service: BlueprintService, namespace: str = "default") -> Dict[str, object]:
     ports = [{"port": p, "targetPort": p, "protocol": "TCP"} for p in service.ports] or [{"port": 80, "targetPort": 80}]
     return {
@@ -73,6 +222,23 @@ def build_service(service: BlueprintService, namespace: str = "default") -> Dict
     }
 
 
+def headless_service_name(name: str) -> str:
+    return f"{name}-headless"
+
+
+def build_headless_service(service: BlueprintService, namespace: str = "default") -> Dict[str, object]:
+    """Return the headless Service a StatefulSet names as ``serviceName``.
+
+    It gives each replica a stable DNS name; clients keep using the ClusterIP Service.
+    """
+
+    manifest = build_service(service, namespace)
+    manifest["metadata"]["name"] = headless_service_name(service.name)
+    manifest["spec"] = {"clusterIP": "None", **manifest["spec"]}
+    del manifest["spec"]["type"]
+    return manifest
+
+
 def build_ingress(services: List[BlueprintService], host: str, namespace: str = "default") -> Dict[str, object]:
     rules = []
     for svc in services:
@@ -85,31 +251,104 @@ def build_ingress(services: List[BlueprintService], host: str, namespace: str =
                 "backend": {"service": {"name": svc.name, "port": {"number": svc.ports[0]}}},
             }
         )
+    metadata: Dict[str, object] = {"name": "legacy-migration", "namespace": namespace}
+    annotations = ingress_annotations(services)
+    if annotations:
+        metadata["annotations"] = annotations
     return {
         "apiVersion": "networking.k8s.io/v1",
         "kind": "Ingress",
-        "metadata": {"name": "legacy-migration", "namespace": namespace},
+        "metadata": metadata,
         "spec": {"rules": [{"host": host, "http": {"paths": rules}}]},
     }
 
 
-def generate_manifests(
+def _render(manifest: Dict[str, object]) -> str:
+    return yaml.safe_dump(manifest, sort_keys=False)
+
+
+def iter_manifests(
     services: List[BlueprintService],
     namespace: str = "default",
     ingress_host: Optional[str] = None,
-) -> Dict[str, str]:
-    rendered: Dict[str, str] = {}
+) -> Iterator[Tuple[str, str]]:
+    """Lazily render manifests as ``(file name, YAML document)`` pairs.
+
+    Only one service's manifests are alive at a time, so callers that write the
+    documents out as they arrive keep memory flat regardless of blueprint size.
+    """
+
     for svc in services:
-        deployment = build_deployment(svc, namespace)
-        service = build_service(svc, namespace)
-        sa = security_policies.service_account_manifest(svc.name, namespace)
-        netpol = security_policies.network_policy_allow_namespace(svc.name, namespace, svc.ports)
-        rendered[f"deployment-{svc.name}.yaml"] = yaml.safe_dump(deployment, sort_keys=False)
-        rendered[f"service-{svc.name}.yaml"] = yaml.safe_dump(service, sort_keys=False)
-        rendered[f"sa-{svc.name}.yaml"] = yaml.safe_dump(sa, sort_keys=False)
-        rendered[f"netpol-{svc.name}.yaml"] = yaml.safe_dump(netpol, sort_keys=False)
+        yield from _service_manifests(svc, namespace)
     if ingress_host:
-        ingress = build_ingress(services, ingress_host, namespace)
-        rendered["ingress.yaml"] = yaml.safe_dump(ingress, sort_keys=False)
-    return rendered
+        yield "ingress.yaml", _render(build_ingress(services, ingress_host, namespace))
+
+
+def _service_manifests(svc: BlueprintService, namespace: str) -> Iterator[Tuple[str, str]]:
+    if uses_statefulset(svc):
+        yield f"statefulset-{svc.name}.yaml", _render(build_statefulset(svc, namespace))
+        yield f"service-{svc.name}-headless.yaml", _render(build_headless_service(svc, namespace))
+    else:
+        yield f"deployment-{svc.name}.yaml", _render(build_deployment(svc, namespace))
+    yield f"service-{svc.name}.yaml", _render(build_service(svc, namespace))
+    hpa = build_hpa(svc, namespace)
+    if hpa:
+        yield f"hpa-{svc.name}.yaml", _render(hpa)
+    yield f"sa-{svc.name}.yaml", _render(security_policies.service_account_manifest(svc.name, namespace))
+    netpol = security_policies.network_policy_allow_namespace(svc.name, namespace, svc.ports)
+    yield f"netpol-{svc.name}.yaml", _render(netpol)
+
+
+def generate_manifests(
+    services: List[BlueprintService],
+    namespace: str = "default",
+    ingress_host: Optional[str] = None,
+) -> Dict[str, str]:
+    return dict(iter_manifests(services, namespace=namespace, ingress_host=ingress_host))
+
+
+class IncrementalManifestRenderer:
+    """Re-render only the services whose blueprint changed since the previous call.
+
+    After :meth:`render`, ``changed`` lists the files whose content is new and
+    ``removed`` the files that belonged to services no longer present.
+    """
+
+    def __init__(self) -> None:
+        self._cache: Dict[str, Tuple[str, List[Tuple[str, str]]]] = {}
+        self._ingress: Optional[Tuple[str, str]] = None
+        self.changed: List[str] = []
+        self.removed: List[str] = []
+
+    def render(
+        self,
+        services: List[BlueprintService],
+        namespace: str = "default",
+        ingress_host: Optional[str] = None,
+    ) -> List[Tuple[str, str]]:
+        self.changed = []
+        cache: Dict[str, Tuple[str, List[Tuple[str, str]]]] = {}
+        manifests: List[Tuple[str, str]] = []
+        for svc in services:
+            fingerprint = f"{namespace}|{svc!r}"
+            cached = self._cache.get(svc.name)
+            if cached is None or cached[0] != fingerprint:
+                cached = (fingerprint, list(_service_manifests(svc, namespace)))
+                self.changed.extend(name for name, _ in cached[1])
+            cache[svc.name] = cached
+            manifests.extend(cached[1])
+
+        ingress = ("ingress.yaml", _render(build_ingress(services, ingress_host, namespace))) if ingress_host else None
+        if ingress:
+            manifests.append(ingress)
+            if ingress != self._ingress:
+                self.changed.append(ingress[0])
 
+        current = {name for name, _ in manifests}
+        previous = {name for _, docs in self._cache.values() for name, _ in docs}
+        if self._ingress:
+            previous.add(self._ingress[0])
+        self.removed = sorted(previous - current)
+        self._cache = cache
+        self._ingress = ingress
+        return manifests
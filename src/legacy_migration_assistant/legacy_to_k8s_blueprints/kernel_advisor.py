@@ -0,0 +1,223 @@
+"""Carry host sysctls and process limits over to pods and compose services."""
+
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Tuple
+
+from legacy_migration_assistant.core.models import ProcessLimits
+
+# Upstream defaults of tunables that are not limits; any other value was tuned on purpose.
+SYSCTL_DEFAULTS = {
+    "net.ipv4.tcp_fin_timeout": "60",
+    "net.ipv4.tcp_keepalive_time": "7200",
+    "net.ipv4.tcp_keepalive_intvl": "75",
+    "net.ipv4.tcp_keepalive_probes": "9",
+    "vm.swappiness": "60",
+    "vm.overcommit_memory": "0",
+    "vm.dirty_ratio": "20",
+    "vm.dirty_background_ratio": "10",
+}
+# Modern defaults of limits (fixed, or the ceiling of what the kernel or systemd scale
+# with the machine). Only values above them are carried: old distributions ship lower
+# ones (CentOS 7's somaxconn=128) that would throttle the workload on a current node.
+SYSCTL_LIMITS = {
+    "net.core.somaxconn": "4096",
+    "net.core.netdev_max_backlog": "1000",
+    "net.core.rmem_max": "212992",
+    "net.core.wmem_max": "212992",
+    "net.ipv4.tcp_max_syn_backlog": "4096",
+    "fs.nr_open": "1048576",
+    "fs.file-max": "1048576",
+    "fs.inotify.max_user_watches": "1048576",
+    "kernel.pid_max": "4194304",
+    "vm.max_map_count": "65530",
+    "kernel.shmmax": "18446744073692774399",
+    "kernel.shmall": "18446744073692774399",
+    "kernel.shmmni": "4096",
+    "kernel.sem": "32000 1024000000 500 32000",
+    "kernel.msgmax": "8192",
+    "kernel.msgmnb": "16384",
+}
+# A wider range raises the limit: a lower first port or a higher last one.
+PORT_RANGE_SYSCTL = "net.ipv4.ip_local_port_range"
+PORT_RANGE_DEFAULT = (32768, 60999)
+# Switches carried only when set to a value that enables more than the default does;
+# tcp_tw_reuse=0 or tcp_syncookies=0 would turn a modern default off.
+SYSCTL_ENABLING_VALUES = {
+    "net.ipv4.tcp_tw_reuse": frozenset({"1"}),
+    "net.ipv4.tcp_syncookies": frozenset({"2"}),
+}
+
+# Sysctls Kubernetes allows in any pod without kubelet configuration.
+K8S_SAFE_SYSCTLS = frozenset(
+    {
+        "kernel.shm_rmid_forced",
+        "net.ipv4.ip_local_port_range",
+        "net.ipv4.ip_local_reserved_ports",
+        "net.ipv4.ip_unprivileged_port_start",
+        "net.ipv4.ping_group_range",
+        "net.ipv4.tcp_syncookies",
+        "net.ipv4.tcp_keepalive_time",
+        "net.ipv4.tcp_keepalive_intvl",
+        "net.ipv4.tcp_keepalive_probes",
+        "net.ipv4.tcp_fin_timeout",
+    }
+)
+NAMESPACED_PREFIXES = ("net.", "kernel.shm", "kernel.msg", "kernel.sem", "fs.mqueue.")
+# net.core buffers and backlogs are global even though they live under net.
+NODE_LEVEL_SYSCTLS = frozenset(
+    {
+        "net.core.rmem_max",
+        "net.core.wmem_max",
+        "net.core.rmem_default",
+        "net.core.wmem_default",
+        "net.core.netdev_max_backlog",
+    }
+)
+
+# systemd's DefaultLimit* values; nproc is omitted because its default scales with RAM.
+ULIMIT_DEFAULTS: Dict[str, Tuple[Optional[int], Optional[int]]] = {
+    "nofile": (1024, 524288),
+    "memlock": (8388608, 8388608),
+    "core": (0, None),
+}
+
+
+def classify_sysctl(key: str) -> str:
+    """Return ``"safe"``, ``"namespaced"`` (needs an unsafe-sysctl allowlist) or ``"node"``."""
+
+    if key in K8S_SAFE_SYSCTLS:
+        return "safe"
+    if key not in NODE_LEVEL_SYSCTLS and key.startswith(NAMESPACED_PREFIXES):
+        return "namespaced"
+    return "node"
+
+
+def _fields(value: str) -> Optional[List[int]]:
+    try:
+        return [int(field) for field in value.split()]
+    except ValueError:
+        return None
+
+
+def raises_limit(key: str, value: str) -> bool:
+    """True when ``value`` lifts the limit ``key`` above its modern default in some field
+    without lowering it in any other."""
+
+    if key == PORT_RANGE_SYSCTL:
+        fields = _fields(value)
+        if fields is None or len(fields) != 2:
+            return False
+        (low, high), (default_low, default_high) = fields, PORT_RANGE_DEFAULT
+        return low <= default_low and high >= default_high and (low, high) != PORT_RANGE_DEFAULT
+    fields, defaults = _fields(value), _fields(SYSCTL_LIMITS[key])
+    if fields is None or defaults is None or len(fields) != len(defaults):
+        return False
+    pairs = list(zip(fields, defaults, strict=True))
+    return all(field >= default for field, default in pairs) and any(field > default for field, default in pairs)
+
+
+def tuned_sysctls(sysctls: Dict[str, str]) -> Dict[str, str]:
+    """Keep tunables that differ from the kernel's defaults and limits that were raised.
+
+    Limits set below the modern default are dropped rather than carried over.
+    """
+
+    tuned: Dict[str, str] = {}
+    for key, value in sorted(sysctls.items()):
+        if key in SYSCTL_LIMITS or key == PORT_RANGE_SYSCTL:
+            if raises_limit(key, value):
+                tuned[key] = value
+        elif key in SYSCTL_ENABLING_VALUES:
+            if value in SYSCTL_ENABLING_VALUES[key]:
+                tuned[key] = value
+        elif key in SYSCTL_DEFAULTS:
+            if value != SYSCTL_DEFAULTS[key]:
+                tuned[key] = value
+        else:
+            tuned[key] = value
+    return tuned
+
+
+def _node_note(keys: Dict[str, str]) -> str:
+    settings = ", ".join(f"{key}={value}" for key, value in keys.items())
+    return f"node-level sysctls cannot be set per workload; tune the nodes instead: {settings}"
+
+
+def pod_sysctls(sysctls: Dict[str, str]) -> Tuple[List[Dict[str, str]], List[str]]:
+    """Split tuned sysctls into pod securityContext entries and notes for the rest."""
+
+    tuned = tuned_sysctls(sysctls)
+    entries = [{"name": k, "value": v} for k, v in tuned.items() if classify_sysctl(k) == "safe"]
+    notes: List[str] = []
+    unsafe = {k: v for k, v in tuned.items() if classify_sysctl(k) == "namespaced"}
+    if unsafe:
+        settings = ", ".join(f"{key}={value}" for key, value in unsafe.items())
+        notes.append(f"unsafe sysctls need kubelet --allowed-unsafe-sysctls before adding them: {settings}")
+    node = {k: v for k, v in tuned.items() if classify_sysctl(k) == "node"}
+    if node:
+        notes.append(_node_note(node))
+    return entries, notes
+
+
+def compose_sysctls(sysctls: Dict[str, str]) -> Tuple[Dict[str, str], List[str]]:
+    """Docker accepts every namespaced sysctl; node-level ones become notes."""
+
+    tuned = tuned_sysctls(sysctls)
+    entries = {k: v for k, v in tuned.items() if classify_sysctl(k) != "node"}
+    node = {k: v for k, v in tuned.items() if classify_sysctl(k) == "node"}
+    return entries, [_node_note(node)] if node else []
+
+
+def _raised(value: Optional[int], default: Optional[int]) -> bool:
+    # None stands for unlimited.
+    return default is not None and (value is None or value > default)
+
+
+def _higher(value: Optional[int], default: Optional[int]) -> Optional[int]:
+    return None if value is None or default is None else max(value, default)
+
+
+def tuned_ulimits(limits: Optional[ProcessLimits]) -> Dict[str, Tuple[Optional[int], Optional[int]]]:
+    """Return (soft, hard) for limits raised above systemd's defaults.
+
+    A value below the default is never carried: the default takes its place, so a
+    raised soft nofile with the old hard cap of 4096 keeps the modern hard limit.
+    """
+
+    if limits is None:
+        return {}
+    tuned: Dict[str, Tuple[Optional[int], Optional[int]]] = {}
+    for name, (default_soft, default_hard) in ULIMIT_DEFAULTS.items():
+        if name not in limits.soft:
+            continue
+        soft, hard = limits.soft[name], limits.hard.get(name)
+        if _raised(soft, default_soft) or _raised(hard, default_hard):
+            tuned[name] = (_higher(soft, default_soft), _higher(hard, default_hard))
+    return tuned
+
+
+def compose_ulimits(limits: Optional[ProcessLimits]) -> Dict[str, Dict[str, int]]:
+    """Render tuned limits as compose ``ulimits`` (-1 stands for unlimited)."""
+
+    def _value(raw: Optional[int]) -> int:
+        return -1 if raw is None else raw
+
+    return {name: {"soft": _value(soft), "hard": _value(hard)} for name, (soft, hard) in tuned_ulimits(limits).items()}
+
+
+def pod_ulimit_notes(limits: Optional[ProcessLimits]) -> List[str]:
+    """Kubernetes cannot express ulimits, so tuned ones are surfaced as notes."""
+
+    tuned = tuned_ulimits(limits)
+    if not tuned:
+        return []
+
+    def _value(raw: Optional[int]) -> str:
+        return "unlimited" if raw is None else str(raw)
+
+    settings = ", ".join(f"{name}={_value(soft)}:{_value(hard)}" for name, (soft, hard) in tuned.items())
+    return [
+        f"host ran with tuned limits ({settings}); "
+        "Kubernetes has no per-pod ulimits, check the container runtime defaults"
+    ]
@@ -0,0 +1,64 @@
+"""Guaranteed QoS and kubelet policy advice for CPU-pinned and NUMA-bound workloads."""
+
+from __future__ import annotations
+
+import math
+from typing import List
+
+from legacy_migration_assistant.core.models import CpuAffinity
+from legacy_migration_assistant.core.utils import format_cpu_list
+from legacy_migration_assistant.legacy_to_k8s_blueprints.blueprint_models import (
+    BlueprintService,
+    Finding,
+    ResourceAdvice,
+)
+from legacy_migration_assistant.legacy_to_k8s_blueprints.resources_advisor import parse_cpu
+
+CPU_MANAGER_STATIC = "--cpu-manager-policy=static"
+MEMORY_MANAGER_STATIC = "--memory-manager-policy=Static"
+TOPOLOGY_SINGLE_NODE = "--topology-manager-policy=single-numa-node"
+TOPOLOGY_BEST_EFFORT = "--topology-manager-policy=best-effort"
+
+
+def guaranteed_resources(advice: ResourceAdvice, affinity: CpuAffinity) -> ResourceAdvice:
+    """Integer CPUs with requests equal to limits, so the static CPU manager grants exclusive cores."""
+
+    cores = max(len(affinity.cpus), math.ceil(parse_cpu(advice.cpu_request) / 1000), 1)
+    return ResourceAdvice(
+        cpu_request=str(cores),
+        memory_request=advice.memory_limit,
+        cpu_limit=str(cores),
+        memory_limit=advice.memory_limit,
+    )
+
+
+def kubelet_policies(affinity: CpuAffinity) -> List[str]:
+    policies = [CPU_MANAGER_STATIC]
+    policies.append(TOPOLOGY_SINGLE_NODE if len(affinity.nodes) == 1 else TOPOLOGY_BEST_EFFORT)
+    if affinity.mems:
+        policies.append(MEMORY_MANAGER_STATIC)
+    return policies
+
+
+def pinning_findings(service: BlueprintService) -> List[Finding]:
+    affinity = service.affinity
+    if affinity is None:
+        return []
+    parts = []
+    if affinity.cpus:
+        parts.append(f"CPUs {format_cpu_list(affinity.cpus)}")
+    if affinity.mems:
+        parts.append(f"memory nodes {format_cpu_list(affinity.mems)}")
+    if affinity.nodes:
+        parts.append(f"NUMA node(s) {format_cpu_list(affinity.nodes)}")
+    return [
+        Finding(
+            workload=service.name,
+            category="cpu-pinning",
+            message=(
+                f"pinned on the host to {', '.join(parts)}; generated as a Guaranteed pod with "
+                "integer CPUs, which only get exclusive cores on nodes using these kubelet policies"
+            ),
+            kubelet=kubelet_policies(affinity),
+        )
+    ]
@@ -0,0 +1,104 @@
+"""Pod affinity, anti-affinity and topology spread from relation traffic weights."""
+
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Tuple
+
+from legacy_migration_assistant.core.models import Relation
+from legacy_migration_assistant.legacy_to_k8s_blueprints.blueprint_models import (
+    AutoscalingAdvice,
+    BlueprintService,
+    Finding,
+    PlacementThresholds,
+)
+
+HOSTNAME_KEY = "kubernetes.io/hostname"
+ZONE_KEY = "topology.kubernetes.io/zone"
+MAX_AFFINITY_WEIGHT = 100
+SPREAD_MAX_SKEW = 1
+
+
+def is_coupled(relation: Relation, thresholds: PlacementThresholds) -> bool:
+    if relation.external:
+        return False
+    mean = relation.weight or 0.0
+    peak = relation.connections or 0
+    return mean >= thresholds.min_mean_connections or peak >= thresholds.min_peak_connections
+
+
+def coupled_relations(
+    relations: List[Relation], name: str, thresholds: Optional[PlacementThresholds] = None
+) -> List[Relation]:
+    """Relations of component ``name`` (either end) that pass ``thresholds``."""
+
+    thresholds = thresholds or PlacementThresholds()
+    return [
+        rel for rel in relations if name in (rel.source, rel.target) and is_coupled(rel, thresholds)
+    ]
+
+
+def _describe(relation: Relation) -> str:
+    return f"{relation.source}->{relation.target} (mean {relation.weight or 0:g}, peak {relation.connections or 0} connections)"
+
+
+def _peers(service: BlueprintService) -> List[Tuple[str, float, List[Relation]]]:
+    """Coupled peers with their summed traffic, heaviest first."""
+
+    peers: Dict[str, List[Relation]] = {}
+    for rel in service.coupled:
+        peer = rel.target if rel.source == service.name else rel.source
+        peers.setdefault(peer, []).append(rel)
+    ranked = [(peer, sum(r.weight or 0.0 for r in rels), rels) for peer, rels in peers.items()]
+    return sorted(ranked, key=lambda item: (-item[1], item[0]))
+
+
+def pod_placement(
+    service: BlueprintService, autoscaling: Optional[AutoscalingAdvice]
+) -> Tuple[Dict[str, object], List[Dict[str, object]], List[str]]:
+    """Return (affinity, topologySpreadConstraints, notes naming the edges behind each rule)."""
+
+    affinity: Dict[str, object] = {}
+    notes: List[str] = []
+    peers = _peers(service)
+    if peers:
+        heaviest = max(traffic for _, traffic, _ in peers) or 1.0
+        terms = []
+        for peer, traffic, rels in peers:
+            weight = max(1, round(MAX_AFFINITY_WEIGHT * traffic / heaviest))
+            terms.append(
+                {
+                    "weight": weight,
+                    "podAffinityTerm": {"labelSelector": {"matchLabels": {"app": peer}}, "topologyKey": HOSTNAME_KEY},
+                }
+            )
+            notes.append(f"podAffinity to {peer} (weight {weight}) from {', '.join(map(_describe, rels))}")
+        affinity["podAffinity"] = {"preferredDuringSchedulingIgnoredDuringExecution": terms}
+    spread: List[Dict[str, object]] = []
+    if autoscaling is not None and autoscaling.min_replicas > 1:
+        selector = {"matchLabels": {"app": service.name}}
+        affinity["podAntiAffinity"] = {
+            "preferredDuringSchedulingIgnoredDuringExecution": [
+                {"weight": MAX_AFFINITY_WEIGHT, "podAffinityTerm": {"labelSelector": selector, "topologyKey": HOSTNAME_KEY}}
+            ]
+        }
+        spread.append(
+            {
+                "maxSkew": SPREAD_MAX_SKEW,
+                "topologyKey": ZONE_KEY,
+                "whenUnsatisfiable": "ScheduleAnyway",
+                "labelSelector": selector,
+            }
+        )
+        notes.append(f"podAntiAffinity and zone spread across {autoscaling.min_replicas}+ replicas")
+    return affinity, spread, notes
+
+
+def placement_findings(service: BlueprintService) -> List[Finding]:
+    return [
+        Finding(
+            workload=service.name,
+            category="placement",
+            message=f"prefers nodes running {peer}: {', '.join(map(_describe, rels))}",
+        )
+        for peer, _, rels in _peers(service)
+    ]
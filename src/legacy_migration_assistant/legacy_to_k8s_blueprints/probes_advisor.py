@@ -2,11 +2,28 @@
 
 from __future__ import annotations
 
-from typing import Dict
+import math
+from typing import Dict, Optional
 
-from legacy_migration_assistant.core.models import ComponentType
+from legacy_migration_assistant.core.models import ComponentType, StartupTiming
 from legacy_migration_assistant.legacy_to_k8s_blueprints.blueprint_models import ProbeAdvice
 
+# A measured start gets a startupProbe whose failureThreshold x periodSeconds budget
+# covers the observed latency times the safety factor (never less than the minimum).
+STARTUP_PERIOD_SECONDS = 10
+STARTUP_SAFETY_FACTOR = 2.0
+MIN_STARTUP_BUDGET_SECONDS = 30
+# Services that were up this quickly get tighter liveness/readiness instead.
+FAST_START_SECONDS = 10.0
+
+# Engine-native readiness checks by well-known port; anything else gets a plain TCP or HTTP check.
+HEALTHCHECK_COMMANDS = {
+    3306: "mysqladmin ping -h 127.0.0.1 --silent",
+    5432: "pg_isready -h 127.0.0.1 -p 5432",
+    6379: "redis-cli -p 6379 ping",
+    5672: "rabbitmq-diagnostics -q ping",
+}
+
 
 def _http_probe(path: str, port: int) -> Dict[str, object]:
     return {"httpGet": {"path": path, "port": port}, "initialDelaySeconds": 10, "periodSeconds": 10}
@@ -16,8 +33,7 @@ def _tcp_probe(port: int) -> Dict[str, object]:
     return {"tcpSocket": {"port": port}, "initialDelaySeconds": 10, "periodSeconds": 10}
 
 
-def suggest_probes(component_type: ComponentType | None, ports: list[int]) -> ProbeAdvice:
-    port = ports[0] if ports else 80
+def _base_probes(component_type: ComponentType | None, port: int) -> ProbeAdvice:
     if component_type == ComponentType.WEB:
         return ProbeAdvice(liveness=_http_probe("/health", port), readiness=_http_probe("/", port), startup=None)
     if component_type == ComponentType.DATABASE:
@@ -28,3 +44,72 @@ def suggest_probes(component_type: ComponentType | None, ports: list[int]) -> Pr
         return ProbeAdvice(liveness=_tcp_probe(port), readiness=_tcp_probe(port), startup=None)
     return ProbeAdvice(liveness=_tcp_probe(port), readiness=_tcp_probe(port), startup=None)
 
+
+def _apply_startup_timing(probes: ProbeAdvice, startup: StartupTiming) -> ProbeAdvice:
+    seconds = startup.start_seconds
+    if seconds is None:
+        return probes
+    if seconds <= FAST_START_SECONDS:
+        if startup.restarts:
+            # A flapping unit should not be killed even faster after migration.
+            return probes
+        delay = math.ceil(seconds) + 1
+        probes.liveness.update({"initialDelaySeconds": delay, "periodSeconds": 5, "failureThreshold": 3})
+        probes.readiness.update({"initialDelaySeconds": delay, "periodSeconds": 5})
+        return probes
+
+    budget = max(MIN_STARTUP_BUDGET_SECONDS, seconds * STARTUP_SAFETY_FACTOR)
+    startup_probe = {k: v for k, v in probes.liveness.items() if k not in ("initialDelaySeconds", "periodSeconds")}
+    startup_probe.update(
+        {
+            "periodSeconds": STARTUP_PERIOD_SECONDS,
+            "failureThreshold": math.ceil(budget / STARTUP_PERIOD_SECONDS),
+        }
+    )
+    # Liveness and readiness only start once the startup probe has succeeded.
+    probes.liveness["initialDelaySeconds"] = 0
+    probes.readiness["initialDelaySeconds"] = 0
+    probes.startup = startup_probe
+    return probes
+
+
+def suggest_probes(
+    component_type: ComponentType | None, ports: list[int], startup: Optional[StartupTiming] = None
+) -> ProbeAdvice:
+    port = ports[0] if ports else 80
+    probes = _base_probes(component_type, port)
+    if startup is not None:
+        probes = _apply_startup_timing(probes, startup)
+    return probes
+
+
+def has_compose_healthcheck(ports: list[int]) -> bool:
+    """Return True when one of ``ports`` has a health command known to ship in its image."""
+
+    return any(port in HEALTHCHECK_COMMANDS for port in ports)
+
+
+def compose_healthcheck(
+    component_type: ComponentType | None, ports: list[int], startup: Optional[StartupTiming] = None
+) -> Optional[Dict[str, object]]:
+    """Return a compose ``healthcheck`` so dependents can wait for ``service_healthy``.
+
+    Only ports with a command from ``HEALTHCHECK_COMMANDS`` get one: a generic curl or
+    ``/dev/tcp`` probe needs tools that minimal and alpine images lack, and would leave
+    the service unhealthy forever. Everything else gets None. The start period follows
+    the same budget as the startupProbe.
+    """
+
+    port = next((p for p in ports if p in HEALTHCHECK_COMMANDS), None)
+    if port is None:
+        return None
+    start_period = MIN_STARTUP_BUDGET_SECONDS
+    if startup is not None and startup.start_seconds is not None:
+        start_period = max(start_period, math.ceil(startup.start_seconds * STARTUP_SAFETY_FACTOR))
+    return {
+        "test": ["CMD-SHELL", HEALTHCHECK_COMMANDS[port]],
+        "interval": f"{STARTUP_PERIOD_SECONDS}s",
+        "timeout": "5s",
+        "retries": 3,
+        "start_period": f"{start_period}s",
+    }
@@ -0,0 +1,39 @@
+"""Migration report: findings that need cluster-side action beyond applying manifests."""
+
+from __future__ import annotations
+
+import json
+from dataclasses import asdict
+from typing import Callable, Dict, List
+
+from legacy_migration_assistant.legacy_to_k8s_blueprints.blueprint_models import (
+    BlueprintService,
+    Finding,
+)
+from legacy_migration_assistant.legacy_to_k8s_blueprints.hugepages_advisor import hugepage_findings
+from legacy_migration_assistant.legacy_to_k8s_blueprints.io_advisor import io_findings
+from legacy_migration_assistant.legacy_to_k8s_blueprints.pinning_advisor import pinning_findings
+from legacy_migration_assistant.legacy_to_k8s_blueprints.placement_advisor import placement_findings
+
+Check = Callable[[BlueprintService], List[Finding]]
+
+CHECKS: List[Check] = [pinning_findings, hugepage_findings, io_findings, placement_findings]
+
+
+def collect_findings(services: List[BlueprintService]) -> List[Finding]:
+    return [finding for svc in services for check in CHECKS for finding in check(svc)]
+
+
+def build_report(findings: List[Finding]) -> Dict[str, object]:
+    """Group findings and list the kubelet flags the target nodes need overall."""
+
+    return {
+        "findings": [asdict(f) for f in findings],
+        "kubelet": sorted({flag for f in findings for flag in f.kubelet}),
+    }
+
+
+def write_report(findings: List[Finding], path: str) -> None:
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(build_report(findings), handle, indent=2)
+        handle.write("\n")
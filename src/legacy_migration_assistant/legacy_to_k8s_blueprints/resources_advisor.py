@@ -2,7 +2,11 @@
 
 from __future__ import annotations
 
-from legacy_migration_assistant.core.models import ComponentType
+import math
+from typing import Dict, Optional
+
+from legacy_migration_assistant.core.models import ComponentType, ResourceUsage
+from legacy_migration_assistant.core.utils import percentile
 from legacy_migration_assistant.legacy_to_k8s_blueprints.blueprint_models import ResourceAdvice
 
 DEFAULT = ResourceAdvice(
@@ -12,8 +16,20 @@ DEFAULT = ResourceAdvice(
     memory_limit="256Mi",
 )
 
+# Requests cover the p90 of observed usage, limits the observed peak, each with headroom.
+REQUEST_PERCENTILE = 90
+LIMIT_PERCENTILE = 99
+MEMORY_REQUEST_HEADROOM = 1.2
+MEMORY_LIMIT_HEADROOM = 1.5
+CPU_REQUEST_HEADROOM = 1.2
+CPU_LIMIT_HEADROOM = 2.0
+MIN_CPU_MILLICORES = 50
+MIN_MEMORY_MIB = 64
+# Limits leave this much room above what the configuration lets the service allocate.
+CONFIGURED_MEMORY_HEADROOM = 1.15
+
 
-def suggest_resources(component_type: ComponentType | None) -> ResourceAdvice:
+def _table(component_type: ComponentType | None) -> ResourceAdvice:
     if component_type == ComponentType.WEB:
         return ResourceAdvice("200m", "256Mi", "500m", "512Mi")
     if component_type == ComponentType.DATABASE:
@@ -26,3 +42,127 @@ def suggest_resources(component_type: ComponentType | None) -> ResourceAdvice:
         return ResourceAdvice("300m", "256Mi", "700m", "512Mi")
     return DEFAULT
 
+
+def format_cpu(millicores: float) -> str:
+    value = max(MIN_CPU_MILLICORES, math.ceil(millicores / 10.0) * 10)
+    return str(value // 1000) if value % 1000 == 0 else f"{value}m"
+
+
+def format_memory(kib: float) -> str:
+    mib = max(MIN_MEMORY_MIB, math.ceil(kib / 1024 / 16.0) * 16)
+    return f"{mib // 1024}Gi" if mib % 1024 == 0 else f"{mib}Mi"
+
+
+def parse_cpu(value: str) -> float:
+    """Convert a Kubernetes CPU quantity to millicores."""
+    return float(value[:-1]) if value.endswith("m") else float(value) * 1000
+
+
+def parse_memory(value: str) -> float:
+    """Convert a Kubernetes/compose memory quantity to KiB."""
+    units = {"Ki": 1, "Mi": 1024, "Gi": 1024**2, "Ti": 1024**3, "K": 1, "M": 1024, "G": 1024**2, "k": 1, "m": 1024, "g": 1024**2}
+    for suffix in sorted(units, key=len, reverse=True):
+        if value.endswith(suffix):
+            return float(value[: -len(suffix)]) * units[suffix]
+    return float(value) / 1024
+
+
+def advice_from_usage(usage: ResourceUsage, fallback: ResourceAdvice) -> ResourceAdvice:
+    """Derive requests and limits from sampled usage, keeping table values for gaps."""
+
+    advice = ResourceAdvice(fallback.cpu_request, fallback.memory_request, fallback.cpu_limit, fallback.memory_limit)
+    if usage.memory_kib:
+        observed_peak = max([*usage.memory_kib, usage.memory_peak_kib or 0])
+        request = percentile(usage.memory_kib, REQUEST_PERCENTILE) * MEMORY_REQUEST_HEADROOM
+        limit = max(observed_peak * MEMORY_LIMIT_HEADROOM, request)
+        advice.memory_request = format_memory(request)
+        advice.memory_limit = format_memory(limit)
+    if usage.cpu_millicores:
+        request = percentile(usage.cpu_millicores, REQUEST_PERCENTILE) * CPU_REQUEST_HEADROOM
+        limit = max(percentile(usage.cpu_millicores, LIMIT_PERCENTILE) * CPU_LIMIT_HEADROOM, request)
+        advice.cpu_request = format_cpu(request)
+        advice.cpu_limit = format_cpu(limit)
+    return advice
+
+
+def apply_configured_memory(advice: ResourceAdvice, configured_kib: int, measured: bool) -> ResourceAdvice:
+    """Raise the memory limit so the configured workload (buffer pools, workers) fits.
+
+    Without measurements the configured footprint is also the best request estimate.
+    """
+
+    limit_kib = max(parse_memory(advice.memory_limit), configured_kib * CONFIGURED_MEMORY_HEADROOM)
+    request_kib = parse_memory(advice.memory_request)
+    if not measured:
+        request_kib = max(request_kib, configured_kib)
+    return ResourceAdvice(
+        cpu_request=advice.cpu_request,
+        memory_request=format_memory(min(request_kib, limit_kib)),
+        cpu_limit=advice.cpu_limit,
+        memory_limit=format_memory(limit_kib),
+    )
+
+
+def apply_configured_cpu(advice: ResourceAdvice, millicores: int) -> ResourceAdvice:
+    """Request the CPU the configured worker/processor count expects; keep limits above it."""
+
+    request = max(parse_cpu(advice.cpu_request), millicores)
+    return ResourceAdvice(
+        cpu_request=format_cpu(request),
+        memory_request=advice.memory_request,
+        cpu_limit=format_cpu(max(parse_cpu(advice.cpu_limit), request)),
+        memory_limit=advice.memory_limit,
+    )
+
+
+def suggest_resources(
+    component_type: ComponentType | None,
+    usage: Optional[ResourceUsage] = None,
+    configured_memory_kib: Optional[int] = None,
+    configured_cpu_millicores: Optional[int] = None,
+) -> ResourceAdvice:
+    advice = _table(component_type)
+    if usage is not None:
+        advice = advice_from_usage(usage, advice)
+    if configured_memory_kib:
+        advice = apply_configured_memory(advice, configured_memory_kib, measured=bool(usage and usage.memory_kib))
+    if configured_cpu_millicores:
+        advice = apply_configured_cpu(advice, configured_cpu_millicores)
+    return advice
+
+
+def to_compose_resources(advice: ResourceAdvice) -> Dict[str, object]:
+    """Express advice as a compose ``deploy.resources`` block."""
+
+    def _cpus(value: str) -> str:
+        return f"{parse_cpu(value) / 1000:g}"
+
+    def _memory(value: str) -> str:
+        return f"{math.ceil(parse_memory(value) / 1024)}M"
+
+    return {
+        "limits": {"cpus": _cpus(advice.cpu_limit), "memory": _memory(advice.memory_limit)},
+        "reservations": {"cpus": _cpus(advice.cpu_request), "memory": _memory(advice.memory_request)},
+    }
+
+
+def from_compose_resources(resources: Dict[str, object]) -> Optional[ResourceAdvice]:
+    """Read a compose ``deploy.resources`` block back into advice, if complete."""
+
+    limits = resources.get("limits") or {}
+    reservations = resources.get("reservations") or {}
+    if not isinstance(limits, dict) or not isinstance(reservations, dict):
+        return None
+    try:
+        cpu_limit = float(limits["cpus"]) * 1000
+        memory_limit = parse_memory(str(limits["memory"]))
+        cpu_request = float(reservations.get("cpus", limits["cpus"])) * 1000
+        memory_request = parse_memory(str(reservations.get("memory", limits["memory"])))
+    except (KeyError, TypeError, ValueError):
+        return None
+    return ResourceAdvice(
+        cpu_request=format_cpu(cpu_request),
+        memory_request=format_memory(memory_request),
+        cpu_limit=format_cpu(cpu_limit),
+        memory_limit=format_memory(memory_limit),
+    )
@@ -0,0 +1,82 @@
+"""Container sizing and env hints from runtime settings found on process command lines."""
+
+from __future__ import annotations
+
+import math
+from typing import Dict, List, Optional
+
+from legacy_migration_assistant.core.models import RuntimeSettings
+
+# A JVM uses memory beyond -Xmx for GC structures and JIT (proportional) plus metaspace,
+# code cache and thread stacks (roughly fixed).
+JVM_HEAP_OVERHEAD_FACTOR = 1.25
+JVM_FIXED_OVERHEAD_KIB = 256 * 1024
+# V8's old space is most of a Node process; new space and native buffers come on top.
+NODE_FIXED_OVERHEAD_KIB = 128 * 1024
+# gunicorn's rule of thumb is 2 x cores + 1 workers, so invert it for a CPU request.
+MIN_WORKER_CPU_MILLICORES = 250
+
+
+def runtime_memory_kib(settings: RuntimeSettings) -> Optional[int]:
+    """Memory the runtime may grow to: heap plus the runtime's own overhead."""
+
+    if not settings.heap_kib:
+        return None
+    if settings.runtime == "jvm":
+        return int(settings.heap_kib * JVM_HEAP_OVERHEAD_FACTOR) + JVM_FIXED_OVERHEAD_KIB
+    if settings.runtime == "node":
+        return settings.heap_kib + NODE_FIXED_OVERHEAD_KIB
+    return settings.heap_kib
+
+
+def runtime_cpu_millicores(settings: RuntimeSettings) -> Optional[int]:
+    """CPU the configured concurrency expects to have."""
+
+    if settings.cpus:
+        return settings.cpus * 1000
+    if settings.workers:
+        return max(MIN_WORKER_CPU_MILLICORES, math.ceil((settings.workers - 1) / 2) * 1000)
+    return None
+
+
+def runtime_env_hints(settings: RuntimeSettings) -> Dict[str, str]:
+    """Environment variables that reapply the host's settings inside a container image."""
+
+    if not settings.options:
+        return {}
+    if settings.runtime == "jvm":
+        return {"JAVA_TOOL_OPTIONS": " ".join(settings.options)}
+    if settings.runtime == "node":
+        return {"NODE_OPTIONS": " ".join(settings.options)}
+    if settings.runtime == "gunicorn":
+        return {"GUNICORN_CMD_ARGS": " ".join(settings.options)}
+    if settings.runtime == "uwsgi":
+        hints = {"UWSGI_PROCESSES": str(settings.workers)} if settings.workers else {}
+        if settings.threads:
+            hints["UWSGI_THREADS"] = str(settings.threads)
+        return hints
+    return {}
+
+
+def _total(values: List[Optional[int]]) -> Optional[int]:
+    known = [v for v in values if v]
+    return sum(known) if known else None
+
+
+def combined_memory_kib(runtimes: List[RuntimeSettings]) -> Optional[int]:
+    return _total([runtime_memory_kib(r) for r in runtimes])
+
+
+def combined_cpu_millicores(runtimes: List[RuntimeSettings]) -> Optional[int]:
+    return _total([runtime_cpu_millicores(r) for r in runtimes])
+
+
+def combined_env_hints(runtimes: List[RuntimeSettings], environment: Dict[str, str]) -> Dict[str, str]:
+    """Hints for every runtime, never overriding variables the service already sets."""
+
+    hints: Dict[str, str] = {}
+    for settings in runtimes:
+        for key, value in runtime_env_hints(settings).items():
+            if key not in environment:
+                hints.setdefault(key, value)
+    return hints
@@ -0,0 +1,84 @@
+"""PersistentVolumeClaim sizing and storage class hints from measured data directories."""
+
+from __future__ import annotations
+
+import math
+from typing import Dict, List, Optional
+
+from legacy_migration_assistant.core.models import ComponentType, VolumeUsage
+from legacy_migration_assistant.legacy_to_k8s_blueprints.autoscaling_advisor import STATEFUL_TYPES
+from legacy_migration_assistant.legacy_to_k8s_blueprints.blueprint_models import BlueprintService
+
+STORAGE_HINT_ANNOTATION = "legacy-migration/storage-class-hint"
+
+# Claims leave room for growth until someone can resize them.
+GROWTH_HEADROOM = 1.5
+# An incomplete walk only gives a lower bound, so it gets extra room.
+INCOMPLETE_WALK_HEADROOM = 2.0
+MIN_VOLUME_GIB = 1
+DEFAULT_VOLUME_SIZE = "10Gi"
+
+SHARED_FSTYPES = frozenset({"nfs", "nfs4", "cifs", "smb3", "glusterfs", "fuse.glusterfs", "ceph", "cephfs", "lustre"})
+# Options that are defaults everywhere and say nothing about tuning.
+DEFAULT_MOUNT_OPTIONS = frozenset({"rw", "relatime", "seclabel"})
+
+
+def uses_statefulset(service: BlueprintService) -> bool:
+    return service.component_type in STATEFUL_TYPES and bool(service.volumes)
+
+
+def volume_size(usage: Optional[VolumeUsage]) -> str:
+    """Claim size from measured usage plus growth headroom, in whole GiB."""
+
+    if usage is None:
+        return DEFAULT_VOLUME_SIZE
+    headroom = GROWTH_HEADROOM if usage.complete else INCOMPLETE_WALK_HEADROOM
+    gib = math.ceil(usage.used_kib * headroom / (1024 * 1024))
+    return f"{max(MIN_VOLUME_GIB, gib)}Gi"
+
+
+def access_modes(usage: Optional[VolumeUsage]) -> List[str]:
+    if usage is not None and usage.fstype in SHARED_FSTYPES:
+        return ["ReadWriteMany"]
+    return ["ReadWriteOnce"]
+
+
+def storage_class_hint(
+    component_type: ComponentType | None, usage: Optional[VolumeUsage], io_heavy: bool = False
+) -> str:
+    """Describe the kind of storage class to pick; class names are cluster specific."""
+
+    if usage is not None and usage.fstype in SHARED_FSTYPES:
+        return f"shared filesystem ({usage.fstype}) on the host; pick a ReadWriteMany class"
+    if io_heavy:
+        kind = "I/O heavy: SSD or provisioned-IOPS block storage"
+    elif component_type == ComponentType.DATABASE:
+        kind = "low-latency block storage (SSD)"
+    else:
+        kind = "block storage"
+    if usage is None or usage.fstype is None:
+        return kind
+    tuned = [opt for opt in usage.mount_options if opt not in DEFAULT_MOUNT_OPTIONS]
+    options = f" mounted {','.join(tuned)}" if tuned else ""
+    return f"{kind}; host used {usage.fstype}{options}"
+
+
+def volume_claim_template(
+    name: str, component_type: ComponentType | None, usage: Optional[VolumeUsage], io_heavy: bool = False
+) -> Dict[str, object]:
+    hint = storage_class_hint(component_type, usage, io_heavy)
+    return {
+        "metadata": {"name": name, "annotations": {STORAGE_HINT_ANNOTATION: hint}},
+        "spec": {
+            "accessModes": access_modes(usage),
+            "resources": {"requests": {"storage": volume_size(usage)}},
+        },
+    }
+
+
+def storage_notes(storage: List[VolumeUsage]) -> List[str]:
+    return [
+        f"{usage.path}: walk stopped after the time cap at {usage.files} files; claim size is a rough estimate"
+        for usage in storage
+        if not usage.complete
+    ]
@@ -0,0 +1,44 @@
+from legacy_migration_assistant.core.models import ComponentType, ResourceUsage
+from legacy_migration_assistant.legacy_to_k8s_blueprints.autoscaling_advisor import (
+    suggest_autoscaling,
+)
+from legacy_migration_assistant.legacy_to_k8s_blueprints.blueprint_models import BlueprintService
+from legacy_migration_assistant.legacy_to_k8s_blueprints.k8s_generator import (
+    build_deployment,
+    generate_manifests,
+)
+
+
+def _usage(cpu):
+    return ResourceUsage(service="app", cgroup="v2", interval=1.0, cpu_millicores=cpu)
+
+
+def test_bursty_web_gets_wide_range_and_low_target():
+    advice = suggest_autoscaling(ComponentType.WEB, _usage([100, 100, 100, 500]))
+    assert advice.min_replicas == 2
+    assert advice.max_replicas == 5
+    assert advice.target_cpu_utilization == 50
+
+
+def test_connections_widen_range_beyond_cpu():
+    flat = _usage([200, 200, 200])
+    assert suggest_autoscaling(ComponentType.WEB, flat).max_replicas == 3
+    advice = suggest_autoscaling(ComponentType.WEB, flat, connections=[10, 10, 10, 90])
+    assert advice.max_replicas == 6
+
+
+def test_no_advice_without_samples_or_for_stateful():
+    assert suggest_autoscaling(ComponentType.WEB, _usage([100])) is None
+    assert suggest_autoscaling(ComponentType.DATABASE, _usage([100, 100, 900])) is None
+
+
+def test_hpa_manifest_and_stateful_note():
+    web = BlueprintService(name="web", component_type=ComponentType.WEB, ports=[80], usage=_usage([100, 300, 200]))
+    db = BlueprintService(name="db", component_type=ComponentType.DATABASE, ports=[5432])
+    manifests = generate_manifests([web, db])
+    assert "hpa-web.yaml" in manifests and "hpa-db.yaml" not in manifests
+    assert "averageUtilization: 67" in manifests["hpa-web.yaml"]
+    assert build_deployment(web)["spec"]["replicas"] == 2
+    deployment = build_deployment(db)
+    assert deployment["spec"]["replicas"] == 1
+    assert "single replica" in deployment["metadata"]["annotations"]["legacy-migration/notes"]
@@ -0,0 +1,45 @@
+import json
+
+import pytest
+import yaml
+
+from legacy_migration_assistant.legacy_to_k8s_blueprints import batch
+from legacy_migration_assistant.legacy_to_k8s_blueprints.cli import main
+
+
+def _write_inputs(root):
+    root.mkdir()
+    (root / "shop_compose.yaml").write_text(yaml.safe_dump({"services": {"web": {"image": "nginx", "ports": ["80:80"]}}}))
+    (root / "crm-map.yaml").write_text(
+        yaml.safe_dump({"components": [{"name": "db", "component_type": "database", "ports": [5432]}]})
+    )
+    (root / "broken.yaml").write_text("services: [unclosed")
+
+
+def test_run_batch_isolates_failures(tmp_path):
+    inputs_dir = tmp_path / "inputs"
+    _write_inputs(inputs_dir)
+    results = batch.run_batch(batch.discover_inputs([str(inputs_dir)]), str(tmp_path / "out"), jobs=1)
+    by_ns = {r.namespace: r for r in results}
+    assert set(by_ns) == {"broken", "crm-map", "shop-compose"}
+    assert by_ns["broken"].error
+    assert by_ns["crm-map"].kind == "map" and by_ns["shop-compose"].kind == "compose"
+    assert (tmp_path / "out" / "shop-compose" / "deployment-web.yaml").exists()
+
+
+def test_namespace_for_is_unique(tmp_path):
+    taken = set()
+    assert batch.namespace_for(tmp_path / "App_Map.yaml", taken) == "app-map"
+    assert batch.namespace_for(tmp_path / "app-map.json", taken) == "app-map-2"
+
+
+def test_batch_cli_writes_summary(tmp_path):
+    inputs_dir = tmp_path / "inputs"
+    _write_inputs(inputs_dir)
+    out = tmp_path / "out"
+    # broken.yaml fails, so the command exits non-zero after writing the summary.
+    with pytest.raises(SystemExit) as exc:
+        main(["batch", str(inputs_dir / "*.yaml"), "--output-root", str(out), "--jobs", "2"])
+    assert exc.value.code == 1
+    summary = json.loads((out / batch.SUMMARY_FILE).read_text())
+    assert summary["inputs"] == 3 and summary["failed"] == 1
@@ -0,0 +1,41 @@
+import tarfile
+import types
+
+import yaml
+
+from legacy_migration_assistant.core.models import ComponentType
+from legacy_migration_assistant.legacy_to_k8s_blueprints.blueprint_models import BlueprintService
+from legacy_migration_assistant.legacy_to_k8s_blueprints.bundle import write_bundle
+from legacy_migration_assistant.legacy_to_k8s_blueprints.k8s_generator import (
+    generate_manifests,
+    iter_manifests,
+)
+
+SERVICES = [
+    BlueprintService(name="web", component_type=ComponentType.WEB, ports=[80]),
+    BlueprintService(name="db", component_type=ComponentType.DATABASE, ports=[5432]),
+]
+
+
+def test_iter_manifests_is_lazy_and_matches_dict():
+    stream = iter_manifests(SERVICES, namespace="demo", ingress_host="demo.local")
+    assert isinstance(stream, types.GeneratorType)
+    assert dict(stream) == generate_manifests(SERVICES, namespace="demo", ingress_host="demo.local")
+
+
+def test_multi_document_bundle(tmp_path):
+    target = tmp_path / "out.yaml"
+    count = write_bundle(iter_manifests(SERVICES, namespace="demo"), str(target))
+    docs = [d for d in yaml.safe_load_all(target.read_text()) if d]
+    assert count == len(docs) == 8
+    assert {d["kind"] for d in docs} >= {"Deployment", "Service", "NetworkPolicy"}
+
+
+def test_tarball_bundle(tmp_path):
+    target = tmp_path / "out.tar.gz"
+    write_bundle(iter_manifests(SERVICES), str(target))
+    with tarfile.open(target, "r:gz") as archive:
+        names = archive.getnames()
+        content = archive.extractfile("deployment-web.yaml").read().decode()
+    assert "service-db.yaml" in names
+    assert yaml.safe_load(content)["kind"] == "Deployment"
@@ -0,0 +1,118 @@
+import io
+import json
+import tarfile
+from pathlib import Path
+
+import pytest
+
+from legacy_migration_assistant.legacy_server_scanner import bundles
+from legacy_migration_assistant.legacy_server_scanner.cli import main
+from legacy_migration_assistant.legacy_server_scanner.fleet import iter_scans
+
+DPKG = """Desired=Unknown/Install/Remove/Purge/Hold
+||/ Name           Version      Architecture Description
+ii  nginx          1.18.0-6     amd64        small, powerful, scalable web/proxy server
+ii  mysql-server   8.0.36-0     amd64        MySQL database server
+"""
+SS = """Netid State  Recv-Q Send-Q Local Address:Port Peer Address:Port Process
+tcp   LISTEN 0      511    0.0.0.0:80         0.0.0.0:*     users:(("nginx",pid=10,fd=6))
+tcp   LISTEN 0      151    127.0.0.1:3306     0.0.0.0:*     users:(("mysqld",pid=20,fd=21))
+"""
+UNITS = """UNIT            LOAD   ACTIVE SUB     DESCRIPTION
+nginx.service   loaded active running A high performance web server
+mysql.service   loaded active running MySQL Community Server
+"""
+
+
+def _bundle(path, host, members, top_level=True):
+    with tarfile.open(path, "w:gz") as archive:
+        for name, text in members.items():
+            data = text.encode()
+            info = tarfile.TarInfo(f"{host}/{name}" if top_level else name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+
+
+def _members(host):
+    return {
+        "hostname": f"{host}\n",
+        "dpkg-l.txt": DPKG,
+        "ss-tulpen.txt": SS,
+        "systemctl-list-units.txt": UNITS,
+        "crontab-www-data.txt": "*/5 * * * * php /var/www/cron.php\n",
+        "cron/etc/crontab": "SHELL=/bin/sh\n0 3 * * * root /usr/local/bin/backup\n",
+        "notes/ignored.txt": "not part of the format",
+    }
+
+
+def test_bundle_is_parsed_without_extracting(tmp_path):
+    path = tmp_path / "web01.tar.gz"
+    _bundle(path, "web01", _members("web01"))
+    files = bundles.read_bundle(str(path))
+    assert "notes/ignored.txt" not in files and "cron/etc/crontab" in files
+    scan = bundles.scan_from_bundle(files)
+    assert [p["name"] for p in scan["packages"]] == ["nginx", "mysql-server"]
+    assert {p["port"] for p in scan["ports"]} == {80, 3306}
+    assert [s["name"] for s in scan["services"]] == ["nginx", "mysql"]
+    assert [(c["user"], c["source"]) for c in scan["cron"]] == [("root", "/etc/crontab"), ("www-data", "user")]
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_host_name_is_sanitized(tmp_path):
+    assert bundles.bundle_host("x/db02.tgz", {}) == "db02"
+    host = bundles.bundle_host("x/a.tar", {"hostname": "../../etc\n"})
+    assert "/" not in host and not host.startswith(".")
+
+
+def test_ingest_bundles_command(tmp_path):
+    source = tmp_path / "bundles"
+    source.mkdir()
+    for host in ("web01", "web02"):
+        _bundle(source / f"{host}.tar.gz", host, _members(host), top_level=host == "web01")
+    (source / "broken.tar.gz").write_bytes(b"not a tarball")
+    out = tmp_path / "out"
+    # broken.tar.gz fails, so the command exits non-zero after writing the summary.
+    with pytest.raises(SystemExit) as exc:
+        main(["ingest-bundles", str(source), "--output-root", str(out), "--jobs", "2"])
+    assert exc.value.code == 1
+    summary = json.loads((out / bundles.SUMMARY_FILE).read_text())
+    assert (summary["succeeded"], summary["failed"]) == (2, 1)
+    assert (out / "web02" / "app-map.yaml").exists()
+    assert json.loads((out / "web01" / "scan.json").read_text())["ports"][0]["backlog"] == 511
+    assert [host for host, _, _ in iter_scans(str(out))] == ["web01", "web02"]
+
+
+def test_bundles_with_the_same_host_do_not_overwrite_each_other(tmp_path, capsys):
+    source = tmp_path / "bundles"
+    (source / "rack2").mkdir(parents=True)
+    _bundle(source / "web01.tar.gz", "web01", _members("web01"))
+    _bundle(source / "web01-rebuilt.tar.gz", "web01", {**_members("web01"), "ss-tulpen.txt": ""})
+    _bundle(source / "rack2" / "web01.tar.gz", "web01", _members("web01"))
+    out = tmp_path / "out"
+
+    main(["ingest-bundles", str(source), "--output-root", str(out), "--jobs", "2"])
+
+    summary = json.loads((out / bundles.SUMMARY_FILE).read_text())
+    assert (summary["succeeded"], summary["duplicate_hosts"]) == (3, 2)
+    first, *duplicates = summary["results"]
+    assert first["output_dir"] == str(out / "web01") and first["duplicate_of"] is None
+    assert [Path(result["output_dir"]).name for result in duplicates] == ["web01--web01-rebuilt", "web01--web01"]
+    assert {result["duplicate_of"] for result in duplicates} == {str(source / "rack2" / "web01.tar.gz")}
+    assert json.loads((out / "web01--web01-rebuilt" / "scan.json").read_text())["ports"] == []
+    assert "already ingested from" in capsys.readouterr().err
+
+
+def test_each_bundle_is_read_once(tmp_path, monkeypatch):
+    members = {name: text for name, text in _members("db01").items() if name != "hostname"}
+    _bundle(tmp_path / "db01.tar.gz", "db01", members)
+    _bundle(tmp_path / "web01.tar.gz", "web01", _members("web01"))
+    reads = []
+    read_bundle = bundles.read_bundle
+    monkeypatch.setattr(bundles, "read_bundle", lambda path: reads.append(path) or read_bundle(path))
+    out = tmp_path / "out"
+
+    results = bundles.run_ingest(bundles.discover_bundles(str(tmp_path)), str(out), jobs=1)
+
+    assert sorted(reads) == [str(tmp_path / "db01.tar.gz"), str(tmp_path / "web01.tar.gz")]
+    assert [Path(result.output_dir).name for result in results] == ["db01", "web01"]
+    assert sorted(path.name for path in out.iterdir()) == ["db01", "web01"]
@@ -0,0 +1,50 @@
+from legacy_migration_assistant.core.models import Service
+from legacy_migration_assistant.legacy_server_scanner.cgroups import (
+    parse_cpu_stat,
+    sample_unit_usage,
+)
+
+
+def _unit_v2(root, unit, memory, cpu_usec):
+    unit_dir = root / "system.slice" / unit
+    unit_dir.mkdir(parents=True, exist_ok=True)
+    (unit_dir / "memory.current").write_text(f"{memory}\n")
+    (unit_dir / "memory.peak").write_text(f"{memory * 2}\n")
+    (unit_dir / "cpu.stat").write_text(f"usage_usec {cpu_usec}\nuser_usec 1\nsystem_usec 1\n")
+
+
+def test_parse_cpu_stat():
+    assert parse_cpu_stat("usage_usec 1500\nuser_usec 1000\n") == 1500
+
+
+def test_sample_v2_window(tmp_path):
+    (tmp_path / "cgroup.controllers").write_text("cpu memory\n")
+    _unit_v2(tmp_path, "mysql.service", 1024 * 1024 * 1024, 0)
+    ticks = iter([0.0, 0.0, 1.0, 2.0])
+
+    def fake_sleep(_):
+        # mysql burns half a core per second
+        current = int((tmp_path / "system.slice/mysql.service/cpu.stat").read_text().split()[1])
+        _unit_v2(tmp_path, "mysql.service", 1024 * 1024 * 1024, current + 500_000)
+
+    services = [Service(name="mysql", status="active/running", manager="systemd"), Service(name="x", status="running")]
+    usage = sample_unit_usage(
+        services, window=2, interval=1, root=str(tmp_path), sleep=fake_sleep, clock=lambda: next(ticks)
+    )
+    assert len(usage) == 1
+    record = usage[0]
+    assert record.cgroup == "v2" and record.service == "mysql"
+    assert record.memory_kib == [1024 * 1024] * 3
+    assert record.memory_peak_kib == 2 * 1024 * 1024
+    assert record.cpu_millicores == [500, 500]
+
+
+def test_sample_v1_snapshot(tmp_path):
+    memory_dir = tmp_path / "memory" / "system.slice" / "redis.service"
+    memory_dir.mkdir(parents=True)
+    (memory_dir / "memory.usage_in_bytes").write_text("2097152\n")
+    (memory_dir / "memory.max_usage_in_bytes").write_text("4194304\n")
+    usage = sample_unit_usage([Service(name="redis", status="active", manager="systemd")], root=str(tmp_path))
+    assert usage[0].cgroup == "v1"
+    assert usage[0].memory_kib == [2048] and usage[0].memory_peak_kib == 4096
+    assert usage[0].cpu_millicores == []
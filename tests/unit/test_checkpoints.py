@@ -0,0 +1,90 @@
+import json
+
+import pytest
+
+from legacy_migration_assistant.core.models import Package, ResourceUsage
+from legacy_migration_assistant.legacy_server_scanner import checkpoints, cli
+from legacy_migration_assistant.legacy_server_scanner.checkpoints import (
+    CheckpointStore,
+    checkpointed_list,
+    checkpointed_metrics,
+)
+
+HOST = {"hostname": "web-01", "machine_id": "abc", "boot_id": "boot-1", "kernel": "6.1.0"}
+
+
+def test_collector_output_is_reused_on_the_same_host(tmp_path):
+    calls = []
+
+    def collect():
+        calls.append(1)
+        return [Package(name="nginx", version="1.18.0", source="dpkg")]
+
+    first = checkpointed_list(CheckpointStore(str(tmp_path), HOST), "packages", Package, collect)
+    store = CheckpointStore(str(tmp_path), HOST)
+    second = checkpointed_list(store, "packages", Package, collect)
+
+    assert first == second
+    assert len(calls) == 1
+    assert store.resumed == ["packages"]
+    assert not store.discarded
+
+
+def test_checkpoints_from_another_boot_are_discarded(tmp_path):
+    checkpointed_list(CheckpointStore(str(tmp_path), HOST), "packages", Package, lambda: [])
+    store = CheckpointStore(str(tmp_path), {**HOST, "boot_id": "boot-2"})
+
+    assert store.discarded
+    assert not (tmp_path / "packages.json").exists()
+    assert json.loads((tmp_path / checkpoints.FINGERPRINT_FILE).read_text())["boot_id"] == "boot-2"
+
+
+def test_changed_params_rerun_the_collector(tmp_path):
+    store = CheckpointStore(str(tmp_path), HOST)
+    usage = [ResourceUsage(service="nginx", cgroup="/system.slice/nginx.service", cpu_millicores=[10, 20])]
+    checkpointed_metrics(store, "samples", lambda: {"usage": usage, "edges_dropped": 2}, {"window": 10})
+
+    resumed = checkpointed_metrics(store, "samples", lambda: pytest.fail("should resume"), {"window": 10})
+    assert resumed == {"usage": usage, "edges_dropped": 2}
+
+    rerun = checkpointed_metrics(store, "samples", lambda: {"usage": []}, {"window": 30})
+    assert rerun == {"usage": []}
+    assert store.resumed == ["samples"]
+
+
+def test_failed_write_leaves_previous_checkpoint(tmp_path):
+    store = CheckpointStore(str(tmp_path), HOST)
+    store.save("cron", [{"schedule": "@daily", "command": "backup"}])
+
+    with pytest.raises(TypeError):
+        store.save("cron", [object()])
+
+    assert store.load("cron") == [{"schedule": "@daily", "command": "backup"}]
+    assert not list(tmp_path.glob(".*.tmp"))
+
+
+def test_scan_resumes_unfinished_collectors(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(cli, "host_fingerprint", lambda: HOST)
+    monkeypatch.setattr(cli, "collect_packages", lambda: [Package(name="nginx", version="1.18.0")])
+    monkeypatch.setattr(cli, "collect_services", lambda: [])
+    monkeypatch.setattr(cli, "collect_ports", lambda: [])
+    monkeypatch.setattr(cli, "collect_cron", lambda: [])
+
+    def killed():
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(cli, "discover_configs", killed)
+    checkpoint_dir = tmp_path / "checkpoints"
+    output = tmp_path / "scan.json"
+    argv = ["scan", "--output", str(output), "--checkpoint-dir", str(checkpoint_dir), "--storage-time-cap", "0"]
+    with pytest.raises(KeyboardInterrupt):
+        cli.main(argv)
+    assert (checkpoint_dir / "packages.json").exists()
+
+    monkeypatch.setattr(cli, "collect_packages", lambda: pytest.fail("packages were checkpointed"))
+    monkeypatch.setattr(cli, "discover_configs", lambda: [])
+    cli.main(argv)
+
+    assert json.loads(output.read_text())["packages"][0]["name"] == "nginx"
+    assert "Resumed from checkpoints: packages, services, ports, cron" in capsys.readouterr().out
+    assert not (checkpoint_dir / "packages.json").exists()
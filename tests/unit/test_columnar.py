@@ -0,0 +1,69 @@
+import csv
+import json
+
+import pytest
+
+from legacy_migration_assistant.legacy_server_scanner import columnar
+from legacy_migration_assistant.legacy_server_scanner.cli import main
+
+
+def _write_scans(root, hosts=5):
+    for index in range(hosts):
+        scan = {
+            "packages": [{"name": f"pkg{n}", "version": "1.0", "source": "dpkg"} for n in range(3)],
+            "services": [{"name": "nginx", "status": "running", "pid": 100 + index}],
+            "ports": [{"protocol": "tcp", "address": "0.0.0.0", "port": 80, "backlog": 511}],
+            "cron": [],
+            "configs": [{"path": "/etc/nginx/nginx.conf", "service": "nginx", "metadata": {"workers": 4}}],
+        }
+        (root / f"web{index}.json").write_text(json.dumps(scan))
+
+
+def test_csv_chunks_by_row_group(tmp_path):
+    scans = tmp_path / "scans"
+    scans.mkdir()
+    _write_scans(scans)
+    out = tmp_path / "out"
+    hosts, counts, _ = columnar.export_columnar(str(scans), str(out), "csv", row_group_rows=4)
+    assert hosts == 5
+    assert counts == {"packages": 15, "services": 5, "ports": 5, "cron": 0, "configs": 5}
+    chunks = sorted(out.glob("packages-*.csv"))
+    assert len(chunks) == 4
+    rows = [row for chunk in chunks for row in csv.DictReader(chunk.open())]
+    assert len(rows) == 15 and rows[0]["host"] == "web0"
+    config = next(csv.DictReader((out / "configs-00001.csv").open()))
+    assert json.loads(config["metadata"]) == {"workers": 4}
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+def test_arrow_formats_stream_row_groups(tmp_path, fmt):
+    pa = pytest.importorskip("pyarrow")
+    scans = tmp_path / "scans"
+    scans.mkdir()
+    _write_scans(scans)
+    out = tmp_path / "out"
+    main(["export", str(scans), "--output", str(out), "--columnar", "--format", fmt, "--row-group-rows", "4"])
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        handle = pq.ParquetFile(str(out / "packages.parquet"))
+        assert handle.num_row_groups == 4
+        table = handle.read()
+    else:
+        import pyarrow.ipc as ipc
+
+        table = ipc.open_file(str(out / "services.arrow")).read_all()
+        assert table.schema.field("pid").type == pa.int64()
+        assert table.column("pid").to_pylist() == [100, 101, 102, 103, 104]
+        return
+    assert table.num_rows == 15
+    assert table.column("host").to_pylist()[:3] == ["web0"] * 3
+
+
+def test_json_lines_export(tmp_path):
+    scans = tmp_path / "scans"
+    scans.mkdir()
+    _write_scans(scans, hosts=2)
+    main(["export", str(scans), "--output", str(tmp_path / "scans.jsonl")])
+    lines = (tmp_path / "scans.jsonl").read_text().splitlines()
+    assert [json.loads(line)["host"] for line in lines] == ["web0", "web1"]
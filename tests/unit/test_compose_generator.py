@@ -1,4 +1,10 @@
-from legacy_migration_assistant.core.models import AppComponent, AppTopology, ComponentType
+from legacy_migration_assistant.core.models import (
+    AppComponent,
+    AppTopology,
+    ComponentType,
+    HostMetrics,
+    ResourceUsage,
+)
 from legacy_migration_assistant.legacy_server_scanner.compose_generator import build_compose
 
 
@@ -11,3 +17,11 @@ def test_compose_generator_creates_services():
     compose = build_compose(topology)
     assert "services" in compose
     assert set(compose["services"].keys()) == {"web", "db"}
+
+
+def test_compose_generator_sizes_from_usage():
+    components = [AppComponent(name="db", component_type=ComponentType.DATABASE, services=["mysql"])]
+    usage = ResourceUsage(service="mysql", cgroup="v2", memory_kib=[8 * 1024 * 1024])
+    topology = AppTopology(components=components, metrics=HostMetrics(usage=[usage]))
+    resources = build_compose(topology)["services"]["db"]["deploy"]["resources"]
+    assert int(resources["limits"]["memory"].rstrip("M")) >= 8 * 1024
@@ -0,0 +1,81 @@
+from legacy_migration_assistant.core.models import ComponentType
+from legacy_migration_assistant.legacy_server_scanner import config_tuning
+from legacy_migration_assistant.legacy_server_scanner.config_tuning import (
+    extract_tuning,
+    parse_size,
+)
+from legacy_migration_assistant.legacy_to_k8s_blueprints.resources_advisor import (
+    parse_memory,
+    suggest_resources,
+)
+
+
+def test_parse_size_dialects():
+    assert parse_size("4G") == 4 * 1024**3
+    assert parse_size("128MB") == 128 * 1024**2
+    assert parse_size("16384", default_unit=8192) == 128 * 1024**2
+    assert parse_size("2gb", decimal_short=True) == 2 * 1024**3
+    assert parse_size("2g", decimal_short=True) == 2 * 1000**3
+    assert parse_size("lots") is None
+
+
+def test_nginx_includes_are_relative_to_main_config(tmp_path):
+    (tmp_path / "conf.d").mkdir()
+    (tmp_path / "nginx.conf").write_text(
+        "worker_processes 4;  # pinned\nevents {\n    worker_connections 512;\n}\nhttp { include conf.d/*.conf; }\n"
+    )
+    (tmp_path / "conf.d" / "tuning.conf").write_text("worker_connections 2048;\n")
+    tuning = extract_tuning("nginx", str(tmp_path / "nginx.conf"))
+    assert tuning["settings"] == {"worker_processes": 4, "worker_connections": 2048}
+    assert tuning["memory_kib"] == 4 * (8 * 1024 + 2048 * 8)
+    assert tuning["includes"] == [str(tmp_path / "conf.d" / "tuning.conf")]
+
+
+def test_mysql_includedir_and_section_filtering(tmp_path):
+    (tmp_path / "mysql.conf.d").mkdir()
+    (tmp_path / "my.cnf").write_text(f"[client]\nmax_connections = 9999\n!includedir {tmp_path / 'mysql.conf.d'}\n")
+    (tmp_path / "mysql.conf.d" / "mysqld.cnf").write_text(
+        "[mysqld]\ninnodb-buffer-pool-size = 4G\nmax_connections = 100\n"
+    )
+    tuning = extract_tuning("mysql", str(tmp_path / "my.cnf"))
+    assert tuning["settings"] == {"innodb_buffer_pool_size": 4 * 1024**3, "max_connections": 100}
+    assert 4 * 1024**2 < tuning["memory_kib"] < 5 * 1024**2
+
+
+def test_postgres_redis_and_php_fpm(tmp_path):
+    (tmp_path / "postgresql.conf").write_text("shared_buffers = 2GB\nmax_connections = 50\nwork_mem = 8MB\n")
+    pg = extract_tuning("postgresql", str(tmp_path / "postgresql.conf"))
+    assert pg["settings"]["shared_buffers_kib"] == 2 * 1024**2
+
+    (tmp_path / "redis.conf").write_text('maxmemory 1gb\nmaxmemory-policy "allkeys-lru"\n')
+    assert extract_tuning("redis", str(tmp_path / "redis.conf"))["memory_kib"] == int(1024**3 * 1.3) // 1024
+
+    (tmp_path / "pool.d").mkdir()
+    (tmp_path / "php-fpm.conf").write_text("[global]\ninclude=pool.d/*.conf\n")
+    (tmp_path / "pool.d" / "www.conf").write_text(
+        "[www]\npm = static\npm.max_children = 20\nphp_admin_value[memory_limit] = 32M\n"
+    )
+    php = extract_tuning("php-fpm", str(tmp_path / "php-fpm.conf"))
+    assert php["settings"] == {"pm.max_children": {"www": 20}}
+    assert php["memory_kib"] == 20 * 32 * 1024
+    # only entry files are analysed; their includes are folded in
+    assert extract_tuning("php-fpm", str(tmp_path / "pool.d" / "www.conf")) is None
+
+
+def test_parsed_files_are_cached_by_content(tmp_path, monkeypatch):
+    calls = []
+    original = config_tuning.PARSERS["redis"]
+    monkeypatch.setitem(config_tuning.PARSERS, "redis", lambda text: calls.append(text) or original(text))
+    monkeypatch.setattr(config_tuning, "_PARSE_CACHE", {})
+    for name in ("a", "b"):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "redis.conf").write_text("maxmemory 100mb\n")
+        extract_tuning("redis", str(tmp_path / name / "redis.conf"))
+    assert len(calls) == 1
+
+
+def test_configured_memory_raises_limits():
+    advice = suggest_resources(ComponentType.DATABASE, configured_memory_kib=4 * 1024**2)
+    assert parse_memory(advice.memory_request) >= 4 * 1024**2
+    assert parse_memory(advice.memory_limit) >= 4 * 1024**2 * 1.15
+    assert suggest_resources(ComponentType.DATABASE, configured_memory_kib=1024).memory_limit == "1Gi"
@@ -0,0 +1,100 @@
+from legacy_migration_assistant.core.metrics import is_saturated
+from legacy_migration_assistant.core.models import (
+    ComponentType,
+    HostMetrics,
+    Port,
+    PortLoad,
+    Service,
+)
+from legacy_migration_assistant.legacy_server_scanner.connections import (
+    ConnectionSampler,
+    decode_address,
+    parse_proc_net_tcp,
+)
+from legacy_migration_assistant.legacy_server_scanner.topology_builder import build_topology
+from legacy_migration_assistant.legacy_to_k8s_blueprints.blueprint_models import BlueprintService
+from legacy_migration_assistant.legacy_to_k8s_blueprints.k8s_generator import (
+    build_deployment,
+    build_ingress,
+)
+
+TCP = """  sl  local_address rem_address   st tx_queue rx_queue tr tm->when retrnsmt   uid  timeout inode
+   0: 00000000:0050 00000000:0000 0A 00000000:00000000 00:00000000 00000000     0        0 1001 1
+   1: 0100007F:0050 0100007F:D431 01 00000000:00000000 00:00000000 00000000    33        0 1002 1
+   2: 0100007F:0050 0100007F:D432 01 00000000:00000000 00:00000000 00000000    33        0 1003 1
+   3: 0100007F:D431 0100007F:0050 01 00000000:00000000 00:00000000 00000000  1000        0 1004 1
+"""
+
+
+def test_decode_address_ipv4_and_ipv6():
+    assert decode_address("0100007F:1F90") == ("127.0.0.1", 8080)
+    assert decode_address("00000000000000000000000001000000:0050") == ("::1", 80)
+
+
+def test_parse_and_sample_established_per_listening_port(tmp_path):
+    sockets = list(parse_proc_net_tcp(TCP))
+    assert [s.state for s in sockets] == [0x0A, 0x01, 0x01, 0x01]
+
+    (tmp_path / "net").mkdir()
+    (tmp_path / "net" / "tcp").write_text(TCP)
+    sampler = ConnectionSampler([Port(protocol="tcp", address="*", port=80)], proc_root=str(tmp_path), throughput=False)
+    sampler.tick(0.0)
+    sampler.tick(1.0)
+    [load] = sampler.results()
+    # the client side of the loopback connection (local port 0xD431) is not counted
+    assert load.port == 80 and load.established == [2, 2]
+
+
+LISTEN_QUEUED = TCP.replace("0A 00000000:00000000", "0A 00000000:00000078")
+
+SS_FIRST = """ESTAB 0 0 127.0.0.1:80 127.0.0.1:54321
+\t cubic wscale:7,7 rto:204 bytes_sent:100 bytes_acked:100 bytes_received:50 segs_out:3
+ESTAB 0 0 127.0.0.1:54321 127.0.0.1:80
+\t cubic bytes_acked:50 bytes_received:100
+"""
+SS_SECOND = """ESTAB 0 0 127.0.0.1:80 127.0.0.1:54321
+\t cubic wscale:7,7 rto:204 bytes_sent:2100 bytes_acked:2100 bytes_received:1050 segs_out:9
+ESTAB 0 0 127.0.0.1:80 127.0.0.1:54999
+\t cubic bytes_acked:400 bytes_received:0
+"""
+
+
+def test_accept_queue_backlog_bytes_and_overflows(tmp_path):
+    (tmp_path / "net").mkdir()
+    (tmp_path / "net" / "tcp").write_text(LISTEN_QUEUED)
+    (tmp_path / "sys" / "net" / "core").mkdir(parents=True)
+    (tmp_path / "sys" / "net" / "core" / "somaxconn").write_text("4096\n")
+    netstat = "TcpExt: SyncookiesSent ListenOverflows ListenDrops\nTcpExt: 0 {} 0\n"
+    (tmp_path / "net" / "netstat").write_text(netstat.format(10))
+    outputs = iter([(0, SS_FIRST, ""), (0, SS_SECOND, "")])
+
+    port = Port(protocol="tcp", address="*", port=80, backlog=128)
+    sampler = ConnectionSampler([port], proc_root=str(tmp_path), runner=lambda cmd: next(outputs))
+    sampler.tick(0.0)
+    (tmp_path / "net" / "netstat").write_text(netstat.format(25))
+    sampler.tick(2.0)
+
+    [load] = sampler.results()
+    assert load.backlog == 128
+    assert load.accept_queue == [120, 120]
+    # existing connection: +1000 in / +2000 out; new connection counted from zero
+    assert load.bytes_in == [500]
+    assert load.bytes_out == [1200]
+    assert sampler.overflow_results() == [15]
+    assert is_saturated(load)
+
+
+def test_saturated_port_is_flagged_and_drives_replicas_and_ingress_timeouts():
+    saturated = PortLoad(port=80, established=[10, 12, 11], accept_queue=[0, 127, 3], backlog=128)
+    idle = PortLoad(port=8080, established=[200] * 3, bytes_in=[1000] * 3, bytes_out=[1000] * 3)
+    nginx = Service(name="nginx", status="active/running", manager="systemd")
+    topology = build_topology([], [nginx], [], [], [], HostMetrics(connections=[saturated]))
+    [web] = topology.components
+    assert "port 80: accept queue saturated (peak 127 of backlog 128)" in web.notes
+
+    svc = BlueprintService(name="web", component_type=ComponentType.WEB, ports=[80], port_loads=[saturated])
+    assert build_deployment(svc)["spec"]["replicas"] == 3
+    ws = BlueprintService(name="ws", component_type=ComponentType.WEB, ports=[8080], port_loads=[idle])
+    annotations = build_ingress([svc, ws], "example.com")["metadata"]["annotations"]
+    assert annotations["nginx.ingress.kubernetes.io/proxy-read-timeout"] == "3600"
+    assert annotations["nginx.ingress.kubernetes.io/proxy-connect-timeout"] == "15"
@@ -0,0 +1,51 @@
+import csv
+import json
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from legacy_migration_assistant.legacy_server_scanner import drift  # noqa: E402
+from legacy_migration_assistant.legacy_server_scanner.cli import main  # noqa: E402
+
+
+def _write_fleet(root):
+    for index in range(30):
+        openssl = "3.0.2-0ubuntu1.9" if index < 10 else "3.0.2-0ubuntu1.10"
+        packages = [{"name": "openssl", "version": openssl, "source": "dpkg"}]
+        if index == 29:
+            packages.append({"name": "php8.1", "version": "8.1.2-1ubuntu2.14", "source": "dpkg"})
+        if index == 0:
+            openssl = "3.0.1-1"
+            packages[0]["version"] = openssl
+        packages.append({"name": "openssl", "version": "1:3.0.7-16.el9", "source": "rpm"})
+        (root / f"host{index:02d}.json").write_text(json.dumps({"packages": packages, "services": []}))
+
+
+def test_histograms_behind_latest_and_outliers(tmp_path):
+    _write_fleet(tmp_path)
+    fleet = drift.load_fleet(str(tmp_path))
+    packages, hosts, _ = drift.analyze_drift(fleet)
+    by_key = {(row.package, row.source): row for row in packages}
+    deb = by_key[("openssl", "dpkg")]
+    assert list(deb.histogram) == ["3.0.1-1", "3.0.2-0ubuntu1.9", "3.0.2-0ubuntu1.10"]
+    assert deb.histogram["3.0.1-1"] == 1
+    assert deb.latest == "3.0.2-0ubuntu1.10"
+    assert (deb.behind, deb.outliers) == (10, 1)
+    assert by_key[("openssl", "rpm")].behind == 0
+    assert packages[0] is deb
+    assert hosts[0].host == "host00" and hosts[0].outliers == 1
+
+
+def test_drift_command_writes_csv(tmp_path, capsys):
+    scans = tmp_path / "scans"
+    scans.mkdir()
+    _write_fleet(scans)
+    out = tmp_path / "out"
+    main(["drift", str(scans), "--output-dir", str(out), "--package", "openssl"])
+    rows = list(csv.DictReader((out / drift.PACKAGES_CSV).open()))
+    assert rows[0]["package"] == "openssl" and rows[0]["behind_latest"] == "10"
+    selected = list(csv.DictReader((out / drift.SELECTED_CSV).open()))
+    assert len(selected) == 60
+    assert {row["latest"] for row in selected if row["source"] == "dpkg"} == {"3.0.2-0ubuntu1.10"}
+    assert "openssl (dpkg)" in capsys.readouterr().out
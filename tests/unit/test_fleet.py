@@ -0,0 +1,81 @@
+import json
+
+from legacy_migration_assistant.legacy_server_scanner.cli import main
+from legacy_migration_assistant.legacy_server_scanner.fleet import (
+    BANDS,
+    DEFAULT_THRESHOLD,
+    SIGNATURE_SIZE,
+    build_clusters,
+    estimated_similarity,
+    fingerprint_scans,
+    jaccard,
+    minhash,
+)
+
+
+def _scan(packages, services=(), ports=(), versions=None):
+    versions = versions or {}
+    return {
+        "packages": [{"name": name, "version": versions.get(name, "1.0")} for name in packages],
+        "services": [{"name": name, "status": "running"} for name in services],
+        "ports": [{"protocol": "tcp", "address": "0.0.0.0", "port": port} for port in ports],
+        "cron": [],
+        "configs": [],
+    }
+
+
+def _fleet(tmp_path):
+    base_web = [f"lib{i}" for i in range(200)] + ["nginx", "php-fpm"]
+    base_db = [f"lib{i}" for i in range(100)] + [f"pg{i}" for i in range(120)] + ["postgresql"]
+    for index in range(20):
+        extra = [f"tool{(index * 37 + k * 101) % 1000}" for k in range(3)]
+        scan = _scan(base_web + extra, ["nginx", "php-fpm"], [80, 443])
+        (tmp_path / f"web{index:02d}.json").write_text(json.dumps(scan))
+    for index in range(10):
+        versions = {"postgresql": "15.4"} if index == 3 else None
+        scan = _scan(base_db, ["postgresql"], [5432], versions)
+        (tmp_path / f"db{index:02d}.json").write_text(json.dumps(scan))
+    (tmp_path / "notes.json").write_text(json.dumps({"owner": "ops"}))
+
+
+def test_minhash_estimates_jaccard():
+    left = frozenset(f"pkg:{i}" for i in range(400))
+    right = frozenset(f"pkg:{i}" for i in range(100, 500))
+    estimate = estimated_similarity(minhash(left), minhash(right))
+    assert abs(estimate - jaccard(left, right)) < 0.15
+    assert estimated_similarity(minhash(left), minhash(left)) == 1.0
+
+
+def test_clusters_group_archetypes_with_deltas(tmp_path):
+    _fleet(tmp_path)
+    hosts = fingerprint_scans(str(tmp_path), jobs=1)
+    assert len(hosts) == 30
+    clusters = build_clusters(hosts)
+    assert [len(cluster.members) for cluster in clusters] == [20, 10]
+    web, db = clusters
+    assert {m.host[:3] for m in web.members} == {"web"}
+    assert all(delta.similarity > 0.9 for delta in web.deltas)
+    assert any(delta.added for delta in web.deltas)
+    versions = {delta.host: delta.versions for delta in db.deltas if delta.versions}
+    if db.representative.host == "db03":
+        assert len(versions) == 9
+    else:
+        assert versions == {"db03": {"postgresql": "15.4"}}
+
+
+def test_cluster_command_writes_maps(tmp_path):
+    scans = tmp_path / "scans"
+    scans.mkdir()
+    _fleet(scans)
+    out = tmp_path / "out"
+    main(["cluster", str(scans), "--output-dir", str(out)])
+    index = json.loads((out / "clusters.json").read_text())
+    assert [entry["hosts"] for entry in index] == [20, 10]
+    assert (out / "cluster-001" / "app-map.yaml").exists()
+    assert "deltas" in (out / "cluster-002" / "hosts.yaml").read_text()
+
+
+def test_bands_catch_pairs_at_the_default_threshold():
+    rows = SIGNATURE_SIZE // BANDS
+    assert (1 / BANDS) ** (1 / rows) < DEFAULT_THRESHOLD
+    assert 1 - (1 - DEFAULT_THRESHOLD**rows) ** BANDS > 0.999
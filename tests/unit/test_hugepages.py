@@ -0,0 +1,66 @@
+from legacy_migration_assistant.core.models import ComponentType, HugePageUsage
+from legacy_migration_assistant.legacy_server_scanner.hugepages import (
+    collect_hugepage_usage,
+    read_hugepage_pools,
+    read_transparent_hugepages,
+)
+from legacy_migration_assistant.legacy_to_k8s_blueprints.blueprint_models import BlueprintService
+from legacy_migration_assistant.legacy_to_k8s_blueprints.hugepages_advisor import hugepage_requests
+from legacy_migration_assistant.legacy_to_k8s_blueprints.k8s_generator import build_deployment
+
+
+def _write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+
+def test_pools_thp_and_smaps(tmp_path):
+    sys_root, proc = tmp_path / "sys", tmp_path / "proc"
+    _write(proc / "meminfo", "MemTotal: 1 kB\nHugePages_Total: 512\nHugepagesize:    2048 kB\n")
+    for size, total, free in (("2048", "512", "256"), ("1048576", "0", "0")):
+        pool = sys_root / "hugepages" / f"hugepages-{size}kB"
+        for name, value in (("nr_hugepages", total), ("free_hugepages", free), ("resv_hugepages", "0")):
+            _write(pool / name, value + "\n")
+    _write(sys_root / "transparent_hugepage" / "enabled", "always [madvise] never\n")
+    _write(proc / "40" / "smaps_rollup", "Rss: 9 kB\nAnonHugePages:  4096 kB\nHugetlbPages:  524288 kB\n")
+    _write(proc / "41" / "smaps_rollup", "Rss: 9 kB\nAnonHugePages: 0 kB\nHugetlbPages: 0 kB\n")
+
+    default, pools = read_hugepage_pools(str(sys_root), str(proc))
+    assert default == 2048
+    assert [(p.size_kib, p.total, p.free) for p in pools] == [(2048, 512, 256), (1048576, 0, 0)]
+    assert read_transparent_hugepages(str(sys_root)) == "madvise"
+    [usage] = collect_hugepage_usage({"postgres": 40, "nginx": 41}, default, pools, str(proc))
+    assert (usage.service, usage.hugetlb_kib, usage.page_size_kib, usage.anon_huge_kib) == ("postgres", 524288, 2048, 4096)
+
+
+def test_meminfo_fallback_without_sysfs(tmp_path):
+    _write(tmp_path / "meminfo", "HugePages_Total: 4\nHugePages_Free: 4\nHugepagesize: 1048576 kB\n")
+    default, [pool] = read_hugepage_pools(str(tmp_path / "missing"), str(tmp_path))
+    assert default == pool.size_kib == 1048576
+    assert pool.total == 4
+
+
+def test_requests_round_up_to_whole_pages():
+    usages = [
+        HugePageUsage(service="a", hugetlb_kib=3000, page_size_kib=2048),
+        HugePageUsage(service="b", hugetlb_kib=1048576, page_size_kib=1048576),
+    ]
+    assert hugepage_requests(usages) == {"hugepages-2Mi": "4Mi", "hugepages-1Gi": "1Gi"}
+
+
+def test_deployment_requests_hugepages_and_mounts_volume():
+    svc = BlueprintService(
+        name="postgres",
+        component_type=ComponentType.DATABASE,
+        volumes=["/var/lib/postgresql"],
+        hugepages=[HugePageUsage(service="postgres", hugetlb_kib=524288, page_size_kib=2048, anon_huge_kib=2048)],
+        transparent_hugepages="madvise",
+    )
+    deployment = build_deployment(svc)
+    pod = deployment["spec"]["template"]["spec"]
+    container = pod["containers"][0]
+    assert container["resources"]["requests"]["hugepages-2Mi"] == "512Mi"
+    assert container["resources"]["limits"]["hugepages-2Mi"] == "512Mi"
+    assert {"name": "hugepages", "emptyDir": {"medium": "HugePages"}} in pod["volumes"]
+    assert {"name": "hugepages", "mountPath": "/dev/hugepages"} in container["volumeMounts"]
+    assert "transparent huge pages (host mode: madvise)" in deployment["metadata"]["annotations"]["legacy-migration/notes"]
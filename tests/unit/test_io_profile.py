@@ -0,0 +1,116 @@
+from legacy_migration_assistant.core.models import ComponentType, IoUsage, VolumeUsage
+from legacy_migration_assistant.legacy_server_scanner.cgroups import parse_blkio
+from legacy_migration_assistant.legacy_server_scanner.io_profile import IoSampler
+from legacy_migration_assistant.legacy_to_k8s_blueprints.blueprint_models import BlueprintService
+from legacy_migration_assistant.legacy_to_k8s_blueprints.io_advisor import is_io_heavy
+from legacy_migration_assistant.legacy_to_k8s_blueprints.k8s_generator import build_statefulset
+
+MIB = 1024 * 1024
+
+
+def _write_counters(proc, read_bytes, write_bytes, sectors_written, io_ticks, stall_usec):
+    (proc / "30").mkdir(parents=True, exist_ok=True)
+    (proc / "30" / "io").write_text(
+        f"rchar: 1\nwchar: 1\nsyscr: 10\nsyscw: {write_bytes // 4096}\n"
+        f"read_bytes: {read_bytes}\nwrite_bytes: {write_bytes}\ncancelled_write_bytes: 0\n"
+    )
+    (proc / "diskstats").write_text(
+        f"   8       0 sda 100 0 800 10 200 0 {sectors_written} 20 0 {io_ticks} 30 0 0 0 0\n"
+        f"   8       1 sda1 100 0 800 10 200 0 {sectors_written} 20 0 {io_ticks} 30 0 0 0 0\n"
+        f"   7       0 loop0 1 0 8 0 0 0 0 0 0 0 0 0 0 0 0\n"
+    )
+    (proc / "pressure").mkdir(exist_ok=True)
+    (proc / "pressure" / "io").write_text(
+        f"some avg10=0.00 avg60=0.00 avg300=0.00 total={stall_usec}\nfull avg10=0.00 avg60=0.00 avg300=0.00 total=0\n"
+    )
+
+
+def test_sampler_rates_from_counter_deltas(tmp_path):
+    proc, sys_root = tmp_path / "proc", tmp_path / "sys"
+    (sys_root / "block" / "sda" / "queue").mkdir(parents=True)
+    (sys_root / "block" / "sda" / "queue" / "rotational").write_text("1\n")
+    sampler = IoSampler({"mysql": 30}, proc_root=str(proc), sys_root=str(sys_root))
+    _write_counters(proc, 0, 0, 0, 0, 0)
+    sampler.tick(0.0)
+    _write_counters(proc, 10 * MIB, 40 * MIB, 2048, 1500, 400_000)
+    sampler.tick(2.0)
+
+    [usage] = sampler.results()
+    assert (usage.read_bytes, usage.write_bytes) == ([5 * MIB], [20 * MIB])
+    # syscr/syscw count syscalls, not disk operations, so the /proc fallback has bytes only.
+    assert (usage.cgroup, usage.read_ops, usage.write_ops) == (None, [], [])
+    [disk] = sampler.disk_results()
+    assert (disk.device, disk.rotational) == ("sda", True)
+    assert disk.write_bytes == [1024 * 512]
+    assert disk.utilization == [75]
+    assert sampler.pressure_results() == [20.0]
+
+
+def _unit_io_v2(root, rbytes, wbytes, rios, wios):
+    unit = root / "system.slice" / "mysql.service"
+    unit.mkdir(parents=True, exist_ok=True)
+    (unit / "io.stat").write_text(
+        f"8:0 rbytes={rbytes} wbytes={wbytes} rios={rios} wios={wios} dbytes=0 dios=0\n"
+        "253:0 rbytes=0 wbytes=4096 rios=0 wios=2 dbytes=0 dios=0\n"
+    )
+
+
+def test_unit_cgroup_io_replaces_main_process_counters(tmp_path):
+    proc, cgroup = tmp_path / "proc", tmp_path / "cgroup"
+    cgroup.mkdir()
+    (cgroup / "cgroup.controllers").write_text("cpu io memory\n")
+    sampler = IoSampler(
+        {"mysql": 30},
+        proc_root=str(proc),
+        sys_root=str(tmp_path / "sys"),
+        units={"mysql.service": "mysql"},
+        cgroup_root=str(cgroup),
+    )
+    _write_counters(proc, 0, 0, 0, 0, 0)
+    _unit_io_v2(cgroup, 0, 0, 0, 0)
+    sampler.tick(0.0)
+    _write_counters(proc, MIB, MIB, 0, 0, 0)
+    _unit_io_v2(cgroup, 8 * MIB, 2 * MIB, 3000, 1000)
+    sampler.tick(2.0)
+
+    [usage] = sampler.results()
+    assert usage.cgroup == "v2"
+    assert (usage.read_bytes, usage.write_bytes) == ([4 * MIB], [MIB])
+    assert (usage.read_ops, usage.write_ops) == ([1500], [500])
+    assert is_io_heavy(usage)
+
+
+def test_blkio_v1_counters():
+    content = "8:0 Read 4096\n8:0 Write 8192\n8:0 Sync 0\n8:16 Read 1024\n8:16 Total 1024\nTotal 13312\n"
+    assert parse_blkio(content) == {"Read": 5120, "Write": 8192}
+
+
+def test_ops_without_cgroup_stats_do_not_make_a_component_io_heavy():
+    syscalls = IoUsage(service="app", read_bytes=[MIB], write_bytes=[MIB], read_ops=[5000], write_ops=[5000])
+    assert not is_io_heavy(syscalls)
+    syscalls.cgroup = "v2"
+    assert is_io_heavy(syscalls)
+
+
+def test_heavy_writer_gets_ssd_hint_affinity_and_log_warning():
+    io = IoUsage(service="db", read_bytes=[MIB] * 5, write_bytes=[30 * MIB] * 5, read_ops=[10] * 5, write_ops=[900] * 5)
+    assert is_io_heavy(io)
+    assert not is_io_heavy(IoUsage(service="x", read_bytes=[MIB], write_bytes=[MIB]))
+    svc = BlueprintService(
+        name="db",
+        component_type=ComponentType.DATABASE,
+        volumes=["/var/lib/mysql"],
+        storage=[VolumeUsage(path="/var/lib/mysql", used_kib=MIB, fstype="xfs", mount_point="/")],
+        log_storage=VolumeUsage(path="/var/log", mount_point="/"),
+        io=io,
+        io_pressure=[3.0, 25.0],
+    )
+    manifest = build_statefulset(svc)
+    pod = manifest["spec"]["template"]["spec"]
+    preference = pod["affinity"]["nodeAffinity"]["preferredDuringSchedulingIgnoredDuringExecution"][0]
+    assert preference["preference"]["matchExpressions"][0]["key"] == "legacy-migration/local-ssd"
+    [claim] = manifest["spec"]["volumeClaimTemplates"]
+    assert "SSD" in claim["metadata"]["annotations"]["legacy-migration/storage-class-hint"]
+    notes = manifest["metadata"]["annotations"]["legacy-migration/notes"]
+    assert "competed with logs on /" in notes
+    assert "stalled on I/O up to 25%" in notes
@@ -0,0 +1,94 @@
+from legacy_migration_assistant.core.models import (
+    AppComponent,
+    AppTopology,
+    ComponentType,
+    HostMetrics,
+    ProcessLimits,
+)
+from legacy_migration_assistant.legacy_server_scanner.compose_generator import build_compose
+from legacy_migration_assistant.legacy_server_scanner.kernel import (
+    collect_process_limits,
+    parse_proc_limits,
+    read_sysctls,
+)
+from legacy_migration_assistant.legacy_to_k8s_blueprints.compose_parser import topology_to_blueprint
+from legacy_migration_assistant.legacy_to_k8s_blueprints.k8s_generator import build_deployment
+from legacy_migration_assistant.legacy_to_k8s_blueprints.kernel_advisor import (
+    tuned_sysctls,
+    tuned_ulimits,
+)
+
+LIMITS = """Limit                     Soft Limit           Hard Limit           Units
+Max core file size        0                    unlimited            bytes
+Max processes             63704                63704                processes
+Max open files            65535                65535                files
+Max locked memory         8388608              8388608              bytes
+"""
+
+SYSCTLS = {
+    "net.core.somaxconn": "65535",
+    "net.ipv4.ip_local_port_range": "1024 65000",
+    "net.ipv4.tcp_fin_timeout": "60",
+    "vm.swappiness": "10",
+}
+
+
+def test_parse_proc_limits():
+    soft, hard = parse_proc_limits(LIMITS)
+    assert soft["nofile"] == 65535 and hard["nofile"] == 65535
+    assert soft["core"] == 0 and hard["core"] is None
+
+
+def test_collectors_read_proc_tree(tmp_path):
+    (tmp_path / "sys" / "net" / "ipv4").mkdir(parents=True)
+    (tmp_path / "sys" / "net" / "ipv4" / "ip_local_port_range").write_text("1024\t65000\n")
+    assert read_sysctls(("net.ipv4.ip_local_port_range", "vm.swappiness"), str(tmp_path)) == {
+        "net.ipv4.ip_local_port_range": "1024 65000"
+    }
+    (tmp_path / "42").mkdir()
+    (tmp_path / "42" / "limits").write_text(LIMITS)
+    [record] = collect_process_limits([], proc_root=str(tmp_path), pids={"nginx": 42})
+    assert record.service == "nginx" and record.soft["nofile"] == 65535
+
+
+def _topology():
+    soft, hard = parse_proc_limits(LIMITS)
+    return AppTopology(
+        components=[AppComponent(name="nginx", component_type=ComponentType.WEB, ports=[80], services=["nginx"])],
+        metrics=HostMetrics(sysctls=SYSCTLS, limits=[ProcessLimits(service="nginx", pid=42, soft=soft, hard=hard)]),
+    )
+
+
+def test_compose_gets_namespaced_sysctls_ulimits_and_node_notes():
+    service = build_compose(_topology())["services"]["nginx"]
+    assert service["sysctls"] == {"net.core.somaxconn": "65535", "net.ipv4.ip_local_port_range": "1024 65000"}
+    # The host's hard cap is below systemd's default, so the default is kept instead.
+    assert service["ulimits"] == {"nofile": {"soft": 65535, "hard": 524288}}
+    assert any("vm.swappiness=10" in note for note in service["x-notes"])
+
+
+def test_pod_gets_only_safe_sysctls():
+    [svc] = topology_to_blueprint(_topology())
+    deployment = build_deployment(svc)
+    pod_context = deployment["spec"]["template"]["spec"]["securityContext"]
+    assert pod_context["sysctls"] == [{"name": "net.ipv4.ip_local_port_range", "value": "1024 65000"}]
+    notes = deployment["metadata"]["annotations"]["legacy-migration/notes"]
+    assert "net.core.somaxconn=65535" in notes and "vm.swappiness=10" in notes and "nofile=65535:524288" in notes
+
+
+def test_limits_below_modern_defaults_are_never_carried():
+    centos7 = {
+        "net.core.somaxconn": "128",
+        "net.ipv4.tcp_tw_reuse": "0",
+        "net.ipv4.tcp_max_syn_backlog": "512",
+        "net.ipv4.ip_local_port_range": "40000 60999",
+        "kernel.sem": "250 32000 32 128",
+        "vm.max_map_count": "262144",
+        "net.ipv4.tcp_keepalive_time": "600",
+    }
+    assert tuned_sysctls(centos7) == {"net.ipv4.tcp_keepalive_time": "600", "vm.max_map_count": "262144"}
+    assert tuned_sysctls({"net.ipv4.tcp_tw_reuse": "1"}) == {"net.ipv4.tcp_tw_reuse": "1"}
+
+    soft = {"nofile": 1024, "core": 0}
+    hard = {"nofile": 4096, "core": None}
+    assert tuned_ulimits(ProcessLimits(service="legacy", pid=1, soft=soft, hard=hard)) == {}
@@ -0,0 +1,73 @@
+import json
+
+from legacy_migration_assistant.core.models import AppComponent, ComponentType, CpuAffinity
+from legacy_migration_assistant.core.utils import format_cpu_list, parse_cpu_list
+from legacy_migration_assistant.legacy_server_scanner.compose_generator import build_compose_service
+from legacy_migration_assistant.legacy_server_scanner.numa import (
+    collect_cpu_affinity,
+    read_numa_layout,
+)
+from legacy_migration_assistant.legacy_to_k8s_blueprints.blueprint_models import BlueprintService
+from legacy_migration_assistant.legacy_to_k8s_blueprints.compose_parser import parse_compose_dict
+from legacy_migration_assistant.legacy_to_k8s_blueprints.k8s_generator import build_deployment
+from legacy_migration_assistant.legacy_to_k8s_blueprints.report import (
+    collect_findings,
+    write_report,
+)
+
+
+def _host(tmp_path):
+    sys_root = tmp_path / "sys"
+    (sys_root / "cpu").mkdir(parents=True)
+    (sys_root / "cpu" / "online").write_text("0-7\n")
+    for node, cpus in (("node0", "0-3"), ("node1", "4-7")):
+        (sys_root / "node" / node).mkdir(parents=True)
+        (sys_root / "node" / node / "cpulist").write_text(cpus + "\n")
+    proc = tmp_path / "proc"
+    for pid, cpus, mems in ((10, "2-3", "0"), (11, "0-7", "0-1")):
+        (proc / str(pid)).mkdir(parents=True)
+        (proc / str(pid) / "status").write_text(
+            f"Name:\tx\nCpus_allowed_list:\t{cpus}\nMems_allowed_list:\t{mems}\n"
+        )
+    return str(sys_root), str(proc)
+
+
+def test_cpu_list_round_trip():
+    assert parse_cpu_list("0-3,8,10-11\n") == [0, 1, 2, 3, 8, 10, 11]
+    assert format_cpu_list([11, 0, 1, 2, 3, 8, 10]) == "0-3,8,10-11"
+    assert parse_cpu_list("") == []
+
+
+def test_only_pinned_services_are_recorded(tmp_path):
+    sys_root, proc = _host(tmp_path)
+    online, numa = read_numa_layout(sys_root)
+    assert online == list(range(8))
+    assert [n.node for n in numa] == [0, 1]
+    [affinity] = collect_cpu_affinity({"db": 10, "web": 11}, online, numa, proc_root=proc)
+    assert (affinity.service, affinity.cpus, affinity.mems, affinity.nodes) == ("db", [2, 3], [0], [0])
+
+
+def test_pinned_service_becomes_guaranteed_and_reported(tmp_path):
+    svc = BlueprintService(
+        name="db",
+        component_type=ComponentType.DATABASE,
+        affinity=CpuAffinity(service="db", cpus=[2, 3], mems=[0], nodes=[0]),
+    )
+    resources = build_deployment(svc)["spec"]["template"]["spec"]["containers"][0]["resources"]
+    assert resources["requests"] == resources["limits"]
+    assert resources["limits"]["cpu"] == "2"
+
+    path = tmp_path / "report.json"
+    write_report(collect_findings([svc, BlueprintService(name="web")]), str(path))
+    report = json.loads(path.read_text())
+    assert [f["workload"] for f in report["findings"]] == ["db"]
+    assert "--cpu-manager-policy=static" in report["kubelet"]
+    assert "--topology-manager-policy=single-numa-node" in report["kubelet"]
+
+
+def test_compose_cpuset_round_trip():
+    component = AppComponent(name="db", component_type=ComponentType.DATABASE)
+    service, _ = build_compose_service(component, [], affinity=CpuAffinity(service="db", cpus=[2, 3]))
+    assert service["cpuset"] == "2-3"
+    [parsed] = parse_compose_dict({"services": {"db": service}})
+    assert parsed.affinity.cpus == [2, 3]
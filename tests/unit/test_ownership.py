@@ -0,0 +1,135 @@
+from legacy_migration_assistant.core.models import ConfigFile, Service
+from legacy_migration_assistant.legacy_server_scanner import ownership
+from legacy_migration_assistant.legacy_server_scanner.ownership import OwnershipIndex
+
+NGINX_LIST = """/.
+/etc
+/etc/nginx
+/etc/nginx/nginx.conf
+/etc/nginx/mime.types
+/usr
+/usr/sbin
+/usr/sbin/nginx
+/lib/systemd/system/nginx.service
+"""
+MYSQL_LIST = """/.
+/etc
+/etc/mysql
+/etc/mysql/my.cnf
+/usr/sbin/mysqld
+/etc/mysql/conf.d
+/etc/mysql/conf.d/mysqld.cnf
+"""
+RPM_FILES = """httpd\t2.4.57-5.el9\t/usr/sbin/httpd
+httpd\t2.4.57-5.el9\t/etc/httpd/conf/httpd.conf
+redis\t6.2.7-1.el9\t/usr/bin/redis-server
+(none)
+"""
+
+
+def _index(tmp_path):
+    info = tmp_path / "info"
+    info.mkdir()
+    (info / "nginx-core.list").write_text(NGINX_LIST)
+    (info / "mysql-server-core-8.0:amd64.list").write_text(MYSQL_LIST)
+    (info / "nginx-core.md5sums").write_text("ignored\n")
+    packages, entries = ownership.parse_dpkg_lists(
+        str(info), {"nginx-core": "1.18.0-6", "mysql-server-core-8.0": "8.0.36-0"}
+    )
+    return OwnershipIndex.build(packages, entries, key="dpkg:1")
+
+
+def test_files_map_to_their_package_and_directories_are_dropped(tmp_path):
+    index = _index(tmp_path)
+
+    assert index.owner("/etc/nginx/nginx.conf") == ("nginx-core", "1.18.0-6")
+    assert index.owner("/usr/sbin/mysqld") == ("mysql-server-core-8.0", "8.0.36-0")
+    assert index.owner("/etc/nginx") is None
+    assert index.owner("/etc/nginx/nginx.conf.bak") is None
+    assert len(index) == 7
+
+
+def test_build_streams_entries_and_first_listing_wins():
+    packages = [("dash", "0.5.12"), ("bash", "5.2"), ("coreutils", "9.1")]
+    entries = iter(
+        [
+            ("/usr/bin/sh", 0),
+            ("/usr/bin", 0),
+            ("/usr/bin/bash", 1),
+            ("/usr/bin/sh", 1),
+            ("/usr/bin/ls", 2),
+            ("/usr/bin/dash", 0),
+        ]
+    )
+    index = OwnershipIndex.build(packages, entries)
+
+    assert index.owner("/usr/bin/sh") == ("dash", "0.5.12")
+    assert index.owner("/usr/bin/dash") == ("dash", "0.5.12")
+    assert index.owner("/usr/bin") is None
+    assert len(index) == 4
+
+
+def test_usr_merge_twins_resolve(tmp_path):
+    index = _index(tmp_path)
+
+    assert index.owner("/sbin/nginx") == ("nginx-core", "1.18.0-6")
+    assert index.owner("/usr/lib/systemd/system/nginx.service") == ("nginx-core", "1.18.0-6")
+
+
+def test_directory_owner_needs_a_single_package(tmp_path):
+    index = _index(tmp_path)
+
+    assert index.directory_owner("/etc/mysql/conf.d") == ("mysql-server-core-8.0", "8.0.36-0")
+    assert index.directory_owner("/etc/nginx/") == ("nginx-core", "1.18.0-6")
+    assert index.directory_owner("/etc/apache2") is None
+
+
+def test_cache_round_trip_and_invalidation(tmp_path):
+    index = _index(tmp_path)
+    cache = tmp_path / "ownership.idx"
+    index.save(str(cache))
+
+    loaded = OwnershipIndex.load(str(cache), key="dpkg:1")
+    assert loaded is not None
+    assert loaded.owner("/etc/mysql/my.cnf") == ("mysql-server-core-8.0", "8.0.36-0")
+    assert loaded.packages == index.packages
+    assert OwnershipIndex.load(str(cache), key="dpkg:2") is None
+
+    cache.write_bytes(cache.read_bytes()[:-3])
+    assert OwnershipIndex.load(str(cache)) is None
+
+
+def test_parse_rpm_file_list():
+    packages, entries = ownership.parse_rpm_file_list(RPM_FILES)
+    index = OwnershipIndex.build(packages, entries)
+
+    assert packages == [("httpd", "2.4.57-5.el9"), ("redis", "6.2.7-1.el9")]
+    assert index.owner("/etc/httpd/conf/httpd.conf") == ("httpd", "2.4.57-5.el9")
+    assert index.owner("/usr/bin/redis-server") == ("redis", "6.2.7-1.el9")
+
+
+def test_services_and_configs_are_annotated(tmp_path):
+    index = _index(tmp_path)
+    proc = tmp_path / "proc" / "42"
+    proc.mkdir(parents=True)
+    (proc / "exe").symlink_to("/usr/sbin/mysqld")
+    services = [
+        Service(name="mysql", status="running", manager="systemd"),
+        Service(name="nginx", status="running", manager="systemd"),
+        Service(name="app", status="running", main_cmd="/opt/app/bin/app --serve", manager="ps"),
+    ]
+    configs = [
+        ConfigFile(path="/etc/nginx/nginx.conf", service="nginx"),
+        ConfigFile(path="/etc/mysql/conf.d/tuning.cnf", service="mysql"),
+        ConfigFile(path="/etc/redis/redis.conf", service="redis"),
+    ]
+
+    ownership.annotate_services(services, index, {"mysql": 42}, proc_root=str(tmp_path / "proc"))
+    ownership.annotate_configs(configs, index)
+
+    assert [(svc.package, svc.package_version) for svc in services] == [
+        ("mysql-server-core-8.0", "8.0.36-0"),
+        ("nginx-core", "1.18.0-6"),
+        (None, None),
+    ]
+    assert [config.package for config in configs] == ["nginx-core", "mysql-server-core-8.0", None]
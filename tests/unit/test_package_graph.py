@@ -0,0 +1,115 @@
+from legacy_migration_assistant.core.models import ConfigFile, Service
+from legacy_migration_assistant.core.package_graph import PackageGraph, application_closures
+from legacy_migration_assistant.legacy_server_scanner.cli import read_base_packages
+from legacy_migration_assistant.legacy_server_scanner.ownership import (
+    OwnershipIndex,
+    resolve_file_dependencies,
+)
+from legacy_migration_assistant.legacy_server_scanner.packages import (
+    parse_dpkg_query_output,
+    parse_dpkg_relations,
+    parse_rpm_query_output,
+)
+from legacy_migration_assistant.legacy_server_scanner.topology_builder import build_topology
+
+DPKG_QUERY = (
+    "ii \tnginx\t1.22.1-9\t\tnginx-core (<< 1.22.1-9.1~) | nginx-light, lsb-base\t\n"
+    "ii \tnginx-core\t1.22.1-9\t\tlibc6 (>= 2.34), libpcre2-8-0, nginx-common (= 1.22.1-9), default-mta | mail-transport-agent\t"
+    "httpd, httpd-cgi\n"
+    "ii \tnginx-common\t1.22.1-9\t\tlsb-base, debconf (>= 0.5) | debconf-2.0\t\n"
+    "ii \tpostfix\t3.7.6-0\t\tlibc6, ssl-cert\tmail-transport-agent\n"
+    "ii \tssl-cert\t1.1.2\t\topenssl\t\n"
+    "ii \topenssl\t3.0.11-1\t\tlibc6, libssl3\t\n"
+    "ii \tlibssl3:amd64\t3.0.11-1\tlibc6:any\t\t\n"
+    "ii \tlibc6:amd64\t2.36-9\t\tlibgcc-s1\t\n"
+    "ii \tlibgcc-s1:amd64\t12.2.0-14\t\tgcc-12-base, libc6\t\n"
+    "ii \tlibpcre2-8-0:amd64\t10.42-1\t\tlibc6\t\n"
+    "ii \tlsb-base\t11.6\t\tsysvinit-utils\t\n"
+    "ii \tdebconf\t1.5.82\t\t\tdebconf-2.0\n"
+    "rc \told-thing\t1.0\t\t\t\n"
+    "un \tnever-installed\t\t\t\t\n"
+)
+BASE = ["libc6", "libgcc-s1", "gcc-12-base", "debconf", "sysvinit-utils"]
+
+
+def test_parse_dpkg_relations():
+    assert parse_dpkg_relations("libc6 (>= 2.34), default-mta | mail-transport-agent, python3:any [amd64] <!nocheck>") == [
+        "libc6",
+        "default-mta|mail-transport-agent",
+        "python3",
+    ]
+    assert parse_dpkg_relations("") == []
+
+
+def test_parse_dpkg_query_output():
+    packages = {pkg.name: pkg for pkg in parse_dpkg_query_output(DPKG_QUERY)}
+
+    assert "never-installed" not in packages
+    assert packages["libssl3:amd64"].depends == ["libc6"]
+    assert packages["nginx-core"].provides == ["httpd", "httpd-cgi"]
+    assert packages["nginx"].depends == ["nginx-core|nginx-light", "lsb-base"]
+
+
+def test_parse_rpm_query_output():
+    output = (
+        "httpd\t2.4.57-5.el9\t/bin/sh,httpd-core,libc.so.6()(64bit),rpmlib(PayloadIsZstd),systemd,\t"
+        "httpd,httpd(x86-64),webserver,\n"
+        "gpg-pubkey\tfd431d51-4ae0493b\t\tgpg-pubkey,\n"
+    )
+    (httpd,) = parse_rpm_query_output(output)
+
+    assert httpd.version == "2.4.57-5.el9"
+    assert httpd.depends == ["/bin/sh", "httpd-core", "libc.so.6()(64bit)", "systemd"]
+    assert httpd.provides == ["httpd(x86-64)", "webserver"]
+
+
+def test_closure_resolves_alternatives_and_virtual_packages():
+    graph = PackageGraph(parse_dpkg_query_output(DPKG_QUERY))
+
+    # nginx-core | nginx-light: the installed one; mail-transport-agent: provided by postfix.
+    assert graph.dependencies("nginx") == ["nginx-core", "lsb-base"]
+    assert "postfix" in graph.dependencies("nginx-core")
+    # Multi-arch names such as libssl3:amd64 still satisfy plain dependencies.
+    assert graph.closure(["nginx"], exclude=BASE) == [
+        "libpcre2-8-0:amd64",
+        "libssl3:amd64",
+        "lsb-base",
+        "nginx",
+        "nginx-common",
+        "nginx-core",
+        "openssl",
+        "postfix",
+        "ssl-cert",
+    ]
+
+
+def test_file_dependencies_resolve_through_ownership():
+    packages = parse_rpm_query_output("httpd\t2.4.57\t/bin/sh,\t\nbash\t5.1.8\t\t\n")
+    index = OwnershipIndex.build([("bash", "5.1.8")], [("/usr/bin/sh", 0)])
+    resolve_file_dependencies(packages, index)
+
+    assert packages[0].depends == ["bash"]
+    assert PackageGraph(packages).closure(["httpd"]) == ["bash", "httpd"]
+
+
+def test_components_get_their_package_closure():
+    packages = parse_dpkg_query_output(DPKG_QUERY)
+    services = [Service(name="nginx", status="active/running", manager="systemd", package="nginx-core")]
+    configs = [ConfigFile(path="/etc/nginx/nginx.conf", service="nginx", package="nginx-common")]
+    topology = build_topology(packages, services, [], configs, [], base_packages=BASE)
+
+    (web,) = [component for component in topology.components if component.name == "web"]
+    assert "nginx-core" in web.packages
+    assert "nginx" not in web.packages
+    assert "libc6:amd64" not in web.packages
+    assert application_closures(topology, BASE)["web"] == web.packages
+
+
+def test_read_base_packages(tmp_path):
+    listing = tmp_path / "base.txt"
+    listing.write_text("# bookworm-slim\nlibc6\n\nbash  # shell\n")
+    scan = tmp_path / "scan.json"
+    scan.write_text('{"packages": [{"name": "glibc", "version": "2.34"}]}')
+
+    assert read_base_packages(str(listing)) == ["libc6", "bash"]
+    assert read_base_packages(str(scan)) == ["glibc"]
@@ -0,0 +1,57 @@
+from legacy_migration_assistant.core.models import (
+    AppComponent,
+    AppTopology,
+    ComponentType,
+    Relation,
+    ResourceUsage,
+)
+from legacy_migration_assistant.legacy_to_k8s_blueprints.blueprint_models import PlacementThresholds
+from legacy_migration_assistant.legacy_to_k8s_blueprints.compose_parser import topology_to_blueprint
+from legacy_migration_assistant.legacy_to_k8s_blueprints.k8s_generator import build_deployment
+from legacy_migration_assistant.legacy_to_k8s_blueprints.report import collect_findings
+
+
+def _topology():
+    return AppTopology(
+        components=[
+            AppComponent(name="app", component_type=ComponentType.WORKER, services=["php-fpm"]),
+            AppComponent(name="memcached", component_type=ComponentType.CACHE),
+            AppComponent(name="db", component_type=ComponentType.DATABASE),
+        ],
+        relations=[
+            Relation(source="app", target="memcached", connections=40, weight=30.0),
+            Relation(source="app", target="db", connections=6, weight=3.0),
+            Relation(source="app", target="10.0.0.5:5432", connections=50, weight=50.0, external=True),
+        ],
+    )
+
+
+def test_thresholds_pick_coupled_edges():
+    app = topology_to_blueprint(_topology())[0]
+    assert [(r.source, r.target) for r in app.coupled] == [("app", "memcached")]
+    loose = topology_to_blueprint(_topology(), PlacementThresholds(min_mean_connections=2.0))[0]
+    assert [r.target for r in loose.coupled] == ["memcached", "db"]
+
+
+def test_affinity_anti_affinity_spread_and_reasons():
+    services = topology_to_blueprint(_topology(), PlacementThresholds(min_mean_connections=2.0))
+    app, memcached = services[0], services[1]
+    app.usage = ResourceUsage(service="php-fpm", cgroup="v2", cpu_millicores=[100, 400, 100, 100])
+
+    deployment = build_deployment(app)
+    pod = deployment["spec"]["template"]["spec"]
+    terms = pod["affinity"]["podAffinity"]["preferredDuringSchedulingIgnoredDuringExecution"]
+    assert [(t["podAffinityTerm"]["labelSelector"]["matchLabels"]["app"], t["weight"]) for t in terms] == [
+        ("memcached", 100),
+        ("db", 10),
+    ]
+    anti = pod["affinity"]["podAntiAffinity"]["preferredDuringSchedulingIgnoredDuringExecution"][0]
+    assert anti["podAffinityTerm"]["labelSelector"] == {"matchLabels": {"app": "app"}}
+    assert pod["topologySpreadConstraints"][0]["topologyKey"] == "topology.kubernetes.io/zone"
+    notes = deployment["metadata"]["annotations"]["legacy-migration/notes"]
+    assert "podAffinity to memcached (weight 100) from app->memcached (mean 30, peak 40 connections)" in notes
+
+    # the target side prefers its client too, but is a single replica without anti-affinity
+    cache_pod = build_deployment(memcached)["spec"]["template"]["spec"]
+    assert "podAntiAffinity" not in cache_pod["affinity"]
+    assert [f.category for f in collect_findings([memcached])] == ["placement"]
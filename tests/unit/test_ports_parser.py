@@ -20,6 +20,7 @@ tcp        0      0 0.0.0.0:22              0.0.0.0:*               LISTEN
 def test_parse_ss_output():
     ports = parse_ss_output(SS_SAMPLE)
     assert any(p.port == 80 and p.protocol == "tcp" for p in ports)
+    assert [p.backlog for p in ports] == [None, 128]
 
 
 def test_parse_netstat_output():
@@ -1,4 +1,4 @@
-from legacy_migration_assistant.core.models import ComponentType
+from legacy_migration_assistant.core.models import ComponentType, StartupTiming
 from legacy_migration_assistant.legacy_to_k8s_blueprints.probes_advisor import suggest_probes
 
 
@@ -6,3 +6,17 @@ def test_web_probes_http():
     probes = suggest_probes(ComponentType.WEB, [8080])
     assert 'httpGet' in probes.liveness
     assert probes.liveness['httpGet']['port'] == 8080
+
+
+def test_slow_start_gets_startup_probe():
+    probes = suggest_probes(ComponentType.DATABASE, [1521], StartupTiming(service="oracle", start_seconds=150))
+    assert probes.startup is not None
+    budget = probes.startup['failureThreshold'] * probes.startup['periodSeconds']
+    assert budget >= 300
+    assert probes.liveness['initialDelaySeconds'] == 0
+
+
+def test_fast_start_tightens_liveness():
+    probes = suggest_probes(ComponentType.CACHE, [6379], StartupTiming(service="redis", start_seconds=0.4))
+    assert probes.startup is None
+    assert probes.liveness['periodSeconds'] == 5 and probes.liveness['initialDelaySeconds'] == 2
@@ -0,0 +1,83 @@
+import os
+
+from legacy_migration_assistant.core.models import (
+    AppComponent,
+    ComponentType,
+    ConnectionEdge,
+    Port,
+    Relation,
+    Service,
+)
+from legacy_migration_assistant.legacy_server_scanner.relations import (
+    RelationSampler,
+    unit_from_cgroup,
+)
+from legacy_migration_assistant.legacy_server_scanner.topology_builder import observed_relations
+
+HEADER = "  sl  local_address rem_address   st tx_queue rx_queue tr tm->when retrnsmt   uid  timeout inode\n"
+
+
+def _row(local, remote, state, inode):
+    return f"   0: {local} {remote} {state} 00000000:00000000 00:00000000 00000000     0        0 {inode} 1\n"
+
+
+def _proc(tmp_path, rows, owners):
+    (tmp_path / "net").mkdir(exist_ok=True)
+    (tmp_path / "net" / "tcp").write_text(HEADER + "".join(rows))
+    for pid, (unit, inodes) in owners.items():
+        fd = tmp_path / str(pid) / "fd"
+        fd.mkdir(parents=True, exist_ok=True)
+        (tmp_path / str(pid) / "cgroup").write_text(f"0::/system.slice/{unit}.service\n")
+        for number, inode in enumerate(inodes):
+            link = fd / str(number + 3)
+            if not os.path.lexists(link):
+                os.symlink(f"socket:[{inode}]", link)
+
+
+def test_unit_from_cgroup():
+    assert unit_from_cgroup("0::/system.slice/php8.2-fpm.service\n") == "php8.2-fpm"
+    assert unit_from_cgroup("0::/user.slice/user-1000.slice/session-2.scope\n") is None
+
+
+def test_sampler_resolves_both_ends_and_caps_edges(tmp_path):
+    rows = [
+        _row("0100007F:18EB", "00000000:0000", "0A", 10),  # redis listening on 6379
+        _row("0100007F:C001", "0100007F:18EB", "01", 11),  # php -> redis
+        _row("0100007F:C002", "0100007F:18EB", "01", 12),  # php -> redis
+        _row("0100007F:18EB", "0100007F:C001", "01", 13),  # redis server side, not a client
+        _row("0A00000A:C003", "0500000A:1538", "01", 14),  # php -> 10.0.0.5:5432
+    ]
+    _proc(tmp_path, rows, {100: ("redis-server", [10, 13]), 200: ("php-fpm", [11, 12, 14])})
+    services = [Service(name=n, status="active/running", manager="systemd") for n in ("redis-server", "php-fpm")]
+    ports = [Port(protocol="tcp", address="127.0.0.1", port=6379)]
+    sampler = RelationSampler(services, ports, proc_root=str(tmp_path))
+    sampler.tick(0.0)
+    sampler.tick(1.0)
+    edges = {(e.address, e.port): e for e in sampler.results()}
+    local = edges[("127.0.0.1", 6379)]
+    assert (local.source, local.target, local.peak, local.mean) == ("php-fpm", "redis-server", 2, 2.0)
+    remote = edges[("10.0.0.5", 5432)]
+    assert remote.target is None and remote.peak == 1
+
+    capped = RelationSampler(services, ports, proc_root=str(tmp_path), max_edges=1)
+    capped.tick(0.0)
+    assert len(capped.results()) == 1 and capped.dropped == 1
+
+
+def test_edges_become_weighted_relations():
+    components = [
+        AppComponent(name="app", component_type=ComponentType.WORKER, services=["php-fpm"]),
+        AppComponent(name="redis", component_type=ComponentType.CACHE, ports=[6379], services=["redis-server"]),
+        AppComponent(name="web", component_type=ComponentType.WEB, ports=[80], services=["nginx"]),
+    ]
+    edges = [
+        ConnectionEdge(source="php-fpm", address="127.0.0.1", port=6379, target="redis-server", peak=2),
+        ConnectionEdge(source="php-fpm", address="10.0.0.1", port=6379, target="redis-server", peak=3),
+        ConnectionEdge(source="php-fpm", address="10.0.0.5", port=5432, peak=4),
+    ]
+    heuristic = [Relation(source="web", target="redis", description="web uses cache")]
+    relations = observed_relations(components, edges, heuristic)
+    by_pair = {(r.source, r.target): r for r in relations}
+    assert by_pair[("app", "redis")].connections == 5
+    assert by_pair[("app", "10.0.0.5:5432")].external
+    assert by_pair[("web", "redis")].connections is None
@@ -1,8 +1,42 @@
-from legacy_migration_assistant.core.models import ComponentType
-from legacy_migration_assistant.legacy_to_k8s_blueprints.resources_advisor import suggest_resources
+from legacy_migration_assistant.core.metrics import merge_usage
+from legacy_migration_assistant.core.models import ComponentType, ResourceUsage
+from legacy_migration_assistant.legacy_to_k8s_blueprints.resources_advisor import (
+    from_compose_resources,
+    parse_memory,
+    suggest_resources,
+    to_compose_resources,
+)
 
 
 def test_resources_for_web():
     res = suggest_resources(ComponentType.WEB)
     assert res.cpu_request == "200m"
     assert res.memory_limit.endswith("Mi") or res.memory_limit.endswith("Gi")
+
+
+def test_resources_from_measured_usage():
+    usage = ResourceUsage(
+        service="mysql",
+        cgroup="v2",
+        memory_kib=[12 * 1024 * 1024] * 10,
+        memory_peak_kib=13 * 1024 * 1024,
+        cpu_millicores=[800] * 9 + [1500],
+    )
+    res = suggest_resources(ComponentType.DATABASE, usage)
+    assert parse_memory(res.memory_limit) >= 13 * 1024 * 1024
+    assert parse_memory(res.memory_request) >= 12 * 1024 * 1024
+    assert res.cpu_request == "960m"
+    assert res.cpu_limit == "3"
+
+
+def test_merged_usage_keeps_the_longest_series():
+    app = ResourceUsage(service="php-fpm", cgroup="v2", memory_kib=[100, 100, 100], cpu_millicores=[50, 50, 50])
+    late = ResourceUsage(service="worker", cgroup="v2", memory_kib=[10], cpu_millicores=[500])
+    merged = merge_usage("app", [app, late])
+    assert merged.memory_kib == [110, 100, 100]
+    assert merged.cpu_millicores == [550, 50, 50]
+
+
+def test_compose_resources_round_trip():
+    advice = suggest_resources(ComponentType.WEB)
+    assert from_compose_resources(to_compose_resources(advice)) == advice
@@ -0,0 +1,76 @@
+from legacy_migration_assistant.core.models import ComponentType, RuntimeSettings, Service
+from legacy_migration_assistant.legacy_server_scanner.runtimes import (
+    analyze_cmdline,
+    collect_runtime_settings,
+)
+from legacy_migration_assistant.legacy_to_k8s_blueprints.blueprint_models import BlueprintService
+from legacy_migration_assistant.legacy_to_k8s_blueprints.k8s_generator import build_deployment
+from legacy_migration_assistant.legacy_to_k8s_blueprints.resources_advisor import (
+    parse_cpu,
+    parse_memory,
+)
+from legacy_migration_assistant.legacy_to_k8s_blueprints.runtime_advisor import (
+    runtime_cpu_millicores,
+    runtime_env_hints,
+)
+
+
+def test_java_flags_respect_option_precedence():
+    argv = ["/usr/bin/java", "-Xms1g", "-Xmx8g", "-XX:+UseG1GC", "-jar", "app.jar", "-Xmx1g"]
+    settings = analyze_cmdline("tomcat", argv, {"JAVA_TOOL_OPTIONS": "-Xmx2g", "_JAVA_OPTIONS": "-XX:ActiveProcessorCount=4"})
+    assert settings.runtime == "jvm"
+    assert settings.heap_kib == 8 * 1024 * 1024  # the jar's own -Xmx1g argument is not a JVM option
+    assert settings.cpus == 4
+    assert "-XX:+UseG1GC" in settings.options
+
+
+def test_java_flags_after_classpath_are_kept():
+    assert analyze_cmdline("app", ["java", "-cp", "/app/lib/*", "-Xmx8g", "Main"]).heap_kib == 8 * 1024 * 1024
+    settings = analyze_cmdline("app", ["java", "-Xms1g", "-classpath", "app.jar", "-Xmx8g", "Main", "-Xmx1g"])
+    assert settings.heap_kib == 8 * 1024 * 1024
+    assert settings.options == ["-Xms1g", "-Xmx8g"]
+    module = analyze_cmdline("app", ["java", "--module-path", "mods", "-Xmx2g", "-m", "app/app.Main", "-Xmx1g"])
+    assert module.heap_kib == 2 * 1024 * 1024
+
+
+def test_node_gunicorn_uwsgi():
+    node = analyze_cmdline("api", ["node", "--max-old-space-size", "4096", "server.js"])
+    assert node.heap_kib == 4096 * 1024
+    gunicorn = analyze_cmdline("web", ["/usr/bin/python3", "/srv/venv/bin/gunicorn", "-w", "17", "--threads=2", "app:app"])
+    assert (gunicorn.runtime, gunicorn.workers, gunicorn.threads) == ("gunicorn", 17, 2)
+    uwsgi = analyze_cmdline("web", ["uwsgi", "--ini", "app.ini", "--processes", "8"])
+    assert uwsgi.workers == 8
+    assert analyze_cmdline("sshd", ["/usr/sbin/sshd", "-D"]) is None
+
+
+def test_config_file_settings_are_not_replaced_by_defaults():
+    gunicorn = analyze_cmdline("web", ["gunicorn", "-c", "/etc/gunicorn/app.conf.py", "app:app"])
+    assert (gunicorn.workers, gunicorn.options) == (None, [])
+    assert runtime_env_hints(gunicorn) == {} and runtime_cpu_millicores(gunicorn) is None
+    uwsgi = analyze_cmdline("web", ["uwsgi", "--ini", "app.ini", "--threads", "4"])
+    assert (uwsgi.workers, uwsgi.options) == (None, ["--threads=4"])
+    assert runtime_env_hints(uwsgi) == {"UWSGI_THREADS": "4"}
+
+
+def test_collect_reads_proc_cmdline_and_whitelisted_env(tmp_path):
+    (tmp_path / "7").mkdir()
+    (tmp_path / "7" / "cmdline").write_text("node\0server.js\0")
+    (tmp_path / "7" / "environ").write_text("SECRET=x\0NODE_OPTIONS=--max-old-space-size=1024\0")
+    services = [Service(name="api", status="active/running", manager="systemd")]
+    [settings] = collect_runtime_settings(services, {"api": 7}, proc_root=str(tmp_path))
+    assert settings.heap_kib == 1024 * 1024
+
+
+def test_deployment_sized_from_runtime_and_gets_env_hints():
+    runtimes = [
+        RuntimeSettings(service="tomcat", runtime="jvm", heap_kib=8 * 1024 * 1024, options=["-Xmx8g"]),
+        RuntimeSettings(service="gunicorn", runtime="gunicorn", workers=9, options=["--workers=9"]),
+    ]
+    svc = BlueprintService(
+        name="app", component_type=ComponentType.WORKER, environment={"GUNICORN_CMD_ARGS": "--workers=2"}, runtimes=runtimes
+    )
+    container = build_deployment(svc)["spec"]["template"]["spec"]["containers"][0]
+    assert parse_memory(container["resources"]["limits"]["memory"]) >= 8 * 1024 * 1024 * 1.25
+    assert parse_cpu(container["resources"]["requests"]["cpu"]) == 4000
+    env = {item["name"]: item["value"] for item in container["env"]}
+    assert env == {"GUNICORN_CMD_ARGS": "--workers=2", "JAVA_TOOL_OPTIONS": "-Xmx8g"}
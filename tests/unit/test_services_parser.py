@@ -1,6 +1,8 @@
 from legacy_migration_assistant.legacy_server_scanner.services import (
     parse_ps_aux,
     parse_systemctl_list_units,
+    parse_systemctl_show,
+    startup_timing_from_properties,
 )
 
 SYSTEMCTL_SAMPLE = """
@@ -26,3 +28,21 @@ def test_parse_ps_aux():
     services = parse_ps_aux(PS_SAMPLE)
     assert any(s.name == "cron" for s in services)
     assert services[0].pid is not None
+
+
+SHOW_SAMPLE = """Id=tomcat.service
+InactiveExitTimestampMonotonic=5000000
+ActiveEnterTimestampMonotonic=95500000
+NRestarts=2
+
+Id=nginx.service
+InactiveExitTimestampMonotonic=7000000
+ActiveEnterTimestampMonotonic=7250000
+NRestarts=0
+"""
+
+
+def test_startup_timing_from_systemctl_show():
+    timings = [startup_timing_from_properties(p) for p in parse_systemctl_show(SHOW_SAMPLE)]
+    assert timings[0].service == "tomcat" and timings[0].start_seconds == 90.5 and timings[0].restarts == 2
+    assert timings[1].start_seconds == 0.25
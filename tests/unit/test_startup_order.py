@@ -0,0 +1,145 @@
+import pytest
+
+from legacy_migration_assistant.core.graph import (
+    DependencyCycleError,
+    critical_path,
+    dependency_graph,
+    find_cycle,
+    startup_graph,
+    topological_levels,
+)
+from legacy_migration_assistant.core.models import (
+    AppComponent,
+    AppTopology,
+    ComponentType,
+    CpuAffinity,
+    HostMetrics,
+    Relation,
+    StartupTiming,
+)
+from legacy_migration_assistant.legacy_server_scanner.compose_generator import build_compose
+from legacy_migration_assistant.legacy_to_k8s_blueprints.compose_parser import (
+    parse_compose_dict,
+    topology_to_blueprint,
+)
+from legacy_migration_assistant.legacy_to_k8s_blueprints.k8s_generator import build_deployment
+
+
+def _topology():
+    return AppTopology(
+        components=[
+            AppComponent(name="web", component_type=ComponentType.WEB, ports=[8080], depends_on=["app"]),
+            AppComponent(name="app", component_type=ComponentType.WEB, ports=[9000], services=["php-fpm"]),
+            AppComponent(name="db", component_type=ComponentType.DATABASE, ports=[3306], services=["mysqld"]),
+            AppComponent(name="cache", component_type=ComponentType.CACHE, ports=[6379]),
+            AppComponent(name="cron", component_type=ComponentType.WORKER),
+        ],
+        relations=[
+            Relation(source="app", target="db"),
+            Relation(source="app", target="cache"),
+            Relation(source="app", target="10.0.0.9:5432", external=True),
+            Relation(source="cron", target="db"),
+        ],
+        metrics=HostMetrics(startup=[StartupTiming(service="mysqld", start_seconds=40.0)]),
+    )
+
+
+def test_levels_group_independent_components_into_waves():
+    graph = dependency_graph(_topology())
+    assert graph["app"] == ["cache", "db"]
+    assert topological_levels(graph) == [["cache", "db"], ["app", "cron"], ["web"]]
+    assert find_cycle(graph) is None
+
+
+def test_critical_path_by_steps_and_by_measured_start():
+    graph = dependency_graph(_topology())
+    assert critical_path(graph) == (["db", "app", "web"], 3.0)
+    path, seconds = critical_path(graph, {"db": 40.0, "app": 5.0})
+    assert path == ["db", "app", "web"] and seconds == 45.0
+
+
+def test_cycle_is_reported_readably():
+    graph = {"a": ["b"], "b": ["c"], "c": ["a"], "d": []}
+    assert find_cycle(graph) == ["a", "b", "c", "a"]
+    with pytest.raises(DependencyCycleError, match="a -> b -> c -> a"):
+        topological_levels(graph)
+
+
+def test_compose_waits_for_healthy_dependencies():
+    services = build_compose(_topology())["services"]
+    assert services["app"]["depends_on"] == {
+        "cache": {"condition": "service_healthy"},
+        "db": {"condition": "service_healthy"},
+    }
+    assert services["db"]["healthcheck"]["test"] == ["CMD-SHELL", "mysqladmin ping -h 127.0.0.1 --silent"]
+    assert services["db"]["healthcheck"]["start_period"] == "80s"
+    assert "healthcheck" not in services["cron"]
+
+
+def test_compose_only_gates_on_health_commands_the_image_ships():
+    services = build_compose(_topology())["services"]
+    # app listens on 9000 with no known health command; curl or bash may be missing.
+    assert "healthcheck" not in services["app"]
+    assert services["web"]["depends_on"] == {"app": {"condition": "service_started"}}
+    assert "waits for app to start, not to become healthy" in services["web"]["x-notes"][0]
+    assert "x-notes" not in services["app"]
+
+
+def test_compose_refuses_cycles():
+    topology = _topology()
+    topology.components[3].depends_on = ["web"]
+    with pytest.raises(DependencyCycleError, match="app -> cache -> web -> app"):
+        build_compose(topology)
+
+
+def test_deployments_gate_on_dependency_ports():
+    services = {svc.name: svc for svc in topology_to_blueprint(_topology())}
+    assert services["app"].start_wave == 1
+    assert services["app"].wait_for == {"cache": 6379, "db": 3306}
+    deployment = build_deployment(services["app"])
+    init = deployment["spec"]["template"]["spec"]["initContainers"]
+    assert [c["name"] for c in init] == ["wait-for-cache", "wait-for-db"]
+    assert "nc -z db 3306" in init[1]["command"][2]
+    assert deployment["metadata"]["annotations"]["legacy-migration/start-wave"] == "1"
+    assert "initContainers" not in build_deployment(services["db"])["spec"]["template"]["spec"]
+
+
+def test_pinned_pod_with_dependencies_stays_guaranteed():
+    services = {svc.name: svc for svc in topology_to_blueprint(_topology())}
+    app = services["app"]
+    app.affinity = CpuAffinity(service="php-fpm", cpus=[2, 3])
+    spec = build_deployment(app)["spec"]["template"]["spec"]
+
+    containers = spec["initContainers"] + spec["containers"]
+    assert len(containers) == 3
+    for container in containers:
+        assert container["resources"]["requests"] == container["resources"]["limits"]
+
+
+def test_two_way_observed_traffic_does_not_gate_startup():
+    topology = AppTopology(
+        components=[
+            AppComponent(name="api", component_type=ComponentType.WEB, ports=[8080]),
+            AppComponent(name="auth", component_type=ComponentType.WEB, ports=[9000]),
+        ],
+        relations=[
+            Relation(source="api", target="auth", connections=12, observed=True),
+            Relation(source="auth", target="api", connections=3, observed=True),
+        ],
+    )
+
+    assert startup_graph(topology) == ({"api": ["auth"], "auth": []}, [("auth", "api")])
+    compose = build_compose(topology)["services"]
+    assert compose["api"]["depends_on"] == {"auth": {"condition": "service_started"}}
+    assert "depends_on" not in compose["auth"]
+    assert "observed traffic to api does not gate startup" in compose["auth"]["x-notes"][0]
+    services = {svc.name: svc for svc in topology_to_blueprint(topology)}
+    assert services["auth"].wait_for == {}
+    notes = build_deployment(services["auth"])["metadata"]["annotations"]["legacy-migration/notes"]
+    assert "observed traffic to api" in notes
+
+
+def test_compose_input_cycle_is_rejected():
+    data = {"services": {"a": {"depends_on": ["b"]}, "b": {"depends_on": {"a": {"condition": "service_started"}}}}}
+    with pytest.raises(DependencyCycleError):
+        parse_compose_dict(data)
@@ -0,0 +1,78 @@
+import os
+
+from legacy_migration_assistant.core.models import ComponentType, VolumeUsage
+from legacy_migration_assistant.legacy_server_scanner.storage import (
+    find_mount,
+    measure_directory,
+    parse_mountinfo,
+)
+from legacy_migration_assistant.legacy_to_k8s_blueprints.blueprint_models import BlueprintService
+from legacy_migration_assistant.legacy_to_k8s_blueprints.k8s_generator import (
+    build_headless_service,
+    build_statefulset,
+    generate_manifests,
+)
+from legacy_migration_assistant.legacy_to_k8s_blueprints.storage_advisor import volume_size
+
+MOUNTINFO = """\
+22 1 253:0 / / rw,relatime shared:1 - xfs /dev/mapper/root rw,seclabel,attr2
+40 22 253:2 / /var/lib/mysql rw,noatime shared:20 - ext4 /dev/sdb1 rw,data=ordered
+41 22 0:50 / /srv/my\\040share rw - nfs4 nas:/export rw,vers=4.2
+"""
+
+
+def test_mountinfo_longest_prefix_and_escapes():
+    mounts = parse_mountinfo(MOUNTINFO)
+    assert mounts[2].mount_point == "/srv/my share"
+    mysql = find_mount("/var/lib/mysql/ibdata1", mounts)
+    assert (mysql.fstype, mysql.source) == ("ext4", "/dev/sdb1")
+    assert mysql.options == ["rw", "noatime", "data=ordered"]
+    assert find_mount("/var/lib/mysqlx", mounts).fstype == "xfs"
+
+
+def test_parallel_walk_counts_hardlinks_once(tmp_path):
+    (tmp_path / "a" / "b").mkdir(parents=True)
+    (tmp_path / "a" / "b" / "data").write_bytes(b"x" * 65536)
+    os.link(tmp_path / "a" / "b" / "data", tmp_path / "a" / "link")
+    (tmp_path / "c").write_bytes(b"y" * 4096)
+    used, files, complete = measure_directory(str(tmp_path), workers=4)
+    single, _, _ = measure_directory(str(tmp_path / "a" / "b"), workers=1)
+    assert complete and files == 3
+    assert used < 2 * single + 64  # the second link adds no blocks
+
+
+def test_walk_stops_at_time_cap(tmp_path):
+    (tmp_path / "sub").mkdir()
+    ticks = iter([0.0, 0.0, 10.0, 10.0, 10.0])
+    _, _, complete = measure_directory(str(tmp_path), time_cap=1.0, clock=lambda: next(ticks))
+    assert not complete
+
+
+def test_stateful_component_gets_sized_claims():
+    usage = VolumeUsage(path="/var/lib/mysql", used_kib=5 * 1024 * 1024, fstype="ext4", mount_options=["rw", "noatime"])
+    assert volume_size(usage) == "8Gi"
+    assert volume_size(None) == "10Gi"
+    svc = BlueprintService(name="db", component_type=ComponentType.DATABASE, volumes=["/var/lib/mysql"], storage=[usage])
+    manifest = build_statefulset(svc)
+    assert manifest["kind"] == "StatefulSet"
+    assert manifest["spec"]["serviceName"] == "db-headless"
+    assert "volumes" not in manifest["spec"]["template"]["spec"]
+    [claim] = manifest["spec"]["volumeClaimTemplates"]
+    assert claim["metadata"]["name"] == "data-0"
+    assert claim["spec"]["resources"]["requests"]["storage"] == "8Gi"
+    assert "ext4 mounted noatime" in claim["metadata"]["annotations"]["legacy-migration/storage-class-hint"]
+    assert "statefulset-db.yaml" in generate_manifests([svc])
+    assert "deployment-db.yaml" not in generate_manifests([svc])
+
+
+def test_statefulset_names_a_headless_service():
+    svc = BlueprintService(name="db", component_type=ComponentType.DATABASE, ports=[3306], volumes=["/var/lib/mysql"])
+    headless = build_headless_service(svc)
+    assert headless["metadata"]["name"] == build_statefulset(svc)["spec"]["serviceName"]
+    assert headless["spec"]["clusterIP"] == "None"
+    assert "type" not in headless["spec"]
+    assert headless["spec"]["selector"] == {"app": "db"}
+    assert headless["spec"]["ports"] == [{"port": 3306, "targetPort": 3306, "protocol": "TCP"}]
+    manifests = generate_manifests([svc])
+    assert "service-db-headless.yaml" in manifests
+    assert "name: db\n" in manifests["service-db.yaml"]
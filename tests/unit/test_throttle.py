@@ -0,0 +1,130 @@
+from legacy_migration_assistant.core import utils
+from legacy_migration_assistant.legacy_server_scanner import throttle
+from legacy_migration_assistant.legacy_server_scanner.throttle import ScanGovernor
+
+PSI = """some avg10=42.50 avg60=10.00 avg300=2.00 total=123456
+full avg10=1.00 avg60=0.50 avg300=0.10 total=654
+"""
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _governor(clock, cpu=lambda: 0.0, pressure=lambda: None, **kwargs):
+    governor = ScanGovernor(clock=clock, sleep=clock.sleep, cpu_time=cpu, pressure=pressure, **kwargs)
+    governor._next_pressure_check = 0.0
+    return governor
+
+
+def test_parse_pressure_avg10():
+    assert throttle.parse_pressure_avg10(PSI) == 42.5
+    assert throttle.parse_pressure_avg10("") is None
+
+
+def test_cpu_share_pauses_until_usage_fits():
+    clock = FakeClock()
+    used = {"cpu": 0.0}
+    governor = _governor(clock, cpu=lambda: used["cpu"], cpu_share=0.25)
+    clock.now, used["cpu"] = 1.0, 0.5
+
+    governor.pace()
+
+    # 0.5s of CPU at a quarter share needs 2s of wall time, one second more.
+    assert clock.sleeps == [1.0]
+    assert governor.overhead().throttled_seconds == 1.0
+
+
+def test_pressure_backs_off_until_host_is_quiet():
+    clock = FakeClock()
+    readings = iter([30.0, 25.0, 4.0])
+    governor = _governor(clock, pressure=lambda: next(readings), cpu_share=None)
+
+    governor.pace()
+
+    assert clock.sleeps == [throttle.MIN_BACKOFF, throttle.MIN_BACKOFF * 2]
+    overhead = governor.overhead()
+    assert overhead.pressure_backoffs == 1
+    assert overhead.pressure_wait_seconds == 1.5
+
+
+def test_sustained_pressure_costs_one_capped_wait_per_cooldown():
+    clock = FakeClock()
+    governor = _governor(clock, pressure=lambda: 15.0, cpu_share=None)
+
+    work_done = 0.0
+    while work_done < 10.0:
+        clock.now += 0.1
+        work_done += 0.1
+        governor.pace()
+
+    overhead = governor.overhead()
+    assert overhead.pressure_backoffs == 1
+    assert overhead.pressure_wait_seconds == throttle.MAX_PRESSURE_WAIT
+    assert max(clock.sleeps) == throttle.MAX_BACKOFF
+    assert clock.now < 10.0 + throttle.MAX_PRESSURE_WAIT + 1
+
+
+def test_reads_are_rate_limited_and_large_files_dropped_from_cache(tmp_path):
+    clock = FakeClock()
+    big = tmp_path / "big.log"
+    big.write_bytes(b"x" * throttle.LARGE_READ_BYTES)
+    small = tmp_path / "small.conf"
+    small.write_text("a\r\nb\n")
+    governor = _governor(clock, cpu_share=None, read_bytes_per_second=throttle.LARGE_READ_BYTES // 4)
+
+    assert len(governor.read_text(str(big))) == throttle.LARGE_READ_BYTES
+    assert governor.read_text(str(small)) == "a\nb\n"
+    assert governor.read_text(str(tmp_path / "missing")) is None
+
+    overhead = governor.overhead()
+    assert overhead.bytes_read == throttle.LARGE_READ_BYTES + 5
+    assert overhead.files_dropped_from_cache == 1
+    # Four budget-seconds of data, give or take one pause granularity.
+    assert 3.9 <= clock.now <= 4.1
+
+
+def test_governor_is_installed_only_while_active(tmp_path, monkeypatch):
+    monkeypatch.setattr(throttle, "run_command", lambda command: (1, "", ""))
+    path = tmp_path / "app.conf"
+    path.write_text("listen 80\n")
+    governor = ScanGovernor(cpu_share=None, use_cgroup=False, pressure=lambda: None)
+
+    with governor:
+        assert utils.safe_read_file(str(path)) == "listen 80\n"
+    utils.safe_read_file(str(path))
+
+    assert governor.bytes_read == len("listen 80\n")
+    assert "ionice" not in governor.overhead().measures
+
+
+def test_enter_cgroup_writes_caps(tmp_path):
+    root = tmp_path / "cgroup"
+    root.mkdir()
+    (root / "cgroup.controllers").write_text("cpu io memory\n")
+    sda = tmp_path / "sys" / "block" / "sda"
+    sda.mkdir(parents=True)
+    (sda / "dev").write_text("8:0\n")
+    loop = tmp_path / "sys" / "block" / "loop0"
+    loop.mkdir()
+    (loop / "dev").write_text("7:0\n")
+
+    path = throttle.enter_cgroup(0.5, 10_000_000, 4242, cgroup_root=str(root), sys_root=str(tmp_path / "sys"))
+
+    assert path == root / "legacy-scan-4242"
+    assert (path / "cpu.max").read_text() == "50000 100000"
+    assert (path / "io.max").read_text() == "8:0 rbps=10000000"
+    assert (path / "cgroup.procs").read_text() == "4242"
+
+
+def test_enter_cgroup_needs_cgroup_v2(tmp_path):
+    assert throttle.enter_cgroup(0.5, None, 1, cgroup_root=str(tmp_path)) is None
@@ -0,0 +1,34 @@
+import pytest
+
+from legacy_migration_assistant.core.versions import compare_debian, compare_rpm
+
+
+@pytest.mark.parametrize(
+    ("left", "right", "expected"),
+    [
+        ("1.0~rc1", "1.0", -1),
+        ("1:0.9", "2.0", 1),
+        ("3.0.2-0ubuntu1.10", "3.0.2-0ubuntu1.9", 1),
+        ("1.0", "1.00", 0),
+        ("1.0a", "1.0+", -1),
+    ],
+)
+def test_debian_ordering(left, right, expected):
+    result = compare_debian(left, right)
+    assert (result > 0) - (result < 0) == expected
+
+
+@pytest.mark.parametrize(
+    ("left", "right", "expected"),
+    [
+        ("1.0~rc1", "1.0", -1),
+        ("1.0^git1", "1.0", 1),
+        ("1.0^git1", "1.0.1", -1),
+        ("1.a", "1.1", -1),
+        ("3.0.7-16.el9", "3.0.7-18.el9", -1),
+        ("1.001", "1.1", 0),
+    ],
+)
+def test_rpm_ordering(left, right, expected):
+    result = compare_rpm(left, right)
+    assert (result > 0) - (result < 0) == expected
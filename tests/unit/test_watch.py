@@ -0,0 +1,77 @@
+import os
+
+import pytest
+import yaml
+
+from legacy_migration_assistant.core.models import (
+    AppComponent,
+    AppTopology,
+    ComponentType,
+    Relation,
+)
+from legacy_migration_assistant.core.watch import FileWatcher, IncrementalYAMLLoader
+from legacy_migration_assistant.legacy_server_scanner.compose_generator import (
+    IncrementalComposeRenderer,
+    build_compose,
+    compose_to_yaml,
+)
+from legacy_migration_assistant.legacy_to_k8s_blueprints.blueprint_models import BlueprintService
+from legacy_migration_assistant.legacy_to_k8s_blueprints.k8s_generator import (
+    IncrementalManifestRenderer,
+)
+
+
+def _topology(web_ports):
+    return AppTopology(
+        components=[
+            AppComponent(name="web", component_type=ComponentType.WEB, ports=web_ports, notes=["nginx"]),
+            AppComponent(name="db", component_type=ComponentType.DATABASE, ports=[3306], volumes=["/var/lib/mysql"]),
+        ],
+        relations=[Relation(source="web", target="db")],
+    )
+
+
+def test_incremental_loader_reparses_only_changed_items():
+    loader = IncrementalYAMLLoader()
+    text = yaml.safe_dump(_topology([80]).to_dict(), sort_keys=False)
+    assert loader.load(text) == yaml.safe_load(text)
+
+    edited = yaml.safe_dump(_topology([8080]).to_dict(), sort_keys=False)
+    assert loader.load(edited) == yaml.safe_load(edited)
+    assert loader.parsed_chunks == 1
+
+
+def test_compose_renderer_matches_full_render():
+    renderer = IncrementalComposeRenderer()
+    assert renderer.render(_topology([80])) == compose_to_yaml(build_compose(_topology([80])))
+    assert renderer.rendered == ["web", "db"]
+
+    text = renderer.render(_topology([8080]))
+    assert yaml.safe_load(text) == build_compose(_topology([8080]))
+    assert renderer.rendered == ["web"]
+
+
+def test_manifest_renderer_tracks_changes_and_removals():
+    renderer = IncrementalManifestRenderer()
+    web = BlueprintService(name="web", component_type=ComponentType.WEB, ports=[80])
+    db = BlueprintService(name="db", component_type=ComponentType.DATABASE, ports=[5432])
+    renderer.render([web, db])
+    assert len(renderer.changed) == 8
+
+    renderer.render([BlueprintService(name="web", component_type=ComponentType.WEB, ports=[8080])])
+    assert all(name.endswith("-web.yaml") for name in renderer.changed)
+    assert "deployment-db.yaml" in renderer.removed
+
+
+@pytest.mark.parametrize("use_inotify", [False, True])
+def test_file_watcher_detects_modification(tmp_path, use_inotify):
+    target = tmp_path / "app-map.yaml"
+    target.write_text("components: []\n")
+    watcher = FileWatcher(str(target), interval=0.01, use_inotify=use_inotify)
+    try:
+        assert watcher.poll(timeout=0.05) is False
+        target.write_text("components: [{name: web}]\n")
+        os.utime(target, ns=(1, 1))
+        assert watcher.poll(timeout=2) is True
+    finally:
+        watcher.close()